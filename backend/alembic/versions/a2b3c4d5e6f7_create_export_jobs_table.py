@@ -0,0 +1,108 @@
+"""create export_jobs table
+
+Revision ID: a2b3c4d5e6f7
+Revises: f6a7b8c9d0e1
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "a2b3c4d5e6f7"
+down_revision = "f6a7b8c9d0e1"
+branch_labels = None
+depends_on = None
+
+_NULLIF_TENANT = "NULLIF(current_setting('app.current_tenant', true), '')::uuid"
+_TENANT_MATCH = f"tenant_id = {_NULLIF_TENANT}"
+
+# (policy-name suffix, command, using/check clause) — one CREATE POLICY per row.
+_POLICIES = (
+    ("select_tenant", "FOR SELECT", f"USING ({_TENANT_MATCH})"),
+    ("insert_tenant", "FOR INSERT", f"WITH CHECK ({_TENANT_MATCH})"),
+    ("update_tenant", "FOR UPDATE", f"USING ({_TENANT_MATCH}) WITH CHECK ({_TENANT_MATCH})"),
+    ("delete_tenant", "FOR DELETE", f"USING ({_TENANT_MATCH})"),
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "export_jobs",
+        sa.Column(
+            "id",
+            sa.UUID(as_uuid=True),
+            primary_key=True,
+            server_default=sa.text("gen_random_uuid()"),
+        ),
+        sa.Column(
+            "tenant_id",
+            sa.UUID(as_uuid=True),
+            sa.ForeignKey("tenants.id"),
+            nullable=False,
+        ),
+        sa.Column(
+            "requested_by",
+            sa.UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="SET NULL"),
+            nullable=True,
+        ),
+        sa.Column("entity", sa.Text(), nullable=False),
+        sa.Column("format", sa.Text(), nullable=False),
+        sa.Column("start_date", sa.Date(), nullable=True),
+        sa.Column("end_date", sa.Date(), nullable=True),
+        sa.Column("params_hash", sa.Text(), nullable=False),
+        sa.Column("status", sa.Text(), nullable=False, server_default=sa.text("'pending'")),
+        sa.Column("s3_key", sa.Text(), nullable=True),
+        sa.Column("row_count", sa.Integer(), nullable=True),
+        sa.Column("size_bytes", sa.BigInteger(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=True),
+        sa.CheckConstraint(
+            "status IN ('pending', 'running', 'completed', 'failed')",
+            name="ck_export_jobs_status",
+        ),
+        sa.CheckConstraint(
+            "entity IN ('orders', 'donations', 'pledges')",
+            name="ck_export_jobs_entity",
+        ),
+        sa.CheckConstraint(
+            "format IN ('csv', 'csv_gzip', 'parquet', 'xlsx')",
+            name="ck_export_jobs_format",
+        ),
+    )
+
+    op.create_index("ix_export_jobs_tenant_id", "export_jobs", ["tenant_id"])
+    op.create_index(
+        "ix_export_jobs_tenant_params_created",
+        "export_jobs",
+        ["tenant_id", "params_hash", sa.text("created_at DESC")],
+    )
+    op.create_index(
+        "uq_export_jobs_active_params",
+        "export_jobs",
+        ["tenant_id", "params_hash"],
+        unique=True,
+        postgresql_where=sa.text("status IN ('pending', 'running')"),
+    )
+
+    op.execute("ALTER TABLE export_jobs ENABLE ROW LEVEL SECURITY")
+    op.execute("ALTER TABLE export_jobs FORCE ROW LEVEL SECURITY")
+    for suffix, command, clause in _POLICIES:
+        op.execute(f"CREATE POLICY export_jobs_{suffix} ON export_jobs {command} {clause}")
+    op.execute("GRANT SELECT, INSERT, UPDATE, DELETE ON export_jobs TO app_user")
+
+
+def downgrade() -> None:
+    op.execute("REVOKE SELECT, INSERT, UPDATE, DELETE ON export_jobs FROM app_user")
+    for suffix, _command, _clause in _POLICIES:
+        op.execute(f"DROP POLICY IF EXISTS export_jobs_{suffix} ON export_jobs")
+    op.drop_table("export_jobs")
@@ -0,0 +1,74 @@
+"""create idempotency_keys
+
+Revision ID: a5b6c7d8e9f0
+Revises: f4a5b6c7d8e9
+Create Date: 2026-10-19
+
+Database fallback for Idempotency-Key handling on the public submission
+endpoints and POS sales: the stored response of each keyed request,
+committed with the row it created. Redis holds the same responses for the
+fast path.
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "a5b6c7d8e9f0"
+down_revision = "f4a5b6c7d8e9"
+branch_labels = None
+depends_on = None
+
+_NULLIF_TENANT = "NULLIF(current_setting('app.current_tenant', true), '')::uuid"
+_TENANT_MATCH = f"tenant_id = {_NULLIF_TENANT}"
+
+# (policy-name suffix, command, using/check clause) — one CREATE POLICY per row.
+_POLICIES = (
+    ("select_tenant", "FOR SELECT", f"USING ({_TENANT_MATCH})"),
+    ("insert_tenant", "FOR INSERT", f"WITH CHECK ({_TENANT_MATCH})"),
+    ("update_tenant", "FOR UPDATE", f"USING ({_TENANT_MATCH}) WITH CHECK ({_TENANT_MATCH})"),
+    ("delete_tenant", "FOR DELETE", f"USING ({_TENANT_MATCH})"),
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "idempotency_keys",
+        sa.Column(
+            "tenant_id",
+            sa.UUID(as_uuid=True),
+            sa.ForeignKey("tenants.id"),
+            nullable=False,
+        ),
+        sa.Column("endpoint", sa.Text(), nullable=False),
+        sa.Column("key", sa.Text(), nullable=False),
+        sa.Column("request_hash", sa.Text(), nullable=False),
+        sa.Column("status_code", sa.SmallInteger(), nullable=True),
+        sa.Column("response_body", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+        sa.PrimaryKeyConstraint("tenant_id", "endpoint", "key"),
+    )
+    op.create_index("ix_idempotency_keys_tenant_id", "idempotency_keys", ["tenant_id"])
+    op.create_index(
+        "ix_idempotency_keys_tenant_created_at", "idempotency_keys", ["tenant_id", "created_at"]
+    )
+
+    op.execute("ALTER TABLE idempotency_keys ENABLE ROW LEVEL SECURITY")
+    op.execute("ALTER TABLE idempotency_keys FORCE ROW LEVEL SECURITY")
+    for suffix, command, clause in _POLICIES:
+        op.execute(
+            f"CREATE POLICY idempotency_keys_{suffix} ON idempotency_keys {command} {clause}"
+        )
+    op.execute("GRANT SELECT, INSERT, UPDATE, DELETE ON idempotency_keys TO app_user")
+
+
+def downgrade() -> None:
+    op.execute("REVOKE SELECT, INSERT, UPDATE, DELETE ON idempotency_keys FROM app_user")
+    for suffix, _command, _clause in _POLICIES:
+        op.execute(f"DROP POLICY IF EXISTS idempotency_keys_{suffix} ON idempotency_keys")
+    op.drop_table("idempotency_keys")
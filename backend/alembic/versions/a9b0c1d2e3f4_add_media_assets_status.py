@@ -0,0 +1,35 @@
+"""add media_assets.status
+
+Revision ID: a9b0c1d2e3f4
+Revises: f8a9b0c1d2e3
+Create Date: 2026-10-19
+
+New assets start 'pending' and become 'ready' once their upload is
+confirmed; public storefronts only show ready assets. Existing rows were
+already visible, so they are backfilled as 'ready'.
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "a9b0c1d2e3f4"
+down_revision = "f8a9b0c1d2e3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "media_assets",
+        sa.Column("status", sa.Text(), nullable=False, server_default="ready"),
+    )
+    op.alter_column("media_assets", "status", server_default="pending")
+    op.create_check_constraint(
+        "ck_media_assets_status", "media_assets", "status IN ('pending', 'ready')"
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("ck_media_assets_status", "media_assets", type_="check")
+    op.drop_column("media_assets", "status")
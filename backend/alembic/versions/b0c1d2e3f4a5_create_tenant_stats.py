@@ -0,0 +1,118 @@
+"""create tenant_stats
+
+Revision ID: b0c1d2e3f4a5
+Revises: a9b0c1d2e3f4
+Create Date: 2026-10-19
+
+Per-tenant member/order/donation/pledge counts and last activity for the
+platform admin tenant list, maintained by the write paths. Tenants read and
+write their own row; platform admins read all rows (same policy shape as
+ai_usage_rollups).
+
+The source tables are FORCE RLS (app_migrator included), so the backfill
+runs tenant by tenant under each tenant's ``app.current_tenant``, like
+``scripts.rebuild_tenant_stats``. tenant_id is the primary key, so there is
+no separate tenant_id index.
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "b0c1d2e3f4a5"
+down_revision = "a9b0c1d2e3f4"
+branch_labels = None
+depends_on = None
+
+_NULLIF_TENANT = "NULLIF(current_setting('app.current_tenant', true), '')::uuid"
+_TENANT_MATCH = f"tenant_id = {_NULLIF_TENANT}"
+
+_PLATFORM_ADMIN = """
+    EXISTS (
+        SELECT 1 FROM users
+        WHERE users.id = NULLIF(current_setting('app.current_user_id', true), '')::uuid
+          AND users.is_platform_admin = true
+    )
+"""
+
+# Same statement as services.tenant_stats._REBUILD_SQL.
+_BACKFILL_SQL = """
+    INSERT INTO tenant_stats (
+        tenant_id, member_count, order_count, donation_count, pledge_count,
+        last_activity_at, updated_at
+    )
+    SELECT
+        CAST(:tid AS uuid),
+        (SELECT COUNT(*) FROM tenant_members
+         WHERE tenant_id = CAST(:tid AS uuid) AND status = 'active'),
+        (SELECT COUNT(*) FROM orders WHERE tenant_id = CAST(:tid AS uuid)),
+        (SELECT COUNT(*) FROM donations WHERE tenant_id = CAST(:tid AS uuid)),
+        (SELECT COUNT(*) FROM pledges WHERE tenant_id = CAST(:tid AS uuid)),
+        GREATEST(
+            (SELECT MAX(created_at) FROM orders WHERE tenant_id = CAST(:tid AS uuid)),
+            (SELECT MAX(created_at) FROM donations WHERE tenant_id = CAST(:tid AS uuid)),
+            (SELECT MAX(created_at) FROM pledges WHERE tenant_id = CAST(:tid AS uuid))
+        ),
+        now()
+"""
+
+
+def _backfill() -> None:
+    bind = op.get_bind()
+    tenant_ids = [str(row[0]) for row in bind.exec_driver_sql("SELECT id FROM tenants")]
+    for tenant_id in tenant_ids:
+        bind.execute(
+            sa.text("SELECT set_config('app.current_tenant', :tid, true)"), {"tid": tenant_id}
+        )
+        bind.execute(sa.text(_BACKFILL_SQL), {"tid": tenant_id})
+    bind.exec_driver_sql("SELECT set_config('app.current_tenant', '', true)")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "tenant_stats",
+        sa.Column(
+            "tenant_id",
+            sa.UUID(as_uuid=True),
+            sa.ForeignKey("tenants.id"),
+            primary_key=True,
+        ),
+        sa.Column("member_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("order_count", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("donation_count", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("pledge_count", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("last_activity_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+
+    op.execute("ALTER TABLE tenant_stats ENABLE ROW LEVEL SECURITY")
+    op.execute("ALTER TABLE tenant_stats FORCE ROW LEVEL SECURITY")
+    op.execute(
+        f"CREATE POLICY tenant_stats_select ON tenant_stats FOR SELECT USING ({_TENANT_MATCH})"
+    )
+    op.execute(
+        f"CREATE POLICY tenant_stats_insert ON tenant_stats "
+        f"FOR INSERT WITH CHECK ({_TENANT_MATCH})"
+    )
+    op.execute(
+        f"CREATE POLICY tenant_stats_update ON tenant_stats "
+        f"FOR UPDATE USING ({_TENANT_MATCH}) WITH CHECK ({_TENANT_MATCH})"
+    )
+    op.execute(
+        f"CREATE POLICY tenant_stats_platform_admin_select ON tenant_stats "
+        f"FOR SELECT USING ({_PLATFORM_ADMIN})"
+    )
+    op.execute("GRANT SELECT, INSERT, UPDATE ON tenant_stats TO app_user")
+    _backfill()
+
+
+def downgrade() -> None:
+    op.execute("REVOKE SELECT, INSERT, UPDATE ON tenant_stats FROM app_user")
+    for policy in ("select", "insert", "update", "platform_admin_select"):
+        op.execute(f"DROP POLICY IF EXISTS tenant_stats_{policy} ON tenant_stats")
+    op.drop_table("tenant_stats")
@@ -0,0 +1,78 @@
+"""add keyset + filter indexes for orders, donations, pledges lists
+
+Revision ID: b4c5d6e7f8a9
+Revises: a2b3c4d5e6f7
+Create Date: 2026-10-19
+
+The admin list endpoints page on (created_at DESC, id DESC) per tenant.
+Each filter gets a composite index with the filter column between tenant_id
+and the sort key, so a filtered page is a single index range scan. Indexes
+on nullable filter columns are partial (IS NOT NULL) — NULL never matches
+an equality filter, and most storefront orders have no payment method,
+fulfillment status or customer link yet.
+"""
+
+from alembic import op
+
+revision = "b4c5d6e7f8a9"
+down_revision = "a2b3c4d5e6f7"
+branch_labels = None
+depends_on = None
+
+_KEYSET = "created_at DESC, id DESC"
+
+# (index name, table, leading filter columns, partial predicate or None)
+_INDEXES = (
+    ("ix_orders_tenant_created_id", "orders", "tenant_id", None),
+    ("ix_orders_tenant_status_created", "orders", "tenant_id, status", None),
+    ("ix_orders_tenant_source_created", "orders", "tenant_id, source", None),
+    (
+        "ix_orders_tenant_payment_created",
+        "orders",
+        "tenant_id, payment_method",
+        "payment_method IS NOT NULL",
+    ),
+    (
+        "ix_orders_tenant_fulfillment_created",
+        "orders",
+        "tenant_id, fulfillment_status",
+        "fulfillment_status IS NOT NULL",
+    ),
+    (
+        "ix_orders_tenant_customer_created",
+        "orders",
+        "tenant_id, customer_id",
+        "customer_id IS NOT NULL",
+    ),
+    ("ix_donations_tenant_created_id", "donations", "tenant_id", None),
+    ("ix_donations_tenant_status_created", "donations", "tenant_id, status", None),
+    (
+        "ix_donations_tenant_customer_created",
+        "donations",
+        "tenant_id, customer_id",
+        "customer_id IS NOT NULL",
+    ),
+    ("ix_pledges_tenant_created_id", "pledges", "tenant_id", None),
+    ("ix_pledges_tenant_status_created", "pledges", "tenant_id, status", None),
+)
+
+# Superseded by the (tenant_id, created_at, id) keyset indexes above.
+_REPLACED = (
+    ("ix_orders_tenant_created", "orders"),
+    ("ix_donations_tenant_created", "donations"),
+)
+
+
+def upgrade() -> None:
+    for name, table, columns, predicate in _INDEXES:
+        where = f" WHERE {predicate}" if predicate else ""
+        op.execute(f"CREATE INDEX {name} ON {table} ({columns}, {_KEYSET}){where}")
+    for name, _table in _REPLACED:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+def downgrade() -> None:
+    for name, table in _REPLACED:
+        op.execute(f"CREATE INDEX {name} ON {table} (tenant_id, created_at DESC)")
+    for name, _table, _columns, _predicate in reversed(_INDEXES):
+        op.execute(f"DROP INDEX IF EXISTS {name}")
@@ -0,0 +1,82 @@
+"""add running sales totals + z_report to pos_shifts, create pos_shift_payments
+
+Revision ID: b6c7d8e9f0a1
+Revises: a5b6c7d8e9f0
+Create Date: 2026-10-19
+
+Existing shifts start at zero: FORCE RLS keeps the migration from
+backfilling, so run ``python -m scripts.verify_pos_shift_totals --fix``
+afterwards.
+"""
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+from alembic import op
+
+revision = "b6c7d8e9f0a1"
+down_revision = "a5b6c7d8e9f0"
+branch_labels = None
+depends_on = None
+
+_NULLIF_TENANT = "NULLIF(current_setting('app.current_tenant', true), '')::uuid"
+_TENANT_MATCH = f"tenant_id = {_NULLIF_TENANT}"
+
+# (policy-name suffix, command, using/check clause) — one CREATE POLICY per row.
+_POLICIES = (
+    ("select_tenant", "FOR SELECT", f"USING ({_TENANT_MATCH})"),
+    ("insert_tenant", "FOR INSERT", f"WITH CHECK ({_TENANT_MATCH})"),
+    ("update_tenant", "FOR UPDATE", f"USING ({_TENANT_MATCH}) WITH CHECK ({_TENANT_MATCH})"),
+    ("delete_tenant", "FOR DELETE", f"USING ({_TENANT_MATCH})"),
+)
+
+
+def upgrade() -> None:
+    for name in ("order_count", "cancelled_count"):
+        op.add_column(
+            "pos_shifts", sa.Column(name, sa.Integer(), nullable=False, server_default="0")
+        )
+    for name in ("sales_total", "cash_sales"):
+        op.add_column(
+            "pos_shifts",
+            sa.Column(name, sa.Numeric(12, 3), nullable=False, server_default="0"),
+        )
+    op.add_column("pos_shifts", sa.Column("z_report", JSONB(), nullable=True))
+
+    op.create_table(
+        "pos_shift_payments",
+        sa.Column(
+            "tenant_id",
+            sa.UUID(as_uuid=True),
+            sa.ForeignKey("tenants.id"),
+            nullable=False,
+        ),
+        sa.Column(
+            "shift_id",
+            sa.UUID(as_uuid=True),
+            sa.ForeignKey("pos_shifts.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("payment_method", sa.Text(), nullable=False),
+        sa.Column("order_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("total", sa.Numeric(12, 3), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("shift_id", "payment_method"),
+    )
+    op.create_index("ix_pos_shift_payments_tenant_id", "pos_shift_payments", ["tenant_id"])
+
+    op.execute("ALTER TABLE pos_shift_payments ENABLE ROW LEVEL SECURITY")
+    op.execute("ALTER TABLE pos_shift_payments FORCE ROW LEVEL SECURITY")
+    for suffix, command, clause in _POLICIES:
+        op.execute(
+            f"CREATE POLICY pos_shift_payments_{suffix} ON pos_shift_payments {command} {clause}"
+        )
+    op.execute("GRANT SELECT, INSERT, UPDATE, DELETE ON pos_shift_payments TO app_user")
+
+
+def downgrade() -> None:
+    op.execute("REVOKE SELECT, INSERT, UPDATE, DELETE ON pos_shift_payments FROM app_user")
+    for suffix, _command, _clause in _POLICIES:
+        op.execute(f"DROP POLICY IF EXISTS pos_shift_payments_{suffix} ON pos_shift_payments")
+    op.drop_table("pos_shift_payments")
+    for name in ("z_report", "cash_sales", "sales_total", "cancelled_count", "order_count"):
+        op.drop_column("pos_shifts", name)
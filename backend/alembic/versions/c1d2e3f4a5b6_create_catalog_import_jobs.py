@@ -0,0 +1,91 @@
+"""create catalog_import_jobs table
+
+Revision ID: c1d2e3f4a5b6
+Revises: b0c1d2e3f4a5
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision = "c1d2e3f4a5b6"
+down_revision = "b0c1d2e3f4a5"
+branch_labels = None
+depends_on = None
+
+_NULLIF_TENANT = "NULLIF(current_setting('app.current_tenant', true), '')::uuid"
+_TENANT_MATCH = f"tenant_id = {_NULLIF_TENANT}"
+
+# (policy-name suffix, command, using/check clause) — one CREATE POLICY per row.
+_POLICIES = (
+    ("select_tenant", "FOR SELECT", f"USING ({_TENANT_MATCH})"),
+    ("insert_tenant", "FOR INSERT", f"WITH CHECK ({_TENANT_MATCH})"),
+    ("update_tenant", "FOR UPDATE", f"USING ({_TENANT_MATCH}) WITH CHECK ({_TENANT_MATCH})"),
+    ("delete_tenant", "FOR DELETE", f"USING ({_TENANT_MATCH})"),
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "catalog_import_jobs",
+        sa.Column(
+            "id",
+            sa.UUID(as_uuid=True),
+            primary_key=True,
+            server_default=sa.text("gen_random_uuid()"),
+        ),
+        sa.Column(
+            "tenant_id",
+            sa.UUID(as_uuid=True),
+            sa.ForeignKey("tenants.id"),
+            nullable=False,
+        ),
+        sa.Column(
+            "requested_by",
+            sa.UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="SET NULL"),
+            nullable=True,
+        ),
+        sa.Column("file_name", sa.Text(), nullable=False),
+        sa.Column("format", sa.Text(), nullable=False),
+        sa.Column("s3_key", sa.Text(), nullable=False),
+        sa.Column("status", sa.Text(), nullable=False, server_default=sa.text("'pending'")),
+        sa.Column("row_count", sa.Integer(), nullable=True),
+        sa.Column("products_created", sa.Integer(), nullable=True),
+        sa.Column("variants_created", sa.Integer(), nullable=True),
+        sa.Column("errors", postgresql.JSONB(), nullable=True),
+        sa.Column("error_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.CheckConstraint(
+            "status IN ('pending', 'running', 'completed', 'failed')",
+            name="ck_catalog_import_jobs_status",
+        ),
+        sa.CheckConstraint("format IN ('csv', 'xlsx')", name="ck_catalog_import_jobs_format"),
+    )
+
+    op.create_index("ix_catalog_import_jobs_tenant_id", "catalog_import_jobs", ["tenant_id"])
+
+    op.execute("ALTER TABLE catalog_import_jobs ENABLE ROW LEVEL SECURITY")
+    op.execute("ALTER TABLE catalog_import_jobs FORCE ROW LEVEL SECURITY")
+    for suffix, command, clause in _POLICIES:
+        op.execute(
+            f"CREATE POLICY catalog_import_jobs_{suffix} ON catalog_import_jobs {command} {clause}"
+        )
+    op.execute("GRANT SELECT, INSERT, UPDATE, DELETE ON catalog_import_jobs TO app_user")
+
+
+def downgrade() -> None:
+    op.execute("REVOKE SELECT, INSERT, UPDATE, DELETE ON catalog_import_jobs FROM app_user")
+    for suffix, _command, _clause in _POLICIES:
+        op.execute(f"DROP POLICY IF EXISTS catalog_import_jobs_{suffix} ON catalog_import_jobs")
+    op.drop_table("catalog_import_jobs")
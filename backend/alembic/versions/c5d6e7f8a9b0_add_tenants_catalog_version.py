@@ -0,0 +1,26 @@
+"""add tenants.catalog_version
+
+Revision ID: c5d6e7f8a9b0
+Revises: b4c5d6e7f8a9
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "c5d6e7f8a9b0"
+down_revision = "b4c5d6e7f8a9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "tenants",
+        sa.Column("catalog_version", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("tenants", "catalog_version")
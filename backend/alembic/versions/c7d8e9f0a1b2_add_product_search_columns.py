@@ -0,0 +1,96 @@
+"""add generated product search columns (search_text, search_vector) + indexes
+
+Revision ID: c7d8e9f0a1b2
+Revises: b6c7d8e9f0a1
+Create Date: 2026-10-19
+
+``search_normalize`` folds case, Arabic letter variants (alef forms, alef
+maqsura, ta marbuta), diacritics, tatweel and Arabic-Indic digits. It must
+stay identical to services.product_search.normalize_search_text.
+
+Both columns are STORED generated columns, so the ALTER fills them for
+existing rows (no per-tenant backfill needed despite FORCE RLS).
+
+The trigram index needs the ``pg_trgm`` extension (part of contrib, shipped
+with the postgres images we deploy). app_migrator has no CREATE on the
+database, so bootstrap installs it (scripts/init-db.sql, bootstrap_db.py).
+Where it is not installed, the index is skipped with a warning: search
+still answers correctly, the substring match just scans the tenant's
+products.
+"""
+
+import logging
+
+from alembic import op
+
+revision = "c7d8e9f0a1b2"
+down_revision = "b6c7d8e9f0a1"
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+# Keep in sync with services.product_search._FOLD.
+_FOLD_FROM = "أإآٱىة٠١٢٣٤٥٦٧٨٩"
+_FOLD_TO = "اااايه0123456789"
+_DROP = "\u0640\u064b\u064c\u064d\u064e\u064f\u0650\u0651\u0652"  # tatweel, tashkeel
+
+
+def _norm(expr: str) -> str:
+    return f"search_normalize({expr})"
+
+
+_SEARCH_TEXT = _norm(
+    "coalesce(name, '') || ' ' || coalesce(name_ar, '') || ' ' "
+    "|| coalesce(sku, '') || ' ' || coalesce(barcode, '')"
+)
+
+_SEARCH_VECTOR = " || ".join(
+    f"setweight(to_tsvector('simple', {_norm(expr)}), '{weight}')"
+    for expr, weight in (
+        ("coalesce(name, '') || ' ' || coalesce(name_ar, '')", "A"),
+        ("coalesce(sku, '') || ' ' || coalesce(barcode, '')", "B"),
+        ("coalesce(description, '') || ' ' || coalesce(description_ar, '')", "C"),
+    )
+)
+
+
+def upgrade() -> None:
+    op.execute(
+        f"""
+        CREATE FUNCTION search_normalize(text) RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE
+        RETURN lower(translate($1, '{_FOLD_FROM}{_DROP}', '{_FOLD_TO}'))
+        """
+    )
+    op.execute(
+        f"ALTER TABLE products ADD COLUMN search_text text "
+        f"GENERATED ALWAYS AS ({_SEARCH_TEXT}) STORED"
+    )
+    op.execute(
+        f"ALTER TABLE products ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS ({_SEARCH_VECTOR}) STORED"
+    )
+    op.execute("CREATE INDEX ix_products_search_vector ON products USING gin (search_vector)")
+
+    # Bootstrap installs pg_trgm (scripts/init-db.sql): app_migrator cannot.
+    installed = (
+        op.get_bind()
+        .exec_driver_sql("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        .first()
+    )
+    if installed is None:
+        logger.warning("pg_trgm is not installed; skipping ix_products_search_text_trgm")
+        return
+    op.execute(
+        "CREATE INDEX ix_products_search_text_trgm ON products "
+        "USING gin (search_text gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_products_search_text_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_products_search_vector")
+    op.execute("ALTER TABLE products DROP COLUMN search_vector")
+    op.execute("ALTER TABLE products DROP COLUMN search_text")
+    op.execute("DROP FUNCTION search_normalize(text)")
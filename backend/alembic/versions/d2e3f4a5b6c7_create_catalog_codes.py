@@ -0,0 +1,134 @@
+"""create catalog_codes
+
+Revision ID: d2e3f4a5b6c7
+Revises: c1d2e3f4a5b6
+Create Date: 2026-10-19
+
+Registry of every product/variant SKU and barcode, unique per
+(tenant_id, code_type, code) across both tables, used for the cross-table
+uniqueness guard and POS scan lookups.
+
+The source tables are FORCE RLS (app_migrator included), so the backfill
+runs tenant by tenant under each tenant's ``app.current_tenant``, like
+``scripts.rebuild_catalog_codes``. Codes already held by another product or
+variant (duplicates written before the registry existed) are left out and
+reported; fix them by hand, then rerun the script for that tenant.
+"""
+
+import logging
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "d2e3f4a5b6c7"
+down_revision = "c1d2e3f4a5b6"
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+_NULLIF_TENANT = "NULLIF(current_setting('app.current_tenant', true), '')::uuid"
+_TENANT_MATCH = f"tenant_id = {_NULLIF_TENANT}"
+
+# (policy-name suffix, command, using/check clause) — one CREATE POLICY per row.
+_POLICIES = (
+    ("select_tenant", "FOR SELECT", f"USING ({_TENANT_MATCH})"),
+    ("insert_tenant", "FOR INSERT", f"WITH CHECK ({_TENANT_MATCH})"),
+    ("update_tenant", "FOR UPDATE", f"USING ({_TENANT_MATCH}) WITH CHECK ({_TENANT_MATCH})"),
+    ("delete_tenant", "FOR DELETE", f"USING ({_TENANT_MATCH})"),
+)
+
+# Same statement as services.catalog_codes._REBUILD_SQL.
+_BACKFILL_SQL = """
+    INSERT INTO catalog_codes (tenant_id, code_type, code, product_id, variant_id)
+    SELECT tenant_id, 'sku', sku, id, NULL::uuid FROM products
+     WHERE tenant_id = CAST(:tid AS uuid) AND sku IS NOT NULL
+    UNION ALL
+    SELECT tenant_id, 'barcode', barcode, id, NULL::uuid FROM products
+     WHERE tenant_id = CAST(:tid AS uuid) AND barcode IS NOT NULL
+    UNION ALL
+    SELECT tenant_id, 'sku', sku, product_id, id FROM product_variants
+     WHERE tenant_id = CAST(:tid AS uuid) AND sku IS NOT NULL
+    UNION ALL
+    SELECT tenant_id, 'barcode', barcode, product_id, id FROM product_variants
+     WHERE tenant_id = CAST(:tid AS uuid) AND barcode IS NOT NULL
+    ON CONFLICT DO NOTHING
+"""
+
+_CODE_COUNT_SQL = """
+    SELECT (SELECT count(sku) + count(barcode) FROM products
+             WHERE tenant_id = CAST(:tid AS uuid))
+         + (SELECT count(sku) + count(barcode) FROM product_variants
+             WHERE tenant_id = CAST(:tid AS uuid))
+"""
+
+
+def _backfill() -> None:
+    bind = op.get_bind()
+    tenant_ids = [str(row[0]) for row in bind.exec_driver_sql("SELECT id FROM tenants")]
+    for tenant_id in tenant_ids:
+        bind.execute(
+            sa.text("SELECT set_config('app.current_tenant', :tid, true)"), {"tid": tenant_id}
+        )
+        params = {"tid": tenant_id}
+        inserted = bind.execute(sa.text(_BACKFILL_SQL), params).rowcount
+        total = bind.execute(sa.text(_CODE_COUNT_SQL), params).scalar_one()
+        if total > inserted:
+            logger.warning(
+                "catalog_codes: tenant %s has %d duplicate codes not registered",
+                tenant_id,
+                total - inserted,
+            )
+    bind.exec_driver_sql("SELECT set_config('app.current_tenant', '', true)")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "catalog_codes",
+        sa.Column(
+            "tenant_id",
+            sa.UUID(as_uuid=True),
+            sa.ForeignKey("tenants.id"),
+            nullable=False,
+        ),
+        sa.Column("code_type", sa.Text(), nullable=False),
+        sa.Column("code", sa.String(64), nullable=False),
+        sa.Column(
+            "product_id",
+            sa.UUID(as_uuid=True),
+            sa.ForeignKey("products.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "variant_id",
+            sa.UUID(as_uuid=True),
+            sa.ForeignKey("product_variants.id", ondelete="CASCADE"),
+            nullable=True,
+        ),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+        sa.PrimaryKeyConstraint("tenant_id", "code_type", "code"),
+        sa.CheckConstraint("code_type IN ('sku', 'barcode')", name="ck_catalog_codes_code_type"),
+    )
+    op.create_index("ix_catalog_codes_tenant_id", "catalog_codes", ["tenant_id"])
+    op.create_index("ix_catalog_codes_product_id", "catalog_codes", ["product_id"])
+    op.create_index("ix_catalog_codes_variant_id", "catalog_codes", ["variant_id"])
+
+    op.execute("ALTER TABLE catalog_codes ENABLE ROW LEVEL SECURITY")
+    op.execute("ALTER TABLE catalog_codes FORCE ROW LEVEL SECURITY")
+    for suffix, command, clause in _POLICIES:
+        op.execute(f"CREATE POLICY catalog_codes_{suffix} ON catalog_codes {command} {clause}")
+    op.execute("GRANT SELECT, INSERT, UPDATE, DELETE ON catalog_codes TO app_user")
+    _backfill()
+
+
+def downgrade() -> None:
+    op.execute("REVOKE SELECT, INSERT, UPDATE, DELETE ON catalog_codes FROM app_user")
+    for suffix, _command, _clause in _POLICIES:
+        op.execute(f"DROP POLICY IF EXISTS catalog_codes_{suffix} ON catalog_codes")
+    op.drop_table("catalog_codes")
@@ -0,0 +1,171 @@
+"""create append-only ai_messages table; move conversation messages out of JSON
+
+Revision ID: d6e7f8a9b0c1
+Revises: c5d6e7f8a9b0
+Create Date: 2026-10-19
+
+Each chat turn used to rewrite the whole ``messages`` JSON array of its
+conversation. Messages now live one per row in ``ai_messages``; a turn is a
+two-row INSERT and the prompt window is an index range scan on
+(conversation, id DESC). app_user gets SELECT/INSERT only — rows are never
+updated or deleted by the application.
+
+Migrations run as app_migrator, which is subject to FORCE RLS, so the
+backfill (and the downgrade's reverse copy) runs tenant by tenant under each
+tenant's ``app.current_tenant``. The explicit tenant_id filters keep a
+superuser run (RLS bypassed) from copying rows once per tenant.
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "d6e7f8a9b0c1"
+down_revision = "c5d6e7f8a9b0"
+branch_labels = None
+depends_on = None
+
+_NULLIF_TENANT = "NULLIF(current_setting('app.current_tenant', true), '')::uuid"
+_TENANT_MATCH = f"tenant_id = {_NULLIF_TENANT}"
+
+# (conversation table, ai_messages FK column)
+_CONVERSATIONS = (
+    ("ai_conversations", "conversation_id"),
+    ("storefront_ai_conversations", "storefront_conversation_id"),
+)
+
+
+def _tenant_ids() -> list[str]:
+    return [str(row[0]) for row in op.get_bind().exec_driver_sql("SELECT id FROM tenants")]
+
+
+def _set_tenant(tenant_id: str) -> None:
+    op.get_bind().execute(
+        sa.text("SELECT set_config('app.current_tenant', :tid, true)"), {"tid": tenant_id}
+    )
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ai_messages",
+        sa.Column("id", sa.BigInteger(), sa.Identity(always=True), primary_key=True),
+        sa.Column(
+            "tenant_id",
+            sa.UUID(as_uuid=True),
+            sa.ForeignKey("tenants.id"),
+            nullable=False,
+        ),
+        sa.Column(
+            "conversation_id",
+            sa.UUID(as_uuid=True),
+            sa.ForeignKey("ai_conversations.id"),
+            nullable=True,
+        ),
+        sa.Column(
+            "storefront_conversation_id",
+            sa.UUID(as_uuid=True),
+            sa.ForeignKey("storefront_ai_conversations.id"),
+            nullable=True,
+        ),
+        sa.Column("role", sa.Text(), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("summary_through_id", sa.BigInteger(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+        sa.CheckConstraint(
+            "num_nonnulls(conversation_id, storefront_conversation_id) = 1",
+            name="ck_ai_messages_one_conversation",
+        ),
+        sa.CheckConstraint(
+            "role IN ('user', 'assistant', 'summary')",
+            name="ck_ai_messages_role",
+        ),
+        sa.CheckConstraint(
+            "(role = 'summary') = (summary_through_id IS NOT NULL)",
+            name="ck_ai_messages_summary_through",
+        ),
+    )
+
+    op.create_index("ix_ai_messages_tenant_id", "ai_messages", ["tenant_id"])
+    for _table, column in _CONVERSATIONS:
+        op.execute(
+            f"CREATE INDEX ix_ai_messages_{column}_id ON ai_messages ({column}, id DESC) "
+            f"WHERE {column} IS NOT NULL"
+        )
+        # Latest summary per conversation without scanning its messages.
+        op.execute(
+            f"CREATE INDEX ix_ai_messages_{column}_summary ON ai_messages ({column}, id DESC) "
+            f"WHERE {column} IS NOT NULL AND role = 'summary'"
+        )
+
+    op.execute("ALTER TABLE ai_messages ENABLE ROW LEVEL SECURITY")
+    op.execute("ALTER TABLE ai_messages FORCE ROW LEVEL SECURITY")
+    op.execute(
+        f"CREATE POLICY ai_messages_select ON ai_messages FOR SELECT USING ({_TENANT_MATCH})"
+    )
+    op.execute(
+        f"CREATE POLICY ai_messages_insert ON ai_messages FOR INSERT WITH CHECK ({_TENANT_MATCH})"
+    )
+    op.execute("GRANT SELECT, INSERT ON ai_messages TO app_user")
+
+    # Backfill in array order so identity ids preserve message order.
+    bind = op.get_bind()
+    for tenant_id in _tenant_ids():
+        _set_tenant(tenant_id)
+        for table, column in _CONVERSATIONS:
+            bind.execute(
+                sa.text(
+                    f"INSERT INTO ai_messages (tenant_id, {column}, role, content, created_at) "
+                    "SELECT c.tenant_id, c.id, m.value->>'role', m.value->>'content', "
+                    "COALESCE(c.updated_at, c.created_at) "
+                    f"FROM {table} c, jsonb_array_elements(c.messages::jsonb) WITH ORDINALITY m "
+                    "WHERE c.tenant_id = CAST(:tid AS uuid) "
+                    "AND m.value->>'role' IN ('user', 'assistant') "
+                    "ORDER BY c.created_at, c.id, m.ordinality"
+                ),
+                {"tid": tenant_id},
+            )
+    _set_tenant("")
+    for table, _column in _CONVERSATIONS:
+        op.drop_column(table, "messages")
+
+
+def downgrade() -> None:
+    for table, _column in _CONVERSATIONS:
+        op.add_column(
+            table,
+            sa.Column(
+                "messages",
+                sa.JSON(),
+                nullable=False,
+                server_default=sa.text("'[]'::jsonb"),
+            ),
+        )
+
+    # Summaries have no JSON equivalent; the original turns are still stored.
+    bind = op.get_bind()
+    for tenant_id in _tenant_ids():
+        _set_tenant(tenant_id)
+        for table, column in _CONVERSATIONS:
+            bind.execute(
+                sa.text(
+                    f"UPDATE {table} c SET messages = agg.messages FROM ("
+                    f"SELECT {column} AS conv_id, "
+                    "json_agg(json_build_object('role', role, 'content', content) ORDER BY id) "
+                    "AS messages "
+                    "FROM ai_messages WHERE tenant_id = CAST(:tid AS uuid) "
+                    f"AND {column} IS NOT NULL AND role <> 'summary' "
+                    f"GROUP BY {column}) agg WHERE agg.conv_id = c.id"
+                ),
+                {"tid": tenant_id},
+            )
+    _set_tenant("")
+
+    op.execute("REVOKE SELECT, INSERT ON ai_messages FROM app_user")
+    op.execute("DROP POLICY IF EXISTS ai_messages_select ON ai_messages")
+    op.execute("DROP POLICY IF EXISTS ai_messages_insert ON ai_messages")
+    op.drop_table("ai_messages")
@@ -0,0 +1,66 @@
+"""add customers.phone_digits + customer search indexes
+
+Revision ID: d8e9f0a1b2c3
+Revises: c7d8e9f0a1b2
+Create Date: 2026-10-19
+
+``phone_digits`` is a STORED generated column holding only the digits of
+``phone`` ("+965 5555-1234" → "96555551234"), so a number typed at POS
+matches however it was formatted when saved. Prefix matches use a btree
+with ``text_pattern_ops``; substring matches on name (normalized with
+``search_normalize`` from c7d8e9f0a1b2), email and phone_digits use pg_trgm
+GIN indexes, skipped with a warning where bootstrap has not installed the
+extension (see c7d8e9f0a1b2).
+
+Exact-match lookups in ``find_or_create_customer`` are already served by
+uq_customers_tenant_email / uq_customers_tenant_phone: email and phone are
+normalized before they are stored.
+"""
+
+import logging
+
+from alembic import op
+
+revision = "d8e9f0a1b2c3"
+down_revision = "c7d8e9f0a1b2"
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+_TRGM_INDEXES = (
+    ("ix_customers_name_trgm", "search_normalize(name)"),
+    ("ix_customers_email_trgm", "email"),
+    ("ix_customers_phone_digits_trgm", "phone_digits"),
+)
+
+
+def upgrade() -> None:
+    op.execute(
+        "ALTER TABLE customers ADD COLUMN phone_digits text "
+        "GENERATED ALWAYS AS (NULLIF(regexp_replace(phone, '[^0-9]', '', 'g'), '')) STORED"
+    )
+    op.execute(
+        "CREATE INDEX ix_customers_tenant_phone_digits "
+        "ON customers (tenant_id, phone_digits text_pattern_ops) "
+        "WHERE phone_digits IS NOT NULL"
+    )
+
+    # Bootstrap installs pg_trgm (scripts/init-db.sql): app_migrator cannot.
+    installed = (
+        op.get_bind()
+        .exec_driver_sql("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        .first()
+    )
+    if installed is None:
+        logger.warning("pg_trgm is not installed; skipping customer trigram indexes")
+        return
+    for name, expr in _TRGM_INDEXES:
+        op.execute(f"CREATE INDEX {name} ON customers USING gin (({expr}) gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    for name, _expr in _TRGM_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    op.execute("DROP INDEX IF EXISTS ix_customers_tenant_phone_digits")
+    op.execute("ALTER TABLE customers DROP COLUMN phone_digits")
@@ -0,0 +1,68 @@
+"""create catalog_changes
+
+Revision ID: e3f4a5b6c7d8
+Revises: d2e3f4a5b6c7
+Create Date: 2026-10-19
+
+Compacted change log behind the POS catalog sync feed: one row per product
+holding the tenant sync version of its last change. Starts empty; terminals
+begin from a full snapshot, so no backfill is needed.
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "e3f4a5b6c7d8"
+down_revision = "d2e3f4a5b6c7"
+branch_labels = None
+depends_on = None
+
+_NULLIF_TENANT = "NULLIF(current_setting('app.current_tenant', true), '')::uuid"
+_TENANT_MATCH = f"tenant_id = {_NULLIF_TENANT}"
+
+# (policy-name suffix, command, using/check clause) — one CREATE POLICY per row.
+_POLICIES = (
+    ("select_tenant", "FOR SELECT", f"USING ({_TENANT_MATCH})"),
+    ("insert_tenant", "FOR INSERT", f"WITH CHECK ({_TENANT_MATCH})"),
+    ("update_tenant", "FOR UPDATE", f"USING ({_TENANT_MATCH}) WITH CHECK ({_TENANT_MATCH})"),
+    ("delete_tenant", "FOR DELETE", f"USING ({_TENANT_MATCH})"),
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "catalog_changes",
+        sa.Column(
+            "tenant_id",
+            sa.UUID(as_uuid=True),
+            sa.ForeignKey("tenants.id"),
+            nullable=False,
+        ),
+        sa.Column("product_id", sa.UUID(as_uuid=True), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "changed_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+        sa.PrimaryKeyConstraint("tenant_id", "product_id"),
+    )
+    op.create_index("ix_catalog_changes_tenant_id", "catalog_changes", ["tenant_id"])
+    op.create_index(
+        "ix_catalog_changes_tenant_version", "catalog_changes", ["tenant_id", "version"]
+    )
+
+    op.execute("ALTER TABLE catalog_changes ENABLE ROW LEVEL SECURITY")
+    op.execute("ALTER TABLE catalog_changes FORCE ROW LEVEL SECURITY")
+    for suffix, command, clause in _POLICIES:
+        op.execute(f"CREATE POLICY catalog_changes_{suffix} ON catalog_changes {command} {clause}")
+    op.execute("GRANT SELECT, INSERT, UPDATE, DELETE ON catalog_changes TO app_user")
+
+
+def downgrade() -> None:
+    op.execute("REVOKE SELECT, INSERT, UPDATE, DELETE ON catalog_changes FROM app_user")
+    for suffix, _command, _clause in _POLICIES:
+        op.execute(f"DROP POLICY IF EXISTS catalog_changes_{suffix} ON catalog_changes")
+    op.drop_table("catalog_changes")
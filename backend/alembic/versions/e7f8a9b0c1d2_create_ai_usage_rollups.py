@@ -0,0 +1,105 @@
+"""create ai_usage_rollups and ai_usage_rollup_state
+
+Revision ID: e7f8a9b0c1d2
+Revises: d6e7f8a9b0c1
+Create Date: 2026-10-19
+
+Hourly and daily per-tenant AI usage aggregates (by channel and model), kept
+up to date by the rollup_ai_usage worker job. Tenants read their own rows;
+platform admins read all rows (same policy shape as orders/donations/pledges).
+The job state table is global (no tenant_id, no RLS), like ``tenants``.
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "e7f8a9b0c1d2"
+down_revision = "d6e7f8a9b0c1"
+branch_labels = None
+depends_on = None
+
+_NULLIF_TENANT = "NULLIF(current_setting('app.current_tenant', true), '')::uuid"
+_TENANT_MATCH = f"tenant_id = {_NULLIF_TENANT}"
+
+_PLATFORM_ADMIN = """
+    EXISTS (
+        SELECT 1 FROM users
+        WHERE users.id = NULLIF(current_setting('app.current_user_id', true), '')::uuid
+          AND users.is_platform_admin = true
+    )
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ai_usage_rollups",
+        sa.Column(
+            "tenant_id",
+            sa.UUID(as_uuid=True),
+            sa.ForeignKey("tenants.id"),
+            nullable=False,
+        ),
+        sa.Column("period", sa.Text(), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("channel", sa.Text(), nullable=False),
+        sa.Column("model", sa.Text(), nullable=False),
+        sa.Column("tokens_in", sa.BigInteger(), nullable=False),
+        sa.Column("tokens_out", sa.BigInteger(), nullable=False),
+        sa.Column("cost_usd", sa.Numeric(14, 6), nullable=False),
+        sa.Column("request_count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("tenant_id", "period", "bucket_start", "channel", "model"),
+        sa.CheckConstraint("period IN ('hour', 'day')", name="ck_ai_usage_rollups_period"),
+        sa.CheckConstraint(
+            "channel IN ('dashboard', 'storefront')", name="ck_ai_usage_rollups_channel"
+        ),
+    )
+    op.create_index("ix_ai_usage_rollups_tenant_id", "ai_usage_rollups", ["tenant_id"])
+    # Platform-wide reports scan one period across all tenants.
+    op.execute(
+        "CREATE INDEX ix_ai_usage_rollups_period_bucket "
+        "ON ai_usage_rollups (period, bucket_start)"
+    )
+
+    op.execute("ALTER TABLE ai_usage_rollups ENABLE ROW LEVEL SECURITY")
+    op.execute("ALTER TABLE ai_usage_rollups FORCE ROW LEVEL SECURITY")
+    op.execute(
+        f"CREATE POLICY ai_usage_rollups_select ON ai_usage_rollups "
+        f"FOR SELECT USING ({_TENANT_MATCH})"
+    )
+    op.execute(
+        f"CREATE POLICY ai_usage_rollups_insert ON ai_usage_rollups "
+        f"FOR INSERT WITH CHECK ({_TENANT_MATCH})"
+    )
+    op.execute(
+        f"CREATE POLICY ai_usage_rollups_update ON ai_usage_rollups "
+        f"FOR UPDATE USING ({_TENANT_MATCH}) WITH CHECK ({_TENANT_MATCH})"
+    )
+    op.execute(
+        f"CREATE POLICY ai_usage_rollups_platform_admin_select ON ai_usage_rollups "
+        f"FOR SELECT USING ({_PLATFORM_ADMIN})"
+    )
+    op.execute("GRANT SELECT, INSERT, UPDATE ON ai_usage_rollups TO app_user")
+
+    op.create_table(
+        "ai_usage_rollup_state",
+        sa.Column("job", sa.Text(), primary_key=True),
+        sa.Column("rolled_up_to", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+    op.execute("GRANT SELECT, INSERT, UPDATE ON ai_usage_rollup_state TO app_user")
+
+
+def downgrade() -> None:
+    op.execute("REVOKE SELECT, INSERT, UPDATE ON ai_usage_rollup_state FROM app_user")
+    op.drop_table("ai_usage_rollup_state")
+
+    op.execute("REVOKE SELECT, INSERT, UPDATE ON ai_usage_rollups FROM app_user")
+    for policy in ("select", "insert", "update", "platform_admin_select"):
+        op.execute(f"DROP POLICY IF EXISTS ai_usage_rollups_{policy} ON ai_usage_rollups")
+    op.drop_table("ai_usage_rollups")
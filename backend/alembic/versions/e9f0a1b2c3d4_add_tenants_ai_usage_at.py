@@ -0,0 +1,33 @@
+"""add tenants.ai_usage_at
+
+Revision ID: e9f0a1b2c3d4
+Revises: d8e9f0a1b2c3
+Create Date: 2026-10-19
+
+Time of the tenant's latest AI usage log row, set by the write paths (see
+services.ai_usage.mark_ai_usage). The usage logs are FORCE RLS, so the
+rollup job cannot ask them which tenants have new rows; it reads this
+column on the global ``tenants`` table instead and only visits tenants
+used since its high-water mark.
+
+The logs cannot be read here either, so existing tenants start at now():
+the first rollup run after upgrading visits every tenant once.
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "e9f0a1b2c3d4"
+down_revision = "d8e9f0a1b2c3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("tenants", sa.Column("ai_usage_at", sa.DateTime(timezone=True), nullable=True))
+    op.execute("UPDATE tenants SET ai_usage_at = now()")
+
+
+def downgrade() -> None:
+    op.drop_column("tenants", "ai_usage_at")
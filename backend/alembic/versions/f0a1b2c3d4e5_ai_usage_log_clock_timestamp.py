@@ -0,0 +1,32 @@
+"""stamp AI usage logs with clock_timestamp()
+
+Revision ID: f0a1b2c3d4e5
+Revises: e9f0a1b2c3d4
+Create Date: 2026-10-19
+
+``created_at`` defaulted to now(), the transaction start. The chat request
+transaction stays open across the provider call (failover included), so a
+row could commit after the rollup job's high-water mark had already passed
+its ``created_at`` and never be rolled up. clock_timestamp() stamps the row
+when it is inserted, just before the turn commits, so ROLLUP_LAG only has
+to cover the commit itself.
+"""
+
+from alembic import op
+
+revision = "f0a1b2c3d4e5"
+down_revision = "e9f0a1b2c3d4"
+branch_labels = None
+depends_on = None
+
+_TABLES = ("ai_usage_log", "storefront_ai_usage_log")
+
+
+def upgrade() -> None:
+    for table in _TABLES:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN created_at SET DEFAULT clock_timestamp()")
+
+
+def downgrade() -> None:
+    for table in _TABLES:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN created_at SET DEFAULT now()")
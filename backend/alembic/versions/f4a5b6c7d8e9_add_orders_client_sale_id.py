@@ -0,0 +1,31 @@
+"""add orders.client_sale_id for offline POS batch uploads
+
+Revision ID: f4a5b6c7d8e9
+Revises: e3f4a5b6c7d8
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "f4a5b6c7d8e9"
+down_revision = "e3f4a5b6c7d8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("orders", sa.Column("client_sale_id", sa.Text(), nullable=True))
+    op.create_index(
+        "uq_orders_tenant_client_sale_id",
+        "orders",
+        ["tenant_id", "client_sale_id"],
+        unique=True,
+        postgresql_where=sa.text("client_sale_id IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_orders_tenant_client_sale_id", table_name="orders")
+    op.drop_column("orders", "client_sale_id")
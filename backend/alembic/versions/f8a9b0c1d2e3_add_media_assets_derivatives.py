@@ -0,0 +1,29 @@
+"""add media_assets.size_bytes and derivatives
+
+Revision ID: f8a9b0c1d2e3
+Revises: e7f8a9b0c1d2
+Create Date: 2026-10-19
+
+size_bytes is recorded when an upload is confirmed; derivatives lists the
+resized WebP/JPEG copies produced by the media worker.
+"""
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+from alembic import op
+
+revision = "f8a9b0c1d2e3"
+down_revision = "e7f8a9b0c1d2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("media_assets", sa.Column("size_bytes", sa.BigInteger(), nullable=True))
+    op.add_column("media_assets", sa.Column("derivatives", JSONB(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("media_assets", "derivatives")
+    op.drop_column("media_assets", "size_bytes")
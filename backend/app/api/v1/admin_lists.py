@@ -1,6 +1,6 @@
 """Tenant-scoped list + export endpoints for orders, donations, pledges.
 
-GET /tenants/me/orders
+GET /tenants/me/orders      — keyset-paginated on (created_at, id), filterable
 GET /tenants/me/donations
 GET /tenants/me/pledges
 GET /tenants/me/orders/export
@@ -11,11 +11,12 @@ Role: member+ for lists, admin+ for exports.
 """
 
 import uuid
-from datetime import date
+from datetime import date, datetime
+from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import Response
-from sqlalchemy import select
+from sqlalchemy import Select, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.dependencies import get_current_user, get_db_with_tenant, require_role
@@ -23,97 +24,202 @@ from app.models.donation import Donation
 from app.models.order import Order
 from app.models.pledge import Pledge
 from app.models.user import User
+from app.schemas.common import CountedPaginatedResponse
 from app.schemas.donation import DonationListItem
 from app.schemas.order import OrderDetailResponse, OrderListItem
 from app.schemas.pledge import PledgeListItem
 from app.services.csv_export import rows_to_csv_bytes
+from app.services.exports import (
+    DONATION_COLUMNS,
+    ORDER_COLUMNS,
+    PLEDGE_COLUMNS,
+    donation_row,
+    headers_of,
+    order_row,
+    pledge_row,
+)
+from app.services.pagination import count_rows
 
 router = APIRouter()
 
 DEFAULT_LIMIT = 50
 
+# Listable models share tenant_id / status / created_at / id.
+_Listable = Order | Donation | Pledge
 
-@router.get("/orders", response_model=list[OrderListItem])
+
+def _encode_cursor(row: _Listable) -> str:
+    return f"{row.created_at.isoformat()}|{row.id}"
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    try:
+        dt_str, id_str = cursor.split("|", 1)
+        return datetime.fromisoformat(dt_str), uuid.UUID(id_str)
+    except (ValueError, AttributeError) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
+def _norm(value: str | None) -> str | None:
+    return value.strip().lower() if value else None
+
+
+async def _paginate(
+    db: AsyncSession,
+    model: type[_Listable],
+    stmt: Select[Any],
+    cursor: str | None,
+    limit: int,
+    include_total: bool,
+) -> tuple[list[Any], str | None, bool, int | None, bool]:
+    """Run a filtered list query as a (created_at, id) keyset page.
+
+    Returns (rows, next_cursor, has_more, total, total_is_estimate).
+    """
+    total, total_is_estimate = await count_rows(db, stmt) if include_total else (None, False)
+
+    page = stmt.order_by(model.created_at.desc(), model.id.desc())
+    if cursor:
+        cursor_dt, cursor_id = _decode_cursor(cursor)
+        page = page.where(tuple_(model.created_at, model.id) < tuple_(cursor_dt, cursor_id))
+    result = await db.execute(page.limit(limit + 1))
+    rows = list(result.scalars().all())
+
+    has_more = len(rows) > limit
+    items = rows[:limit]
+    next_cursor = _encode_cursor(items[-1]) if has_more and items else None
+    return items, next_cursor, has_more, total, total_is_estimate
+
+
+def _date_range(
+    stmt: Select[Any], model: type[_Listable], start_date: date | None, end_date: date | None
+) -> Select[Any]:
+    if start_date:
+        stmt = stmt.where(model.created_at >= start_date)
+    if end_date:
+        stmt = stmt.where(model.created_at < end_date)
+    return stmt
+
+
+@router.get("/orders", response_model=CountedPaginatedResponse[OrderListItem])
 async def list_orders(
     status: str | None = Query(None),
+    source: str | None = Query(None),
+    payment_method: str | None = Query(None),
+    fulfillment_status: str | None = Query(None),
+    customer_id: uuid.UUID | None = Query(None),
+    start_date: date | None = Query(None),
+    end_date: date | None = Query(None),
+    cursor: str | None = Query(None),
     limit: int = Query(DEFAULT_LIMIT, ge=1, le=200),
-    offset: int = Query(0, ge=0),
+    include_total: bool = Query(False),
     user: User = Depends(get_current_user),
     db_tenant: tuple[AsyncSession, uuid.UUID] = Depends(get_db_with_tenant),
-) -> list[OrderListItem]:
+) -> CountedPaginatedResponse[OrderListItem]:
+    """List orders newest first. Filters combine with AND; end_date is exclusive."""
     db, tenant_id = db_tenant
     await require_role("member", db, tenant_id, user)
 
-    stmt = select(Order).where(Order.tenant_id == tenant_id).order_by(Order.created_at.desc())
+    stmt = select(Order).where(Order.tenant_id == tenant_id)
     if status:
-        stmt = stmt.where(Order.status == status.strip().lower())
-    stmt = stmt.offset(offset).limit(limit)
-
-    result = await db.execute(stmt)
-    return [OrderListItem.model_validate(r) for r in result.scalars().all()]
+        stmt = stmt.where(Order.status == _norm(status))
+    if source:
+        stmt = stmt.where(Order.source == _norm(source))
+    if payment_method:
+        stmt = stmt.where(Order.payment_method == _norm(payment_method))
+    if fulfillment_status:
+        stmt = stmt.where(Order.fulfillment_status == _norm(fulfillment_status))
+    if customer_id:
+        stmt = stmt.where(Order.customer_id == customer_id)
+    stmt = _date_range(stmt, Order, start_date, end_date)
+
+    items, next_cursor, has_more, total, estimated = await _paginate(
+        db, Order, stmt, cursor, limit, include_total
+    )
+    return CountedPaginatedResponse(
+        items=[OrderListItem.model_validate(r) for r in items],
+        next_cursor=next_cursor,
+        has_more=has_more,
+        total=total,
+        total_is_estimate=estimated,
+    )
 
 
-@router.get("/donations", response_model=list[DonationListItem])
+@router.get("/donations", response_model=CountedPaginatedResponse[DonationListItem])
 async def list_donations(
     status: str | None = Query(None),
+    customer_id: uuid.UUID | None = Query(None),
+    start_date: date | None = Query(None),
+    end_date: date | None = Query(None),
+    cursor: str | None = Query(None),
     limit: int = Query(DEFAULT_LIMIT, ge=1, le=200),
-    offset: int = Query(0, ge=0),
+    include_total: bool = Query(False),
     user: User = Depends(get_current_user),
     db_tenant: tuple[AsyncSession, uuid.UUID] = Depends(get_db_with_tenant),
-) -> list[DonationListItem]:
+) -> CountedPaginatedResponse[DonationListItem]:
+    """List donations newest first. Filters combine with AND; end_date is exclusive."""
     db, tenant_id = db_tenant
     await require_role("member", db, tenant_id, user)
 
-    stmt = (
-        select(Donation)
-        .where(Donation.tenant_id == tenant_id)
-        .order_by(Donation.created_at.desc())
-    )
+    stmt = select(Donation).where(Donation.tenant_id == tenant_id)
     if status:
-        stmt = stmt.where(Donation.status == status.strip().lower())
-    stmt = stmt.offset(offset).limit(limit)
+        stmt = stmt.where(Donation.status == _norm(status))
+    if customer_id:
+        stmt = stmt.where(Donation.customer_id == customer_id)
+    stmt = _date_range(stmt, Donation, start_date, end_date)
 
-    result = await db.execute(stmt)
-    return [DonationListItem.model_validate(r) for r in result.scalars().all()]
+    items, next_cursor, has_more, total, estimated = await _paginate(
+        db, Donation, stmt, cursor, limit, include_total
+    )
+    return CountedPaginatedResponse(
+        items=[DonationListItem.model_validate(r) for r in items],
+        next_cursor=next_cursor,
+        has_more=has_more,
+        total=total,
+        total_is_estimate=estimated,
+    )
 
 
-@router.get("/pledges", response_model=list[PledgeListItem])
+@router.get("/pledges", response_model=CountedPaginatedResponse[PledgeListItem])
 async def list_pledges(
     status: str | None = Query(None),
+    start_date: date | None = Query(None),
+    end_date: date | None = Query(None),
+    cursor: str | None = Query(None),
     limit: int = Query(DEFAULT_LIMIT, ge=1, le=200),
-    offset: int = Query(0, ge=0),
+    include_total: bool = Query(False),
     user: User = Depends(get_current_user),
     db_tenant: tuple[AsyncSession, uuid.UUID] = Depends(get_db_with_tenant),
-) -> list[PledgeListItem]:
+) -> CountedPaginatedResponse[PledgeListItem]:
+    """List pledges newest first. Filters combine with AND; end_date is exclusive."""
     db, tenant_id = db_tenant
     await require_role("member", db, tenant_id, user)
 
-    stmt = select(Pledge).where(Pledge.tenant_id == tenant_id).order_by(Pledge.created_at.desc())
+    stmt = select(Pledge).where(Pledge.tenant_id == tenant_id)
     if status:
-        stmt = stmt.where(Pledge.status == status.strip().lower())
-    stmt = stmt.offset(offset).limit(limit)
+        stmt = stmt.where(Pledge.status == _norm(status))
+    stmt = _date_range(stmt, Pledge, start_date, end_date)
 
-    result = await db.execute(stmt)
-    return [PledgeListItem.model_validate(r) for r in result.scalars().all()]
+    items, next_cursor, has_more, total, estimated = await _paginate(
+        db, Pledge, stmt, cursor, limit, include_total
+    )
+    return CountedPaginatedResponse(
+        items=[PledgeListItem.model_validate(r) for r in items],
+        next_cursor=next_cursor,
+        has_more=has_more,
+        total=total,
+        total_is_estimate=estimated,
+    )
 
 
 # ---------------------------------------------------------------------------
 # CSV exports (admin+)
 # ---------------------------------------------------------------------------
 
+# Larger ranges should go through the background export jobs (/tenants/me/exports).
 MAX_EXPORT_ROWS = 10000
 
 
-def _items_summary(items_json: list) -> str:
-    """Flatten JSONB order items into a readable summary string."""
-    parts = []
-    for item in items_json:
-        name = item.get("name", "?")
-        qty = item.get("qty", 1)
-        parts.append(f"{name} x{qty}")
-    return "; ".join(parts)
-
-
 def _csv_response(data: bytes, filename: str) -> Response:
     return Response(
         content=data,
@@ -141,36 +247,8 @@ async def export_orders(
     stmt = stmt.limit(MAX_EXPORT_ROWS)
 
     result = await db.execute(stmt)
-    orders = result.scalars().all()
-
-    headers = [
-        "order_number",
-        "status",
-        "customer_name",
-        "customer_phone",
-        "customer_email",
-        "items",
-        "total_amount",
-        "currency",
-        "notes",
-        "created_at",
-    ]
-    rows = [
-        (
-            o.order_number,
-            o.status,
-            o.customer_name,
-            o.customer_phone,
-            o.customer_email,
-            _items_summary(o.items if isinstance(o.items, list) else []),
-            o.total_amount,
-            o.currency,
-            o.notes,
-            o.created_at,
-        )
-        for o in orders
-    ]
-    return _csv_response(rows_to_csv_bytes(headers, rows), "orders.csv")
+    rows = [order_row(o) for o in result.scalars().all()]
+    return _csv_response(rows_to_csv_bytes(headers_of(ORDER_COLUMNS), rows), "orders.csv")
 
 
 @router.get("/orders/{order_id}", response_model=OrderDetailResponse)
@@ -214,38 +292,8 @@ async def export_donations(
     stmt = stmt.limit(MAX_EXPORT_ROWS)
 
     result = await db.execute(stmt)
-    donations = result.scalars().all()
-
-    headers = [
-        "donation_number",
-        "status",
-        "donor_name",
-        "donor_phone",
-        "donor_email",
-        "amount",
-        "currency",
-        "campaign",
-        "receipt_requested",
-        "notes",
-        "created_at",
-    ]
-    rows = [
-        (
-            d.donation_number,
-            d.status,
-            d.donor_name,
-            d.donor_phone,
-            d.donor_email,
-            d.amount,
-            d.currency,
-            d.campaign,
-            d.receipt_requested,
-            d.notes,
-            d.created_at,
-        )
-        for d in donations
-    ]
-    return _csv_response(rows_to_csv_bytes(headers, rows), "donations.csv")
+    rows = [donation_row(d) for d in result.scalars().all()]
+    return _csv_response(rows_to_csv_bytes(headers_of(DONATION_COLUMNS), rows), "donations.csv")
 
 
 @router.get("/pledges/export")
@@ -267,35 +315,5 @@ async def export_pledges(
     stmt = stmt.limit(MAX_EXPORT_ROWS)
 
     result = await db.execute(stmt)
-    pledges = result.scalars().all()
-
-    headers = [
-        "pledge_number",
-        "status",
-        "pledgor_name",
-        "pledgor_phone",
-        "pledgor_email",
-        "amount",
-        "currency",
-        "target_date",
-        "fulfilled_amount",
-        "notes",
-        "created_at",
-    ]
-    rows = [
-        (
-            p.pledge_number,
-            p.status,
-            p.pledgor_name,
-            p.pledgor_phone,
-            p.pledgor_email,
-            p.amount,
-            p.currency,
-            p.target_date,
-            p.fulfilled_amount,
-            p.notes,
-            p.created_at,
-        )
-        for p in pledges
-    ]
-    return _csv_response(rows_to_csv_bytes(headers, rows), "pledges.csv")
+    rows = [pledge_row(p) for p in result.scalars().all()]
+    return _csv_response(rows_to_csv_bytes(headers_of(PLEDGE_COLUMNS), rows), "pledges.csv")
@@ -1,24 +1,78 @@
-"""Dashboard AI assistant chat endpoint.
+"""Dashboard AI assistant chat endpoints.
 
-POST /tenants/me/ai/chat — authenticated, member+ role.
+POST /tenants/me/ai/chat                        — authenticated, member+ role.
+POST /tenants/me/ai/chat/stream                 — same, relayed token by token over SSE.
+GET  /tenants/me/ai/storefront/answer-cache     — storefront cache hit rate, admin+.
+GET  /tenants/me/ai/usage                       — hourly/daily usage rollups, admin+.
 """
 
+import logging
 import uuid
+from collections.abc import AsyncIterator
+from datetime import UTC, date, datetime, timedelta
+from decimal import Decimal
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.core.dependencies import get_current_user, get_db_with_tenant, require_role
+from app.models.ai_usage_rollup import AIUsageRollup
+from app.models.storefront_ai_usage_log import StorefrontAIUsageLog
 from app.models.tenant import Tenant
 from app.models.user import User
-from app.schemas.ai_chat import AIChatRequest, AIChatResponse, AIChatUsage
-from app.services.ai_gateway import AIGatewayError, handle_chat
-from app.services.ai_provider import get_provider
+from app.schemas.ai_chat import (
+    AIChatRequest,
+    AIChatResponse,
+    AIChatUsage,
+    AIUsageBucket,
+    AIUsageReportResponse,
+    AnswerCacheStatsResponse,
+)
+from app.services.ai_answer_cache import ANSWER_CACHE_MODEL
+from app.services.ai_gateway import (
+    AIGatewayError,
+    ChatResult,
+    PreparedChat,
+    handle_chat,
+    prepare_chat,
+    stream_chat,
+)
+from app.services.ai_provider import AIProvider, get_provider
+from app.services.ai_usage import rolled_up_to, usage_range
+from app.services.sse import SSE_HEADERS, SSE_MEDIA_TYPE, sse_event
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+_USAGE_MAX_DAYS = {"hour": 31, "day": 366}
+
+
+async def _load_tenant(db: AsyncSession, tenant_id: uuid.UUID) -> Tenant:
+    # Load tenant with plan eagerly for quota check
+    result = await db.execute(
+        select(Tenant).options(selectinload(Tenant.plan)).where(Tenant.id == tenant_id)
+    )
+    tenant = result.scalar_one_or_none()
+    if tenant is None:
+        raise HTTPException(status_code=500, detail="Tenant not found")
+    return tenant
+
+
+def _chat_response(chat_result: ChatResult) -> AIChatResponse:
+    return AIChatResponse(
+        conversation_id=chat_result.conversation_id,
+        reply=chat_result.reply,
+        usage=AIChatUsage(
+            tokens_in=chat_result.tokens_in,
+            tokens_out=chat_result.tokens_out,
+            cost_usd=chat_result.cost_usd,
+        ),
+    )
+
 
 @router.post("/ai/chat", response_model=AIChatResponse)
 async def ai_chat(
@@ -30,14 +84,7 @@ async def ai_chat(
     db, tenant_id = db_tenant
     await require_role("member", db, tenant_id, user)
 
-    # Load tenant with plan eagerly for quota check
-    result = await db.execute(
-        select(Tenant).options(selectinload(Tenant.plan)).where(Tenant.id == tenant_id)
-    )
-    tenant = result.scalar_one_or_none()
-    if tenant is None:
-        raise HTTPException(status_code=500, detail="Tenant not found")
-
+    tenant = await _load_tenant(db, tenant_id)
     provider = get_provider()
 
     try:
@@ -53,12 +100,131 @@ async def ai_chat(
             detail={"message": "AI provider error", "type": "provider_error"},
         ) from e
 
-    return AIChatResponse(
-        conversation_id=chat_result.conversation_id,
-        reply=chat_result.reply,
-        usage=AIChatUsage(
-            tokens_in=chat_result.tokens_in,
-            tokens_out=chat_result.tokens_out,
-            cost_usd=chat_result.cost_usd,
-        ),
+    return _chat_response(chat_result)
+
+
+async def _chat_events(prepared: PreparedChat, provider: AIProvider) -> AsyncIterator[str]:
+    try:
+        async for item in stream_chat(prepared, provider):
+            if isinstance(item, ChatResult):
+                yield sse_event("done", _chat_response(item).model_dump(mode="json"))
+            else:
+                yield sse_event("token", {"delta": item})
+    except Exception:
+        logger.exception("AI chat stream failed tenant=%s", prepared.tenant_id)
+        yield sse_event("error", {"message": "AI provider error", "type": "provider_error"})
+
+
+@router.post("/ai/chat/stream")
+async def ai_chat_stream(
+    body: AIChatRequest,
+    user: User = Depends(get_current_user),
+    db_tenant: tuple[AsyncSession, uuid.UUID] = Depends(get_db_with_tenant),
+) -> StreamingResponse:
+    """Stream the assistant reply as SSE: ``token`` events, then ``done`` or ``error``.
+
+    Validation, rate-limit and quota failures are plain HTTP errors before the
+    stream starts. The ``done`` payload matches the non-streaming response.
+    """
+    db, tenant_id = db_tenant
+    await require_role("member", db, tenant_id, user)
+
+    tenant = await _load_tenant(db, tenant_id)
+    provider = get_provider()
+
+    try:
+        prepared = await prepare_chat(db, tenant, user.id, body.message)
+    except AIGatewayError as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail={"message": e.detail, "type": e.error_type},
+        ) from e
+
+    # Release the request's DB connection while tokens stream; the turn is
+    # recorded on a fresh session once the provider finishes.
+    await db.commit()
+    await db.close()
+
+    return StreamingResponse(
+        _chat_events(prepared, provider), media_type=SSE_MEDIA_TYPE, headers=SSE_HEADERS
+    )
+
+
+@router.get("/ai/storefront/answer-cache", response_model=AnswerCacheStatsResponse)
+async def storefront_answer_cache_stats(
+    days: int = Query(30, ge=1, le=365),
+    user: User = Depends(get_current_user),
+    db_tenant: tuple[AsyncSession, uuid.UUID] = Depends(get_db_with_tenant),
+) -> AnswerCacheStatsResponse:
+    """Hit rate of the storefront answer cache, from the usage log."""
+    db, tenant_id = db_tenant
+    await require_role("admin", db, tenant_id, user)
+
+    is_hit = StorefrontAIUsageLog.model == ANSWER_CACHE_MODEL
+    result = await db.execute(
+        select(
+            func.count(),
+            func.count().filter(is_hit),
+            func.coalesce(func.sum(StorefrontAIUsageLog.cost_usd), 0),
+        ).where(
+            StorefrontAIUsageLog.tenant_id == tenant_id,
+            StorefrontAIUsageLog.created_at >= datetime.now(UTC) - timedelta(days=days),
+        )
+    )
+    requests, hits, cost = result.one()
+    return AnswerCacheStatsResponse(
+        days=days,
+        requests=requests,
+        cache_hits=hits,
+        hit_rate=round(hits / requests, 4) if requests else 0.0,
+        provider_cost_usd=cost,
+    )
+
+
+@router.get("/ai/usage", response_model=AIUsageReportResponse)
+async def ai_usage_report(
+    from_date: date | None = Query(None, alias="from"),
+    to_date: date | None = Query(None, alias="to"),
+    period: str = Query("day"),
+    user: User = Depends(get_current_user),
+    db_tenant: tuple[AsyncSession, uuid.UUID] = Depends(get_db_with_tenant),
+) -> AIUsageReportResponse:
+    """Tenant AI tokens/cost per hour or day, by channel and model (month-to-date)."""
+    db, tenant_id = db_tenant
+    await require_role("admin", db, tenant_id, user)
+
+    if period not in _USAGE_MAX_DAYS:
+        raise HTTPException(status_code=422, detail="period must be 'hour' or 'day'")
+    start, end = usage_range(from_date, to_date, _USAGE_MAX_DAYS[period])
+
+    result = await db.execute(
+        select(AIUsageRollup)
+        .where(
+            AIUsageRollup.tenant_id == tenant_id,
+            AIUsageRollup.period == period,
+            AIUsageRollup.bucket_start >= start,
+            AIUsageRollup.bucket_start < end,
+        )
+        .order_by(AIUsageRollup.bucket_start, AIUsageRollup.channel, AIUsageRollup.model)
+    )
+    buckets = [
+        AIUsageBucket(
+            bucket_start=row.bucket_start,
+            channel=row.channel,
+            model=row.model,
+            tokens_in=row.tokens_in,
+            tokens_out=row.tokens_out,
+            cost_usd=row.cost_usd,
+            request_count=row.request_count,
+        )
+        for row in result.scalars().all()
+    ]
+    return AIUsageReportResponse(
+        period=period,
+        rolled_up_to=await rolled_up_to(db),
+        tokens_in=sum(b.tokens_in for b in buckets),
+        tokens_out=sum(b.tokens_out for b in buckets),
+        cost_usd=sum((b.cost_usd for b in buckets), Decimal(0)),
+        request_count=sum(b.request_count for b in buckets),
+        buckets=buckets,
     )
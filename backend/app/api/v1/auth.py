@@ -24,6 +24,7 @@ from app.schemas.auth import (
     LoginResponse,
 )
 from app.services.auth_service import mock_login, refresh_cognito_token
+from app.services.tenant_stats import update_tenant_stats
 
 router = APIRouter()
 
@@ -363,6 +364,7 @@ async def accept_invite(
         invitation.user_id = user.id
         invitation.status = "active"
         invitation.joined_at = datetime.now(UTC)
+        await update_tenant_stats(db, invitation.tenant_id, members=1)
         accepted.append(
             {
                 "tenant_id": str(invitation.tenant_id),
@@ -0,0 +1,111 @@
+"""Bulk catalog import jobs (products + variants from CSV/XLSX).
+
+POST /tenants/me/products/imports           — upload a file and queue the import
+GET  /tenants/me/products/imports/{job_id}  — job status + per-row error report
+
+Role: admin+ (same as product create). File layout: see services.catalog_import.
+"""
+
+import asyncio
+import logging
+import uuid
+from datetime import UTC, datetime
+
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.dependencies import get_current_user, get_db_with_tenant, require_role
+from app.models.catalog_import_job import CatalogImportJob
+from app.models.user import User
+from app.schemas.catalog_import import CatalogImportJobResponse
+from app.services.catalog_import import IMPORT_FORMATS, MAX_IMPORT_BYTES
+from app.services.storage import build_import_key, put_object
+from app.workers.tasks.catalog_import import run_catalog_import
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+def _import_format(file_name: str) -> str:
+    extension = file_name.rsplit(".", 1)[-1].lower() if "." in file_name else ""
+    for fmt, (ext, _content_type) in IMPORT_FORMATS.items():
+        if extension == ext:
+            return fmt
+    raise HTTPException(status_code=400, detail="File must be a .csv or .xlsx")
+
+
+@router.post("", response_model=CatalogImportJobResponse, status_code=202)
+async def create_catalog_import(
+    file: UploadFile = File(...),
+    user: User = Depends(get_current_user),
+    db_tenant: tuple[AsyncSession, uuid.UUID] = Depends(get_db_with_tenant),
+) -> CatalogImportJob:
+    """Store the uploaded file and queue the import job."""
+    db, tenant_id = db_tenant
+    await require_role("admin", db, tenant_id, user)
+
+    file_name = file.filename or ""
+    fmt = _import_format(file_name)
+    body = await file.read(MAX_IMPORT_BYTES + 1)
+    if not body:
+        raise HTTPException(status_code=400, detail="File is empty")
+    if len(body) > MAX_IMPORT_BYTES:
+        raise HTTPException(status_code=413, detail="File exceeds the 10 MB import limit")
+
+    job_id = uuid.uuid4()
+    extension, content_type = IMPORT_FORMATS[fmt]
+    s3_key = build_import_key(tenant_id, job_id, extension)
+    try:
+        await asyncio.to_thread(put_object, s3_key, body, content_type)
+    except Exception:
+        logger.exception("Failed to store catalog import upload %s", s3_key)
+        raise HTTPException(status_code=502, detail="Failed to store import file") from None
+
+    job = CatalogImportJob(
+        id=job_id,
+        tenant_id=tenant_id,
+        requested_by=user.id,
+        file_name=file_name[:255],
+        format=fmt,
+        s3_key=s3_key,
+        status="pending",
+    )
+    db.add(job)
+    await db.flush()
+    await db.refresh(job)
+    # Commit before dispatching so the worker can see the row
+    await db.commit()
+
+    try:
+        run_catalog_import.delay(str(tenant_id), str(job.id))
+    except Exception:
+        logger.exception("Failed to enqueue catalog import job=%s", job.id)
+        job.status = "failed"
+        job.error = "Failed to enqueue import"
+        job.completed_at = datetime.now(UTC)
+        await db.commit()
+
+    return job
+
+
+@router.get("/{job_id}", response_model=CatalogImportJobResponse)
+async def get_catalog_import(
+    job_id: uuid.UUID,
+    user: User = Depends(get_current_user),
+    db_tenant: tuple[AsyncSession, uuid.UUID] = Depends(get_db_with_tenant),
+) -> CatalogImportJob:
+    """Return job status; failed jobs carry the per-row error report."""
+    db, tenant_id = db_tenant
+    await require_role("admin", db, tenant_id, user)
+
+    result = await db.execute(
+        select(CatalogImportJob).where(
+            CatalogImportJob.id == job_id, CatalogImportJob.tenant_id == tenant_id
+        )
+    )
+    job = result.scalar_one_or_none()
+    if job is None:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job
@@ -13,6 +13,7 @@ from app.models.category import Category
 from app.models.user import User
 from app.schemas.category import CategoryCreate, CategoryResponse, CategoryUpdate
 from app.schemas.common import BulkDeleteRequest, BulkDeleteResponse, PaginatedResponse
+from app.services.catalog_version import bump_catalog_version
 
 router = APIRouter()
 
@@ -84,6 +85,7 @@ async def create_category(
     )
     db.add(category)
     await db.flush()
+    await bump_catalog_version(db, tenant_id)
     await db.refresh(category)
     return CategoryResponse.model_validate(category)
 
@@ -125,6 +127,7 @@ async def update_category(
         setattr(category, field, value)
 
     await db.flush()
+    await bump_catalog_version(db, tenant_id)
     await db.refresh(category)
     return CategoryResponse.model_validate(category)
 
@@ -143,6 +146,8 @@ async def bulk_delete_categories(
         sa_delete(Category).where(Category.id.in_(body.ids)).returning(Category.id)
     )
     deleted_ids = result.fetchall()
+    if deleted_ids:
+        await bump_catalog_version(db, tenant_id)
     await db.flush()
     return BulkDeleteResponse(deleted=len(deleted_ids))
 
@@ -162,4 +167,5 @@ async def delete_category(
         raise HTTPException(status_code=404, detail="Category not found")
 
     await db.delete(category)
+    await bump_catalog_version(db, tenant_id)
     await db.flush()
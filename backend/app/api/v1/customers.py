@@ -15,6 +15,7 @@ from app.models.user import User
 from app.schemas.common import PaginatedResponse
 from app.schemas.customer import CustomerCreate, CustomerResponse, CustomerUpdate
 from app.schemas.order import OrderListItem
+from app.services.customer_search import search_customers
 
 router = APIRouter()
 
@@ -68,6 +69,27 @@ async def list_customers(
     )
 
 
+@router.get("/search", response_model=PaginatedResponse[CustomerResponse])
+async def search_customers_endpoint(
+    q: str = Query(..., min_length=1, max_length=100),
+    cursor: str | None = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=100),
+    user: User = Depends(get_current_user),
+    db_tenant: tuple[AsyncSession, uuid.UUID] = Depends(get_db_with_tenant),
+) -> PaginatedResponse[CustomerResponse]:
+    """Customers matching *q* by name, email or phone, best match first.
+    Cashiers may search so POS can look up a number as it is typed."""
+    db, tenant_id = db_tenant
+    await require_role("cashier", db, tenant_id, user)
+
+    items, next_cursor = await search_customers(db, tenant_id, q, limit=limit, cursor=cursor)
+    return PaginatedResponse(
+        items=[CustomerResponse.model_validate(c) for c in items],
+        next_cursor=next_cursor,
+        has_more=next_cursor is not None,
+    )
+
+
 @router.post("", response_model=CustomerResponse, status_code=201)
 async def create_customer(
     body: CustomerCreate,
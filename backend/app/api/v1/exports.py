@@ -0,0 +1,162 @@
+"""Background export jobs for orders, donations, pledges.
+
+POST /tenants/me/exports           — queue an export (deduplicated per parameter set)
+GET  /tenants/me/exports/{job_id}  — job status + presigned download URL
+
+Role: admin+ (same as the synchronous CSV exports).
+"""
+
+import hashlib
+import json
+import logging
+import uuid
+from datetime import UTC, datetime, timedelta
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy import or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.dependencies import get_current_user, get_db_with_tenant, require_role
+from app.models.export_job import ExportJob
+from app.models.user import User
+from app.schemas.export_job import ExportJobCreateRequest, ExportJobResponse
+from app.services.exports import export_file_name
+from app.services.storage import presign_get
+from app.workers.tasks.exports import run_export_job
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# A pending/running job older than this is assumed lost (worker died) and is
+# superseded instead of blocking new requests for the same parameters.
+_STALE_JOB_AFTER = timedelta(hours=1)
+
+
+def _params_hash(body: ExportJobCreateRequest) -> str:
+    canonical = json.dumps(
+        {
+            "entity": body.entity,
+            "format": body.format,
+            "start_date": body.start_date.isoformat() if body.start_date else None,
+            "end_date": body.end_date.isoformat() if body.end_date else None,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _job_response(job: ExportJob) -> ExportJobResponse:
+    response = ExportJobResponse.model_validate(job)
+    if job.status == "completed" and job.s3_key and job.expires_at > datetime.now(UTC):
+        response.download_url = presign_get(
+            job.s3_key, download_name=export_file_name(job.entity, job.format, job.created_at)
+        )
+    return response
+
+
+async def _find_reusable_job(
+    db: AsyncSession, tenant_id: uuid.UUID, params_hash: str
+) -> ExportJob | None:
+    """Newest in-flight or unexpired completed job for the same parameters."""
+    now = datetime.now(UTC)
+    result = await db.execute(
+        select(ExportJob)
+        .where(
+            ExportJob.tenant_id == tenant_id,
+            ExportJob.params_hash == params_hash,
+            or_(
+                ExportJob.status.in_(("pending", "running")),
+                (ExportJob.status == "completed") & (ExportJob.expires_at > now),
+            ),
+        )
+        .order_by(ExportJob.created_at.desc())
+        .limit(1)
+    )
+    job = result.scalar_one_or_none()
+    if (
+        job is not None
+        and job.status in ("pending", "running")
+        and job.created_at < now - _STALE_JOB_AFTER
+    ):
+        job.status = "failed"
+        job.error = "Export timed out"
+        job.completed_at = now
+        await db.flush()
+        return None
+    return job
+
+
+@router.post("", response_model=ExportJobResponse, status_code=202)
+async def create_export_job(
+    body: ExportJobCreateRequest,
+    response: Response,
+    user: User = Depends(get_current_user),
+    db_tenant: tuple[AsyncSession, uuid.UUID] = Depends(get_db_with_tenant),
+) -> ExportJobResponse:
+    """Queue a background export. Returns the existing job (200) for a repeat request."""
+    db, tenant_id = db_tenant
+    await require_role("admin", db, tenant_id, user)
+
+    params_hash = _params_hash(body)
+    existing = await _find_reusable_job(db, tenant_id, params_hash)
+    if existing is not None:
+        response.status_code = 200
+        return _job_response(existing)
+
+    job = ExportJob(
+        tenant_id=tenant_id,
+        requested_by=user.id,
+        entity=body.entity,
+        format=body.format,
+        start_date=body.start_date,
+        end_date=body.end_date,
+        params_hash=params_hash,
+        status="pending",
+    )
+    try:
+        async with db.begin_nested():
+            db.add(job)
+            await db.flush()
+    except IntegrityError:
+        # A concurrent request queued the same export first.
+        existing = await _find_reusable_job(db, tenant_id, params_hash)
+        if existing is None:
+            raise HTTPException(status_code=409, detail="Export already in progress") from None
+        response.status_code = 200
+        return _job_response(existing)
+
+    await db.refresh(job)
+    # Commit before dispatching so the worker can see the row
+    await db.commit()
+
+    try:
+        run_export_job.delay(str(tenant_id), str(job.id))
+    except Exception:
+        logger.exception("Failed to enqueue export job=%s", job.id)
+        job.status = "failed"
+        job.error = "Failed to enqueue export"
+        job.completed_at = datetime.now(UTC)
+        await db.commit()
+
+    return _job_response(job)
+
+
+@router.get("/{job_id}", response_model=ExportJobResponse)
+async def get_export_job(
+    job_id: uuid.UUID,
+    user: User = Depends(get_current_user),
+    db_tenant: tuple[AsyncSession, uuid.UUID] = Depends(get_db_with_tenant),
+) -> ExportJobResponse:
+    """Return job status; completed, unexpired jobs include a presigned download URL."""
+    db, tenant_id = db_tenant
+    await require_role("admin", db, tenant_id, user)
+
+    result = await db.execute(
+        select(ExportJob).where(ExportJob.id == job_id, ExportJob.tenant_id == tenant_id)
+    )
+    job = result.scalar_one_or_none()
+    if job is None:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    return _job_response(job)
@@ -0,0 +1,52 @@
+"""Live event stream for dashboards and POS terminals.
+
+GET /tenants/me/events — authenticated SSE stream, cashier+ role.
+"""
+
+import logging
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.dependencies import get_current_user, get_db_with_tenant, require_role
+from app.models.user import User
+from app.services.live_events import acquire_connection, live_event_stream
+from app.services.sse import SSE_HEADERS, SSE_MEDIA_TYPE
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.get("/events")
+async def stream_events(
+    user: User = Depends(get_current_user),
+    db_tenant: tuple[AsyncSession, uuid.UUID] = Depends(get_db_with_tenant),
+) -> StreamingResponse:
+    """The tenant's order and shift events over SSE (see services.live_events).
+
+    Starts with ``ready``; clients load their state after it and then apply
+    events as deltas. A ``: ping`` comment is sent every
+    ``LIVE_EVENTS_HEARTBEAT_SECONDS``. 429 when the tenant already has
+    ``LIVE_EVENTS_MAX_CONNECTIONS_PER_TENANT`` streams open.
+    """
+    db, tenant_id = db_tenant
+    await require_role("cashier", db, tenant_id, user)
+
+    try:
+        lease_id = await acquire_connection(tenant_id)
+    except Exception as exc:
+        logger.warning("Live events unavailable tenant=%s", tenant_id, exc_info=True)
+        raise HTTPException(status_code=503, detail="Live events unavailable") from exc
+    if lease_id is None:
+        raise HTTPException(status_code=429, detail="Too many live event connections")
+
+    # Release the request's DB connection for the life of the stream.
+    await db.commit()
+    await db.close()
+
+    return StreamingResponse(
+        live_event_stream(tenant_id, lease_id), media_type=SSE_MEDIA_TYPE, headers=SSE_HEADERS
+    )
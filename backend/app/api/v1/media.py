@@ -1,10 +1,11 @@
 """Presigned media upload/download endpoints."""
 
+import asyncio
 import logging
 import uuid
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.dependencies import get_current_user, get_db_with_tenant, require_role
@@ -12,19 +13,30 @@ from app.models.media_asset import MediaAsset
 from app.models.user import User
 from app.schemas.media import (
     MediaAssetResponse,
+    MediaBatchConfirmRequest,
+    MediaBatchConfirmResponse,
+    MediaBatchUploadRequest,
+    MediaBatchUploadResponse,
+    MediaConfirmFailure,
     MediaDownloadResponse,
     MediaUploadRequest,
     MediaUploadResponse,
 )
+from app.services.media_derivatives import IMAGE_CONTENT_TYPES
 from app.services.storage import (
     ALLOWED_CONTENT_TYPES,
+    MAX_UPLOAD_SIZE,
     PRESIGN_DOWNLOAD_EXPIRES,
     PRESIGN_UPLOAD_EXPIRES,
     build_tenant_key,
     delete_object,
+    head_object,
+    head_objects,
     presign_get,
     presign_put,
+    presign_put_many,
 )
+from app.workers.tasks.media import generate_media_derivatives
 
 logger = logging.getLogger(__name__)
 
@@ -73,7 +85,9 @@ async def create_upload_url(
     """Generate a presigned PUT URL for uploading a file to S3.
 
     Creates a media_assets row and returns the upload URL.
-    The client should PUT the file directly to the returned URL.
+    The client should PUT the file directly to the returned URL, then call
+    the confirm endpoint; until then the asset is pending and hidden from
+    storefronts.
     """
     db, tenant_id = db_tenant
     await require_role("admin", db, tenant_id, user)
@@ -115,6 +129,163 @@ async def create_upload_url(
     )
 
 
+@router.post("/upload-urls", response_model=MediaBatchUploadResponse, status_code=201)
+async def create_upload_urls(
+    body: MediaBatchUploadRequest,
+    user: User = Depends(get_current_user),
+    db_tenant: tuple[AsyncSession, uuid.UUID] = Depends(get_db_with_tenant),
+):
+    """Presigned PUT URLs for several files (e.g. a product gallery) at once.
+
+    All media_assets rows go in with one multi-row INSERT and all URLs are
+    signed with one S3 client. Assets stay pending until confirmed.
+    """
+    db, tenant_id = db_tenant
+    await require_role("admin", db, tenant_id, user)
+
+    for i, file in enumerate(body.files):
+        if file.content_type not in ALLOWED_CONTENT_TYPES:
+            allowed = ", ".join(sorted(ALLOWED_CONTENT_TYPES))
+            raise HTTPException(
+                status_code=400,
+                detail=f"files[{i}].content_type must be one of: {allowed}",
+            )
+
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "tenant_id": tenant_id,
+            "s3_key": build_tenant_key(tenant_id, file.file_name),
+            "file_name": file.file_name,
+            "content_type": file.content_type,
+            "product_id": file.product_id,
+            "entity_type": file.entity_type,
+            "entity_id": file.entity_id,
+        }
+        for file in body.files
+    ]
+    await db.execute(insert(MediaAsset), rows)
+
+    upload_urls = presign_put_many([(row["s3_key"], row["content_type"]) for row in rows])
+    return MediaBatchUploadResponse(
+        items=[
+            MediaUploadResponse(
+                media_id=row["id"],
+                upload_url=url,
+                s3_key=row["s3_key"],
+                expires_in=PRESIGN_UPLOAD_EXPIRES,
+            )
+            for row, url in zip(rows, upload_urls, strict=True)
+        ]
+    )
+
+
+def _check_upload(media: MediaAsset, stored: dict | None) -> tuple[int, str] | None:
+    """(status_code, detail) if the stored object does not match the asset."""
+    if stored is None:
+        return 409, "Upload has not completed"
+    if stored["size_bytes"] > MAX_UPLOAD_SIZE:
+        return 400, "Uploaded file exceeds the size limit"
+    if stored["content_type"] != media.content_type:
+        return 400, "Uploaded content type does not match"
+    return None
+
+
+def _queue_derivatives(tenant_id: uuid.UUID, assets: list[MediaAsset]) -> None:
+    for media in assets:
+        if media.content_type not in IMAGE_CONTENT_TYPES:
+            continue
+        try:
+            generate_media_derivatives.delay(str(tenant_id), str(media.id))
+        except Exception:
+            # Listings fall back to the original image; confirm again to retry.
+            logger.warning("Failed to queue derivatives for media %s", media.id, exc_info=True)
+
+
+@router.post("/{media_id}/confirm", response_model=MediaAssetResponse)
+async def confirm_upload(
+    media_id: uuid.UUID,
+    user: User = Depends(get_current_user),
+    db_tenant: tuple[AsyncSession, uuid.UUID] = Depends(get_db_with_tenant),
+):
+    """Confirm that the client's direct upload to S3 has finished.
+
+    Verifies the stored object (exists, within MAX_UPLOAD_SIZE, declared
+    content type), records its size, marks the asset ready and queues the
+    derivative worker for images. Confirming again re-queues the worker.
+    """
+    db, tenant_id = db_tenant
+    await require_role("admin", db, tenant_id, user)
+
+    result = await db.execute(select(MediaAsset).where(MediaAsset.id == media_id))
+    media = result.scalar_one_or_none()
+    if media is None:
+        raise HTTPException(status_code=404, detail="Media asset not found")
+
+    stored = await asyncio.to_thread(head_object, media.s3_key)
+    error = _check_upload(media, stored)
+    if error is not None:
+        raise HTTPException(status_code=error[0], detail=error[1])
+
+    media.size_bytes = stored["size_bytes"]
+    media.status = "ready"
+    await db.commit()
+
+    _queue_derivatives(tenant_id, [media])
+    return media
+
+
+@router.post("/confirm", response_model=MediaBatchConfirmResponse)
+async def confirm_uploads(
+    body: MediaBatchConfirmRequest,
+    user: User = Depends(get_current_user),
+    db_tenant: tuple[AsyncSession, uuid.UUID] = Depends(get_db_with_tenant),
+):
+    """Confirm many finished uploads at once.
+
+    Objects are HEADed concurrently; each asset is confirmed or reported in
+    ``failed`` independently, as the single-asset endpoint would.
+    """
+    db, tenant_id = db_tenant
+    await require_role("admin", db, tenant_id, user)
+
+    media_ids = list(dict.fromkeys(body.media_ids))
+    result = await db.execute(select(MediaAsset).where(MediaAsset.id.in_(media_ids)))
+    assets = {media.id: media for media in result.scalars().all()}
+    stored_by_key = await asyncio.to_thread(
+        head_objects, [media.s3_key for media in assets.values()]
+    )
+
+    confirmed: list[MediaAsset] = []
+    failed: list[MediaConfirmFailure] = []
+    for media_id in media_ids:
+        media = assets.get(media_id)
+        if media is None:
+            failed.append(
+                MediaConfirmFailure(
+                    media_id=media_id, status_code=404, detail="Media asset not found"
+                )
+            )
+            continue
+        stored = stored_by_key[media.s3_key]
+        error = _check_upload(media, stored)
+        if error is not None:
+            failed.append(
+                MediaConfirmFailure(media_id=media_id, status_code=error[0], detail=error[1])
+            )
+            continue
+        media.size_bytes = stored["size_bytes"]
+        media.status = "ready"
+        confirmed.append(media)
+    await db.commit()
+
+    _queue_derivatives(tenant_id, confirmed)
+    return MediaBatchConfirmResponse(
+        confirmed=[MediaAssetResponse.model_validate(media) for media in confirmed],
+        failed=failed,
+    )
+
+
 @router.get("/{media_id}/download-url", response_model=MediaDownloadResponse)
 async def get_download_url(
     media_id: uuid.UUID,
@@ -15,6 +15,7 @@ from app.models.audit_event import AuditEvent
 from app.models.tenant_member import TenantMember
 from app.models.user import User
 from app.schemas.member import MemberInvite, MemberResponse, MemberUpdate
+from app.services.tenant_stats import update_tenant_stats
 
 router = APIRouter()
 
@@ -158,6 +159,8 @@ async def remove_member(
         if owner_count.scalar() <= 1:
             raise HTTPException(status_code=400, detail="Cannot remove the last owner")
 
+    if member.status == "active":
+        await update_tenant_stats(db, tenant_id, members=-1)
     member.status = "removed"
     await db.flush()
 
@@ -1,6 +1,7 @@
 """Platform admin endpoints — cross-tenant management.
 
 GET  /admin/tenants           — list all tenants
+GET  /admin/ai-usage          — per-tenant AI usage from daily rollups
 POST /admin/tenants/{id}/suspend    — suspend a tenant
 POST /admin/tenants/{id}/reactivate — reactivate a tenant
 
@@ -10,135 +11,201 @@ These endpoints use get_db() (no tenant context by default).
 RLS strategy:
 - app.current_user_id is SET LOCAL to the admin's user ID at the start of
   each endpoint. This activates the tenant_members_platform_admin_select
-  RLS policy (SELECT-only, checks users.is_platform_admin).
+  RLS policy (SELECT-only, checks users.is_platform_admin), and the
+  matching tenant_stats / ai_usage_rollups platform admin policies.
 - Suspend/reactivate also SET LOCAL app.current_tenant to the target tenant
   before writing audit events, so the audit_events INSERT check passes.
 """
 
 import uuid
+from datetime import UTC, date, datetime
+from typing import Any, Literal
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import func, select, text
+from sqlalchemy import ColumnElement, func, or_, select, text, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.dependencies import get_db, require_platform_admin
+from app.models.ai_usage_rollup import AIUsageRollup
 from app.models.audit_event import AuditEvent
-from app.models.donation import Donation
-from app.models.order import Order
-from app.models.pledge import Pledge
 from app.models.tenant import Tenant
-from app.models.tenant_member import TenantMember
+from app.models.tenant_stats import TenantStats
 from app.models.user import User
-from app.schemas.platform_admin import AdminTenantActionResponse, AdminTenantListItem
+from app.schemas.common import PaginatedResponse
+from app.schemas.platform_admin import (
+    AdminAIUsageResponse,
+    AdminTenantActionResponse,
+    AdminTenantAIUsageItem,
+    AdminTenantListItem,
+)
+from app.services.ai_usage import rolled_up_to, usage_range
 
 router = APIRouter()
 
 DEFAULT_LIMIT = 50
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)  # sort value for "no activity yet"
 
+TenantSort = Literal[
+    "created_at",
+    "last_activity_at",
+    "member_count",
+    "order_count",
+    "donation_count",
+    "pledge_count",
+]
+_AI_USAGE_MAX_DAYS = 366
 
-@router.get("/tenants", response_model=list[AdminTenantListItem])
+
+def _tenant_sort_key(sort: TenantSort) -> ColumnElement[Any]:
+    """Sort expression; tenants without a stats row sort as zero / no activity."""
+    if sort == "created_at":
+        return Tenant.created_at
+    if sort == "last_activity_at":
+        return func.coalesce(TenantStats.last_activity_at, _EPOCH)
+    return func.coalesce(getattr(TenantStats, sort), 0)
+
+
+def _encode_tenant_cursor(value: datetime | int, tenant_id: uuid.UUID) -> str:
+    raw = value.isoformat() if isinstance(value, datetime) else str(value)
+    return f"{raw}|{tenant_id}"
+
+
+def _decode_tenant_cursor(cursor: str, sort: TenantSort) -> tuple[datetime | int, uuid.UUID]:
+    try:
+        raw, id_str = cursor.split("|", 1)
+        value = datetime.fromisoformat(raw) if sort.endswith("_at") else int(raw)
+        return value, uuid.UUID(id_str)
+    except (ValueError, AttributeError) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
+@router.get("/tenants", response_model=PaginatedResponse[AdminTenantListItem])
 async def list_tenants(
+    sort: TenantSort = Query("created_at"),
+    direction: Literal["asc", "desc"] = Query("desc"),
+    is_active: bool | None = Query(None),
+    q: str | None = Query(None, min_length=1, max_length=100),
+    min_orders: int | None = Query(None, ge=0),
+    active_since: date | None = Query(None),
+    cursor: str | None = Query(None),
     limit: int = Query(DEFAULT_LIMIT, ge=1, le=200),
-    offset: int = Query(0, ge=0),
     admin: User = Depends(require_platform_admin),
     db: AsyncSession = Depends(get_db),
-) -> list[AdminTenantListItem]:
-    """List all tenants with member count. Platform admin only."""
-    # Set user context so platform admin RLS policy on tenant_members activates
+) -> PaginatedResponse[AdminTenantListItem]:
+    """List all tenants with their activity stats. Platform admin only.
+
+    Counts come from ``tenant_stats`` (one join, no per-row aggregates).
+    Keyset-paginated on (sort key, id); ``q`` matches name or slug.
+    """
+    # Activates the tenant_stats platform admin SELECT policy
     await db.execute(
         text("SELECT set_config('app.current_user_id', :uid, true)"),
         {"uid": str(admin.id)},
     )
 
-    member_count_sub = (
-        select(func.count(TenantMember.id))
-        .where(
-            TenantMember.tenant_id == Tenant.id,
-            TenantMember.status == "active",
-        )
-        .correlate(Tenant)
-        .scalar_subquery()
-        .label("member_count")
+    sort_key = _tenant_sort_key(sort)
+    stmt = select(Tenant, TenantStats, sort_key.label("sort_key")).outerjoin(
+        TenantStats, TenantStats.tenant_id == Tenant.id
     )
-
-    order_count_sub = (
-        select(func.count(Order.id))
-        .where(Order.tenant_id == Tenant.id)
-        .correlate(Tenant)
-        .scalar_subquery()
-        .label("order_count")
+    if is_active is not None:
+        stmt = stmt.where(Tenant.is_active.is_(is_active))
+    if q:
+        pattern = f"%{q.strip()}%"
+        stmt = stmt.where(or_(Tenant.name.ilike(pattern), Tenant.slug.ilike(pattern)))
+    if min_orders is not None:
+        stmt = stmt.where(func.coalesce(TenantStats.order_count, 0) >= min_orders)
+    if active_since is not None:
+        stmt = stmt.where(TenantStats.last_activity_at >= active_since)
+
+    if cursor:
+        key = tuple_(sort_key, Tenant.id)
+        bound = tuple_(*_decode_tenant_cursor(cursor, sort))
+        stmt = stmt.where(key < bound if direction == "desc" else key > bound)
+    if direction == "desc":
+        stmt = stmt.order_by(sort_key.desc(), Tenant.id.desc())
+    else:
+        stmt = stmt.order_by(sort_key.asc(), Tenant.id.asc())
+
+    rows = (await db.execute(stmt.limit(limit + 1))).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    return PaginatedResponse(
+        items=[
+            AdminTenantListItem(
+                id=t.id,
+                name=t.name,
+                slug=t.slug,
+                is_active=t.is_active,
+                created_at=t.created_at,
+                member_count=stats.member_count if stats else 0,
+                order_count=stats.order_count if stats else 0,
+                donation_count=stats.donation_count if stats else 0,
+                pledge_count=stats.pledge_count if stats else 0,
+                last_activity_at=stats.last_activity_at if stats else None,
+            )
+            for t, stats, _ in rows
+        ],
+        next_cursor=(
+            _encode_tenant_cursor(rows[-1].sort_key, rows[-1][0].id) if has_more else None
+        ),
+        has_more=has_more,
     )
 
-    donation_count_sub = (
-        select(func.count(Donation.id))
-        .where(Donation.tenant_id == Tenant.id)
-        .correlate(Tenant)
-        .scalar_subquery()
-        .label("donation_count")
-    )
 
-    pledge_count_sub = (
-        select(func.count(Pledge.id))
-        .where(Pledge.tenant_id == Tenant.id)
-        .correlate(Tenant)
-        .scalar_subquery()
-        .label("pledge_count")
-    )
-
-    last_order = (
-        select(func.max(Order.created_at))
-        .where(Order.tenant_id == Tenant.id)
-        .correlate(Tenant)
-        .scalar_subquery()
-    )
-    last_donation = (
-        select(func.max(Donation.created_at))
-        .where(Donation.tenant_id == Tenant.id)
-        .correlate(Tenant)
-        .scalar_subquery()
-    )
-    last_pledge = (
-        select(func.max(Pledge.created_at))
-        .where(Pledge.tenant_id == Tenant.id)
-        .correlate(Tenant)
-        .scalar_subquery()
-    )
-    last_activity_sub = func.greatest(last_order, last_donation, last_pledge).label(
-        "last_activity_at"
+@router.get("/ai-usage", response_model=AdminAIUsageResponse)
+async def ai_usage_by_tenant(
+    from_date: date | None = Query(None, alias="from"),
+    to_date: date | None = Query(None, alias="to"),
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=200),
+    admin: User = Depends(require_platform_admin),
+    db: AsyncSession = Depends(get_db),
+) -> AdminAIUsageResponse:
+    """AI tokens/cost per tenant (month-to-date by default). Platform admin only."""
+    # Activates the ai_usage_rollups platform admin SELECT policy
+    await db.execute(
+        text("SELECT set_config('app.current_user_id', :uid, true)"),
+        {"uid": str(admin.id)},
     )
+    start, end = usage_range(from_date, to_date, _AI_USAGE_MAX_DAYS)
 
-    stmt = (
+    usage = (
         select(
-            Tenant,
-            member_count_sub,
-            order_count_sub,
-            donation_count_sub,
-            pledge_count_sub,
-            last_activity_sub,
+            AIUsageRollup.tenant_id,
+            func.sum(AIUsageRollup.tokens_in).label("tokens_in"),
+            func.sum(AIUsageRollup.tokens_out).label("tokens_out"),
+            func.sum(AIUsageRollup.cost_usd).label("cost_usd"),
+            func.sum(AIUsageRollup.request_count).label("request_count"),
+        )
+        .where(
+            AIUsageRollup.period == "day",
+            AIUsageRollup.bucket_start >= start,
+            AIUsageRollup.bucket_start < end,
         )
-        .order_by(Tenant.created_at.desc())
-        .offset(offset)
+        .group_by(AIUsageRollup.tenant_id)
+        .subquery()
+    )
+    result = await db.execute(
+        select(Tenant.id, Tenant.name, Tenant.slug, usage)
+        .join(usage, usage.c.tenant_id == Tenant.id)
+        .order_by(usage.c.cost_usd.desc(), Tenant.id)
         .limit(limit)
     )
-
-    result = await db.execute(stmt)
-    rows = result.all()
-
-    return [
-        AdminTenantListItem(
-            id=t.id,
-            name=t.name,
-            slug=t.slug,
-            is_active=t.is_active,
-            created_at=t.created_at,
-            member_count=mc,
-            order_count=oc,
-            donation_count=dc,
-            pledge_count=pc,
-            last_activity_at=la,
-        )
-        for t, mc, oc, dc, pc, la in rows
-    ]
+    return AdminAIUsageResponse(
+        rolled_up_to=await rolled_up_to(db),
+        items=[
+            AdminTenantAIUsageItem(
+                tenant_id=row.id,
+                name=row.name,
+                slug=row.slug,
+                tokens_in=row.tokens_in,
+                tokens_out=row.tokens_out,
+                cost_usd=row.cost_usd,
+                request_count=row.request_count,
+            )
+            for row in result.all()
+        ],
+    )
 
 
 @router.post("/tenants/{tenant_id}/suspend", response_model=AdminTenantActionResponse)
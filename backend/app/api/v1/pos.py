@@ -1,38 +1,63 @@
 """POS (point-of-sale) endpoints — tenant-authenticated."""
 
+import gzip
 import uuid
 from datetime import UTC, datetime
-from decimal import Decimal
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import func, select, tuple_
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import select, tuple_
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.dependencies import get_current_user, get_db_with_tenant, require_role
 from app.models.audit_event import AuditEvent
+from app.models.catalog_code import CatalogCode
 from app.models.order import Order
 from app.models.pos_shift import PosShift
+from app.models.product import Product
+from app.models.product_variant import ProductVariant
 from app.models.storefront_config import StorefrontConfig
 from app.models.tenant import Tenant
 from app.models.user import User
 from app.schemas.common import PaginatedResponse
 from app.schemas.order import OrderCreateResponse, OrderListItem
 from app.schemas.payment import DEFAULT_POS_PAYMENT_METHODS, PosPaymentMethodsResponse
-from app.schemas.pos import PosOrderCancelRequest, PosOrderCreateRequest
+from app.schemas.pos import (
+    PosCatalogSyncResponse,
+    PosOrderBatchRequest,
+    PosOrderBatchResponse,
+    PosOrderCancelRequest,
+    PosOrderCreateRequest,
+    PosScanResponse,
+)
 from app.schemas.pos_shift import (
     PosCurrentShiftResponse,
     PosShiftCloseRequest,
     PosShiftOpenRequest,
+    PosShiftPaymentTotal,
+    PosShiftReport,
     PosShiftResponse,
 )
+from app.services.catalog_codes import CODE_TYPES
+from app.services.catalog_sync import load_catalog_sync
+from app.services.idempotency import claim_idempotency_key, save_idempotent_response
 from app.services.inventory import restore_stock_for_cancelled_order
+from app.services.live_events import order_event_data, queue_live_event, shift_event_data
 from app.services.order_create import create_order
+from app.services.pos_batch import create_pos_order_batch
+from app.services.pos_shift_totals import (
+    load_shift_payments,
+    record_shift_cancellation,
+    record_shift_sales,
+)
 
 router = APIRouter()
 
 DEFAULT_PAGE_SIZE = 20
 
+# Sync responses smaller than this are sent uncompressed.
+GZIP_MIN_BYTES = 1024
+
 
 def _encode_cursor(order: Order) -> str:
     return f"{order.created_at.isoformat()}|{order.id}"
@@ -46,43 +71,38 @@ def _decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
         raise HTTPException(status_code=400, detail="Invalid cursor") from exc
 
 
-async def _get_open_shift(db: AsyncSession, tenant_id: uuid.UUID) -> PosShift | None:
-    result = await db.execute(
-        select(PosShift).where(
-            PosShift.tenant_id == tenant_id,
-            PosShift.status == "open",
-        )
+async def _get_open_shift(
+    db: AsyncSession, tenant_id: uuid.UUID, *, for_update: bool = False
+) -> PosShift | None:
+    """The tenant's open shift. Writers pass *for_update* to lock it first
+    (see services.pos_shift_totals)."""
+    stmt = select(PosShift).where(
+        PosShift.tenant_id == tenant_id,
+        PosShift.status == "open",
     )
+    if for_update:
+        stmt = stmt.with_for_update().execution_options(populate_existing=True)
+    result = await db.execute(stmt)
     return result.scalar_one_or_none()
 
 
-async def _compute_cash_sales(
-    db: AsyncSession, tenant_id: uuid.UUID, shift_id: uuid.UUID
-) -> Decimal:
-    """Sum cash (non-cancelled) POS sales rung up under a shift."""
-    result = await db.execute(
-        select(func.coalesce(func.sum(Order.total_amount), 0)).where(
-            Order.tenant_id == tenant_id,
-            Order.source == "pos",
-            Order.shift_id == shift_id,
-            Order.payment_method == "cash",
-            Order.status != "cancelled",
-        )
-    )
-    return Decimal(result.scalar_one())
-
-
-def _shift_response(shift: PosShift, cash_sales: Decimal) -> PosShiftResponse:
-    expected = shift.starting_cash + cash_sales
+def _shift_response(
+    shift: PosShift, payments: list[PosShiftPaymentTotal] | None = None
+) -> PosShiftResponse:
+    expected = shift.starting_cash + shift.cash_sales
     variance = shift.counted_cash - expected if shift.counted_cash is not None else None
     return PosShiftResponse(
         id=shift.id,
         status=shift.status,
         starting_cash=shift.starting_cash,
-        cash_sales=cash_sales,
+        cash_sales=shift.cash_sales,
         expected_cash=expected,
         counted_cash=shift.counted_cash,
         variance=variance,
+        order_count=shift.order_count,
+        cancelled_count=shift.cancelled_count,
+        sales_total=shift.sales_total,
+        payments=payments or [],
         opened_at=shift.opened_at,
         opened_by=shift.opened_by,
         closed_at=shift.closed_at,
@@ -179,12 +199,93 @@ async def get_pos_payment_methods(
     return PosPaymentMethodsResponse(payment_methods=methods)
 
 
+@router.get("/scan/{code}", response_model=PosScanResponse)
+async def scan_code(
+    code: str,
+    user: User = Depends(get_current_user),
+    db_tenant: tuple[AsyncSession, uuid.UUID] = Depends(get_db_with_tenant),
+) -> PosScanResponse:
+    """Resolve a scanned barcode or SKU to a product/variant with price and stock.
+
+    One primary-key lookup on catalog_codes joined to its owner. If a string
+    is both one item's barcode and another's SKU, the barcode wins (that is
+    what scanners read).
+    """
+    db, tenant_id = db_tenant
+    await require_role("cashier", db, tenant_id, user)
+
+    code = code.strip()
+    result = await db.execute(
+        select(CatalogCode.code_type, Product, ProductVariant, Tenant.default_currency)
+        .join(Product, Product.id == CatalogCode.product_id)
+        .outerjoin(ProductVariant, ProductVariant.id == CatalogCode.variant_id)
+        .join(Tenant, Tenant.id == CatalogCode.tenant_id)
+        .where(
+            CatalogCode.tenant_id == tenant_id,
+            CatalogCode.code_type.in_(CODE_TYPES),
+            CatalogCode.code == code,
+        )
+        .order_by(CatalogCode.code_type)  # 'barcode' < 'sku'
+        .limit(1)
+    )
+    row = result.first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="No product or variant with this code")
+    code_type, product, variant, default_currency = row
+    if not product.is_active or (variant is not None and not variant.is_active):
+        raise HTTPException(status_code=422, detail="Product is inactive")
+
+    stock_qty = variant.stock_qty if variant is not None else product.stock_qty
+    unit_price = (
+        variant.price_amount
+        if variant is not None and variant.price_amount is not None
+        else product.price_amount
+    )
+    return PosScanResponse(
+        code=code,
+        code_type=code_type,
+        catalog_item_id=product.id,
+        variant_id=variant.id if variant is not None else None,
+        name=product.name,
+        variant_name=variant.name if variant is not None else None,
+        unit_price=unit_price,
+        currency=product.currency or default_currency,
+        track_inventory=product.track_inventory,
+        stock_qty=stock_qty,
+        in_stock=not product.track_inventory or (stock_qty or 0) > 0,
+    )
+
+
+@router.get("/catalog", response_model=PosCatalogSyncResponse)
+async def sync_catalog(
+    request: Request,
+    since: int | None = Query(None, ge=0),
+    user: User = Depends(get_current_user),
+    db_tenant: tuple[AsyncSession, uuid.UUID] = Depends(get_db_with_tenant),
+) -> Response:
+    """Sellable catalog for POS terminals: full snapshot, or the delta after *since*.
+
+    Items use short keys (see PosCatalogProduct) and omit empty fields. The
+    body is gzip'd when the client accepts it and it is large enough to gain.
+    """
+    db, tenant_id = db_tenant
+    await require_role("cashier", db, tenant_id, user)
+
+    feed = await load_catalog_sync(db, tenant_id, since)
+    body = feed.model_dump_json(by_alias=True, exclude_none=True).encode()
+    headers = {"Vary": "Accept-Encoding"}
+    if len(body) >= GZIP_MIN_BYTES and "gzip" in request.headers.get("accept-encoding", ""):
+        body = gzip.compress(body, compresslevel=6)
+        headers["Content-Encoding"] = "gzip"
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 @router.get("/shifts/current", response_model=PosCurrentShiftResponse)
 async def get_current_shift(
     user: User = Depends(get_current_user),
     db_tenant: tuple[AsyncSession, uuid.UUID] = Depends(get_db_with_tenant),
 ) -> PosCurrentShiftResponse:
-    """Return the tenant's open POS shift with live cash summary, or null."""
+    """Return the tenant's open POS shift with its running totals, or null."""
     db, tenant_id = db_tenant
     await require_role("cashier", db, tenant_id, user)
 
@@ -192,8 +293,8 @@ async def get_current_shift(
     if shift is None:
         return PosCurrentShiftResponse(shift=None)
 
-    cash_sales = await _compute_cash_sales(db, tenant_id, shift.id)
-    return PosCurrentShiftResponse(shift=_shift_response(shift, cash_sales))
+    payments = await load_shift_payments(db, tenant_id, shift.id)
+    return PosCurrentShiftResponse(shift=_shift_response(shift, payments))
 
 
 @router.post("/shifts/open", response_model=PosShiftResponse, status_code=201)
@@ -223,8 +324,9 @@ async def open_shift(
         raise HTTPException(status_code=409, detail="A POS shift is already open") from exc
 
     await db.refresh(shift)
+    queue_live_event(db, tenant_id, "shift.opened", shift_event_data(shift))
     await db.commit()
-    return _shift_response(shift, Decimal("0"))
+    return _shift_response(shift)
 
 
 @router.post("/shifts/close", response_model=PosShiftResponse)
@@ -233,40 +335,84 @@ async def close_shift(
     user: User = Depends(get_current_user),
     db_tenant: tuple[AsyncSession, uuid.UUID] = Depends(get_db_with_tenant),
 ) -> PosShiftResponse:
-    """Close the open POS shift, snapshotting cash sales. 409 if none open."""
+    """Close the open POS shift and store its Z-report. 409 if none open."""
     db, tenant_id = db_tenant
     await require_role("cashier", db, tenant_id, user)
 
-    shift = await _get_open_shift(db, tenant_id)
+    shift = await _get_open_shift(db, tenant_id, for_update=True)
     if shift is None:
         raise HTTPException(status_code=409, detail="No open POS shift to close")
 
-    cash_sales = await _compute_cash_sales(db, tenant_id, shift.id)
     shift.status = "closed"
     shift.counted_cash = body.counted_cash
-    shift.closing_cash_sales = cash_sales
+    shift.closing_cash_sales = shift.cash_sales
     shift.closed_by = user.id
     shift.closed_at = datetime.now(UTC)
     shift.notes = body.notes
+    response = _shift_response(shift, await load_shift_payments(db, tenant_id, shift.id))
+    currency = (
+        await db.execute(select(Tenant.default_currency).where(Tenant.id == tenant_id))
+    ).scalar_one()
+    shift.z_report = PosShiftReport(
+        **response.model_dump(), currency=currency or "KWD"
+    ).model_dump(mode="json")
+    queue_live_event(db, tenant_id, "shift.closed", shift_event_data(shift))
     await db.commit()
-    return _shift_response(shift, cash_sales)
+    return response
+
+
+@router.get("/shifts/{shift_id}/report", response_model=PosShiftReport)
+async def get_shift_report(
+    shift_id: uuid.UUID,
+    user: User = Depends(get_current_user),
+    db_tenant: tuple[AsyncSession, uuid.UUID] = Depends(get_db_with_tenant),
+) -> PosShiftReport:
+    """Return the end-of-shift (Z) report stored when the shift was closed.
+
+    404 for missing or cross-tenant shifts, 409 while the shift is open.
+    """
+    db, tenant_id = db_tenant
+    await require_role("cashier", db, tenant_id, user)
+
+    result = await db.execute(
+        select(PosShift).where(PosShift.id == shift_id, PosShift.tenant_id == tenant_id)
+    )
+    shift = result.scalar_one_or_none()
+    if shift is None:
+        raise HTTPException(status_code=404, detail="Shift not found")
+    if shift.status == "open":
+        raise HTTPException(status_code=409, detail="Shift is still open")
+    if shift.z_report is None:
+        # Closed before Z-reports were stored: report the (rebuilt) totals.
+        currency = (
+            await db.execute(select(Tenant.default_currency).where(Tenant.id == tenant_id))
+        ).scalar_one()
+        payments = await load_shift_payments(db, tenant_id, shift.id)
+        return PosShiftReport(
+            **_shift_response(shift, payments).model_dump(), currency=currency or "KWD"
+        )
+    return PosShiftReport.model_validate(shift.z_report)
 
 
 @router.post("/orders", response_model=OrderCreateResponse, status_code=201)
 async def create_pos_order(
     body: PosOrderCreateRequest,
+    request: Request,
     user: User = Depends(get_current_user),
     db_tenant: tuple[AsyncSession, uuid.UUID] = Depends(get_db_with_tenant),
-) -> OrderCreateResponse:
+) -> OrderCreateResponse | Response:
     """Create a POS order.
 
     Validates products, decrements stock atomically, and creates an order
-    with source='pos' and status='fulfilled'.
+    with source='pos' and status='fulfilled'. Honours ``Idempotency-Key``.
     """
     db, tenant_id = db_tenant
     await require_role("cashier", db, tenant_id, user)
+    replay = await claim_idempotency_key(db, tenant_id, "pos.orders", request)
+    if replay is not None:
+        return replay
 
-    shift = await _get_open_shift(db, tenant_id)
+    shift = await _get_open_shift(db, tenant_id, for_update=True)
     if shift is None:
         raise HTTPException(status_code=409, detail="Open a POS shift before creating a sale")
 
@@ -283,13 +429,49 @@ async def create_pos_order(
         status="fulfilled",
         actor_user_id=user.id,
         payment_method=body.payment_method,
+        shift_id=shift.id,
     )
-    order.shift_id = shift.id
-    await db.flush()
+    await record_shift_sales(db, tenant_id, shift.id, [order])
 
+    response = OrderCreateResponse.model_validate(order)
+    await save_idempotent_response(db, tenant_id, "pos.orders", request, response)
     await db.commit()
 
-    return OrderCreateResponse.model_validate(order)
+    return response
+
+
+@router.post("/orders/batch", response_model=PosOrderBatchResponse)
+async def create_pos_order_batch_endpoint(
+    body: PosOrderBatchRequest,
+    user: User = Depends(get_current_user),
+    db_tenant: tuple[AsyncSession, uuid.UUID] = Depends(get_db_with_tenant),
+) -> PosOrderBatchResponse:
+    """Upload sales a terminal queued while offline; one outcome per sale.
+
+    Safe to replay: a ``client_sale_id`` that is already recorded returns its
+    order as ``duplicate``. Sales are recorded under the open shift with their
+    capture time as ``created_at``.
+    """
+    db, tenant_id = db_tenant
+    await require_role("cashier", db, tenant_id, user)
+
+    shift = await _get_open_shift(db, tenant_id, for_update=True)
+    if shift is None:
+        raise HTTPException(status_code=409, detail="Open a POS shift before creating a sale")
+
+    result = await db.execute(select(Tenant).where(Tenant.id == tenant_id))
+    tenant = result.scalar_one()
+
+    response = await create_pos_order_batch(
+        db,
+        tenant_id=tenant_id,
+        tenant_currency=tenant.default_currency or "KWD",
+        shift_id=shift.id,
+        sales=body.sales,
+        actor_user_id=user.id,
+    )
+    await db.commit()
+    return response
 
 
 @router.patch("/orders/{order_id}/cancel", response_model=OrderCreateResponse)
@@ -308,12 +490,16 @@ async def cancel_pos_order(
     db, tenant_id = db_tenant
     await require_role("cashier", db, tenant_id, user)
 
+    # Row lock: a concurrent cancel waits here and then sees "cancelled", so
+    # the shift totals move the sale out exactly once.
     result = await db.execute(
-        select(Order).where(
+        select(Order)
+        .where(
             Order.id == order_id,
             Order.tenant_id == tenant_id,
             Order.source == "pos",
         )
+        .with_for_update()
     )
     order = result.scalar_one_or_none()
     if order is None:
@@ -327,6 +513,14 @@ async def cancel_pos_order(
             detail=f"Cannot cancel order in status '{order.status}'",
         )
 
+    if order.shift_id is not None:
+        # Lock the shift before the stock rows, like a sale does.
+        await db.execute(
+            select(PosShift.id)
+            .where(PosShift.id == order.shift_id, PosShift.tenant_id == tenant_id)
+            .with_for_update()
+        )
+
     reason = body.reason if body is not None else None
     order.status = "cancelled"
     order.cancel_reason = reason
@@ -336,6 +530,8 @@ async def cancel_pos_order(
     await restore_stock_for_cancelled_order(
         db, tenant_id=tenant_id, order=order, actor_user_id=user.id
     )
+    if order.shift_id is not None:
+        await record_shift_cancellation(db, tenant_id, order.shift_id, order)
 
     db.add(
         AuditEvent(
@@ -349,6 +545,9 @@ async def cancel_pos_order(
             metadata_={"reason": reason} if reason else None,
         )
     )
+    queue_live_event(
+        db, tenant_id, "order.status", {**order_event_data(order), "from_status": "fulfilled"}
+    )
 
     await db.commit()
 
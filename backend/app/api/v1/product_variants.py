@@ -17,7 +17,9 @@ from app.schemas.product_variant import (
     ProductVariantResponse,
     ProductVariantUpdate,
 )
-from app.services.catalog_codes import assert_catalog_code_available
+from app.services.catalog_codes import claim_catalog_codes
+from app.services.catalog_sync import record_catalog_changes
+from app.services.catalog_version import bump_catalog_version
 
 router = APIRouter()
 
@@ -112,7 +114,6 @@ async def create_variant(
     await require_role("admin", db, tenant_id, user)
 
     await _get_product_or_404(db, tenant_id, product_id)
-    await assert_catalog_code_available(db, tenant_id, sku=body.sku, barcode=body.barcode)
 
     variant = ProductVariant(
         tenant_id=tenant_id,
@@ -135,6 +136,16 @@ async def create_variant(
         raise HTTPException(
             status_code=409, detail="Variant SKU or barcode already exists"
         ) from None
+    await claim_catalog_codes(
+        db,
+        tenant_id,
+        product_id=product_id,
+        variant_id=variant.id,
+        sku=variant.sku,
+        barcode=variant.barcode,
+    )
+    await bump_catalog_version(db, tenant_id)
+    await record_catalog_changes(db, tenant_id, [product_id])
     await db.refresh(variant)
     return ProductVariantResponse.model_validate(variant)
 
@@ -169,12 +180,6 @@ async def update_variant(
     variant = await _get_variant_or_404(db, tenant_id, product_id, variant_id)
 
     update_data = body.model_dump(exclude_unset=True)
-    sku_to_check = update_data.get("sku")
-    barcode_to_check = update_data.get("barcode")
-    await assert_catalog_code_available(
-        db, tenant_id, sku=sku_to_check, barcode=barcode_to_check, exclude_variant_id=variant.id
-    )
-
     for field, value in update_data.items():
         setattr(variant, field, value)
 
@@ -185,6 +190,17 @@ async def update_variant(
         raise HTTPException(
             status_code=409, detail="Variant SKU or barcode already exists"
         ) from None
+    if "sku" in update_data or "barcode" in update_data:
+        await claim_catalog_codes(
+            db,
+            tenant_id,
+            product_id=product_id,
+            variant_id=variant.id,
+            sku=variant.sku,
+            barcode=variant.barcode,
+        )
+    await bump_catalog_version(db, tenant_id)
+    await record_catalog_changes(db, tenant_id, [product_id])
     await db.refresh(variant)
     return ProductVariantResponse.model_validate(variant)
 
@@ -202,4 +218,6 @@ async def delete_variant(
     await _get_product_or_404(db, tenant_id, product_id)
     variant = await _get_variant_or_404(db, tenant_id, product_id, variant_id)
     await db.delete(variant)
+    await bump_catalog_version(db, tenant_id)
+    await record_catalog_changes(db, tenant_id, [product_id])
     await db.flush()
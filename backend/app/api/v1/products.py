@@ -17,14 +17,20 @@ from app.models.tenant import Tenant
 from app.models.user import User
 from app.schemas.common import BulkDeleteRequest, BulkDeleteResponse, PaginatedResponse
 from app.schemas.product import (
+    ProductBulkUpdateRequest,
+    ProductBulkUpdateResponse,
     ProductCreate,
     ProductResponse,
     ProductUpdate,
     RestockRequest,
     StockMovementResponse,
 )
-from app.services.catalog_codes import assert_catalog_code_available
+from app.services.catalog_bulk import apply_bulk_update
+from app.services.catalog_codes import claim_catalog_codes
+from app.services.catalog_sync import record_catalog_changes
+from app.services.catalog_version import bump_catalog_version
 from app.services.inventory import record_stock_movement
+from app.services.product_search import search_products
 
 router = APIRouter()
 
@@ -75,6 +81,27 @@ def _product_response(
     )
 
 
+async def _product_items(
+    db: AsyncSession, tenant: Tenant, items: list[Product]
+) -> list[ProductResponse]:
+    """Responses for a page of products, with batched active-variant existence."""
+    # tenant_id is defense-in-depth on RLS.
+    with_variants: set[uuid.UUID] = set()
+    if items:
+        product_ids = [p.id for p in items]
+        variant_rows = await db.execute(
+            select(ProductVariant.product_id)
+            .where(
+                ProductVariant.product_id.in_(product_ids),
+                ProductVariant.tenant_id == tenant.id,
+                ProductVariant.is_active.is_(True),
+            )
+            .distinct()
+        )
+        with_variants = set(variant_rows.scalars().all())
+    return [_product_response(p, tenant, has_variants=p.id in with_variants) for p in items]
+
+
 def _encode_cursor(product: Product) -> str:
     return f"{product.created_at.isoformat()}|{product.id}"
 
@@ -122,28 +149,38 @@ async def list_products(
     has_more = len(rows) > limit
     items = rows[:limit]
 
-    # Batched active-variant existence (tenant_id is defense-in-depth on RLS).
-    with_variants: set[uuid.UUID] = set()
-    if items:
-        product_ids = [p.id for p in items]
-        variant_rows = await db.execute(
-            select(ProductVariant.product_id)
-            .where(
-                ProductVariant.product_id.in_(product_ids),
-                ProductVariant.tenant_id == tenant_id,
-                ProductVariant.is_active.is_(True),
-            )
-            .distinct()
-        )
-        with_variants = set(variant_rows.scalars().all())
-
     return PaginatedResponse(
-        items=[_product_response(p, tenant, has_variants=p.id in with_variants) for p in items],
+        items=await _product_items(db, tenant, items),
         next_cursor=_encode_cursor(items[-1]) if has_more and items else None,
         has_more=has_more,
     )
 
 
+@router.get("/search", response_model=PaginatedResponse[ProductResponse])
+async def search_products_endpoint(
+    q: str = Query(..., min_length=1, max_length=100),
+    include_inactive: bool = Query(False),
+    cursor: str | None = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=100),
+    user: User = Depends(get_current_user),
+    db_tenant: tuple[AsyncSession, uuid.UUID] = Depends(get_db_with_tenant),
+) -> PaginatedResponse[ProductResponse]:
+    """Products matching *q* (name, Arabic name, description, SKU, barcode),
+    best match first. For POS and the admin catalog; see services.product_search."""
+    db, tenant_id = db_tenant
+    await require_role("cashier", db, tenant_id, user)
+
+    tenant = await _get_tenant(db, tenant_id)
+    items, next_cursor = await search_products(
+        db, tenant_id, q, limit=limit, cursor=cursor, active_only=not include_inactive
+    )
+    return PaginatedResponse(
+        items=await _product_items(db, tenant, items),
+        next_cursor=next_cursor,
+        has_more=next_cursor is not None,
+    )
+
+
 @router.post("", response_model=ProductResponse, status_code=201)
 async def create_product(
     body: ProductCreate,
@@ -173,8 +210,6 @@ async def create_product(
         sku=body.sku,
         barcode=body.barcode,
     )
-    await assert_catalog_code_available(db, tenant_id, sku=body.sku, barcode=body.barcode)
-
     db.add(product)
     try:
         await db.flush()
@@ -184,6 +219,11 @@ async def create_product(
             status_code=409,
             detail="Product name, SKU, or barcode already exists",
         ) from None
+    await claim_catalog_codes(
+        db, tenant_id, product_id=product.id, sku=product.sku, barcode=product.barcode
+    )
+    await bump_catalog_version(db, tenant_id)
+    await record_catalog_changes(db, tenant_id, [product.id])
     await db.refresh(product)
     return _product_response(product, tenant)
 
@@ -225,11 +265,6 @@ async def update_product(
         raise HTTPException(status_code=404, detail="Product not found")
 
     update_data = body.model_dump(exclude_unset=True)
-    sku_to_check = update_data.get("sku")
-    barcode_to_check = update_data.get("barcode")
-    await assert_catalog_code_available(
-        db, tenant_id, sku=sku_to_check, barcode=barcode_to_check, exclude_product_id=product.id
-    )
     for field, value in update_data.items():
         attr = "metadata_" if field == "metadata" else field
         setattr(product, attr, value)
@@ -242,6 +277,12 @@ async def update_product(
             status_code=409,
             detail="Product name, SKU, or barcode already exists",
         ) from None
+    if "sku" in update_data or "barcode" in update_data:
+        await claim_catalog_codes(
+            db, tenant_id, product_id=product.id, sku=product.sku, barcode=product.barcode
+        )
+    await bump_catalog_version(db, tenant_id)
+    await record_catalog_changes(db, tenant_id, [product.id])
     await db.refresh(product)
     return _product_response(product, tenant)
 
@@ -278,6 +319,7 @@ async def restock_product(
         note=body.note,
         actor_user_id=user.id,
     )
+    await record_catalog_changes(db, tenant_id, [product.id])
     await db.refresh(product)
     return _product_response(product, tenant)
 
@@ -345,10 +387,32 @@ async def bulk_delete_products(
         sa_delete(Product).where(Product.id.in_(body.ids)).returning(Product.id)
     )
     deleted_ids = result.fetchall()
+    if deleted_ids:
+        await bump_catalog_version(db, tenant_id)
+        await record_catalog_changes(db, tenant_id, [row[0] for row in deleted_ids])
     await db.flush()
     return BulkDeleteResponse(deleted=len(deleted_ids))
 
 
+@router.post("/bulk-update", response_model=ProductBulkUpdateResponse)
+async def bulk_update_products(
+    body: ProductBulkUpdateRequest,
+    user: User = Depends(get_current_user),
+    db_tenant: tuple[AsyncSession, uuid.UUID] = Depends(get_db_with_tenant),
+) -> ProductBulkUpdateResponse:
+    """Change prices, active flags and stock of many products/variants at once.
+
+    All-or-nothing: any unknown target or negative resulting stock rejects
+    the batch. Stock deltas are recorded as stock movements.
+    """
+    db, tenant_id = db_tenant
+    await require_role("admin", db, tenant_id, user)
+
+    result = await apply_bulk_update(db, tenant_id, body.items, actor_user_id=user.id)
+    await db.flush()
+    return result
+
+
 @router.delete("/{product_id}", status_code=204)
 async def delete_product(
     product_id: uuid.UUID,
@@ -364,4 +428,6 @@ async def delete_product(
         raise HTTPException(status_code=404, detail="Product not found")
 
     await db.delete(product)
+    await bump_catalog_version(db, tenant_id)
+    await record_catalog_changes(db, tenant_id, [product_id])
     await db.flush()
@@ -6,9 +6,12 @@ All in the same DB session. No tenant_id exposed in responses.
 
 import logging
 import uuid
+from collections.abc import AsyncIterator
 from datetime import UTC, datetime
+from typing import TYPE_CHECKING
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy import select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -45,16 +48,24 @@ from app.schemas.storefront_ai_chat import (
 from app.schemas.visit import VisitCreateRequest, VisitCreateResponse
 from app.services.analytics_ingest import handle_analytics_ingest
 from app.services.customer_link import find_or_create_customer
+from app.services.idempotency import claim_idempotency_key, save_idempotent_response
 from app.services.ip_hash import hash_ip
+from app.services.media_derivatives import build_srcset, pick_default
 from app.services.numbering import get_next_donation_number, get_next_pledge_number
 from app.services.order_create import create_order
-from app.services.storage import presign_get
+from app.services.product_search import search_products
+from app.services.sse import SSE_HEADERS, SSE_MEDIA_TYPE, sse_event
+from app.services.storage import presign_get, presign_get_many
+from app.services.tenant_stats import update_tenant_stats
 from app.workers.tasks.notifications import (
     send_donation_notification,
     send_donation_receipt,
     send_order_notification,
 )
 
+if TYPE_CHECKING:
+    from app.services.storefront_ai_gateway import StorefrontChatResult
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
@@ -87,6 +98,7 @@ def _public_product(
     tenant: Tenant,
     image_url: str | None = None,
     variants: list[PublicVariantResponse] | None = None,
+    image_srcset: str | None = None,
 ) -> PublicProductResponse:
     """Build public product response with effective_currency fallback."""
     return PublicProductResponse(
@@ -101,6 +113,7 @@ def _public_product(
         sort_order=product.sort_order,
         metadata=product.metadata_,
         image_url=image_url,
+        image_srcset=image_srcset,
         in_stock=not product.track_inventory or (product.stock_qty or 0) > 0,
         stock_display=_stock_display(product),
         variants=variants or [],
@@ -156,41 +169,20 @@ async def list_public_categories(
     )
 
 
-@router.get("/{slug}/products", response_model=PaginatedResponse[PublicProductResponse])
-async def list_public_products(
-    slug: str,
-    category_id: uuid.UUID | None = Query(None),
-    cursor: str | None = Query(None),
-    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=100),
-    db_tenant: tuple[AsyncSession, Tenant] = Depends(get_db_with_slug),
-) -> PaginatedResponse[PublicProductResponse]:
-    db, tenant = db_tenant
-
-    stmt = (
-        select(Product).where(Product.is_active.is_(True)).order_by(Product.sort_order, Product.id)
-    )
-
-    if category_id is not None:
-        stmt = stmt.where(Product.category_id == category_id)
-    if cursor is not None:
-        cursor_sort, cursor_id = _decode_cursor(cursor)
-        stmt = stmt.where(tuple_(Product.sort_order, Product.id) > tuple_(cursor_sort, cursor_id))
-
-    stmt = stmt.limit(limit + 1)
-    result = await db.execute(stmt)
-    rows = list(result.scalars().all())
-
-    has_more = len(rows) > limit
-    items = rows[:limit]
-
-    # Batch-query primary image for each product (avoids N+1 DB queries)
+async def _public_product_items(
+    db: AsyncSession, tenant: Tenant, items: list[Product]
+) -> list[PublicProductResponse]:
+    """Public responses for a page of products, with images and active variants."""
+    # Batch-query primary image for each product (avoids N+1 DB queries).
+    # Unconfirmed (pending) uploads may never have reached S3: skip them.
     image_urls: dict[uuid.UUID, str] = {}
+    image_srcsets: dict[uuid.UUID, str] = {}
     variants_by_product: dict[uuid.UUID, list[PublicVariantResponse]] = {}
     if items:
         product_ids = [p.id for p in items]
         media_stmt = (
             select(MediaAsset)
-            .where(MediaAsset.product_id.in_(product_ids))
+            .where(MediaAsset.product_id.in_(product_ids), MediaAsset.status == "ready")
             .order_by(
                 MediaAsset.sort_order,
                 MediaAsset.created_at,
@@ -199,9 +191,27 @@ async def list_public_products(
         )
         media_result = await db.execute(media_stmt)
         # Keep only the first media asset per product (deterministic primary)
+        primary: dict[uuid.UUID, MediaAsset] = {}
         for asset in media_result.scalars().all():
-            if asset.product_id not in image_urls:
-                image_urls[asset.product_id] = presign_get(asset.s3_key)
+            primary.setdefault(asset.product_id, asset)
+        # Resized derivatives when the media worker has made them: a WebP
+        # srcset plus a ~640px JPEG fallback; otherwise the original.
+        image_keys: dict[uuid.UUID, str] = {}
+        for product_id, asset in primary.items():
+            fallback = pick_default(asset.derivatives or [])
+            image_keys[product_id] = fallback["key"] if fallback else asset.s3_key
+        srcset_keys = [
+            d["key"]
+            for a in primary.values()
+            for d in a.derivatives or []
+            if d["format"] == "webp"
+        ]
+        urls = presign_get_many([*image_keys.values(), *srcset_keys])
+        for product_id, asset in primary.items():
+            image_urls[product_id] = urls[image_keys[product_id]]
+            srcset = build_srcset(asset.derivatives or [], urls)
+            if srcset:
+                image_srcsets[product_id] = srcset
 
         # Batch-query active variants. The tenant_id filter is defense-in-depth
         # on top of RLS; variants are returned active-only, ordered by sort_order.
@@ -222,16 +232,47 @@ async def list_public_products(
                 _public_variant(variant, parent)
             )
 
+    return [
+        _public_product(
+            p,
+            tenant,
+            image_url=image_urls.get(p.id),
+            variants=variants_by_product.get(p.id, []),
+            image_srcset=image_srcsets.get(p.id),
+        )
+        for p in items
+    ]
+
+
+@router.get("/{slug}/products", response_model=PaginatedResponse[PublicProductResponse])
+async def list_public_products(
+    slug: str,
+    category_id: uuid.UUID | None = Query(None),
+    cursor: str | None = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=100),
+    db_tenant: tuple[AsyncSession, Tenant] = Depends(get_db_with_slug),
+) -> PaginatedResponse[PublicProductResponse]:
+    db, tenant = db_tenant
+
+    stmt = (
+        select(Product).where(Product.is_active.is_(True)).order_by(Product.sort_order, Product.id)
+    )
+
+    if category_id is not None:
+        stmt = stmt.where(Product.category_id == category_id)
+    if cursor is not None:
+        cursor_sort, cursor_id = _decode_cursor(cursor)
+        stmt = stmt.where(tuple_(Product.sort_order, Product.id) > tuple_(cursor_sort, cursor_id))
+
+    stmt = stmt.limit(limit + 1)
+    result = await db.execute(stmt)
+    rows = list(result.scalars().all())
+
+    has_more = len(rows) > limit
+    items = rows[:limit]
+
     return PaginatedResponse(
-        items=[
-            _public_product(
-                p,
-                tenant,
-                image_url=image_urls.get(p.id),
-                variants=variants_by_product.get(p.id, []),
-            )
-            for p in items
-        ],
+        items=await _public_product_items(db, tenant, items),
         next_cursor=(
             _encode_cursor(items[-1].sort_order, items[-1].id) if has_more and items else None
         ),
@@ -239,6 +280,26 @@ async def list_public_products(
     )
 
 
+@router.get("/{slug}/products/search", response_model=PaginatedResponse[PublicProductResponse])
+async def search_public_products(
+    slug: str,
+    q: str = Query(..., min_length=1, max_length=100),
+    cursor: str | None = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=100),
+    db_tenant: tuple[AsyncSession, Tenant] = Depends(get_db_with_slug),
+) -> PaginatedResponse[PublicProductResponse]:
+    """Active products matching *q* (name, Arabic name, description, SKU,
+    barcode), best match first. See services.product_search."""
+    db, tenant = db_tenant
+
+    items, next_cursor = await search_products(db, tenant.id, q, limit=limit, cursor=cursor)
+    return PaginatedResponse(
+        items=await _public_product_items(db, tenant, items),
+        next_cursor=next_cursor,
+        has_more=next_cursor is not None,
+    )
+
+
 def _public_shipping_methods(raw: dict | None) -> list[PublicShippingMethod] | None:
     """Active-only customer-facing shipping methods from stored config; None if none."""
     if not raw:
@@ -372,10 +433,17 @@ async def _create_utm_event(
 async def submit_order(
     slug: str,
     body: OrderCreateRequest,
+    request: Request,
     db_tenant: tuple[AsyncSession, Tenant] = Depends(get_db_with_slug),
-) -> OrderCreateResponse:
-    """Public order submission. Validates items against catalog, computes total."""
+) -> OrderCreateResponse | Response:
+    """Public order submission. Validates items against catalog, computes total.
+
+    Honours ``Idempotency-Key`` (services.idempotency).
+    """
     db, tenant = db_tenant
+    replay = await claim_idempotency_key(db, tenant.id, "storefront.orders", request)
+    if replay is not None:
+        return replay
 
     # Validate visit_id if provided
     await _validate_visit(db, tenant.id, body.visit_id)
@@ -423,6 +491,9 @@ async def submit_order(
     if body.visit_id:
         await _create_utm_event(db, tenant.id, body.visit_id, "order", order.id)
 
+    response = OrderCreateResponse.model_validate(order)
+    await save_idempotent_response(db, tenant.id, "storefront.orders", request, response)
+
     # Commit before dispatching so the worker can see the row
     await db.commit()
 
@@ -432,7 +503,7 @@ async def submit_order(
     except Exception:
         logger.exception("Failed to enqueue order notification for order=%s", order.id)
 
-    return OrderCreateResponse.model_validate(order)
+    return response
 
 
 # ---------------------------------------------------------------------------
@@ -444,10 +515,14 @@ async def submit_order(
 async def submit_donation(
     slug: str,
     body: DonationCreateRequest,
+    request: Request,
     db_tenant: tuple[AsyncSession, Tenant] = Depends(get_db_with_slug),
-) -> DonationCreateResponse:
-    """Public donation submission."""
+) -> DonationCreateResponse | Response:
+    """Public donation submission. Honours ``Idempotency-Key``."""
     db, tenant = db_tenant
+    replay = await claim_idempotency_key(db, tenant.id, "storefront.donations", request)
+    if replay is not None:
+        return replay
 
     # Validate visit_id if provided
     await _validate_visit(db, tenant.id, body.visit_id)
@@ -497,10 +572,14 @@ async def submit_donation(
     )
     db.add(donation)
     await db.flush()
+    await update_tenant_stats(db, tenant.id, donations=1)
 
     if body.visit_id:
         await _create_utm_event(db, tenant.id, body.visit_id, "donation", donation.id)
 
+    response = DonationCreateResponse.model_validate(donation)
+    await save_idempotent_response(db, tenant.id, "storefront.donations", request, response)
+
     # Commit before dispatching so the worker can see the row
     await db.commit()
 
@@ -517,7 +596,7 @@ async def submit_donation(
         except Exception:
             logger.exception("Failed to enqueue donation receipt for donation=%s", donation.id)
 
-    return DonationCreateResponse.model_validate(donation)
+    return response
 
 
 # ---------------------------------------------------------------------------
@@ -529,10 +608,17 @@ async def submit_donation(
 async def submit_pledge(
     slug: str,
     body: PledgeCreateRequest,
+    request: Request,
     db_tenant: tuple[AsyncSession, Tenant] = Depends(get_db_with_slug),
-) -> PledgeCreateResponse:
-    """Public pledge submission. target_date must be in the future."""
+) -> PledgeCreateResponse | Response:
+    """Public pledge submission. target_date must be in the future.
+
+    Honours ``Idempotency-Key``.
+    """
     db, tenant = db_tenant
+    replay = await claim_idempotency_key(db, tenant.id, "storefront.pledges", request)
+    if replay is not None:
+        return replay
 
     # Validate target_date is in the future
     if body.target_date <= datetime.now(UTC).date():
@@ -574,11 +660,14 @@ async def submit_pledge(
     )
     db.add(pledge)
     await db.flush()
+    await update_tenant_stats(db, tenant.id, pledges=1)
 
     if body.visit_id:
         await _create_utm_event(db, tenant.id, body.visit_id, "pledge", pledge.id)
 
-    return PledgeCreateResponse.model_validate(pledge)
+    response = PledgeCreateResponse.model_validate(pledge)
+    await save_idempotent_response(db, tenant.id, "storefront.pledges", request, response)
+    return response
 
 
 # ---------------------------------------------------------------------------
@@ -586,6 +675,29 @@ async def submit_pledge(
 # ---------------------------------------------------------------------------
 
 
+async def _ai_token_quota(db: AsyncSession, tenant: Tenant) -> int:
+    # Load plan quota separately to avoid lazy-load greenlet issues
+    if not tenant.plan_id:
+        return 0
+    from app.models.plan import Plan
+
+    plan_result = await db.execute(select(Plan).where(Plan.id == tenant.plan_id))
+    plan = plan_result.scalar_one_or_none()
+    return plan.ai_token_quota if plan else 0
+
+
+def _storefront_chat_response(result: "StorefrontChatResult") -> StorefrontAIChatResponse:
+    return StorefrontAIChatResponse(
+        conversation_id=result.conversation_id,
+        reply=result.reply,
+        usage=StorefrontAIChatUsage(
+            tokens_in=result.tokens_in,
+            tokens_out=result.tokens_out,
+            cost_usd=result.cost_usd,
+        ),
+    )
+
+
 @router.post("/{slug}/ai/chat", response_model=StorefrontAIChatResponse)
 async def storefront_ai_chat(
     slug: str,
@@ -602,16 +714,7 @@ async def storefront_ai_chat(
 
     db, tenant = db_tenant
 
-    # Load plan quota separately to avoid lazy-load greenlet issues
-    ai_token_quota = 0
-    if tenant.plan_id:
-        from app.models.plan import Plan
-
-        plan_result = await db.execute(select(Plan).where(Plan.id == tenant.plan_id))
-        plan = plan_result.scalar_one_or_none()
-        if plan:
-            ai_token_quota = plan.ai_token_quota
-
+    ai_token_quota = await _ai_token_quota(db, tenant)
     provider = get_provider()
 
     try:
@@ -635,16 +738,61 @@ async def storefront_ai_chat(
             detail={"message": "AI assistant temporarily unavailable", "type": "provider_error"},
         ) from e
 
-    return StorefrontAIChatResponse(
-        conversation_id=result.conversation_id,
-        reply=result.reply,
-        usage=StorefrontAIChatUsage(
-            tokens_in=result.tokens_in,
-            tokens_out=result.tokens_out,
-            cost_usd=result.cost_usd,
-        ),
+    return _storefront_chat_response(result)
+
+
+@router.post("/{slug}/ai/chat/stream")
+async def storefront_ai_chat_stream(
+    slug: str,
+    body: StorefrontAIChatRequest,
+    db_tenant: tuple[AsyncSession, Tenant] = Depends(get_db_with_slug),
+) -> StreamingResponse:
+    """Buyer chat relayed over SSE: ``token`` events, then ``done`` or ``error``."""
+
+    from app.services.ai_provider import get_provider
+    from app.services.storefront_ai_gateway import (
+        StorefrontAIGatewayError,
+        StorefrontChatResult,
+        prepare_storefront_chat,
+        stream_storefront_chat,
     )
 
+    db, tenant = db_tenant
+
+    ai_token_quota = await _ai_token_quota(db, tenant)
+    provider = get_provider()
+
+    try:
+        prepared = await prepare_storefront_chat(
+            db, tenant, slug, body.session_id, body.message, ai_token_quota=ai_token_quota
+        )
+    except StorefrontAIGatewayError as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail={"message": e.detail, "type": e.error_type},
+        ) from e
+
+    # Release the request's DB connection while tokens stream.
+    await db.commit()
+    await db.close()
+
+    async def _events() -> AsyncIterator[str]:
+        try:
+            async for item in stream_storefront_chat(prepared, provider):
+                if isinstance(item, StorefrontChatResult):
+                    payload = _storefront_chat_response(item).model_dump(mode="json")
+                    yield sse_event("done", payload)
+                else:
+                    yield sse_event("token", {"delta": item})
+        except Exception:
+            logger.exception("Storefront AI chat stream failed tenant=%s", prepared.tenant_id)
+            yield sse_event(
+                "error",
+                {"message": "AI assistant temporarily unavailable", "type": "provider_error"},
+            )
+
+    return StreamingResponse(_events(), media_type=SSE_MEDIA_TYPE, headers=SSE_HEADERS)
+
 
 # ---------------------------------------------------------------------------
 # POST /storefront/{slug}/analytics/events
@@ -5,10 +5,13 @@ from fastapi import APIRouter
 from app.api.v1.admin_lists import router as admin_lists_router
 from app.api.v1.ai_chat import router as ai_chat_router
 from app.api.v1.auth import router as auth_router
+from app.api.v1.catalog_imports import router as catalog_imports_router
 from app.api.v1.categories import router as categories_router
 from app.api.v1.customers import router as customers_router
 from app.api.v1.dashboard_analytics import router as dashboard_analytics_router
+from app.api.v1.exports import router as exports_router
 from app.api.v1.health import router as health_router
+from app.api.v1.live_events import router as live_events_router
 from app.api.v1.media import router as media_router
 from app.api.v1.members import router as members_router
 from app.api.v1.notification_preferences import router as notification_prefs_router
@@ -30,6 +33,9 @@ api_v1_router.include_router(members_router, prefix="/tenants/me/members", tags=
 api_v1_router.include_router(
     categories_router, prefix="/tenants/me/categories", tags=["categories"]
 )
+api_v1_router.include_router(
+    catalog_imports_router, prefix="/tenants/me/products/imports", tags=["catalog-imports"]
+)
 api_v1_router.include_router(products_router, prefix="/tenants/me/products", tags=["products"])
 api_v1_router.include_router(
     product_variants_router, prefix="/tenants/me/products", tags=["product-variants"]
@@ -47,6 +53,8 @@ api_v1_router.include_router(ai_chat_router, prefix="/tenants/me", tags=["ai-cha
 api_v1_router.include_router(
     dashboard_analytics_router, prefix="/tenants/me", tags=["dashboard-analytics"]
 )
+api_v1_router.include_router(live_events_router, prefix="/tenants/me", tags=["live-events"])
+api_v1_router.include_router(exports_router, prefix="/tenants/me/exports", tags=["exports"])
 api_v1_router.include_router(
     notification_prefs_router,
     prefix="/tenants/me/notification-preferences",
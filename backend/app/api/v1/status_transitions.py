@@ -29,6 +29,7 @@ from app.schemas.status_transition import (
     StatusTransitionRequest,
 )
 from app.services.inventory import restore_stock_for_cancelled_order
+from app.services.live_events import order_event_data, queue_live_event
 
 router = APIRouter()
 
@@ -145,6 +146,9 @@ async def transition_order_status(
         )
 
     await db.refresh(order)
+    queue_live_event(
+        db, tenant_id, "order.status", {**order_event_data(order), "from_status": old_status}
+    )
 
     return OrderStatusResponse.model_validate(order)
 
@@ -277,6 +281,12 @@ async def transition_order_fulfillment(
         requested,
         action="fulfillment_transition",
     )
+    queue_live_event(
+        db,
+        tenant_id,
+        "order.fulfillment",
+        {**order_event_data(order), "from_fulfillment_status": current_fulfillment},
+    )
     await db.commit()
     await db.refresh(order)
 
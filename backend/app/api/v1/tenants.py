@@ -13,6 +13,7 @@ from app.models.tenant import Tenant
 from app.models.tenant_member import TenantMember
 from app.models.user import User
 from app.schemas.tenant import TenantCreate, TenantResponse
+from app.services.tenant_stats import update_tenant_stats
 
 router = APIRouter()
 
@@ -63,6 +64,7 @@ async def create_tenant(
     )
     db.add(membership)
     await db.flush()
+    await update_tenant_stats(db, tenant.id, members=1)
 
     return tenant
 
@@ -30,6 +30,8 @@ class Settings(BaseSettings):
     AWS_REGION: str = "me-south-1"
     AWS_ACCESS_KEY_ID: str | None = None
     AWS_SECRET_ACCESS_KEY: str | None = None
+    MEDIA_GC_INTERVAL_SECONDS: int = 86400
+    MEDIA_GC_GRACE_HOURS: int = 24  # unconfirmed uploads / unreferenced objects kept this long
 
     # AI
     AI_PROVIDER: str = "openai"
@@ -37,6 +39,33 @@ class Settings(BaseSettings):
     AI_MODEL: str = "gpt-4o"
     AI_MAX_INPUT_CHARS: int = 2000
     AI_MAX_OUTPUT_TOKENS: int = 1024
+    AI_QUOTA_LEASE_TOKENS: int = 20000  # quota leased from Redis per process+tenant
+    AI_QUOTA_LEASE_SECONDS: int = 60  # idle leases return to Redis after this
+    AI_QUOTA_RECONCILE_SLACK_TOKENS: int = 100000  # counter may exceed logged usage by this
+    AI_USAGE_ROLLUP_INTERVAL_SECONDS: int = 300
+    AI_TIMEOUT_SECONDS: float = 30.0  # per provider call (read/write)
+    AI_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    AI_MAX_RETRIES: int = 1  # SDK-level retries on connection errors / 5xx
+    AI_MAX_CONNECTIONS: int = 100  # per process, per provider
+    AI_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    AI_FALLBACK_PROVIDER: str = ""  # empty = same as AI_PROVIDER
+    AI_FALLBACK_MODEL: str = ""  # failover is enabled when either fallback is set
+    AI_FALLBACK_API_KEY: str = ""  # empty = AI_API_KEY
+    AI_FAILOVER_LATENCY_BUDGET_SECONDS: float = 0.0  # 0 = fail over on errors only
+    AI_FAKE_LATENCY_MS: int = 300  # AI_PROVIDER=fake: time to first token
+    AI_FAKE_TOKEN_DELAY_MS: int = 20
+    AI_ANSWER_CACHE_ENABLED: bool = True  # storefront first-turn answer cache
+    AI_ANSWER_CACHE_SIMILARITY: float = 0.0  # >0 enables fuzzy matching (e.g. 0.9)
+
+    # Idempotency-Key (public submissions, POS sales)
+    IDEMPOTENCY_TTL_SECONDS: int = 86400  # stored responses are replayed this long
+    IDEMPOTENCY_LOCK_SECONDS: float = 10.0  # in-flight lock; duplicates wait up to this
+    IDEMPOTENCY_GC_INTERVAL_SECONDS: int = 3600
+
+    # Live event stream (GET /tenants/me/events)
+    LIVE_EVENTS_MAX_CONNECTIONS_PER_TENANT: int = 20
+    LIVE_EVENTS_HEARTBEAT_SECONDS: float = 15.0  # also renews the stream's lease
+    LIVE_EVENTS_QUEUE_SIZE: int = 256  # per client; a client further behind must resync
 
     # CORS
     ALLOWED_ORIGINS: str = "http://localhost:3000,http://localhost:8000"
@@ -0,0 +1,91 @@
+"""Middleware serving Idempotency-Key replays from Redis (see services.idempotency).
+
+Runs before routing and dependencies, so a replayed submission is answered
+without a database session. Only the submission endpoints below are
+covered; anything else passes through untouched.
+"""
+
+import re
+
+import redis.asyncio as aioredis
+from fastapi import HTTPException
+from jose import JWTError
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.config import settings
+from app.core.exceptions import http_exception_handler
+from app.core.security import decode_access_token
+from app.services.idempotency import (
+    IDEMPOTENCY_HEADER,
+    MAX_KEY_LENGTH,
+    StoredResponse,
+    cache_key,
+    cache_response,
+    release_lock,
+    request_hash,
+    wait_for_turn,
+)
+
+_STOREFRONT_PATH = re.compile(r"^/api/v1/storefront/([^/]+)/(orders|donations|pledges)$")
+_POS_ORDERS_PATH = "/api/v1/tenants/me/pos/orders"
+
+
+async def _endpoint_scope(request: Request) -> tuple[str, str] | None:
+    """(endpoint, scope) of a covered request, or None to pass it through."""
+    path = request.url.path
+    match = _STOREFRONT_PATH.match(path)
+    if match:
+        slug, kind = match.groups()
+        return f"storefront.{kind}", slug
+    if path != _POS_ORDERS_PATH:
+        return None
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        claims = await decode_access_token(token)
+    except JWTError:
+        return None  # the route's auth dependency answers 401
+    return "pos.orders", f"{claims.get('sub')}:{request.headers.get('X-Tenant-Id', '')}"
+
+
+class IdempotencyMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next) -> Response:
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if request.method != "POST" or not key or len(key) > MAX_KEY_LENGTH:
+            return await call_next(request)
+        target = await _endpoint_scope(request)
+        if target is None:
+            return await call_next(request)
+
+        ckey = cache_key(*target, key)
+        req_hash = request_hash(await request.body())
+        r = aioredis.from_url(settings.REDIS_URL)
+        try:
+            try:
+                turn = await wait_for_turn(r, ckey, req_hash)
+            except HTTPException as exc:
+                return await http_exception_handler(request, exc)
+            if isinstance(turn, StoredResponse):
+                return turn.to_response()
+
+            try:
+                response = await call_next(request)
+                if 200 <= response.status_code < 300:
+                    body = b"".join([chunk async for chunk in response.body_iterator])
+                    await cache_response(
+                        r, ckey, StoredResponse(req_hash, response.status_code, body.decode())
+                    )
+                    response = Response(
+                        content=body,
+                        status_code=response.status_code,
+                        headers=dict(response.headers),
+                    )
+            finally:
+                if turn is not None:
+                    await release_lock(r, ckey, turn)
+            return response
+        finally:
+            await r.aclose()
@@ -1,3 +1,7 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.core.config import settings
@@ -14,3 +18,17 @@ async_session_factory = async_sessionmaker(
     class_=AsyncSession,
     expire_on_commit=False,
 )
+
+
+@asynccontextmanager
+async def tenant_session(tenant_id: object) -> AsyncIterator[AsyncSession]:
+    """Fresh session scoped to one tenant, for work outside the request session.
+
+    ``app.current_tenant`` is SET LOCAL, so it lasts until the first commit.
+    """
+    async with async_session_factory() as session:
+        await session.execute(
+            text("SELECT set_config('app.current_tenant', :tid, true)"),
+            {"tid": str(tenant_id)},
+        )
+        yield session
@@ -1,5 +1,9 @@
 """FastAPI application entry point."""
 
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
@@ -13,16 +17,32 @@ from app.core.exceptions import (
     validation_exception_handler,
 )
 from app.core.middleware.cors import get_cors_config
+from app.core.middleware.idempotency import IdempotencyMiddleware
 from app.core.middleware.request_id import RequestIdMiddleware
+from app.services.ai_quota import release_leases, run_lease_reconciler
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    # AI quota leases are per process: reconcile idle ones, return all on exit.
+    reconciler = asyncio.create_task(run_lease_reconciler())
+    try:
+        yield
+    finally:
+        reconciler.cancel()
+        await release_leases()
+
 
 app = FastAPI(
     title="Multi-Tenant SaaS API",
     version="0.1.0",
     docs_url="/docs",
     openapi_url="/openapi.json",
+    lifespan=lifespan,
 )
 
 # Middleware (last added = first executed)
+app.add_middleware(IdempotencyMiddleware)
 app.add_middleware(RequestIdMiddleware)
 app.add_middleware(CORSMiddleware, **get_cors_config())
 
@@ -1,18 +1,25 @@
 from app.models.ai_conversation import AIConversation
+from app.models.ai_message import AIMessage
 from app.models.ai_usage_log import AIUsageLog
+from app.models.ai_usage_rollup import AIUsageRollup, AIUsageRollupState
 from app.models.attribution_event import AttributionEvent
 from app.models.attribution_session import AttributionSession
 from app.models.attribution_visitor import AttributionVisitor
 from app.models.audit_event import AuditEvent
+from app.models.catalog_change import CatalogChange
+from app.models.catalog_code import CatalogCode
+from app.models.catalog_import_job import CatalogImportJob
 from app.models.category import Category
 from app.models.customer import Customer
 from app.models.donation import Donation
+from app.models.export_job import ExportJob
+from app.models.idempotency_key import IdempotencyKey
 from app.models.media_asset import MediaAsset
 from app.models.notification_preference import NotificationPreference
 from app.models.order import Order
 from app.models.plan import Plan
 from app.models.pledge import Pledge
-from app.models.pos_shift import PosShift
+from app.models.pos_shift import PosShift, PosShiftPayment
 from app.models.product import Product
 from app.models.product_variant import ProductVariant
 from app.models.stock_movement import StockMovement
@@ -21,26 +28,36 @@ from app.models.storefront_ai_usage_log import StorefrontAIUsageLog
 from app.models.storefront_config import StorefrontConfig
 from app.models.tenant import Tenant
 from app.models.tenant_member import TenantMember
+from app.models.tenant_stats import TenantStats
 from app.models.user import User
 from app.models.utm_event import UtmEvent
 from app.models.visit import Visit
 
 __all__ = [
     "AIConversation",
+    "AIMessage",
     "AIUsageLog",
+    "AIUsageRollup",
+    "AIUsageRollupState",
     "AttributionEvent",
     "AttributionSession",
     "AttributionVisitor",
     "AuditEvent",
+    "CatalogChange",
+    "CatalogCode",
+    "CatalogImportJob",
     "Category",
     "Customer",
     "Donation",
+    "ExportJob",
+    "IdempotencyKey",
     "MediaAsset",
     "NotificationPreference",
     "Order",
     "Plan",
     "Pledge",
     "PosShift",
+    "PosShiftPayment",
     "Product",
     "ProductVariant",
     "StockMovement",
@@ -49,6 +66,7 @@ __all__ = [
     "StorefrontConfig",
     "Tenant",
     "TenantMember",
+    "TenantStats",
     "User",
     "UtmEvent",
     "Visit",
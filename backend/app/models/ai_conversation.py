@@ -1,9 +1,9 @@
-"""AI conversation model — one conversation per user per tenant."""
+"""AI conversation model — one per user per tenant (messages live in ai_messages)."""
 
 import uuid
 from datetime import datetime
 
-from sqlalchemy import JSON, UUID, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import UUID, DateTime, ForeignKey, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 
@@ -22,7 +22,6 @@ class AIConversation(TenantScopedBase):
     user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.id"), nullable=False
     )
-    messages: Mapped[list] = mapped_column(JSON, nullable=False, server_default="[]")
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, server_default=func.now()
     )
@@ -0,0 +1,56 @@
+"""AI chat message — append-only, one row per message.
+
+Rows belong to exactly one dashboard (``conversation_id``) or storefront
+(``storefront_conversation_id``) conversation. ``role='summary'`` rows are
+written by the compaction job and stand in for every message of the same
+conversation with ``id <= summary_through_id``.
+"""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import (
+    UUID,
+    BigInteger,
+    CheckConstraint,
+    DateTime,
+    ForeignKey,
+    Identity,
+    Text,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.db.base import TenantScopedBase
+
+
+class AIMessage(TenantScopedBase):
+    __tablename__ = "ai_messages"
+    __table_args__ = (
+        CheckConstraint(
+            "num_nonnulls(conversation_id, storefront_conversation_id) = 1",
+            name="ck_ai_messages_one_conversation",
+        ),
+        CheckConstraint(
+            "role IN ('user', 'assistant', 'summary')",
+            name="ck_ai_messages_role",
+        ),
+        CheckConstraint(
+            "(role = 'summary') = (summary_through_id IS NOT NULL)",
+            name="ck_ai_messages_summary_through",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(always=True), primary_key=True)
+    conversation_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("ai_conversations.id"), nullable=True
+    )
+    storefront_conversation_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("storefront_ai_conversations.id"), nullable=True
+    )
+    role: Mapped[str] = mapped_column(Text, nullable=False)
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+    summary_through_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
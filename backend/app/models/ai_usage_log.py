@@ -27,6 +27,7 @@ class AIUsageLog(TenantScopedBase):
     tokens_in: Mapped[int] = mapped_column(Integer, nullable=False)
     tokens_out: Mapped[int] = mapped_column(Integer, nullable=False)
     cost_usd: Mapped[Decimal] = mapped_column(Numeric(10, 6), nullable=False)
+    # Insert time, not transaction start: see ai_usage_rollup.ROLLUP_LAG.
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False, server_default=func.now()
+        DateTime(timezone=True), nullable=False, server_default=func.clock_timestamp()
     )
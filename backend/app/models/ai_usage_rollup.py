@@ -0,0 +1,55 @@
+"""AI usage rollups — per-tenant token/cost aggregates by hour and by day.
+
+Maintained incrementally from ``ai_usage_log`` and ``storefront_ai_usage_log``
+by the ``rollup_ai_usage`` worker job. ``AIUsageRollupState`` records how far
+the raw logs have been folded in (the high-water mark).
+"""
+
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import (
+    BigInteger,
+    CheckConstraint,
+    DateTime,
+    Integer,
+    Numeric,
+    PrimaryKeyConstraint,
+    Text,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.db.base import Base, TenantScopedBase
+
+
+class AIUsageRollup(TenantScopedBase):
+    __tablename__ = "ai_usage_rollups"
+    __table_args__ = (
+        PrimaryKeyConstraint("tenant_id", "period", "bucket_start", "channel", "model"),
+        CheckConstraint("period IN ('hour', 'day')", name="ck_ai_usage_rollups_period"),
+        CheckConstraint(
+            "channel IN ('dashboard', 'storefront')", name="ck_ai_usage_rollups_channel"
+        ),
+    )
+
+    period: Mapped[str] = mapped_column(Text, nullable=False)
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    channel: Mapped[str] = mapped_column(Text, nullable=False)
+    model: Mapped[str] = mapped_column(Text, nullable=False)
+    tokens_in: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    tokens_out: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    cost_usd: Mapped[Decimal] = mapped_column(Numeric(14, 6), nullable=False)
+    request_count: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+class AIUsageRollupState(Base):
+    """High-water mark of a rollup job: raw rows before it are aggregated."""
+
+    __tablename__ = "ai_usage_rollup_state"
+
+    job: Mapped[str] = mapped_column(Text, primary_key=True)
+    rolled_up_to: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
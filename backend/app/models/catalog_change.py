@@ -0,0 +1,32 @@
+"""Compacted POS catalog change log.
+
+One row per product with the tenant's sync version of its last change
+(price, active flag, variants, stock, deletion). Rows outlive deleted
+products so a delta can report the deletion. Written by
+services.catalog_sync.record_catalog_changes in the same transaction as
+the change; read by ``GET /tenants/me/pos/catalog?since=<version>``.
+"""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Index, PrimaryKeyConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import TenantScopedBase
+
+
+class CatalogChange(TenantScopedBase):
+    __tablename__ = "catalog_changes"
+    __table_args__ = (
+        PrimaryKeyConstraint("tenant_id", "product_id"),
+        Index("ix_catalog_changes_tenant_version", "tenant_id", "version"),
+    )
+
+    # tenant_id inherited from TenantScopedBase
+    # No foreign key: the row is the tombstone once the product is deleted.
+    product_id: Mapped[uuid.UUID] = mapped_column(nullable=False)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    changed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
@@ -0,0 +1,45 @@
+"""Catalog code registry — every SKU and barcode in a tenant's catalog.
+
+One row per (tenant, code type, code), pointing at the product or variant
+that owns it. The primary key makes a code unique across products and
+variants together, which the per-table partial indexes cannot, and backs
+the POS scan lookup. Kept in sync by services.catalog_codes on every write.
+"""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import (
+    CheckConstraint,
+    DateTime,
+    ForeignKey,
+    PrimaryKeyConstraint,
+    String,
+    Text,
+    func,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import TenantScopedBase
+
+
+class CatalogCode(TenantScopedBase):
+    __tablename__ = "catalog_codes"
+    __table_args__ = (
+        PrimaryKeyConstraint("tenant_id", "code_type", "code"),
+        CheckConstraint("code_type IN ('sku', 'barcode')", name="ck_catalog_codes_code_type"),
+    )
+
+    # tenant_id inherited from TenantScopedBase
+    code_type: Mapped[str] = mapped_column(Text, nullable=False)
+    code: Mapped[str] = mapped_column(String(64), nullable=False)
+    product_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("products.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    # NULL when the code belongs to the product itself
+    variant_id: Mapped[uuid.UUID | None] = mapped_column(
+        ForeignKey("product_variants.id", ondelete="CASCADE"), nullable=True, index=True
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
@@ -0,0 +1,44 @@
+"""Catalog import job model — bulk product/variant load from a CSV or XLSX file."""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import CheckConstraint, DateTime, ForeignKey, Integer, Text, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import TenantScopedBase
+
+
+class CatalogImportJob(TenantScopedBase):
+    __tablename__ = "catalog_import_jobs"
+    __table_args__ = (
+        CheckConstraint(
+            "status IN ('pending', 'running', 'completed', 'failed')",
+            name="ck_catalog_import_jobs_status",
+        ),
+        CheckConstraint("format IN ('csv', 'xlsx')", name="ck_catalog_import_jobs_format"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, server_default=func.gen_random_uuid())
+    # tenant_id inherited from TenantScopedBase
+    requested_by: Mapped[uuid.UUID | None] = mapped_column(
+        ForeignKey("users.id", ondelete="SET NULL"), nullable=True
+    )
+    file_name: Mapped[str] = mapped_column(Text, nullable=False)
+    format: Mapped[str] = mapped_column(Text, nullable=False)
+    s3_key: Mapped[str] = mapped_column(Text, nullable=False)
+    status: Mapped[str] = mapped_column(Text, nullable=False, server_default="'pending'")
+    row_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    products_created: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    variants_created: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # Per-row report: [{"row": 2, "field": "sku", "message": "..."}], capped;
+    # error_count is the uncapped total.
+    errors: Mapped[list | None] = mapped_column(JSONB, nullable=True)
+    error_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
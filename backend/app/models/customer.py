@@ -19,6 +19,8 @@ class Customer(TenantScopedBase):
     phone: Mapped[str | None] = mapped_column(Text, nullable=True)
     email: Mapped[str | None] = mapped_column(Text, nullable=True)
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Not mapped: the generated phone_digits column (migration d8e9f0a1b2c3)
+    # is read only by services.customer_search.
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
@@ -0,0 +1,33 @@
+"""Stored responses of Idempotency-Key requests (Redis fallback).
+
+One row per (endpoint, key) in a tenant. The handler claims the row before
+doing any work and writes the response into it before commit, so the row
+commits or rolls back together with the order/donation/pledge it
+describes. See services.idempotency.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index, PrimaryKeyConstraint, SmallInteger, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import TenantScopedBase
+
+
+class IdempotencyKey(TenantScopedBase):
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        PrimaryKeyConstraint("tenant_id", "endpoint", "key"),
+        Index("ix_idempotency_keys_tenant_created_at", "tenant_id", "created_at"),
+    )
+
+    # tenant_id inherited from TenantScopedBase
+    endpoint: Mapped[str] = mapped_column(Text, nullable=False)
+    key: Mapped[str] = mapped_column(Text, nullable=False)
+    request_hash: Mapped[str] = mapped_column(Text, nullable=False)
+    # NULL until the claiming transaction stores its response.
+    status_code: Mapped[int | None] = mapped_column(SmallInteger, nullable=True)
+    response_body: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
@@ -1,8 +1,8 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, Text, func
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import BigInteger, CheckConstraint, DateTime, ForeignKey, Integer, Text, func
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import TenantScopedBase
@@ -10,6 +10,9 @@ from app.db.base import TenantScopedBase
 
 class MediaAsset(TenantScopedBase):
     __tablename__ = "media_assets"
+    __table_args__ = (
+        CheckConstraint("status IN ('pending', 'ready')", name="ck_media_assets_status"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, server_default=func.gen_random_uuid())
     # tenant_id inherited from TenantScopedBase
@@ -24,6 +27,13 @@ class MediaAsset(TenantScopedBase):
     file_name: Mapped[str | None] = mapped_column(Text, nullable=True)
     content_type: Mapped[str | None] = mapped_column(Text, nullable=True)
     sort_order: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    # pending until the upload is confirmed; storefronts only show ready assets.
+    status: Mapped[str] = mapped_column(Text, nullable=False, server_default="pending")
+    # Set when the upload is confirmed (HEAD of the stored object).
+    size_bytes: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    # Resized copies written by the media worker:
+    # [{"width", "format", "key", "size_bytes"}, ...]; [] if none could be made.
+    derivatives: Mapped[list | None] = mapped_column(JSONB, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
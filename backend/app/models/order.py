@@ -6,10 +6,12 @@ from sqlalchemy import (
     CheckConstraint,
     DateTime,
     ForeignKey,
+    Index,
     Numeric,
     Text,
     UniqueConstraint,
     func,
+    text,
 )
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
@@ -39,6 +41,13 @@ class Order(TenantScopedBase):
             "('packed', 'shipped', 'delivered')",
             name="ck_orders_fulfillment_status",
         ),
+        Index(
+            "uq_orders_tenant_client_sale_id",
+            "tenant_id",
+            "client_sale_id",
+            unique=True,
+            postgresql_where=text("client_sale_id IS NOT NULL"),
+        ),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, server_default=func.gen_random_uuid())
@@ -73,6 +82,8 @@ class Order(TenantScopedBase):
     shift_id: Mapped[uuid.UUID | None] = mapped_column(
         ForeignKey("pos_shifts.id", ondelete="SET NULL"), nullable=True
     )
+    # Terminal-generated key of an offline POS sale; replays return the same order.
+    client_sale_id: Mapped[str | None] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
@@ -1,10 +1,27 @@
-"""POS shift model — cashier open/close with cash reconciliation."""
+"""POS shift model — cashier open/close with cash reconciliation.
+
+Sales totals are running counters, maintained by services.pos_shift_totals
+in the transaction of each POS sale and cancellation: order/cancel counts and
+amounts on ``pos_shifts``, and the per-payment-method breakdown in
+``pos_shift_payments``. ``z_report`` is the end-of-shift report frozen at
+close.
+"""
 
 import uuid
 from datetime import datetime
 from decimal import Decimal
 
-from sqlalchemy import CheckConstraint, DateTime, ForeignKey, Numeric, Text, func
+from sqlalchemy import (
+    CheckConstraint,
+    DateTime,
+    ForeignKey,
+    Integer,
+    Numeric,
+    PrimaryKeyConstraint,
+    Text,
+    func,
+)
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import TenantScopedBase
@@ -38,5 +55,30 @@ class PosShift(TenantScopedBase):
     opened_at: Mapped[datetime] = _ts_column(server_default=func.now())
     closed_at: Mapped[datetime | None] = _ts_column(nullable=True)
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Running totals of the shift's sales; cancelled orders are moved out of
+    # order_count/sales_total/cash_sales into cancelled_count.
+    order_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    cancelled_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    sales_total: Mapped[Decimal] = mapped_column(
+        Numeric(12, 3), nullable=False, server_default="0"
+    )
+    cash_sales: Mapped[Decimal] = mapped_column(Numeric(12, 3), nullable=False, server_default="0")
+    z_report: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
     created_at: Mapped[datetime] = _ts_column(server_default=func.now())
     updated_at: Mapped[datetime | None] = _ts_column(onupdate=func.now())
+
+
+class PosShiftPayment(TenantScopedBase):
+    """Running sales total of one payment method within a shift."""
+
+    __tablename__ = "pos_shift_payments"
+    __table_args__ = (PrimaryKeyConstraint("shift_id", "payment_method"),)
+
+    # tenant_id inherited from TenantScopedBase
+    shift_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("pos_shifts.id", ondelete="CASCADE"), nullable=False
+    )
+    # Orders without a payment method are counted under "unspecified".
+    payment_method: Mapped[str] = mapped_column(Text, nullable=False)
+    order_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    total: Mapped[Decimal] = mapped_column(Numeric(12, 3), nullable=False, server_default="0")
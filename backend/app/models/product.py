@@ -67,6 +67,8 @@ class Product(TenantScopedBase):
     sku: Mapped[str | None] = mapped_column(String(64), nullable=True)
     barcode: Mapped[str | None] = mapped_column(String(64), nullable=True)
     metadata_: Mapped[dict | None] = mapped_column("metadata", JSONB, nullable=True)
+    # Not mapped: the generated search_text / search_vector columns (migration
+    # c7d8e9f0a1b2) are read only by services.product_search.
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
@@ -1,9 +1,9 @@
-"""Storefront AI conversation — one per visitor session per tenant."""
+"""Storefront AI conversation — one per visitor session (messages live in ai_messages)."""
 
 import uuid
 from datetime import datetime
 
-from sqlalchemy import JSON, UUID, DateTime, Text, UniqueConstraint
+from sqlalchemy import UUID, DateTime, Text, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 
@@ -24,7 +24,6 @@ class StorefrontAIConversation(TenantScopedBase):
         UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid()
     )
     session_id: Mapped[str] = mapped_column(Text, nullable=False)
-    messages: Mapped[list] = mapped_column(JSON, nullable=False, server_default="[]")
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, server_default=func.now()
     )
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, String, func
+from sqlalchemy import BigInteger, Boolean, DateTime, ForeignKey, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -22,6 +22,10 @@ class Tenant(Base):
         DateTime(timezone=True), onupdate=func.now()
     )
     default_currency: Mapped[str] = mapped_column(String(3), nullable=False, server_default="KWD")
+    # Bumped on every catalog write; see services.catalog_version.
+    catalog_version: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default="0")
+    # Latest AI usage log write; see services.ai_usage.mark_ai_usage.
+    ai_usage_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
     members: Mapped[list["TenantMember"]] = relationship(back_populates="tenant")  # noqa: F821
     plan: Mapped["Plan | None"] = relationship()  # noqa: F821
@@ -0,0 +1,36 @@
+"""Per-tenant activity counters for the platform admin tenant list.
+
+One row per tenant, maintained by the write paths through
+services.tenant_stats.update_tenant_stats (same transaction as the write)
+and rebuilt from the source tables by ``python -m scripts.rebuild_tenant_stats``.
+"""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import UUID, BigInteger, DateTime, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.db.base import TenantScopedBase
+
+
+class TenantStats(TenantScopedBase):
+    __tablename__ = "tenant_stats"
+
+    # The primary key serves tenant_id lookups; no separate index.
+    tenant_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("tenants.id"), primary_key=True
+    )
+
+    member_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    order_count: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default="0")
+    donation_count: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default="0")
+    pledge_count: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default="0")
+    # Latest order/donation/pledge created_at
+    last_activity_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
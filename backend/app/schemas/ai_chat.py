@@ -1,6 +1,7 @@
 """AI chat request/response schemas."""
 
 import uuid
+from datetime import datetime
 from decimal import Decimal
 
 from pydantic import BaseModel, Field
@@ -20,3 +21,35 @@ class AIChatResponse(BaseModel):
     conversation_id: uuid.UUID
     reply: str
     usage: AIChatUsage
+
+
+class AnswerCacheStatsResponse(BaseModel):
+    """Storefront answer-cache effectiveness over the trailing window."""
+
+    days: int
+    requests: int
+    cache_hits: int
+    hit_rate: float
+    provider_cost_usd: Decimal
+
+
+class AIUsageBucket(BaseModel):
+    bucket_start: datetime
+    channel: str
+    model: str
+    tokens_in: int
+    tokens_out: int
+    cost_usd: Decimal
+    request_count: int
+
+
+class AIUsageReportResponse(BaseModel):
+    """Tenant AI usage from the rollups; usage after ``rolled_up_to`` is pending."""
+
+    period: str
+    rolled_up_to: datetime | None
+    tokens_in: int
+    tokens_out: int
+    cost_usd: Decimal
+    request_count: int
+    buckets: list[AIUsageBucket]
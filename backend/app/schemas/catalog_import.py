@@ -0,0 +1,30 @@
+"""Catalog import job response schemas."""
+
+import uuid
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class CatalogImportRowError(BaseModel):
+    row: int
+    field: str | None = None
+    message: str
+
+
+class CatalogImportJobResponse(BaseModel):
+    id: uuid.UUID
+    file_name: str
+    format: str
+    status: str
+    row_count: int | None = None
+    products_created: int | None = None
+    variants_created: int | None = None
+    error_count: int = 0
+    errors: list[CatalogImportRowError] | None = None
+    error: str | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    completed_at: datetime | None = None
+
+    model_config = {"from_attributes": True}
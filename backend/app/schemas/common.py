@@ -14,6 +14,13 @@ class PaginatedResponse(BaseModel, Generic[T]):
     has_more: bool = False
 
 
+class CountedPaginatedResponse(PaginatedResponse[T], Generic[T]):
+    """Keyset page plus an optional total (see services.pagination.count_rows)."""
+
+    total: int | None = None
+    total_is_estimate: bool = False
+
+
 class ErrorResponse(BaseModel):
     type: str
     title: str
@@ -0,0 +1,55 @@
+"""Background export job request/response schemas."""
+
+import uuid
+from datetime import date, datetime
+
+from pydantic import BaseModel, field_validator, model_validator
+
+from app.services.exports import EXPORT_ENTITIES, EXPORT_FORMATS
+
+
+class ExportJobCreateRequest(BaseModel):
+    entity: str
+    format: str = "csv"
+    start_date: date | None = None
+    end_date: date | None = None
+
+    @field_validator("entity")
+    @classmethod
+    def _validate_entity(cls, v: str) -> str:
+        v = v.strip().lower()
+        if v not in EXPORT_ENTITIES:
+            raise ValueError(f"entity must be one of: {', '.join(EXPORT_ENTITIES)}")
+        return v
+
+    @field_validator("format")
+    @classmethod
+    def _validate_format(cls, v: str) -> str:
+        v = v.strip().lower()
+        if v not in EXPORT_FORMATS:
+            raise ValueError(f"format must be one of: {', '.join(EXPORT_FORMATS)}")
+        return v
+
+    @model_validator(mode="after")
+    def _validate_range(self) -> "ExportJobCreateRequest":
+        if self.start_date and self.end_date and self.end_date <= self.start_date:
+            raise ValueError("end_date must be after start_date")
+        return self
+
+
+class ExportJobResponse(BaseModel):
+    id: uuid.UUID
+    entity: str
+    format: str
+    start_date: date | None = None
+    end_date: date | None = None
+    status: str
+    row_count: int | None = None
+    size_bytes: int | None = None
+    error: str | None = None
+    download_url: str | None = None
+    created_at: datetime
+    completed_at: datetime | None = None
+    expires_at: datetime | None = None
+
+    model_config = {"from_attributes": True}
@@ -7,6 +7,8 @@ from pydantic import BaseModel, Field, model_validator
 
 from app.services.storage import ALLOWED_CONTENT_TYPES, MAX_UPLOAD_SIZE
 
+MAX_BATCH_UPLOADS = 20
+
 
 class MediaUploadRequest(BaseModel):
     file_name: str = Field(..., min_length=1, max_length=255)
@@ -37,6 +39,21 @@ class MediaUploadResponse(BaseModel):
     expires_in: int
 
 
+class MediaBatchUploadRequest(BaseModel):
+    files: list[MediaUploadRequest] = Field(..., min_length=1, max_length=MAX_BATCH_UPLOADS)
+
+
+class MediaBatchUploadResponse(BaseModel):
+    items: list[MediaUploadResponse]  # same order as the request's files
+
+
+class MediaDerivative(BaseModel):
+    width: int
+    format: str
+    key: str
+    size_bytes: int
+
+
 class MediaAssetResponse(BaseModel):
     id: uuid.UUID
     product_id: uuid.UUID | None = None
@@ -46,11 +63,29 @@ class MediaAssetResponse(BaseModel):
     file_name: str | None = None
     content_type: str | None = None
     sort_order: int
+    status: str
+    size_bytes: int | None = None
+    derivatives: list[MediaDerivative] | None = None
     created_at: datetime
 
     model_config = {"from_attributes": True}
 
 
+class MediaBatchConfirmRequest(BaseModel):
+    media_ids: list[uuid.UUID] = Field(..., min_length=1, max_length=MAX_BATCH_UPLOADS)
+
+
+class MediaConfirmFailure(BaseModel):
+    media_id: uuid.UUID
+    status_code: int  # what the single-asset confirm endpoint would return
+    detail: str
+
+
+class MediaBatchConfirmResponse(BaseModel):
+    confirmed: list[MediaAssetResponse]
+    failed: list[MediaConfirmFailure]
+
+
 class MediaDownloadResponse(BaseModel):
     download_url: str
     expires_in: int
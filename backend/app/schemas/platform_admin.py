@@ -2,6 +2,7 @@
 
 import uuid
 from datetime import datetime
+from decimal import Decimal
 
 from pydantic import BaseModel
 
@@ -28,3 +29,20 @@ class AdminTenantActionResponse(BaseModel):
     is_active: bool
 
     model_config = {"from_attributes": True}
+
+
+class AdminTenantAIUsageItem(BaseModel):
+    tenant_id: uuid.UUID
+    name: str
+    slug: str
+    tokens_in: int
+    tokens_out: int
+    cost_usd: Decimal
+    request_count: int
+
+
+class AdminAIUsageResponse(BaseModel):
+    """Per-tenant AI usage from daily rollups, highest cost first."""
+
+    rolled_up_to: datetime | None
+    items: list[AdminTenantAIUsageItem]
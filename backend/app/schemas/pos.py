@@ -1,6 +1,10 @@
-"""POS order request schemas."""
+"""POS order, offline batch, scan lookup and catalog sync schemas."""
 
-from pydantic import BaseModel, Field, field_validator
+import uuid
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 from app.schemas.order import OrderItemRequest
 from app.schemas.payment import normalize_optional_payment_method
@@ -27,3 +31,127 @@ class PosOrderCancelRequest(BaseModel):
             return None
         stripped = v.strip()
         return stripped or None
+
+
+MAX_BATCH_SALES = 200
+# Tolerated terminal clock drift for offline capture timestamps.
+CAPTURE_CLOCK_SKEW = timedelta(minutes=5)
+
+
+class PosOfflineSale(PosOrderCreateRequest):
+    """A sale rung up while the terminal was offline."""
+
+    client_sale_id: str = Field(..., min_length=1, max_length=100)
+    captured_at: datetime
+
+    @field_validator("client_sale_id")
+    @classmethod
+    def _strip_client_sale_id(cls, v: str) -> str:
+        stripped = v.strip()
+        if not stripped:
+            raise ValueError("client_sale_id must not be blank")
+        return stripped
+
+    @field_validator("captured_at")
+    @classmethod
+    def _check_captured_at(cls, v: datetime) -> datetime:
+        if v.tzinfo is None:
+            raise ValueError("captured_at must include a timezone")
+        if v > datetime.now(UTC) + CAPTURE_CLOCK_SKEW:
+            raise ValueError("captured_at is in the future")
+        return v
+
+
+class PosOrderBatchRequest(BaseModel):
+    sales: list[PosOfflineSale] = Field(..., min_length=1, max_length=MAX_BATCH_SALES)
+
+    @model_validator(mode="after")
+    def _unique_client_ids(self) -> "PosOrderBatchRequest":
+        ids = [sale.client_sale_id for sale in self.sales]
+        if len(set(ids)) != len(ids):
+            raise ValueError("Each client_sale_id may appear only once")
+        return self
+
+
+class PosBatchSaleResult(BaseModel):
+    """Outcome of one offline sale, in request order.
+
+    ``created``: recorded now; ``duplicate``: recorded by an earlier upload
+    (same order returned); ``rejected``: not recorded, with the status code and
+    detail the single-sale endpoint would have returned.
+    """
+
+    client_sale_id: str
+    status: str
+    order_id: uuid.UUID | None = None
+    order_number: str | None = None
+    error_status: int | None = None
+    detail: str | None = None
+
+
+class PosOrderBatchResponse(BaseModel):
+    results: list[PosBatchSaleResult]
+    created: int
+    duplicates: int
+    rejected: int
+
+
+class PosScanResponse(BaseModel):
+    """A scanned SKU/barcode resolved to a sellable line (feeds OrderItemRequest)."""
+
+    code: str
+    code_type: str
+    catalog_item_id: uuid.UUID
+    variant_id: uuid.UUID | None = None
+    name: str
+    variant_name: str | None = None
+    unit_price: Decimal
+    currency: str
+    track_inventory: bool
+    stock_qty: int | None = None
+    in_stock: bool
+
+
+# POS catalog sync feed. Items use one- or two-letter keys (serialization
+# aliases) to keep snapshots small; None fields are omitted.
+
+
+class PosCatalogVariant(BaseModel):
+    model_config = {"from_attributes": True}
+
+    id: uuid.UUID = Field(serialization_alias="i")
+    name: str = Field(serialization_alias="n")
+    size: str | None = Field(None, serialization_alias="sz")
+    color: str | None = Field(None, serialization_alias="co")
+    # None: sells at the product price
+    price_amount: Decimal | None = Field(None, serialization_alias="p")
+    stock_qty: int | None = Field(None, serialization_alias="q")
+    sku: str | None = Field(None, serialization_alias="s")
+    barcode: str | None = Field(None, serialization_alias="b")
+
+
+class PosCatalogProduct(BaseModel):
+    id: uuid.UUID = Field(serialization_alias="i")
+    name: str = Field(serialization_alias="n")
+    price_amount: Decimal = Field(serialization_alias="p")
+    currency: str = Field(serialization_alias="c")
+    track_inventory: bool = Field(serialization_alias="t")
+    stock_qty: int | None = Field(None, serialization_alias="q")
+    sku: str | None = Field(None, serialization_alias="s")
+    barcode: str | None = Field(None, serialization_alias="b")
+    # Active variants in display order; omitted when there are none
+    variants: list[PosCatalogVariant] | None = Field(None, serialization_alias="v")
+
+
+class PosCatalogSyncResponse(BaseModel):
+    """Full snapshot (``full``) or the changes since the client's version.
+
+    A delta lists the current state of every changed product that is still
+    sellable; ``deleted`` lists changed products to drop (deleted or
+    deactivated). Clients store ``version`` and pass it as ``since`` next time.
+    """
+
+    version: int
+    full: bool
+    products: list[PosCatalogProduct]
+    deleted: list[uuid.UUID] = []
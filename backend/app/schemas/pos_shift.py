@@ -16,6 +16,12 @@ class PosShiftCloseRequest(BaseModel):
     notes: str | None = Field(None, max_length=2000)
 
 
+class PosShiftPaymentTotal(BaseModel):
+    payment_method: str  # "unspecified" for sales without one
+    order_count: int
+    total: Decimal
+
+
 class PosShiftResponse(BaseModel):
     id: uuid.UUID
     status: str
@@ -24,6 +30,10 @@ class PosShiftResponse(BaseModel):
     expected_cash: Decimal
     counted_cash: Decimal | None = None
     variance: Decimal | None = None
+    order_count: int = 0
+    cancelled_count: int = 0
+    sales_total: Decimal = Decimal("0")
+    payments: list[PosShiftPaymentTotal] = Field(default_factory=list)
     opened_at: datetime
     opened_by: uuid.UUID | None = None
     closed_at: datetime | None = None
@@ -31,5 +41,11 @@ class PosShiftResponse(BaseModel):
     notes: str | None = None
 
 
+class PosShiftReport(PosShiftResponse):
+    """End-of-shift (Z) report, frozen when the shift is closed."""
+
+    currency: str
+
+
 class PosCurrentShiftResponse(BaseModel):
     shift: PosShiftResponse | None = None
@@ -127,6 +127,47 @@ class StockMovementResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+MAX_BULK_UPDATE_ITEMS = 500
+
+
+class ProductBulkUpdateItem(BaseModel):
+    """One product (or, with variant_id, one of its variants) to change."""
+
+    product_id: uuid.UUID
+    variant_id: uuid.UUID | None = None
+    price_amount: Decimal | None = Field(None, ge=0, decimal_places=3)
+    is_active: bool | None = None
+    stock_delta: int | None = Field(
+        None, description="Signed quantity; + is a restock, - an adjustment"
+    )
+    note: str | None = Field(None, max_length=500)
+
+    @model_validator(mode="after")
+    def _has_change(self) -> "ProductBulkUpdateItem":
+        if self.stock_delta == 0:
+            raise ValueError("stock_delta must be non-zero")
+        if self.price_amount is None and self.is_active is None and self.stock_delta is None:
+            raise ValueError("Set at least one of price_amount, is_active, stock_delta")
+        return self
+
+
+class ProductBulkUpdateRequest(BaseModel):
+    items: list[ProductBulkUpdateItem] = Field(..., min_length=1, max_length=MAX_BULK_UPDATE_ITEMS)
+
+    @model_validator(mode="after")
+    def _unique_targets(self) -> "ProductBulkUpdateRequest":
+        targets = [(item.product_id, item.variant_id) for item in self.items]
+        if len(set(targets)) != len(targets):
+            raise ValueError("Each product/variant may appear only once")
+        return self
+
+
+class ProductBulkUpdateResponse(BaseModel):
+    products_updated: int
+    variants_updated: int
+    stock_movements: int
+
+
 class PublicVariantResponse(BaseModel):
     id: uuid.UUID
     name: str
@@ -150,6 +191,7 @@ class PublicProductResponse(BaseModel):
     sort_order: int
     metadata: dict | None = None
     image_url: str | None = None
+    image_srcset: str | None = None  # WebP widths, e.g. "<url> 320w, <url> 640w"
     in_stock: bool
     stock_display: str | None = None
     variants: list[PublicVariantResponse] = Field(default_factory=list)
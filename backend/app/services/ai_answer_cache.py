@@ -0,0 +1,164 @@
+"""Per-tenant answer cache for storefront AI chat.
+
+Buyers ask the same opening questions over and over ("do you deliver?").
+A first-turn question (no conversation history) whose normalised text was
+already answered for the same *scope* is served from cache. The provider is
+skipped, and the turn is still logged as a zero-cost usage row (model
+``ANSWER_CACHE_MODEL``), which is what the hit-rate metrics count.
+
+The scope is ``{tenant_id}:{catalog_version}:{fingerprint}``. The fingerprint
+covers the tenant name/currency, the storefront config timestamp and the
+configured model. Any catalog or config change therefore moves the tenant to
+a fresh scope, and stale answers are never read again.
+
+Tiers:
+  1. exact match — Redis ``ai:answer:{scope}:{sha256(question)}`` (TTL 1 day),
+     shared by all workers
+  2. optional similarity match (``AI_ANSWER_CACHE_SIMILARITY`` > 0) — cosine
+     over the local hashed n-gram embedding (catalog_index) of recently
+     answered questions, held in process per tenant
+
+Redis errors degrade to a miss; the cache is never required for correctness.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import unicodedata
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import numpy as np
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+from app.models.tenant import Tenant
+from app.services.catalog_index import embed_hashed_ngrams
+
+logger = logging.getLogger(__name__)
+
+ANSWER_CACHE_MODEL = "answer-cache"
+
+_REDIS_TTL = 86400  # seconds
+_LOCAL_MAX_TENANTS = 512
+_LOCAL_MAX_QUESTIONS = 256  # per tenant, similarity tier only
+
+
+def normalize_question(text: str) -> str:
+    """Casefold, drop punctuation/symbols, collapse whitespace."""
+    chars = (
+        " " if unicodedata.category(c)[0] in "PSZ" else c
+        for c in unicodedata.normalize("NFKC", text).casefold()
+    )
+    return " ".join("".join(chars).split())
+
+
+def answer_scope(tenant: Tenant, config_updated_at: datetime | None) -> str:
+    """Cache namespace; changes whenever a cached answer could be stale."""
+    fingerprint = hashlib.sha256(
+        "\x1f".join(
+            [
+                tenant.name,
+                tenant.default_currency,
+                config_updated_at.isoformat() if config_updated_at else "",
+                settings.AI_MODEL,
+            ]
+        ).encode()
+    ).hexdigest()
+    return f"{tenant.id}:{tenant.catalog_version}:{fingerprint[:12]}"
+
+
+def _redis_key(scope: str, question: str) -> str:
+    return f"ai:answer:{scope}:{hashlib.sha256(question.encode()).hexdigest()[:32]}"
+
+
+@dataclass
+class _ScopeAnswers:
+    """Recently answered questions of one tenant scope (similarity tier)."""
+
+    scope: str
+    questions: list[str] = field(default_factory=list)
+    answers: list[str] = field(default_factory=list)
+    vectors: np.ndarray | None = None
+
+    def add(self, question: str, answer: str) -> None:
+        if question in self.questions:
+            return
+        vector = embed_hashed_ngrams([question])
+        self.questions.append(question)
+        self.answers.append(answer)
+        self.vectors = vector if self.vectors is None else np.vstack([self.vectors, vector])
+        if len(self.questions) > _LOCAL_MAX_QUESTIONS:
+            del self.questions[0], self.answers[0]
+            self.vectors = self.vectors[1:]
+
+    def nearest(self, question: str, threshold: float) -> str | None:
+        if self.vectors is None:
+            return None
+        scores = self.vectors @ embed_hashed_ngrams([question])[0]
+        best = int(np.argmax(scores))
+        return self.answers[best] if scores[best] >= threshold else None
+
+
+_local: OrderedDict[uuid.UUID, _ScopeAnswers] = OrderedDict()
+
+
+def _local_scope(tenant_id: uuid.UUID, scope: str) -> _ScopeAnswers:
+    entry = _local.get(tenant_id)
+    if entry is None or entry.scope != scope:
+        entry = _ScopeAnswers(scope=scope)  # new version/config: drop stale answers
+        _local[tenant_id] = entry
+    _local.move_to_end(tenant_id)
+    while len(_local) > _LOCAL_MAX_TENANTS:
+        _local.popitem(last=False)
+    return entry
+
+
+async def lookup_answer(tenant_id: uuid.UUID, scope: str, message: str) -> str | None:
+    """Cached answer for *message* in *scope*, or None."""
+    question = normalize_question(message)
+    if not question:
+        return None
+
+    try:
+        r = aioredis.from_url(settings.REDIS_URL)
+        try:
+            value = await r.get(_redis_key(scope, question))
+        finally:
+            await r.aclose()
+    except Exception:
+        logger.warning("Answer cache read failed tenant=%s", tenant_id, exc_info=True)
+        value = None
+    if value is not None:
+        return value.decode()
+
+    threshold = settings.AI_ANSWER_CACHE_SIMILARITY
+    if threshold > 0:
+        return _local_scope(tenant_id, scope).nearest(question, threshold)
+    return None
+
+
+async def store_answer(tenant_id: uuid.UUID, scope: str, message: str, answer: str) -> None:
+    question = normalize_question(message)
+    if not question:
+        return
+
+    try:
+        r = aioredis.from_url(settings.REDIS_URL)
+        try:
+            await r.set(_redis_key(scope, question), answer, ex=_REDIS_TTL)
+        finally:
+            await r.aclose()
+    except Exception:
+        logger.warning("Answer cache write failed tenant=%s", tenant_id, exc_info=True)
+
+    if settings.AI_ANSWER_CACHE_SIMILARITY > 0:
+        _local_scope(tenant_id, scope).add(question, answer)
+
+
+def clear_local_answer_cache() -> None:
+    """Drop the in-process similarity tier (tests, admin tooling)."""
+    _local.clear()
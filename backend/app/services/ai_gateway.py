@@ -1,12 +1,20 @@
 """AI gateway — single orchestrator for all AI chat requests.
 
-Flow: validate → rate-limit → reserve quota → build prompt → call provider
+Flow: validate → rate-limit → build prompt → reserve quota → call provider
      → adjust quota → log usage → save conversation → return response.
+
+Messages are appended to ``ai_messages``; the prompt carries a bounded window
+of them (see ai_messages for summary compaction).
+
+``handle_chat`` runs the whole flow on the request session. ``stream_chat``
+relays provider tokens as they arrive and records the turn afterwards on its
+own session (see ``PreparedChat``).
 """
 
 from __future__ import annotations
 
 import uuid
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from decimal import Decimal
@@ -15,10 +23,16 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+from app.db.session import tenant_session
 from app.models.ai_conversation import AIConversation
 from app.models.ai_usage_log import AIUsageLog
-from app.models.product import Product
 from app.models.tenant import Tenant
+from app.services.ai_messages import (
+    append_messages,
+    load_context_window,
+    needs_compaction,
+    schedule_compaction,
+)
 from app.services.ai_provider import AIProvider, AIResponse
 from app.services.ai_quota import (
     adjust_tokens,
@@ -26,6 +40,9 @@ from app.services.ai_quota import (
     reserve_tokens,
     rollback_tokens,
 )
+from app.services.ai_tokens import estimate_prompt_tokens
+from app.services.ai_usage import mark_ai_usage
+from app.services.catalog_index import get_catalog_index
 
 # Pricing per 1k tokens (fallback; production reads from SSM)
 _PRICING: dict[str, dict[str, float]] = {
@@ -36,7 +53,7 @@ _PRICING: dict[str, dict[str, float]] = {
 }
 
 _MAX_CONTEXT_TURNS = 10  # keep last N user+assistant turn pairs
-_ESTIMATED_TOKENS = 500  # conservative estimate for quota reservation
+_CATALOG_TOP_K = 15  # products retrieved into the prompt per message
 
 
 @dataclass(frozen=True)
@@ -46,6 +63,7 @@ class ChatResult:
     tokens_in: int
     tokens_out: int
     cost_usd: Decimal
+    compact: bool = False  # schedule compaction once the turn is committed
 
 
 class AIGatewayError(Exception):
@@ -66,79 +84,105 @@ def _compute_cost(model: str, tokens_in: int, tokens_out: int) -> Decimal:
     return Decimal(str(round(cost, 6)))
 
 
-async def _build_system_prompt(db: AsyncSession, tenant: Tenant) -> str:
-    """Build system prompt with tenant name + catalog summary."""
-    result = await db.execute(
-        select(Product)
-        .where(Product.is_active.is_(True))
-        .order_by(Product.sort_order, Product.id)
-        .limit(50)
-    )
-    products = list(result.scalars().all())
+# Tenant-independent instructions come first so every tenant's system prompt
+# shares a byte-identical prefix; provider-side prompt caching (OpenAI automatic
+# prefix caching, Anthropic cache_control) can then reuse it across requests.
+_SYSTEM_INSTRUCTIONS = (
+    "You are a helpful assistant for a business using this platform.\n"
+    "You help team members with questions about orders, donations, pledges, "
+    "products, and general business operations.\n\n"
+    "Rules:\n"
+    "- Be friendly, concise, and helpful.\n"
+    "- Answer questions about order statuses, donation tracking, and business metrics.\n"
+    "- If you don't know the answer, say so.\n"
+    "- Never discuss other tenants or the platform itself.\n\n"
+)
 
-    catalog_lines: list[str] = []
-    for p in products:
-        if p.price_amount:
-            currency = p.currency or tenant.default_currency
-            price = f"{p.price_amount} {currency}"
-        else:
-            price = "Price not set"
-        catalog_lines.append(f"- {p.name}: {price}")
 
-    catalog_summary = "\n".join(catalog_lines) if catalog_lines else "No products listed yet."
+def get_system_prompt(tenant: Tenant) -> str:
+    """Stable part of the system prompt: instructions + tenant name.
 
+    Per-message catalog context is sent as a separate system message, so this
+    stays byte-identical across turns for provider-side prompt caching.
+    """
+    return f"{_SYSTEM_INSTRUCTIONS}Business: {tenant.name}"
+
+
+async def _catalog_context(db: AsyncSession, tenant: Tenant, query: str) -> str:
+    """Products relevant to *query*, rendered as a second system message."""
+    index = await get_catalog_index(db, tenant)
+    if not len(index):
+        return "Available products/services:\nNo products listed yet."
+
+    entries = index.search(query, _CATALOG_TOP_K)
+    lines = "\n".join(f"- {e.name}: {e.price_label(tenant.default_currency)}" for e in entries)
+    if len(entries) == len(index):
+        return f"Available products/services:\n{lines}"
     return (
-        f"You are a helpful assistant for {tenant.name}.\n"
-        f"You help team members with questions about orders, donations, pledges, "
-        f"products, and general business operations.\n\n"
-        f"Available products/services:\n{catalog_summary}\n\n"
-        f"Rules:\n"
-        f"- Be friendly, concise, and helpful.\n"
-        f"- Answer questions about order statuses, donation tracking, and business metrics.\n"
-        f"- If you don't know the answer, say so.\n"
-        f"- Never discuss other tenants or the platform itself."
+        f"Products/services most relevant to this message "
+        f"({len(entries)} of {len(index)} in the catalog):\n{lines}"
     )
 
 
-async def _get_or_create_conversation(
+async def _get_conversation(
     db: AsyncSession, tenant_id: uuid.UUID, user_id: uuid.UUID
-) -> AIConversation:
-    """Load existing conversation or create a new one."""
+) -> AIConversation | None:
     result = await db.execute(
         select(AIConversation).where(
             AIConversation.tenant_id == tenant_id,
             AIConversation.user_id == user_id,
         )
     )
-    conversation = result.scalar_one_or_none()
+    return result.scalar_one_or_none()
+
+
+async def _get_or_create_conversation(
+    db: AsyncSession, tenant_id: uuid.UUID, user_id: uuid.UUID
+) -> AIConversation:
+    """Load existing conversation or create a new one."""
+    conversation = await _get_conversation(db, tenant_id, user_id)
     if conversation is not None:
         return conversation
 
     conversation = AIConversation(
         tenant_id=tenant_id,
         user_id=user_id,
-        messages=[],
     )
     db.add(conversation)
     await db.flush()
     return conversation
 
 
-def _trim_context(messages: list[dict], max_turns: int) -> list[dict]:
-    """Keep last max_turns user+assistant pairs."""
-    if len(messages) <= max_turns * 2:
-        return messages
-    return messages[-(max_turns * 2) :]
+async def _trim_context(
+    db: AsyncSession, conversation_id: uuid.UUID, max_turns: int
+) -> list[dict[str, str]]:
+    """Summary + last max_turns user/assistant pairs (bounded window query)."""
+    return await load_context_window(db, "dashboard", conversation_id, max_turns)
 
 
-async def handle_chat(
-    db: AsyncSession,
-    tenant: Tenant,
-    user_id: uuid.UUID,
-    message: str,
-    provider: AIProvider,
-) -> ChatResult:
-    """Full AI chat pipeline."""
+@dataclass(frozen=True)
+class PreparedChat:
+    """Everything needed to call the provider and record the turn afterwards.
+
+    Holds no ORM objects, so the turn can be finished on a different session
+    (streaming releases the request session while tokens are relayed).
+    """
+
+    tenant_id: uuid.UUID
+    user_id: uuid.UUID
+    message: str
+    provider_messages: list[dict[str, str]]
+    reserved_tokens: int
+
+
+async def prepare_chat(
+    db: AsyncSession, tenant: Tenant, user_id: uuid.UUID, message: str
+) -> PreparedChat:
+    """Steps 1–5: validate, rate-limit, build provider messages, reserve quota.
+
+    On success the caller owns the quota reservation and must either
+    ``finish_chat`` or ``abort_chat``.
+    """
     tenant_id = tenant.id
 
     # 1. Validate input length
@@ -156,57 +200,84 @@ async def handle_chat(
             "rate_limited",
         )
 
-    # 3. Reserve quota
+    # 3. Load conversation history (created on first completed turn)
+    conversation = await _get_conversation(db, tenant_id, user_id)
+    history = (
+        await _trim_context(db, conversation.id, _MAX_CONTEXT_TURNS)
+        if conversation is not None
+        else []
+    )
+
+    # 4. Build messages for provider (stable prompt + retrieved products)
+    system_prompt = get_system_prompt(tenant)
+    catalog_context = await _catalog_context(db, tenant, message)
+    provider_messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "system", "content": catalog_context},
+        *history,
+        {"role": "user", "content": message},
+    ]
+
+    # 5. Reserve quota: estimated prompt + the most the reply may use
     hard_limit = tenant.plan.ai_token_quota if tenant.plan else 0
-    quota = await reserve_tokens(str(tenant_id), _ESTIMATED_TOKENS, hard_limit)
+    estimated = estimate_prompt_tokens(provider_messages) + settings.AI_MAX_OUTPUT_TOKENS
+    quota = await reserve_tokens(str(tenant_id), estimated, hard_limit)
     if not quota.allowed:
         raise AIGatewayError(
             "AI token quota exhausted for this month.",
             "quota_exhausted",
         )
 
-    # 4. Load/create conversation
-    conversation = await _get_or_create_conversation(db, tenant_id, user_id)
+    return PreparedChat(
+        tenant_id=tenant_id,
+        user_id=user_id,
+        message=message,
+        provider_messages=provider_messages,
+        reserved_tokens=quota.reserved,
+    )
 
-    # 5. Build messages for provider
-    system_prompt = await _build_system_prompt(db, tenant)
-    context = _trim_context(list(conversation.messages), _MAX_CONTEXT_TURNS)
-    provider_messages = [
-        {"role": "system", "content": system_prompt},
-        *context,
-        {"role": "user", "content": message},
-    ]
 
-    # 6. Call provider
-    ai_response: AIResponse
-    try:
-        ai_response = await provider.chat(
-            provider_messages,
-            max_tokens=settings.AI_MAX_OUTPUT_TOKENS,
-        )
-    except Exception:
-        # Rollback quota reservation on failure
-        await rollback_tokens(str(tenant_id), _ESTIMATED_TOKENS)
-        raise
+async def abort_chat(prepared: PreparedChat) -> None:
+    """Release the quota reservation of a turn that produced no reply."""
+    await rollback_tokens(str(prepared.tenant_id), prepared.reserved_tokens)
+
+
+async def finish_chat(
+    db: AsyncSession, prepared: PreparedChat, ai_response: AIResponse
+) -> ChatResult:
+    """Steps 7–9: adjust quota, save conversation, log usage.
+
+    Does not commit. ``result.compact`` asks the caller to schedule
+    compaction after committing.
+    """
+    tenant_id = prepared.tenant_id
 
     # 7. Adjust quota with actual usage
     actual_tokens = ai_response.tokens_in + ai_response.tokens_out
-    delta = actual_tokens - _ESTIMATED_TOKENS
+    delta = actual_tokens - prepared.reserved_tokens
     await adjust_tokens(str(tenant_id), delta)
 
     # 8. Save conversation (append user + assistant messages)
-    updated_messages = list(conversation.messages)
-    updated_messages.append({"role": "user", "content": message})
-    updated_messages.append({"role": "assistant", "content": ai_response.content})
-    conversation.messages = updated_messages
+    conversation = await _get_or_create_conversation(db, tenant_id, prepared.user_id)
+    await append_messages(
+        db,
+        tenant_id=tenant_id,
+        kind="dashboard",
+        conversation_id=conversation.id,
+        messages=[
+            {"role": "user", "content": prepared.message},
+            {"role": "assistant", "content": ai_response.content},
+        ],
+    )
     conversation.updated_at = datetime.now(UTC)
     await db.flush()
+    compact = await needs_compaction(db, "dashboard", conversation.id, _MAX_CONTEXT_TURNS)
 
     # 9. Log usage
     cost = _compute_cost(ai_response.model, ai_response.tokens_in, ai_response.tokens_out)
     usage_log = AIUsageLog(
         tenant_id=tenant_id,
-        user_id=user_id,
+        user_id=prepared.user_id,
         conversation_id=conversation.id,
         model=ai_response.model,
         tokens_in=ai_response.tokens_in,
@@ -215,6 +286,7 @@ async def handle_chat(
     )
     db.add(usage_log)
     await db.flush()
+    await mark_ai_usage(db, tenant_id)
 
     return ChatResult(
         conversation_id=conversation.id,
@@ -222,4 +294,71 @@ async def handle_chat(
         tokens_in=ai_response.tokens_in,
         tokens_out=ai_response.tokens_out,
         cost_usd=cost,
+        compact=compact,
     )
+
+
+def _schedule_compaction(tenant_id: uuid.UUID, result: ChatResult) -> None:
+    if result.compact:
+        schedule_compaction("dashboard", tenant_id, result.conversation_id, _MAX_CONTEXT_TURNS)
+
+
+async def handle_chat(
+    db: AsyncSession,
+    tenant: Tenant,
+    user_id: uuid.UUID,
+    message: str,
+    provider: AIProvider,
+) -> ChatResult:
+    """Full AI chat pipeline."""
+    prepared = await prepare_chat(db, tenant, user_id, message)
+
+    # 6. Call provider
+    ai_response: AIResponse
+    try:
+        ai_response = await provider.chat(
+            prepared.provider_messages,
+            max_tokens=settings.AI_MAX_OUTPUT_TOKENS,
+        )
+    except Exception:
+        # Rollback quota reservation on failure
+        await abort_chat(prepared)
+        raise
+
+    result = await finish_chat(db, prepared, ai_response)
+    # Commit before enqueueing so the worker sees the new turn.
+    await db.commit()
+    _schedule_compaction(prepared.tenant_id, result)
+    return result
+
+
+async def stream_chat(
+    prepared: PreparedChat, provider: AIProvider
+) -> AsyncIterator[str | ChatResult]:
+    """Streaming step 6–9: yield text deltas, then the recorded ``ChatResult``.
+
+    Runs without the request session: the turn is recorded on a fresh
+    tenant-scoped session once the provider stream has completed. If the
+    stream fails or the consumer goes away, the quota reservation is released.
+    """
+    final: AIResponse | None = None
+    try:
+        async for event in provider.stream_chat(
+            prepared.provider_messages,
+            max_tokens=settings.AI_MAX_OUTPUT_TOKENS,
+        ):
+            if event.final is not None:
+                final = event.final
+            elif event.delta:
+                yield event.delta
+    finally:
+        if final is None:
+            await abort_chat(prepared)
+    if final is None:
+        raise RuntimeError("Provider stream ended without a final response")
+
+    async with tenant_session(prepared.tenant_id) as db:
+        result = await finish_chat(db, prepared, final)
+        await db.commit()
+    _schedule_compaction(prepared.tenant_id, result)
+    yield result
@@ -0,0 +1,203 @@
+"""Append-only AI chat message store + summary compaction.
+
+Both chat gateways store messages as rows in ``ai_messages``. The provider
+context for a turn is a bounded window: the latest summary (if any) plus the
+newest ``max_turns`` user/assistant pairs after the point it covers. Reads
+are two index range scans, so they cost the same however long the
+conversation runs.
+
+Turns that drop out of the window are not lost. Once enough of them pile up,
+``compact_conversation`` folds them (plus the previous summary) into a new
+``role='summary'`` row. That row records the last message id it covers in
+``summary_through_id``. The job runs in the background (see
+workers.tasks.ai_compaction).
+"""
+
+from __future__ import annotations
+
+import logging
+import uuid
+from typing import Literal
+
+from sqlalchemy import Select, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.models.ai_message import AIMessage
+from app.services.ai_provider import AIProvider, AIResponse
+
+logger = logging.getLogger(__name__)
+
+ConversationKind = Literal["dashboard", "storefront"]
+
+# Compact once this many messages have fallen out of the window; batching
+# keeps summarisation calls rare (one per ~10 turns past the window).
+COMPACT_BATCH_MESSAGES = 20
+_SUMMARY_MAX_TOKENS = 400
+
+_SUMMARY_INSTRUCTIONS = (
+    "Summarise the conversation below for an assistant that will continue it. "
+    "Keep facts the user shared, decisions, open questions, and any products, "
+    "orders or amounts mentioned. Write plain prose under 200 words."
+)
+
+
+def _conversation_column(kind: ConversationKind) -> InstrumentedAttribute[uuid.UUID | None]:
+    if kind == "dashboard":
+        return AIMessage.conversation_id
+    return AIMessage.storefront_conversation_id
+
+
+async def append_messages(
+    db: AsyncSession,
+    *,
+    tenant_id: uuid.UUID,
+    kind: ConversationKind,
+    conversation_id: uuid.UUID,
+    messages: list[dict[str, str]],
+) -> None:
+    """Insert *messages* (role/content dicts) in order, one statement."""
+    column = _conversation_column(kind)
+    await db.execute(
+        insert(AIMessage),
+        [
+            {
+                "tenant_id": tenant_id,
+                column.key: conversation_id,
+                "role": m["role"],
+                "content": m["content"],
+            }
+            for m in messages
+        ],
+    )
+
+
+async def _latest_summary(
+    db: AsyncSession, kind: ConversationKind, conversation_id: uuid.UUID
+) -> AIMessage | None:
+    column = _conversation_column(kind)
+    result = await db.execute(
+        select(AIMessage)
+        .where(column == conversation_id, AIMessage.role == "summary")
+        .order_by(AIMessage.id.desc())
+        .limit(1)
+    )
+    return result.scalar_one_or_none()
+
+
+def _uncovered(
+    kind: ConversationKind, conversation_id: uuid.UUID, summary: AIMessage | None
+) -> Select[tuple[AIMessage]]:
+    """Turn messages not yet folded into *summary*."""
+    stmt = select(AIMessage).where(
+        _conversation_column(kind) == conversation_id, AIMessage.role != "summary"
+    )
+    if summary is not None:
+        stmt = stmt.where(AIMessage.id > summary.summary_through_id)
+    return stmt
+
+
+def _summary_message(summary: AIMessage) -> dict[str, str]:
+    return {
+        "role": "system",
+        "content": f"Summary of the earlier conversation:\n{summary.content}",
+    }
+
+
+async def load_context_window(
+    db: AsyncSession, kind: ConversationKind, conversation_id: uuid.UUID, max_turns: int
+) -> list[dict[str, str]]:
+    """Latest summary (as a system message) + the last *max_turns* turn pairs."""
+    summary = await _latest_summary(db, kind, conversation_id)
+    result = await db.execute(
+        _uncovered(kind, conversation_id, summary)
+        .order_by(AIMessage.id.desc())
+        .limit(max_turns * 2)
+    )
+    window = [{"role": m.role, "content": m.content} for m in reversed(result.scalars().all())]
+    return [_summary_message(summary), *window] if summary is not None else window
+
+
+async def needs_compaction(
+    db: AsyncSession, kind: ConversationKind, conversation_id: uuid.UUID, max_turns: int
+) -> bool:
+    """True once COMPACT_BATCH_MESSAGES messages sit outside the window unsummarised.
+
+    Counts at most window + batch + 1 rows, so the check stays cheap.
+    """
+    threshold = max_turns * 2 + COMPACT_BATCH_MESSAGES
+    summary = await _latest_summary(db, kind, conversation_id)
+    bounded = (
+        _uncovered(kind, conversation_id, summary)
+        .with_only_columns(AIMessage.id)
+        .order_by(AIMessage.id.desc())
+        .limit(threshold + 1)
+        .subquery()
+    )
+    count = (await db.execute(select(func.count()).select_from(bounded))).scalar_one()
+    return count > threshold
+
+
+def schedule_compaction(
+    kind: ConversationKind, tenant_id: uuid.UUID, conversation_id: uuid.UUID, max_turns: int
+) -> None:
+    """Enqueue background compaction (idempotent; the task re-checks).
+
+    Call after the new turn is committed, so the worker can see it. Never
+    raises: the turn is already answered, and the next one re-schedules.
+    """
+    # Deferred: the task module imports the provider stack and usage models.
+    from app.workers.tasks.ai_compaction import compact_ai_conversation
+
+    try:
+        compact_ai_conversation.delay(kind, str(tenant_id), str(conversation_id), max_turns)
+    except Exception:
+        logger.warning(
+            "Failed to enqueue AI compaction conversation=%s", conversation_id, exc_info=True
+        )
+
+
+async def compact_conversation(
+    db: AsyncSession,
+    *,
+    tenant_id: uuid.UUID,
+    kind: ConversationKind,
+    conversation_id: uuid.UUID,
+    max_turns: int,
+    provider: AIProvider,
+) -> AIResponse | None:
+    """Fold messages older than the window into a new summary row.
+
+    Returns the provider response (for usage accounting), or None when there
+    is not yet a full batch to compact. The caller should hold a
+    per-conversation lock so concurrent runs do not summarise the same batch.
+    """
+    if not await needs_compaction(db, kind, conversation_id, max_turns):
+        return None
+
+    summary = await _latest_summary(db, kind, conversation_id)
+    result = await db.execute(_uncovered(kind, conversation_id, summary).order_by(AIMessage.id))
+    to_fold = list(result.scalars().all())[: -max_turns * 2]
+
+    transcript = "\n".join(f"{m.role}: {m.content}" for m in to_fold)
+    if summary is not None:
+        transcript = f"Earlier summary: {summary.content}\n\n{transcript}"
+    response = await provider.chat(
+        [
+            {"role": "system", "content": _SUMMARY_INSTRUCTIONS},
+            {"role": "user", "content": transcript},
+        ],
+        max_tokens=_SUMMARY_MAX_TOKENS,
+    )
+
+    db.add(
+        AIMessage(
+            tenant_id=tenant_id,
+            **{_conversation_column(kind).key: conversation_id},
+            role="summary",
+            content=response.content,
+            summary_through_id=to_fold[-1].id,
+        )
+    )
+    await db.flush()
+    return response
@@ -3,15 +3,28 @@
 Protocol + concrete providers. Default is OpenAI; Anthropic kept as optional
 fallback. All AI calls go through this module; route handlers and the gateway
 never import provider SDKs directly.
+
+Provider instances are cached per event loop so SDK clients and their HTTP
+connection pools are reused across requests. Every call has connect/read
+timeouts. ``FailoverProvider`` adds a secondary provider/model, and
+``FakeProvider`` serves load tests without network access.
 """
 
 from __future__ import annotations
 
+import asyncio
+import logging
+import weakref
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
 from typing import Protocol
 
+import httpx
+
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass(frozen=True)
 class AIResponse:
@@ -23,6 +36,14 @@ class AIResponse:
     model: str
 
 
+@dataclass(frozen=True)
+class AIStreamEvent:
+    """One item from ``stream_chat``: a text delta, or — last — the full response."""
+
+    delta: str = ""
+    final: AIResponse | None = None
+
+
 class AIProvider(Protocol):
     """Interface that every provider implementation must satisfy."""
 
@@ -33,6 +54,52 @@ class AIProvider(Protocol):
         max_tokens: int = 1024,
     ) -> AIResponse: ...
 
+    def stream_chat(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        max_tokens: int = 1024,
+    ) -> AsyncIterator[AIStreamEvent]:
+        """Yield text deltas as they arrive, then one event carrying ``final``."""
+        ...
+
+
+def _split_system(messages: list[dict[str, str]]) -> tuple[list[str], list[dict[str, str]]]:
+    """Separate system messages from conversation turns (Anthropic API shape)."""
+    system_texts: list[str] = []
+    conversation: list[dict[str, str]] = []
+    for msg in messages:
+        if msg["role"] == "system":
+            system_texts.append(msg["content"])
+        else:
+            conversation.append(msg)
+    return system_texts, conversation
+
+
+def _cached_system_blocks(system_texts: list[str]) -> list[dict] | None:
+    """System prompt blocks with an Anthropic cache breakpoint after the first.
+
+    The first system message is stable per tenant (instructions + name, see
+    ai_gateway.get_system_prompt), so the breakpoint lets repeat turns reuse
+    it. Later system messages (per-message catalog context) are sent uncached.
+    """
+    if not system_texts:
+        return None
+    blocks: list[dict] = [{"type": "text", "text": t} for t in system_texts]
+    blocks[0]["cache_control"] = {"type": "ephemeral"}
+    return blocks
+
+
+def _timeout() -> httpx.Timeout:
+    return httpx.Timeout(settings.AI_TIMEOUT_SECONDS, connect=settings.AI_CONNECT_TIMEOUT_SECONDS)
+
+
+def _connection_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.AI_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.AI_MAX_KEEPALIVE_CONNECTIONS,
+    )
+
 
 class AnthropicProvider:
     """Anthropic Claude provider using the official SDK."""
@@ -40,7 +107,14 @@ class AnthropicProvider:
     def __init__(self, api_key: str, model: str) -> None:
         import anthropic
 
-        self._client = anthropic.AsyncAnthropic(api_key=api_key)
+        self._client = anthropic.AsyncAnthropic(
+            api_key=api_key,
+            timeout=_timeout(),
+            max_retries=settings.AI_MAX_RETRIES,
+            http_client=anthropic.DefaultAsyncHttpxClient(
+                limits=_connection_limits(), timeout=_timeout()
+            ),
+        )
         self._model = model
 
     async def chat(
@@ -49,19 +123,12 @@ class AnthropicProvider:
         *,
         max_tokens: int = 1024,
     ) -> AIResponse:
-        # Separate system message from conversation turns
-        system_text = ""
-        conversation: list[dict[str, str]] = []
-        for msg in messages:
-            if msg["role"] == "system":
-                system_text = msg["content"]
-            else:
-                conversation.append(msg)
+        system_texts, conversation = _split_system(messages)
 
         response = await self._client.messages.create(
             model=self._model,
             max_tokens=max_tokens,
-            system=system_text or None,
+            system=_cached_system_blocks(system_texts),
             messages=conversation,
         )
 
@@ -72,6 +139,34 @@ class AnthropicProvider:
             model=self._model,
         )
 
+    async def stream_chat(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        max_tokens: int = 1024,
+    ) -> AsyncIterator[AIStreamEvent]:
+        system_texts, conversation = _split_system(messages)
+
+        async with self._client.messages.stream(
+            model=self._model,
+            max_tokens=max_tokens,
+            system=_cached_system_blocks(system_texts),
+            messages=conversation,
+        ) as stream:
+            async for text in stream.text_stream:
+                yield AIStreamEvent(delta=text)
+            final = await stream.get_final_message()
+
+        content = "".join(block.text for block in final.content if block.type == "text")
+        yield AIStreamEvent(
+            final=AIResponse(
+                content=content,
+                tokens_in=final.usage.input_tokens,
+                tokens_out=final.usage.output_tokens,
+                model=self._model,
+            )
+        )
+
 
 class OpenAIProvider:
     """OpenAI-compatible provider. Works with OpenAI, Groq, and other
@@ -80,7 +175,15 @@ class OpenAIProvider:
     def __init__(self, api_key: str, model: str, base_url: str | None = None) -> None:
         import openai
 
-        self._client = openai.AsyncOpenAI(api_key=api_key, base_url=base_url)
+        self._client = openai.AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            timeout=_timeout(),
+            max_retries=settings.AI_MAX_RETRIES,
+            http_client=openai.DefaultAsyncHttpxClient(
+                limits=_connection_limits(), timeout=_timeout()
+            ),
+        )
         self._model = model
 
     async def chat(
@@ -105,30 +208,230 @@ class OpenAIProvider:
             model=self._model,
         )
 
+    async def stream_chat(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        max_tokens: int = 1024,
+    ) -> AsyncIterator[AIStreamEvent]:
+        stream = await self._client.chat.completions.create(
+            model=self._model,
+            max_tokens=max_tokens,
+            messages=messages,
+            stream=True,
+            # Usage arrives on a final chunk with no choices.
+            stream_options={"include_usage": True},
+        )
+
+        parts: list[str] = []
+        tokens_in = tokens_out = 0
+        async for chunk in stream:
+            if chunk.usage:
+                tokens_in = chunk.usage.prompt_tokens
+                tokens_out = chunk.usage.completion_tokens
+            if chunk.choices:
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    yield AIStreamEvent(delta=delta)
 
-_GROQ_BASE_URL = "https://api.groq.com/openai/v1"
+        yield AIStreamEvent(
+            final=AIResponse(
+                content="".join(parts),
+                tokens_in=tokens_in,
+                tokens_out=tokens_out,
+                model=self._model,
+            )
+        )
 
 
-def get_provider() -> AIProvider:
-    """Factory: return the configured provider instance.
+class FailoverProvider:
+    """Try *primary*; on error or when it exceeds *latency_budget*, use *secondary*.
 
-    Supported: "openai" (default), "groq", "anthropic".
+    The budget bounds the whole call for ``chat`` and the time to the first
+    token for ``stream_chat``. Once the primary has streamed a token, the
+    stream is committed to it and later errors propagate. Switching then
+    would repeat text the client has already shown.
     """
-    provider_name = settings.AI_PROVIDER.lower()
-    if provider_name == "anthropic":
-        return AnthropicProvider(
-            api_key=settings.AI_API_KEY,
-            model=settings.AI_MODEL,
-        )
-    if provider_name == "openai":
-        return OpenAIProvider(
-            api_key=settings.AI_API_KEY,
-            model=settings.AI_MODEL,
+
+    def __init__(
+        self, primary: AIProvider, secondary: AIProvider, latency_budget: float | None = None
+    ) -> None:
+        self.primary = primary
+        self.secondary = secondary
+        self._budget = latency_budget
+
+    async def chat(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        max_tokens: int = 1024,
+    ) -> AIResponse:
+        try:
+            return await asyncio.wait_for(
+                self.primary.chat(messages, max_tokens=max_tokens), self._budget
+            )
+        except Exception as exc:
+            logger.warning("Primary AI provider failed (%s); failing over", _describe(exc))
+        return await self.secondary.chat(messages, max_tokens=max_tokens)
+
+    async def stream_chat(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        max_tokens: int = 1024,
+    ) -> AsyncIterator[AIStreamEvent]:
+        primary = aiter(self.primary.stream_chat(messages, max_tokens=max_tokens))
+        try:
+            first = await asyncio.wait_for(anext(primary), self._budget)
+        except Exception as exc:
+            logger.warning("Primary AI stream failed (%s); failing over", _describe(exc))
+            await _aclose(primary)
+            async for event in self.secondary.stream_chat(messages, max_tokens=max_tokens):
+                yield event
+            return
+
+        yield first
+        async for event in primary:
+            yield event
+
+
+def _describe(exc: BaseException) -> str:
+    if isinstance(exc, TimeoutError):
+        return "latency budget exceeded"
+    return type(exc).__name__
+
+
+async def _aclose(stream: AsyncIterator[AIStreamEvent]) -> None:
+    aclose = getattr(stream, "aclose", None)
+    if aclose is None:
+        return
+    try:
+        await aclose()
+    except Exception:
+        logger.debug("Error closing abandoned AI stream", exc_info=True)
+
+
+class FakeProvider:
+    """Deterministic, network-free provider for load tests and local runs.
+
+    Waits *latency* seconds (time to first token), then answers with a fixed
+    echo of the last user message, streamed word by word *token_delay*
+    seconds apart. Token counts are estimated at 4 characters per token.
+    """
+
+    def __init__(
+        self, *, latency: float = 0.0, token_delay: float = 0.0, model: str = "fake"
+    ) -> None:
+        self._latency = latency
+        self._token_delay = token_delay
+        self._model = model
+
+    def _respond(self, messages: list[dict[str, str]]) -> AIResponse:
+        last_user = next((m["content"] for m in reversed(messages) if m["role"] == "user"), "")
+        content = f"[{self._model}] You said: {last_user[:200]}"
+        prompt_chars = sum(len(m["content"]) for m in messages)
+        return AIResponse(
+            content=content,
+            tokens_in=max(1, prompt_chars // 4),
+            tokens_out=max(1, len(content) // 4),
+            model=self._model,
         )
-    if provider_name == "groq":
-        return OpenAIProvider(
-            api_key=settings.AI_API_KEY,
-            model=settings.AI_MODEL,
-            base_url=_GROQ_BASE_URL,
+
+    async def chat(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        max_tokens: int = 1024,
+    ) -> AIResponse:
+        await asyncio.sleep(self._latency + self._token_delay * 8)
+        return self._respond(messages)
+
+    async def stream_chat(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        max_tokens: int = 1024,
+    ) -> AsyncIterator[AIStreamEvent]:
+        response = self._respond(messages)
+        await asyncio.sleep(self._latency)
+        for i, word in enumerate(response.content.split(" ")):
+            if i:
+                await asyncio.sleep(self._token_delay)
+            yield AIStreamEvent(delta=word if i == 0 else f" {word}")
+        yield AIStreamEvent(final=response)
+
+
+_GROQ_BASE_URL = "https://api.groq.com/openai/v1"
+
+
+def _create_provider(name: str, model: str, api_key: str) -> AIProvider:
+    name = name.lower()
+    if name == "anthropic":
+        return AnthropicProvider(api_key=api_key, model=model)
+    if name == "openai":
+        return OpenAIProvider(api_key=api_key, model=model)
+    if name == "groq":
+        return OpenAIProvider(api_key=api_key, model=model, base_url=_GROQ_BASE_URL)
+    if name == "fake":
+        return FakeProvider(
+            latency=settings.AI_FAKE_LATENCY_MS / 1000,
+            token_delay=settings.AI_FAKE_TOKEN_DELAY_MS / 1000,
+            model=model,
         )
-    raise ValueError(f"Unknown AI provider: {provider_name}")
+    raise ValueError(f"Unknown AI provider: {name}")
+
+
+def _build_provider() -> AIProvider:
+    primary = _create_provider(settings.AI_PROVIDER, settings.AI_MODEL, settings.AI_API_KEY)
+    if not (settings.AI_FALLBACK_PROVIDER or settings.AI_FALLBACK_MODEL):
+        return primary
+    secondary = _create_provider(
+        settings.AI_FALLBACK_PROVIDER or settings.AI_PROVIDER,
+        settings.AI_FALLBACK_MODEL or settings.AI_MODEL,
+        settings.AI_FALLBACK_API_KEY or settings.AI_API_KEY,
+    )
+    budget = settings.AI_FAILOVER_LATENCY_BUDGET_SECONDS or None
+    return FailoverProvider(primary, secondary, latency_budget=budget)
+
+
+def _settings_key() -> tuple:
+    return (
+        settings.AI_PROVIDER,
+        settings.AI_MODEL,
+        settings.AI_API_KEY,
+        settings.AI_FALLBACK_PROVIDER,
+        settings.AI_FALLBACK_MODEL,
+        settings.AI_FALLBACK_API_KEY,
+        settings.AI_FAILOVER_LATENCY_BUDGET_SECONDS,
+        settings.AI_TIMEOUT_SECONDS,
+    )
+
+
+# One provider (and so one SDK client + HTTP pool) per event loop: pooled
+# connections are bound to the loop that opened them, and Celery tasks run
+# each job on a fresh loop via asyncio.run().
+_providers: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, tuple[tuple, AIProvider]] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_provider() -> AIProvider:
+    """Return the configured provider, reusing it across calls on this loop.
+
+    Supported: "openai" (default), "groq", "anthropic", "fake". Setting
+    AI_FALLBACK_PROVIDER and/or AI_FALLBACK_MODEL wraps it in a
+    ``FailoverProvider``.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return _build_provider()
+
+    key = _settings_key()
+    cached = _providers.get(loop)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    provider = _build_provider()
+    _providers[loop] = (key, provider)
+    return provider
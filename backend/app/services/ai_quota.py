@@ -1,12 +1,25 @@
 """Redis-backed AI token quota: reserve / adjust / rollback.
 
 Keys:
-  ai:quota:{tenant_id}:month:{YYYY-MM}  — running token total (TTL 35 days)
+  ai:quota:{tenant_id}:month:{YYYY-MM}  — tokens used + leased (TTL 35 days)
   ai:rate:{tenant_id}:{user_id}          — message count (TTL 5 min)
+
+Quota is leased from Redis in chunks (``AI_QUOTA_LEASE_TOKENS``) per process
+and tenant. Most reservations, adjustments and rollbacks then touch only the
+local lease balance. The Redis counter includes outstanding leases, so
+concurrent processes can never reserve past the hard limit together. Near the
+limit, chunks shrink to a quarter of what is left, so unused leases stranded
+in other processes deny little. Leases idle for ``AI_QUOTA_LEASE_SECONDS``
+are returned to Redis (``reconcile_leases``), and the app returns all of them
+on shutdown (``release_leases``). The usage rollup job periodically corrects
+counter drift against the usage logs (``reconcile_month_counters``).
 """
 
 from __future__ import annotations
 
+import asyncio
+import logging
+import time
 from dataclasses import dataclass
 from datetime import UTC, datetime
 
@@ -14,6 +27,8 @@ import redis.asyncio as aioredis
 
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 _RATE_LIMIT_MESSAGES = 30  # per user per 5-min window
 _RATE_LIMIT_WINDOW = 300  # seconds
 
@@ -23,6 +38,7 @@ class QuotaResult:
     allowed: bool
     over_soft: bool
     reason: str | None = None
+    reserved: int = 0  # tokens taken from the quota (0 when unlimited)
 
 
 async def _get_redis() -> aioredis.Redis:
@@ -83,40 +99,109 @@ async def check_analytics_rate_limit(tenant_id: str, session_id: str, ip_hash: s
         await r.aclose()
 
 
+_QUOTA_TTL = 35 * 86400  # seconds
+
+# Atomically lease up to ARGV[2] tokens (at least ARGV[1]) below hard limit
+# ARGV[3]. Returns {granted, counter after grant}; granted = 0 means denied.
+_LEASE_SCRIPT = """
+local used = tonumber(redis.call('GET', KEYS[1]) or '0')
+local need = tonumber(ARGV[1])
+local remaining = tonumber(ARGV[3]) - used
+if remaining < need then
+  return {0, used}
+end
+local grant = math.max(need, math.min(tonumber(ARGV[2]), math.floor(remaining / 4)))
+used = redis.call('INCRBY', KEYS[1], grant)
+if redis.call('TTL', KEYS[1]) == -1 then
+  redis.call('EXPIRE', KEYS[1], ARGV[4])
+end
+return {grant, used}
+"""
+
+
+@dataclass
+class _Lease:
+    """Quota this process has taken from the Redis counter but not yet used."""
+
+    month_key: str
+    balance: int
+    counter: int  # Redis counter after our last lease (soft-limit signal)
+    touched_at: float
+
+
+_leases: dict[str, _Lease] = {}
+
+
+def _current_lease(tenant_id: str) -> _Lease | None:
+    lease = _leases.get(tenant_id)
+    if lease is not None and lease.month_key != _month_key(tenant_id):
+        # New month, new counter; last month's leftovers no longer matter.
+        del _leases[tenant_id]
+        return None
+    return lease
+
+
 async def reserve_tokens(tenant_id: str, estimated: int, hard_limit: int) -> QuotaResult:
-    """Reserve estimated tokens. Returns whether the request is allowed."""
+    """Reserve estimated tokens. Returns whether the request is allowed.
+
+    ``QuotaResult.reserved`` is what the caller must later settle with
+    ``adjust_tokens(actual - reserved)`` or ``rollback_tokens(reserved)``.
+    """
     if hard_limit <= 0:
         # No quota configured — allow unlimited
         return QuotaResult(allowed=True, over_soft=False)
 
-    r = await _get_redis()
-    try:
+    soft_limit = int(hard_limit * 0.8)
+    # Other coroutines may spend the lease while we await Redis, so re-check
+    # the balance after every grant; it must never go below zero (tokens
+    # spent from a negative balance were never counted in Redis).
+    while True:
+        lease = _current_lease(tenant_id)
+        if lease is not None and lease.balance >= estimated:
+            break
+        need = estimated - (lease.balance if lease else 0)
         key = _month_key(tenant_id)
-        new_total = await r.incrby(key, estimated)
-        # Set TTL on first use (35 days)
-        ttl = await r.ttl(key)
-        if ttl == -1:
-            await r.expire(key, 35 * 86400)
-
-        soft_limit = int(hard_limit * 0.8)
-
-        if new_total > hard_limit:
-            # Over hard limit — rollback and deny
-            await r.decrby(key, estimated)
+        r = await _get_redis()
+        try:
+            granted, counter = await r.eval(
+                _LEASE_SCRIPT,
+                1,
+                key,
+                need,
+                max(need, settings.AI_QUOTA_LEASE_TOKENS),
+                hard_limit,
+                _QUOTA_TTL,
+            )
+        finally:
+            await r.aclose()
+        if not granted:
             return QuotaResult(allowed=False, over_soft=True, reason="quota_exhausted")
+        # Re-read: the lease may have been reconciled away while we awaited.
+        lease = _current_lease(tenant_id)
+        if lease is None:
+            lease = _Lease(month_key=key, balance=0, counter=0, touched_at=0.0)
+            _leases[tenant_id] = lease
+        lease.balance += int(granted)
+        lease.counter = int(counter)
 
-        return QuotaResult(
-            allowed=True,
-            over_soft=new_total > soft_limit,
-        )
-    finally:
-        await r.aclose()
+    lease.balance -= estimated
+    lease.touched_at = time.monotonic()
+    # The counter includes our unspent lease; only what is spent counts.
+    used = lease.counter - lease.balance
+    return QuotaResult(allowed=True, over_soft=used > soft_limit, reserved=estimated)
 
 
 async def adjust_tokens(tenant_id: str, delta: int) -> None:
     """Adjust after actual usage known: delta = actual - estimated."""
     if delta == 0:
         return
+    lease = _current_lease(tenant_id)
+    if lease is not None:
+        if delta < 0 or lease.balance >= delta:
+            lease.balance -= delta
+            return
+        delta -= lease.balance
+        lease.balance = 0
     r = await _get_redis()
     try:
         await r.incrby(_month_key(tenant_id), delta)
@@ -126,8 +211,76 @@ async def adjust_tokens(tenant_id: str, delta: int) -> None:
 
 async def rollback_tokens(tenant_id: str, estimated: int) -> None:
     """Release reserved tokens on provider failure."""
+    await adjust_tokens(tenant_id, -estimated)
+
+
+async def _return_leases(tenant_ids: list[str]) -> None:
     r = await _get_redis()
     try:
-        await r.decrby(_month_key(tenant_id), estimated)
+        for tenant_id in tenant_ids:
+            lease = _leases.pop(tenant_id, None)
+            if lease is not None and lease.balance:
+                await r.decrby(lease.month_key, lease.balance)
     finally:
         await r.aclose()
+
+
+async def reconcile_leases() -> int:
+    """Return leases idle for ``AI_QUOTA_LEASE_SECONDS`` to Redis; count them."""
+    cutoff = time.monotonic() - settings.AI_QUOTA_LEASE_SECONDS
+    stale = [tid for tid, lease in _leases.items() if lease.touched_at < cutoff]
+    if stale:
+        await _return_leases(stale)
+    return len(stale)
+
+
+async def release_leases() -> None:
+    """Return every local lease to Redis (shutdown, tests)."""
+    if _leases:
+        await _return_leases(list(_leases))
+
+
+async def reconcile_month_counters(used_by_tenant: dict[str, int], slack: int) -> int:
+    """Correct drift in this month's Redis counters from logged usage.
+
+    A counter legitimately exceeds logged usage by outstanding leases and
+    in-flight reservations. So it is only raised when below *used* (lost
+    increments, e.g. a Redis restart), and lowered when above ``used + slack``
+    (leases stranded by crashed processes). Adjusts with INCRBY so concurrent
+    reservations are not lost. Returns the number of counters corrected.
+    """
+    if not used_by_tenant:
+        return 0
+    tenant_ids = list(used_by_tenant)
+    keys = [_month_key(tid) for tid in tenant_ids]
+    r = await _get_redis()
+    try:
+        counters = await r.mget(keys)
+        corrected = 0
+        for tenant_id, key, raw in zip(tenant_ids, keys, counters, strict=True):
+            counter = int(raw or 0)
+            used = used_by_tenant[tenant_id]
+            if counter < used:
+                delta = used - counter
+            elif counter > used + slack:
+                delta = used + slack - counter
+            else:
+                continue
+            await r.incrby(key, delta)
+            if raw is None:
+                await r.expire(key, _QUOTA_TTL)
+            logger.info("AI quota counter %s corrected by %+d", key, delta)
+            corrected += 1
+        return corrected
+    finally:
+        await r.aclose()
+
+
+async def run_lease_reconciler() -> None:
+    """Background loop: periodically ``reconcile_leases`` until cancelled."""
+    while True:
+        await asyncio.sleep(settings.AI_QUOTA_LEASE_SECONDS)
+        try:
+            await reconcile_leases()
+        except Exception:
+            logger.warning("AI quota lease reconciliation failed", exc_info=True)
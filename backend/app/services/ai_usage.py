@@ -0,0 +1,65 @@
+"""Shared helpers for AI usage reports served from ``ai_usage_rollups``."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import UTC, date, datetime, time, timedelta
+
+from fastapi import HTTPException
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.ai_usage_rollup import AIUsageRollupState
+from app.models.tenant import Tenant
+
+ROLLUP_JOB = "ai_usage"  # AIUsageRollupState key of the rollup worker job
+# How stale tenants.ai_usage_at may get before mark_ai_usage rewrites it.
+MARK_INTERVAL = timedelta(seconds=settings.AI_USAGE_ROLLUP_INTERVAL_SECONDS)
+
+
+def usage_range(
+    from_date: date | None, to_date: date | None, max_days: int
+) -> tuple[datetime, datetime]:
+    """UTC [start, end) for inclusive dates; defaults to month-to-date."""
+    today = datetime.now(UTC).date()
+    from_date = from_date or today.replace(day=1)
+    to_date = to_date or today
+    if to_date < from_date:
+        raise HTTPException(status_code=422, detail="'to' must not be before 'from'")
+    if (to_date - from_date).days >= max_days:
+        raise HTTPException(status_code=422, detail=f"Date range must not exceed {max_days} days")
+    start = datetime.combine(from_date, time.min, tzinfo=UTC)
+    end = datetime.combine(to_date + timedelta(days=1), time.min, tzinfo=UTC)
+    return start, end
+
+
+async def rolled_up_to(db: AsyncSession) -> datetime | None:
+    """High-water mark of the rollup job; later usage is not in the rollups yet."""
+    result = await db.execute(
+        select(AIUsageRollupState.rolled_up_to).where(AIUsageRollupState.job == ROLLUP_JOB)
+    )
+    return result.scalar_one_or_none()
+
+
+async def mark_ai_usage(db: AsyncSession, tenant_id: uuid.UUID) -> None:
+    """Stamp ``tenants.ai_usage_at``; call after flushing an AI usage log row.
+
+    The tenants row is also what ``bump_catalog_version`` locks, so the
+    stamp is only rewritten once it is ``MARK_INTERVAL`` old. It is
+    therefore at most that much earlier than the tenant's newest log row,
+    and the rollup job looks back ``MARK_INTERVAL`` before its mark.
+    clock_timestamp() matches the log rows' ``created_at``.
+    """
+    await db.execute(
+        update(Tenant)
+        .where(
+            Tenant.id == tenant_id,
+            or_(
+                Tenant.ai_usage_at.is_(None),
+                Tenant.ai_usage_at < func.clock_timestamp() - MARK_INTERVAL,
+            ),
+        )
+        .values(ai_usage_at=func.clock_timestamp())
+        .execution_options(synchronize_session=False)
+    )
@@ -0,0 +1,191 @@
+"""Set-based bulk price, active-flag and stock changes for products and variants.
+
+``POST /tenants/me/products/bulk-update`` replaces hundreds of PATCH and
+restock calls. Whatever the batch size, it runs:
+
+  - one SELECT per table to check that the targets exist, and that stock
+    changes only touch tracked-inventory products
+  - one ``UPDATE ... FROM (VALUES ...)`` per table; a NULL column in a
+    VALUES row leaves that field unchanged
+  - one multi-row INSERT into ``stock_movements`` (``manual_restock`` for
+    positive deltas, ``manual_adjustment`` for negative ones)
+  - at most one catalog version bump, and only when a price or active flag
+    changes. Stock-only batches leave catalog caches valid.
+  - one POS sync version for all touched products (catalog_sync)
+
+A delta that would take stock below zero fails the whole batch with 409.
+"""
+
+from __future__ import annotations
+
+import uuid
+from collections.abc import Sequence
+
+from fastapi import HTTPException
+from sqlalchemy import (
+    Boolean,
+    Integer,
+    Numeric,
+    case,
+    cast,
+    column,
+    func,
+    or_,
+    select,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.product import Product
+from app.models.product_variant import ProductVariant
+from app.schemas.product import ProductBulkUpdateItem, ProductBulkUpdateResponse
+from app.services.catalog_sync import record_catalog_changes
+from app.services.catalog_version import bump_catalog_version
+from app.services.inventory import insert_stock_movements
+
+
+def _ids(ids: Sequence[uuid.UUID]) -> str:
+    return ", ".join(str(i) for i in ids)
+
+
+async def _check_targets(
+    db: AsyncSession,
+    tenant_id: uuid.UUID,
+    product_items: list[ProductBulkUpdateItem],
+    variant_items: list[ProductBulkUpdateItem],
+) -> None:
+    product_ids = {item.product_id for item in product_items + variant_items}
+    result = await db.execute(
+        select(Product.id, Product.track_inventory).where(
+            Product.tenant_id == tenant_id, Product.id.in_(product_ids)
+        )
+    )
+    tracked = dict(result.all())
+    missing = [pid for pid in product_ids if pid not in tracked]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Product not found: {_ids(missing)}")
+
+    if variant_items:
+        result = await db.execute(
+            select(ProductVariant.id, ProductVariant.product_id).where(
+                ProductVariant.tenant_id == tenant_id,
+                ProductVariant.id.in_([item.variant_id for item in variant_items]),
+            )
+        )
+        owners = dict(result.all())
+        missing = [
+            item.variant_id
+            for item in variant_items
+            if owners.get(item.variant_id) != item.product_id
+        ]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Variant not found: {_ids(missing)}")
+
+    untracked = [
+        item.product_id
+        for item in product_items + variant_items
+        if item.stock_delta is not None and not tracked[item.product_id]
+    ]
+    if untracked:
+        raise HTTPException(
+            status_code=422,
+            detail="Cannot change stock of a product that does not track inventory: "
+            f"{_ids(list(dict.fromkeys(untracked)))}",
+        )
+
+
+async def _update_table(
+    db: AsyncSession,
+    tenant_id: uuid.UUID,
+    model: type[Product] | type[ProductVariant],
+    rows: list[tuple],
+) -> int:
+    """One UPDATE ... FROM (VALUES ...) for *rows* of (id, price, active, delta)."""
+    if not rows:
+        return 0
+    changes = values(
+        column("id", UUID(as_uuid=True)),
+        column("price_amount", Numeric(12, 3)),
+        column("is_active", Boolean),
+        column("stock_delta", Integer),
+        name="changes",
+    ).data(rows)
+    # NULL cells render as untyped literals, so type them at the point of use.
+    price = cast(changes.c.price_amount, Numeric(12, 3))
+    is_active = cast(changes.c.is_active, Boolean)
+    stock_delta = cast(changes.c.stock_delta, Integer)
+    new_stock = func.coalesce(model.stock_qty, 0) + stock_delta
+    result = await db.execute(
+        update(model)
+        .where(
+            model.id == changes.c.id,
+            model.tenant_id == tenant_id,  # defense-in-depth on top of RLS
+            or_(stock_delta.is_(None), new_stock >= 0),
+        )
+        .values(
+            price_amount=func.coalesce(price, model.price_amount),
+            is_active=func.coalesce(is_active, model.is_active),
+            stock_qty=case((stock_delta.is_(None), model.stock_qty), else_=new_stock),
+        )
+        .returning(model.id)
+        .execution_options(synchronize_session=False)
+    )
+    updated = set(result.scalars().all())
+    # Targets were checked above, so a skipped row means the stock guard held it back.
+    short = [row[0] for row in rows if row[0] not in updated]
+    if short:
+        raise HTTPException(
+            status_code=409, detail=f"Stock cannot go below zero for: {_ids(short)}"
+        )
+    return len(updated)
+
+
+async def apply_bulk_update(
+    db: AsyncSession,
+    tenant_id: uuid.UUID,
+    items: list[ProductBulkUpdateItem],
+    actor_user_id: uuid.UUID | None = None,
+) -> ProductBulkUpdateResponse:
+    """Apply *items* in the caller's transaction (tenant context must be set)."""
+    product_items = [item for item in items if item.variant_id is None]
+    variant_items = [item for item in items if item.variant_id is not None]
+    await _check_targets(db, tenant_id, product_items, variant_items)
+
+    products_updated = await _update_table(
+        db,
+        tenant_id,
+        Product,
+        [(i.product_id, i.price_amount, i.is_active, i.stock_delta) for i in product_items],
+    )
+    variants_updated = await _update_table(
+        db,
+        tenant_id,
+        ProductVariant,
+        [(i.variant_id, i.price_amount, i.is_active, i.stock_delta) for i in variant_items],
+    )
+    if any(item.price_amount is not None or item.is_active is not None for item in items):
+        await bump_catalog_version(db, tenant_id)
+
+    movements = [
+        {
+            "tenant_id": tenant_id,
+            "product_id": item.product_id,
+            "variant_id": item.variant_id,
+            "delta_qty": item.stock_delta,
+            "reason": "manual_restock" if item.stock_delta > 0 else "manual_adjustment",
+            "note": item.note,
+            "actor_user_id": actor_user_id,
+        }
+        for item in items
+        if item.stock_delta is not None
+    ]
+    await insert_stock_movements(db, movements)
+    await record_catalog_changes(db, tenant_id, [item.product_id for item in items])
+
+    return ProductBulkUpdateResponse(
+        products_updated=products_updated,
+        variants_updated=variants_updated,
+        stock_movements=len(movements),
+    )
@@ -1,10 +1,17 @@
-"""Shared catalog code uniqueness checks across products and variants.
+"""Catalog code registry: SKU/barcode uniqueness across products and variants.
 
 A SKU or barcode must be unique within the combined product + product_variant
-namespace for a tenant, so POS scan/search stays unambiguous. DB partial unique
-indexes enforce uniqueness within each table; this helper adds the cross-table
-guard at the application layer. It is not fully race-proof across tables and
-intentionally does not introduce a shared registry table.
+namespace for a tenant, so POS scan/search stays unambiguous. The
+``catalog_codes`` table holds one row per code with primary key
+(tenant_id, code_type, code), so the database enforces that across both
+tables. Concurrent writers claiming the same code serialise on the index
+and the loser gets a 409.
+
+Every write that sets a product or variant sku/barcode calls
+``claim_catalog_codes`` in the same transaction. Deletes cascade through the
+foreign keys. Bulk imports insert registry rows set-based (catalog_import).
+``rebuild_catalog_codes`` recomputes a tenant's rows from the source tables
+(``python -m scripts.rebuild_catalog_codes``).
 """
 
 from __future__ import annotations
@@ -12,59 +19,131 @@ from __future__ import annotations
 import uuid
 
 from fastapi import HTTPException
-from sqlalchemy import select
+from sqlalchemy import and_, delete, or_, select, text
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.product import Product
-from app.models.product_variant import ProductVariant
+from app.models.catalog_code import CatalogCode
+
+CODE_TYPES = ("sku", "barcode")
+_LABELS = {"sku": "SKU", "barcode": "Barcode"}
+
+_REBUILD_SQL = text(
+    """
+    INSERT INTO catalog_codes (tenant_id, code_type, code, product_id, variant_id)
+    SELECT tenant_id, 'sku', sku, id, NULL::uuid FROM products
+     WHERE tenant_id = :tenant_id AND sku IS NOT NULL
+    UNION ALL
+    SELECT tenant_id, 'barcode', barcode, id, NULL::uuid FROM products
+     WHERE tenant_id = :tenant_id AND barcode IS NOT NULL
+    UNION ALL
+    SELECT tenant_id, 'sku', sku, product_id, id FROM product_variants
+     WHERE tenant_id = :tenant_id AND sku IS NOT NULL
+    UNION ALL
+    SELECT tenant_id, 'barcode', barcode, product_id, id FROM product_variants
+     WHERE tenant_id = :tenant_id AND barcode IS NOT NULL
+    ON CONFLICT DO NOTHING
+    """
+)
 
 
-async def _assert_code_unused(
+async def claim_catalog_codes(
     db: AsyncSession,
     tenant_id: uuid.UUID,
-    column: str,
-    value: str,
-    exclude_product_id: uuid.UUID | None,
-    exclude_variant_id: uuid.UUID | None,
-    label: str,
+    *,
+    product_id: uuid.UUID,
+    variant_id: uuid.UUID | None = None,
+    sku: str | None,
+    barcode: str | None,
 ) -> None:
-    product_stmt = select(Product.id).where(
-        Product.tenant_id == tenant_id, getattr(Product, column) == value
-    )
-    if exclude_product_id is not None:
-        product_stmt = product_stmt.where(Product.id != exclude_product_id)
-    if (await db.execute(product_stmt.limit(1))).first() is not None:
-        raise HTTPException(status_code=409, detail=f"{label} already in use")
+    """Make *sku*/*barcode* the registered codes of a product (or its variant).
+
+    Replaces the owner's previous codes. Raises HTTP 409 if another product
+    or variant in the tenant holds either code. Call after the owner row is
+    flushed, in the same transaction.
+    """
+    if variant_id is not None:
+        owner = CatalogCode.variant_id == variant_id
+    else:
+        owner = and_(CatalogCode.product_id == product_id, CatalogCode.variant_id.is_(None))
+    # The tenant_id filters are defense-in-depth on top of RLS.
+    await db.execute(delete(CatalogCode).where(CatalogCode.tenant_id == tenant_id, owner))
 
-    variant_stmt = select(ProductVariant.id).where(
-        ProductVariant.tenant_id == tenant_id, getattr(ProductVariant, column) == value
+    wanted = {
+        code_type: code for code_type, code in zip(CODE_TYPES, (sku, barcode), strict=True) if code
+    }
+    if not wanted:
+        return
+    stmt = (
+        insert(CatalogCode)
+        .values(
+            [
+                {
+                    "tenant_id": tenant_id,
+                    "code_type": code_type,
+                    "code": code,
+                    "product_id": product_id,
+                    "variant_id": variant_id,
+                }
+                for code_type, code in wanted.items()
+            ]
+        )
+        .on_conflict_do_nothing(index_elements=["tenant_id", "code_type", "code"])
+        .returning(CatalogCode.code_type)
     )
-    if exclude_variant_id is not None:
-        variant_stmt = variant_stmt.where(ProductVariant.id != exclude_variant_id)
-    if (await db.execute(variant_stmt.limit(1))).first() is not None:
-        raise HTTPException(status_code=409, detail=f"{label} already in use")
+    claimed = set((await db.execute(stmt)).scalars().all())
+    for code_type in wanted:
+        if code_type not in claimed:
+            raise HTTPException(status_code=409, detail=f"{_LABELS[code_type]} already in use")
 
 
-async def assert_catalog_code_available(
+async def find_used_codes(
     db: AsyncSession,
     tenant_id: uuid.UUID,
     *,
-    sku: str | None,
-    barcode: str | None,
-    exclude_product_id: uuid.UUID | None = None,
-    exclude_variant_id: uuid.UUID | None = None,
-) -> None:
-    """Raise HTTP 409 if sku or barcode is already used by a product or variant.
+    skus: set[str],
+    barcodes: set[str],
+) -> tuple[set[str], set[str]]:
+    """Return the subsets of *skus* and *barcodes* already registered in the tenant.
 
-    Checks both the products and product_variants tables within the tenant,
-    excluding the row being created or updated. RLS also scopes queries to the
-    tenant; the explicit tenant_id filter is defense-in-depth.
+    Set-based check for bulk writes: one primary-key lookup query, whatever
+    the number of codes.
     """
-    if sku is not None:
-        await _assert_code_unused(
-            db, tenant_id, "sku", sku, exclude_product_id, exclude_variant_id, "SKU"
+    if not skus and not barcodes:
+        return set(), set()
+    result = await db.execute(
+        select(CatalogCode.code_type, CatalogCode.code).where(
+            CatalogCode.tenant_id == tenant_id,
+            or_(
+                and_(CatalogCode.code_type == "sku", CatalogCode.code.in_(list(skus))),
+                and_(CatalogCode.code_type == "barcode", CatalogCode.code.in_(list(barcodes))),
+            ),
         )
-    if barcode is not None:
-        await _assert_code_unused(
-            db, tenant_id, "barcode", barcode, exclude_product_id, exclude_variant_id, "Barcode"
+    )
+    rows = result.all()
+    used_skus = {code for code_type, code in rows if code_type == "sku"}
+    used_barcodes = {code for code_type, code in rows if code_type == "barcode"}
+    return used_skus, used_barcodes
+
+
+async def rebuild_catalog_codes(db: AsyncSession, tenant_id: uuid.UUID) -> int:
+    """Recompute a tenant's registry from products/variants (tenant context set).
+
+    Returns the number of codes left out because another product or variant
+    already holds them. Those are duplicates written before the registry
+    existed and need fixing by hand.
+    """
+    await db.execute(delete(CatalogCode).where(CatalogCode.tenant_id == tenant_id))
+    inserted = (await db.execute(_REBUILD_SQL, {"tenant_id": tenant_id})).rowcount
+    total = (
+        await db.execute(
+            text(
+                "SELECT (SELECT count(sku) + count(barcode) FROM products"
+                "        WHERE tenant_id = :tenant_id)"
+                "     + (SELECT count(sku) + count(barcode) FROM product_variants"
+                "        WHERE tenant_id = :tenant_id)"
+            ),
+            {"tenant_id": tenant_id},
         )
+    ).scalar_one()
+    return total - inserted
@@ -0,0 +1,409 @@
+"""Bulk catalog import: parse, validate and load products + variants from a file.
+
+File layout (CSV or XLSX, first sheet, header row first):
+
+  - product columns: ``name``, ``description``, ``name_ar``, ``description_ar``,
+    ``category`` (an existing category name), ``price_amount``, ``currency``,
+    ``is_active``, ``sort_order``, ``track_inventory``, ``stock_qty``,
+    ``low_stock_threshold``, ``sku``, ``barcode``
+  - variant columns: ``variant_name``, ``variant_size``, ``variant_color``,
+    ``variant_sku``, ``variant_barcode``, ``variant_price_amount``,
+    ``variant_stock_qty``
+
+Rows are grouped by ``name``: the first row of a name defines the product,
+and every row that fills any ``variant_*`` column adds a variant to it.
+Continuation rows only need ``name`` plus their variant columns. Product
+columns on them are ignored.
+
+An import is all-or-nothing. Every row is validated in memory with the same
+schemas as the CRUD endpoints. Names, categories and SKU/barcode collisions
+are then checked with one set-based query each (``find_used_codes`` looks
+codes up in the catalog code registry). Any error fails the whole file with a
+per-row report. A clean file is loaded in a single transaction: rows are
+COPYed into temp staging tables, then moved with ``INSERT ... SELECT``, and
+their codes are registered and their POS sync changes recorded from the
+same staging tables. Postgres rejects ``COPY FROM`` into tables with
+row-level security, so the final INSERT is what runs through the tenant's
+RLS policies.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import uuid
+from collections.abc import Iterator
+from contextlib import closing
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.category import Category
+from app.models.product import Product
+from app.schemas.product import ProductCreate
+from app.schemas.product_variant import ProductVariantCreate
+from app.services.catalog_codes import find_used_codes
+from app.services.catalog_sync import next_sync_version
+
+# format -> (file extension, content type)
+IMPORT_FORMATS: dict[str, tuple[str, str]] = {
+    "csv": ("csv", "text/csv"),
+    "xlsx": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+MAX_IMPORT_BYTES = 10 * 1024 * 1024  # 10 MB
+MAX_IMPORT_ROWS = 20_000
+MAX_REPORTED_ERRORS = 500
+
+PRODUCT_COLUMNS = (
+    "name",
+    "description",
+    "name_ar",
+    "description_ar",
+    "category",
+    "price_amount",
+    "currency",
+    "is_active",
+    "sort_order",
+    "track_inventory",
+    "stock_qty",
+    "low_stock_threshold",
+    "sku",
+    "barcode",
+)
+VARIANT_COLUMNS = (
+    "variant_name",
+    "variant_size",
+    "variant_color",
+    "variant_sku",
+    "variant_barcode",
+    "variant_price_amount",
+    "variant_stock_qty",
+)
+_VARIANT_PREFIX = "variant_"
+
+# Column order for the staging COPY and the INSERT ... SELECT.
+_PRODUCT_FIELDS = (
+    "id",
+    "tenant_id",
+    "category_id",
+    "name",
+    "description",
+    "name_ar",
+    "description_ar",
+    "price_amount",
+    "currency",
+    "is_active",
+    "sort_order",
+    "track_inventory",
+    "stock_qty",
+    "low_stock_threshold",
+    "sku",
+    "barcode",
+)
+_VARIANT_FIELDS = (
+    "id",
+    "tenant_id",
+    "product_id",
+    "name",
+    "size",
+    "color",
+    "sku",
+    "barcode",
+    "price_amount",
+    "stock_qty",
+    "is_active",
+    "sort_order",
+)
+
+
+class CatalogImportError(ValueError):
+    """The file as a whole cannot be imported (unreadable, bad header, too big)."""
+
+
+def _error(row: int, column: str | None, message: str) -> dict:
+    return {"row": row, "field": column, "message": message}
+
+
+@dataclass
+class ImportPlan:
+    """Validated products/variants ready to load, plus every error found."""
+
+    row_count: int = 0
+    products: list[dict] = field(default_factory=list)
+    variants: list[dict] = field(default_factory=list)
+    errors: list[dict] = field(default_factory=list)
+
+
+# --- Reading ---------------------------------------------------------------
+
+
+def _csv_rows(source: BinaryIO) -> Iterator[list[Any]]:
+    text_stream = io.TextIOWrapper(source, encoding="utf-8-sig", newline="")
+    try:
+        yield from csv.reader(text_stream)
+    except (UnicodeDecodeError, csv.Error) as exc:
+        raise CatalogImportError(f"Unreadable CSV file: {exc}") from exc
+    finally:
+        # Hand *source* back to the caller; detaching a closed stream raises.
+        if not source.closed:
+            text_stream.detach()
+
+
+def _xlsx_rows(source: BinaryIO) -> Iterator[list[Any]]:
+    try:
+        from openpyxl import load_workbook
+    except ImportError as exc:  # pragma: no cover - depends on install extras
+        raise CatalogImportError("XLSX import requires openpyxl") from exc
+    try:
+        workbook = load_workbook(source, read_only=True, data_only=True)
+    except Exception as exc:  # openpyxl raises a zoo of zip/xml errors
+        raise CatalogImportError(f"Unreadable XLSX file: {exc}") from exc
+    try:
+        for values in workbook.worksheets[0].iter_rows(values_only=True):
+            yield list(values)
+    finally:
+        workbook.close()
+
+
+def _cell(value: Any) -> Any:
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    return value
+
+
+def read_rows(fmt: str, source: BinaryIO) -> list[tuple[int, dict]]:
+    """Parse *source* into ``(row_number, {column: value})`` pairs.
+
+    Row numbers are 1-based as shown in a spreadsheet (the header is row 1).
+    Blank cells are dropped, so schema defaults apply; fully blank rows are
+    skipped.
+    """
+    # Close the reader while *source* is still open, also when a header
+    # error abandons it (its cleanup touches the stream).
+    with closing(_xlsx_rows(source) if fmt == "xlsx" else _csv_rows(source)) as rows:
+        header_row = next(rows, None)
+        if header_row is None:
+            raise CatalogImportError("File is empty")
+        header = [str(h).strip().lower() if h is not None else "" for h in header_row]
+        named = [h for h in header if h]
+        unknown = [h for h in named if h not in PRODUCT_COLUMNS + VARIANT_COLUMNS]
+        if unknown:
+            raise CatalogImportError(f"Unknown columns: {', '.join(unknown)}")
+        if "name" not in named:
+            raise CatalogImportError("Missing required column: name")
+        if len(set(named)) != len(named):
+            raise CatalogImportError("Duplicate column names in header")
+
+        parsed: list[tuple[int, dict]] = []
+        for row_number, values in enumerate(rows, start=2):
+            record = {
+                column: cell
+                for column, value in zip(header, values, strict=False)
+                if column and (cell := _cell(value)) is not None
+            }
+            if not record:
+                continue
+            if len(parsed) >= MAX_IMPORT_ROWS:
+                raise CatalogImportError(f"Too many rows (max {MAX_IMPORT_ROWS})")
+            parsed.append((row_number, record))
+        return parsed
+
+
+# --- Validation ------------------------------------------------------------
+
+
+def _validate(
+    schema: type[BaseModel], data: dict, row: int, prefix: str, errors: list[dict]
+) -> BaseModel | None:
+    try:
+        return schema.model_validate(data)
+    except ValidationError as exc:
+        for err in exc.errors():
+            column = f"{prefix}{err['loc'][0]}" if err["loc"] else None
+            errors.append(_error(row, column, err["msg"]))
+        return None
+
+
+def _claim_code(
+    seen: dict[str, int], code: str | None, row: int, column: str, label: str, errors: list
+) -> None:
+    if code is None:
+        return
+    if code in seen:
+        errors.append(_error(row, column, f"{label} already used in row {seen[code]}"))
+    else:
+        seen[code] = row
+
+
+def build_plan(rows: list[tuple[int, dict]]) -> ImportPlan:
+    """Validate parsed rows in memory (no DB access)."""
+    plan = ImportPlan(row_count=len(rows))
+    errors = plan.errors
+    products_by_name: dict[str, dict | None] = {}
+    seen_skus: dict[str, int] = {}
+    seen_barcodes: dict[str, int] = {}
+
+    for row, record in rows:
+        variant_data = {
+            column.removeprefix(_VARIANT_PREFIX): value
+            for column, value in record.items()
+            if column.startswith(_VARIANT_PREFIX)
+        }
+        name = record.get("name")
+        if not isinstance(name, str):
+            name = None if name is None else str(name)
+        if name is None:
+            errors.append(_error(row, "name", "Field required"))
+            continue
+
+        if name not in products_by_name:
+            product_data = {
+                column: value
+                for column, value in record.items()
+                if column in PRODUCT_COLUMNS and column != "category"
+            }
+            product = _validate(ProductCreate, product_data, row, "", errors)
+            if product is None:
+                products_by_name[name] = None
+            else:
+                entry = product.model_dump(exclude={"category_id", "metadata"})
+                entry.update(id=uuid.uuid4(), row=row, category=record.get("category"))
+                _claim_code(seen_skus, entry["sku"], row, "sku", "SKU", errors)
+                _claim_code(seen_barcodes, entry["barcode"], row, "barcode", "Barcode", errors)
+                products_by_name[name] = entry
+                plan.products.append(entry)
+        elif not variant_data:
+            errors.append(_error(row, "name", "Duplicate product name in file"))
+            continue
+
+        if variant_data:
+            variant = _validate(ProductVariantCreate, variant_data, row, _VARIANT_PREFIX, errors)
+            parent = products_by_name[name]
+            if variant is None or parent is None:
+                continue
+            entry = variant.model_dump()
+            entry.update(id=uuid.uuid4(), row=row, product_id=parent["id"])
+            _claim_code(seen_skus, entry["sku"], row, "variant_sku", "SKU", errors)
+            _claim_code(seen_barcodes, entry["barcode"], row, "variant_barcode", "Barcode", errors)
+            plan.variants.append(entry)
+    return plan
+
+
+async def check_against_catalog(db: AsyncSession, tenant_id: uuid.UUID, plan: ImportPlan) -> None:
+    """Resolve categories and report name/code collisions with existing rows.
+
+    One query each for categories, product names and catalog codes,
+    whatever the file size. Sets ``category_id`` on the planned products.
+    """
+    errors = plan.errors
+    category_names = {p["category"] for p in plan.products if p["category"] is not None}
+    category_ids: dict[str, uuid.UUID] = {}
+    if category_names:
+        result = await db.execute(
+            select(Category.name, Category.id).where(
+                Category.tenant_id == tenant_id, Category.name.in_(category_names)
+            )
+        )
+        category_ids = dict(result.all())
+
+    names = [p["name"] for p in plan.products]
+    existing_names: set[str] = set()
+    if names:
+        result = await db.execute(
+            select(Product.name).where(Product.tenant_id == tenant_id, Product.name.in_(names))
+        )
+        existing_names = set(result.scalars().all())
+
+    entries = [("", p) for p in plan.products] + [(_VARIANT_PREFIX, v) for v in plan.variants]
+    used_skus, used_barcodes = await find_used_codes(
+        db,
+        tenant_id,
+        skus={e["sku"] for _, e in entries if e["sku"] is not None},
+        barcodes={e["barcode"] for _, e in entries if e["barcode"] is not None},
+    )
+
+    for product in plan.products:
+        category = product.pop("category")
+        if category is not None:
+            product["category_id"] = category_ids.get(category)
+            if product["category_id"] is None:
+                errors.append(_error(product["row"], "category", "Unknown category"))
+        else:
+            product["category_id"] = None
+        if product["name"] in existing_names:
+            errors.append(_error(product["row"], "name", "Product name already exists"))
+    for prefix, entry in entries:
+        if entry["sku"] in used_skus:
+            errors.append(_error(entry["row"], f"{prefix}sku", "SKU already in use"))
+        if entry["barcode"] in used_barcodes:
+            errors.append(_error(entry["row"], f"{prefix}barcode", "Barcode already in use"))
+    errors.sort(key=lambda e: e["row"])
+
+
+# --- Loading ---------------------------------------------------------------
+
+
+# Registry rows for the staged products and variants; a conflict raises
+# IntegrityError and rolls the whole import back.
+_REGISTER_CODES_SQL = """
+    INSERT INTO catalog_codes (tenant_id, code_type, code, product_id, variant_id)
+    SELECT tenant_id, 'sku', sku, id, NULL::uuid FROM import_products WHERE sku IS NOT NULL
+    UNION ALL
+    SELECT tenant_id, 'barcode', barcode, id, NULL::uuid FROM import_products
+     WHERE barcode IS NOT NULL
+"""
+_REGISTER_VARIANT_CODES_SQL = """
+    UNION ALL
+    SELECT tenant_id, 'sku', sku, product_id, id FROM import_product_variants
+     WHERE sku IS NOT NULL
+    UNION ALL
+    SELECT tenant_id, 'barcode', barcode, product_id, id FROM import_product_variants
+     WHERE barcode IS NOT NULL
+"""
+
+# One POS sync version for the whole import (see catalog_sync).
+_RECORD_CHANGES_SQL = """
+    INSERT INTO catalog_changes (tenant_id, product_id, version)
+    SELECT tenant_id, id, :version FROM import_products
+    ON CONFLICT (tenant_id, product_id)
+    DO UPDATE SET version = EXCLUDED.version, changed_at = now()
+"""
+
+
+async def _copy_insert(
+    db: AsyncSession, table: str, fields: tuple[str, ...], records: list[tuple]
+) -> None:
+    staging = f"import_{table}"
+    await db.execute(
+        text(f"CREATE TEMP TABLE {staging} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP")
+    )
+    raw = await (await db.connection()).get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(staging, records=records, columns=fields)
+    columns = ", ".join(fields)
+    await db.execute(text(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {staging}"))
+
+
+async def load_catalog(db: AsyncSession, tenant_id: uuid.UUID, plan: ImportPlan) -> None:
+    """Insert a clean plan's products and variants (tenant context must be set).
+
+    Runs in the caller's transaction; the caller commits.
+    """
+    product_records = [
+        tuple(tenant_id if f == "tenant_id" else p[f] for f in _PRODUCT_FIELDS)
+        for p in plan.products
+    ]
+    await _copy_insert(db, "products", _PRODUCT_FIELDS, product_records)
+    if plan.variants:
+        variant_records = [
+            tuple(tenant_id if f == "tenant_id" else v[f] for f in _VARIANT_FIELDS)
+            for v in plan.variants
+        ]
+        await _copy_insert(db, "product_variants", _VARIANT_FIELDS, variant_records)
+    register = _REGISTER_CODES_SQL + (_REGISTER_VARIANT_CODES_SQL if plan.variants else "")
+    await db.execute(text(register))
+    version = await next_sync_version(db, tenant_id)
+    await db.execute(text(_RECORD_CHANGES_SQL), {"version": version})
@@ -0,0 +1,198 @@
+"""Per-tenant product retrieval index for AI chat context.
+
+Instead of pasting the first N products into every prompt, the AI gateways
+embed the tenant's active products once per catalog version and, for each
+message, inject only the top-k products by cosine similarity to the text.
+
+Embeddings come from a pluggable local function (``Embedder``). The default,
+``embed_hashed_ngrams``, hashes whole words and character trigrams into a
+fixed-size signed vector. It needs no model or network, handles Arabic and
+Latin script alike, and tolerates typos and partial words.
+
+Indexes live in an in-process LRU bounded by total indexed rows. Each entry
+records the ``tenants.catalog_version`` it was built from, and a version bump
+rebuilds it on the next message (see catalog_version).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import unicodedata
+import uuid
+import zlib
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from decimal import Decimal
+from functools import lru_cache
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.product import Product
+from app.models.tenant import Tenant
+
+EMBED_DIM = 256
+_DESCRIPTION_CHARS = 300  # enough to carry the key terms; keeps build time flat
+_CACHE_MAX_ROWS = 100_000  # ~100 MB of float32 vectors at EMBED_DIM=256
+
+Embedder = Callable[[Sequence[str]], np.ndarray]
+
+
+def _normalize(text: str) -> str:
+    return " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+
+
+def _features(text: str) -> list[str]:
+    features: list[str] = []
+    for word in _normalize(text).split():
+        features.append(word)
+        padded = f" {word} "
+        features.extend(padded[i : i + 3] for i in range(len(padded) - 2))
+    return features
+
+
+@lru_cache(maxsize=1 << 18)
+def _feature_hash(feature: str) -> int:
+    # Catalog vocabularies repeat heavily; memoising the hash halves build time.
+    return zlib.crc32(feature.encode())
+
+
+def embed_hashed_ngrams(texts: Sequence[str], dim: int = EMBED_DIM) -> np.ndarray:
+    """Embed *texts* as L2-normalised signed feature-hash vectors, shape (n, dim)."""
+    hashes: list[int] = []
+    counts: list[int] = []
+    for text in texts:
+        features = _features(text)
+        hashes.extend(map(_feature_hash, features))
+        counts.append(len(features))
+
+    h = np.asarray(hashes, dtype=np.int64)
+    rows = np.repeat(np.arange(len(texts), dtype=np.int64), counts)
+    signs = np.where(h & 0x80000000, 1.0, -1.0)
+    flat = np.bincount(rows * dim + h % dim, weights=signs, minlength=len(texts) * dim)
+    vectors = flat.reshape(len(texts), dim).astype(np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.divide(vectors, norms, out=vectors, where=norms > 0)
+    return vectors
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    name: str
+    description: str | None
+    price_amount: Decimal | None
+    currency: str | None
+
+    def price_label(self, default_currency: str) -> str:
+        if not self.price_amount:
+            return "Price not set"
+        return f"{self.price_amount} {self.currency or default_currency}"
+
+
+@dataclass(frozen=True)
+class CatalogIndex:
+    """Embedded active products of one tenant at one catalog version."""
+
+    catalog_version: int
+    entries: tuple[CatalogEntry, ...]  # in catalog display order
+    vectors: np.ndarray  # (len(entries), dim), unit rows
+    embedder: Embedder
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def search(self, query: str, k: int) -> list[CatalogEntry]:
+        """Top-*k* entries by cosine similarity; ties keep catalog order.
+
+        Small catalogs (<= k) are returned whole, in catalog order.
+        """
+        n = len(self.entries)
+        if n <= k:
+            return list(self.entries)
+        q = self.embedder([query])[0]
+        if not q.any():
+            return list(self.entries[:k])
+        scores = self.vectors @ q
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.lexsort((top, -scores[top]))]
+        return [self.entries[i] for i in top]
+
+
+def _index_text(name: str, name_ar: str | None, description: str | None, sku: str | None) -> str:
+    parts = [name, name_ar or "", (description or "")[:_DESCRIPTION_CHARS], sku or ""]
+    return " ".join(p for p in parts if p)
+
+
+def build_catalog_index(
+    rows: Sequence[tuple[str, str | None, str | None, str | None, Decimal | None, str | None]],
+    catalog_version: int,
+    embedder: Embedder | None = None,
+) -> CatalogIndex:
+    """Build an index from (name, name_ar, description, sku, price, currency) rows."""
+    embedder = embedder or _embedder
+    entries = tuple(
+        CatalogEntry(name=name, description=description, price_amount=price, currency=currency)
+        for name, _name_ar, description, _sku, price, currency in rows
+    )
+    if entries:
+        vectors = embedder([_index_text(*row[:4]) for row in rows])
+    else:
+        vectors = np.zeros((0, EMBED_DIM), dtype=np.float32)
+    return CatalogIndex(
+        catalog_version=catalog_version, entries=entries, vectors=vectors, embedder=embedder
+    )
+
+
+# ── Per-tenant cache ────────────────────────────────────────────────────
+
+_embedder: Embedder = embed_hashed_ngrams
+_indexes: OrderedDict[uuid.UUID, CatalogIndex] = OrderedDict()
+
+
+def set_embedder(embedder: Embedder) -> None:
+    """Swap the embedding function; cached indexes are dropped."""
+    global _embedder
+    _embedder = embedder
+    _indexes.clear()
+
+
+def clear_catalog_indexes() -> None:
+    """Drop all cached indexes (tests, admin tooling)."""
+    _indexes.clear()
+
+
+def _cache_put(tenant_id: uuid.UUID, index: CatalogIndex) -> None:
+    _indexes[tenant_id] = index
+    _indexes.move_to_end(tenant_id)
+    total = sum(len(i) for i in _indexes.values())
+    while total > _CACHE_MAX_ROWS and len(_indexes) > 1:
+        _, evicted = _indexes.popitem(last=False)
+        total -= len(evicted)
+
+
+async def get_catalog_index(db: AsyncSession, tenant: Tenant) -> CatalogIndex:
+    """Index for *tenant*'s current catalog version, building it on a miss."""
+    index = _indexes.get(tenant.id)
+    if index is not None and index.catalog_version == tenant.catalog_version:
+        _indexes.move_to_end(tenant.id)
+        return index
+
+    result = await db.execute(
+        select(
+            Product.name,
+            Product.name_ar,
+            Product.description,
+            Product.sku,
+            Product.price_amount,
+            Product.currency,
+        )
+        .where(Product.tenant_id == tenant.id, Product.is_active.is_(True))
+        .order_by(Product.sort_order, Product.id)
+    )
+    rows = [tuple(r) for r in result.all()]
+    # Embedding a large catalog is CPU-bound; keep it off the event loop.
+    index = await asyncio.to_thread(build_catalog_index, rows, tenant.catalog_version)
+    _cache_put(tenant.id, index)
+    return index
@@ -0,0 +1,139 @@
+"""POS catalog sync: compact snapshots and ``since=<version>`` deltas.
+
+Each tenant has a sync version, the highest ``catalog_changes.version``.
+Every write that changes what a terminal shows (product or variant fields,
+active flags, stock, deletes) calls ``record_catalog_changes`` in its
+transaction. That takes the next version and stamps it on the touched
+products' ``catalog_changes`` rows, so the log holds one row per product.
+
+Versions are allocated like order numbers: a per-tenant advisory
+transaction lock, then max + 1. The lock is held until commit, so versions
+become visible in order and a client never skips a version that commits
+late. Call it after the write path's own row updates. Taking it last keeps
+the lock order consistent (catalog rows first, then the sync lock).
+
+This is separate from ``tenants.catalog_version``. Stock changes move the
+sync version, because terminals must see them, but they must not
+invalidate catalog caches.
+"""
+
+from __future__ import annotations
+
+import uuid
+from collections.abc import Iterable
+
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.catalog_change import CatalogChange
+from app.models.product import Product
+from app.models.product_variant import ProductVariant
+from app.models.tenant import Tenant
+from app.schemas.pos import PosCatalogProduct, PosCatalogSyncResponse, PosCatalogVariant
+
+
+async def current_sync_version(db: AsyncSession, tenant_id: uuid.UUID) -> int:
+    """Latest committed sync version of the tenant (0 before any change)."""
+    result = await db.execute(
+        select(func.coalesce(func.max(CatalogChange.version), 0)).where(
+            CatalogChange.tenant_id == tenant_id
+        )
+    )
+    return result.scalar_one()
+
+
+async def next_sync_version(db: AsyncSession, tenant_id: uuid.UUID) -> int:
+    """Lock the tenant's sync sequence until commit and return the next version."""
+    await db.execute(
+        text("SELECT pg_advisory_xact_lock(hashtext(:key))"),
+        {"key": f"{tenant_id}:catalog_sync"},
+    )
+    return await current_sync_version(db, tenant_id) + 1
+
+
+async def record_catalog_changes(
+    db: AsyncSession, tenant_id: uuid.UUID, product_ids: Iterable[uuid.UUID]
+) -> None:
+    """Mark *product_ids* changed at a new sync version (tenant context set)."""
+    ids = sorted(set(product_ids))
+    if not ids:
+        return
+    version = await next_sync_version(db, tenant_id)
+    stmt = insert(CatalogChange).values(
+        [{"tenant_id": tenant_id, "product_id": pid, "version": version} for pid in ids]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[CatalogChange.tenant_id, CatalogChange.product_id],
+        set_={"version": stmt.excluded.version, "changed_at": func.now()},
+    )
+    await db.execute(stmt)
+
+
+async def load_catalog_sync(
+    db: AsyncSession, tenant_id: uuid.UUID, since: int | None = None
+) -> PosCatalogSyncResponse:
+    """Build a full snapshot, or the delta after *since*.
+
+    The version is read first. A change that commits while the products are
+    read may show up in this response and again in the next delta, but none
+    is missed. A *since* ahead of the server (e.g. after a restore) gets a
+    full snapshot.
+    """
+    version = await current_sync_version(db, tenant_id)
+    full = since is None or since > version
+
+    stmt = select(Product).where(Product.tenant_id == tenant_id, Product.is_active.is_(True))
+    changed_ids: list[uuid.UUID] = []
+    if not full:
+        changed_ids = list(
+            (
+                await db.execute(
+                    select(CatalogChange.product_id).where(
+                        CatalogChange.tenant_id == tenant_id, CatalogChange.version > since
+                    )
+                )
+            )
+            .scalars()
+            .all()
+        )
+        if not changed_ids:
+            return PosCatalogSyncResponse(version=version, full=False, products=[])
+        stmt = stmt.where(Product.id.in_(changed_ids))
+    products = list((await db.execute(stmt.order_by(Product.sort_order, Product.name))).scalars())
+
+    variant_stmt = select(ProductVariant).where(
+        ProductVariant.tenant_id == tenant_id, ProductVariant.is_active.is_(True)
+    )
+    if not full:
+        variant_stmt = variant_stmt.where(ProductVariant.product_id.in_([p.id for p in products]))
+    variants: dict[uuid.UUID, list[PosCatalogVariant]] = {}
+    for v in (
+        await db.execute(variant_stmt.order_by(ProductVariant.sort_order, ProductVariant.name))
+    ).scalars():
+        variants.setdefault(v.product_id, []).append(PosCatalogVariant.model_validate(v))
+
+    default_currency = (
+        await db.execute(select(Tenant.default_currency).where(Tenant.id == tenant_id))
+    ).scalar_one()
+    items = [
+        PosCatalogProduct(
+            id=p.id,
+            name=p.name,
+            price_amount=p.price_amount,
+            currency=p.currency or default_currency or "KWD",
+            track_inventory=p.track_inventory,
+            stock_qty=p.stock_qty,
+            sku=p.sku,
+            barcode=p.barcode,
+            variants=variants.get(p.id),
+        )
+        for p in products
+    ]
+    sellable = {p.id for p in products}
+    return PosCatalogSyncResponse(
+        version=version,
+        full=full,
+        products=items,
+        deleted=[pid for pid in changed_ids if pid not in sellable],
+    )
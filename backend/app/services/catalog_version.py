@@ -0,0 +1,30 @@
+"""Per-tenant catalog version counter.
+
+``tenants.catalog_version`` is bumped once per transaction that changes
+products, variants or categories. Caches derived from the catalog (AI
+retrieval indexes, storefront snapshots) record the version, so a bump
+invalidates them without explicit purges. The bump is a row-locking UPDATE
+on the tenant, which also serialises concurrent catalog writers per tenant.
+Stock-only changes (sales, restocks) do not bump the version.
+"""
+
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.tenant import Tenant
+
+
+async def bump_catalog_version(db: AsyncSession, tenant_id: uuid.UUID) -> int:
+    """Increment and return the tenant's catalog version (visible on commit)."""
+    result = await db.execute(
+        update(Tenant)
+        .where(Tenant.id == tenant_id)
+        .values(catalog_version=Tenant.catalog_version + 1)
+        .returning(Tenant.catalog_version)
+        .execution_options(synchronize_session=False)
+    )
+    return result.scalar_one()
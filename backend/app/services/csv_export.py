@@ -21,12 +21,23 @@ def _format_value(v: Any) -> str:
     return str(v)
 
 
-def rows_to_csv_bytes(headers: list[str], rows: Sequence[Sequence[Any]]) -> bytes:
-    """Convert header + rows into UTF-8 CSV bytes with BOM for Excel compatibility."""
+def csv_chunk(rows: Sequence[Sequence[Any]], headers: list[str] | None = None) -> bytes:
+    """Encode one batch of rows as UTF-8 CSV bytes.
+
+    Pass ``headers`` for the first chunk only: it is prefixed with the UTF-8
+    BOM so Excel auto-detects encoding (important for Arabic names). Later
+    chunks are plain rows and can be appended to the same stream.
+    """
     buf = io.StringIO()
     writer = csv.writer(buf)
-    writer.writerow(headers)
+    if headers is not None:
+        writer.writerow(headers)
     for row in rows:
         writer.writerow([_format_value(v) for v in row])
-    # UTF-8 BOM so Excel auto-detects encoding (important for Arabic names)
-    return b"\xef\xbb\xbf" + buf.getvalue().encode("utf-8")
+    data = buf.getvalue().encode("utf-8")
+    return b"\xef\xbb\xbf" + data if headers is not None else data
+
+
+def rows_to_csv_bytes(headers: list[str], rows: Sequence[Sequence[Any]]) -> bytes:
+    """Convert header + rows into UTF-8 CSV bytes with BOM for Excel compatibility."""
+    return csv_chunk(rows, headers)
@@ -4,9 +4,10 @@ from __future__ import annotations
 
 import uuid
 
-from sqlalchemy import select
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import Select, Text, Uuid, bindparam, case, literal, or_, select, union_all
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
 from app.models.customer import Customer
 
@@ -25,18 +26,35 @@ def _normalize_phone(value: str | None) -> str | None:
     return stripped or None
 
 
-async def _find_by_email(db: AsyncSession, tenant_id: uuid.UUID, email: str) -> Customer | None:
-    result = await db.execute(
-        select(Customer).where(Customer.tenant_id == tenant_id, Customer.email == email)
+def _find_or_insert_statement() -> Select:
+    """Insert the customer unless a unique index says it exists, and select
+    the existing match (email first, then phone) in the same statement.
+
+    The ``found`` branch reads the statement snapshot, so it misses a row a
+    concurrent transaction committed after the snapshot was taken, which is
+    exactly when ON CONFLICT skips the insert. The caller retries that case.
+    A NULL email or phone matches nothing, so one statement covers both.
+    """
+    email = bindparam("email", type_=Text)
+    phone = bindparam("phone", type_=Text)
+    tenant_id = bindparam("tenant_id", type_=Uuid)
+    inserted = (
+        insert(Customer)
+        .values(tenant_id=tenant_id, name=bindparam("name", type_=Text), phone=phone, email=email)
+        .on_conflict_do_nothing()
+        .returning(*Customer.__table__.c, literal(0).label("precedence"))
+        .cte("inserted")
     )
-    return result.scalar_one_or_none()
+    found = select(
+        *Customer.__table__.c,
+        case((Customer.email == email, 1), else_=2).label("precedence"),
+    ).where(Customer.tenant_id == tenant_id, or_(Customer.email == email, Customer.phone == phone))
+    candidates = union_all(select(inserted), found).subquery()
+    return select(aliased(Customer, candidates)).order_by(candidates.c.precedence).limit(1)
 
 
-async def _find_by_phone(db: AsyncSession, tenant_id: uuid.UUID, phone: str) -> Customer | None:
-    result = await db.execute(
-        select(Customer).where(Customer.tenant_id == tenant_id, Customer.phone == phone)
-    )
-    return result.scalar_one_or_none()
+# Built once: constructing the ORM statement costs more than running it.
+_FIND_OR_INSERT = _find_or_insert_statement()
 
 
 async def find_or_create_customer(
@@ -53,6 +71,10 @@ async def find_or_create_customer(
     customers (prevents POS "Walk-in" duplicates). When email and phone match
     different customers, email wins (no merge, no update). Runs inside the
     caller's transaction: never commits, never rolls back the outer transaction.
+
+    Usually a single round trip: INSERT ... ON CONFLICT DO NOTHING RETURNING
+    and the fallback lookup run as one CTE statement. Only when a concurrent
+    checkout committed the same contact mid-statement is it run once more.
     """
     norm_email = _normalize_email(email)
     norm_phone = _normalize_phone(phone)
@@ -61,38 +83,15 @@ async def find_or_create_customer(
     if norm_email is None and norm_phone is None:
         return None
 
-    if norm_email is not None:
-        existing = await _find_by_email(db, tenant_id, norm_email)
-        if existing is not None:
-            return existing
-
-    if norm_phone is not None:
-        existing = await _find_by_phone(db, tenant_id, norm_phone)
-        if existing is not None:
-            return existing
-
     fallback_name = norm_name or norm_email or norm_phone or "Customer"
-
-    try:
-        async with db.begin_nested():
-            customer = Customer(
-                tenant_id=tenant_id,
-                name=fallback_name,
-                phone=norm_phone,
-                email=norm_email,
-            )
-            db.add(customer)
-            await db.flush()
-        return customer
-    except IntegrityError:
-        # Concurrent insert won the race; the SAVEPOINT rolled back (outer tx intact).
-        # Re-query by the same precedence and return the existing row.
-        if norm_email is not None:
-            existing = await _find_by_email(db, tenant_id, norm_email)
-            if existing is not None:
-                return existing
-        if norm_phone is not None:
-            existing = await _find_by_phone(db, tenant_id, norm_phone)
-            if existing is not None:
-                return existing
-        raise
+    params = {
+        "tenant_id": tenant_id,
+        "name": fallback_name,
+        "phone": norm_phone,
+        "email": norm_email,
+    }
+    for _attempt in range(2):
+        customer = (await db.execute(_FIND_OR_INSERT, params)).scalar_one_or_none()
+        if customer is not None:
+            return customer
+    raise RuntimeError(f"customer for tenant {tenant_id} neither inserted nor found")
@@ -0,0 +1,101 @@
+"""Ranked customer search for the dashboard and POS.
+
+Matches name, email and phone (migration d8e9f0a1b2c3):
+
+  - name: normalized with ``search_normalize`` like product search, so
+    Arabic names match with or without hamza and harakat.
+  - email: stored lower-cased.
+  - phone: through the generated ``phone_digits`` column, so "5555 12"
+    finds "+965 5555-1234". A digits-only query also matches phones
+    starting with it (btree prefix index), which is how POS looks up a
+    number as it is typed.
+
+Queries of ``SUBSTRING_MIN_CHARS`` or more match anywhere in a field
+(pg_trgm GIN indexes); shorter ones only at the start of a name word, an
+email or a phone number.
+
+Ranking: exact email or phone 4, phone starting with the query 3, name
+starting with it 2, a later name word starting with it 1. Ties go to the
+newest customer id; the keyset cursor is ``(score, id)``.
+"""
+
+from __future__ import annotations
+
+import re
+import uuid
+
+from sqlalchemy import ColumnElement, case, func, literal_column, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.customer import Customer
+from app.services.product_search import (
+    SUBSTRING_MIN_CHARS,
+    decode_search_cursor,
+    encode_search_cursor,
+    like_escape,
+    normalize_search_text,
+)
+
+_PHONE_QUERY = re.compile(r"[0-9+()\-.\s]+")
+_NON_DIGIT = re.compile(r"[^0-9]")
+
+
+def _like(expr: ColumnElement, pattern: str) -> ColumnElement[bool]:
+    return expr.like(pattern, escape="\\")
+
+
+async def search_customers(
+    db: AsyncSession,
+    tenant_id: uuid.UUID,
+    q: str,
+    *,
+    limit: int,
+    cursor: str | None = None,
+) -> tuple[list[Customer], str | None]:
+    """One page of the tenant's customers matching *q*, best match first.
+
+    Returns (customers, next_cursor); next_cursor is None on the last page.
+    """
+    norm = normalize_search_text(q.strip())
+    if not norm:
+        return [], None
+    escaped = like_escape(norm)
+    digits = _NON_DIGIT.sub("", norm) if _PHONE_QUERY.fullmatch(norm) else ""
+
+    name = func.search_normalize(Customer.name)
+    phone_digits = literal_column("customers.phone_digits")
+    name_prefix = _like(name, f"{escaped}%")
+    name_word = _like(name, f"% {escaped}%")
+    if len(norm) >= SUBSTRING_MIN_CHARS:
+        matches = [_like(name, f"%{escaped}%"), _like(Customer.email, f"%{escaped}%")]
+    else:
+        matches = [name_prefix, name_word, _like(Customer.email, f"{escaped}%")]
+
+    exact = Customer.email == norm
+    phone_prefix = None
+    if digits:
+        phone_prefix = _like(phone_digits, f"{digits}%")
+        exact = or_(exact, phone_digits == digits)
+        matches.append(phone_prefix)
+        if len(digits) >= SUBSTRING_MIN_CHARS:
+            matches.append(_like(phone_digits, f"%{digits}%"))
+
+    ranks = [(exact, 4), (name_prefix, 2), (name_word, 1)]
+    if phone_prefix is not None:
+        ranks.insert(1, (phone_prefix, 3))
+    score = case(*ranks, else_=0)
+
+    # The tenant_id filter is defense-in-depth on top of RLS.
+    stmt = (
+        select(Customer, score)
+        .where(Customer.tenant_id == tenant_id, or_(*matches))
+        .order_by(score.desc(), Customer.id.desc())
+    )
+    if cursor is not None:
+        cursor_score, cursor_id = decode_search_cursor(cursor)
+        stmt = stmt.where(tuple_(score, Customer.id) < tuple_(cursor_score, cursor_id))
+
+    rows = (await db.execute(stmt.limit(limit + 1))).all()
+    page = rows[:limit]
+    next_cursor = encode_search_cursor(page[-1][1], page[-1][0].id) if len(rows) > limit else None
+    return [customer for customer, _score in page], next_cursor
@@ -0,0 +1,369 @@
+"""Export column specs and streaming file writers for tenant data exports.
+
+One spec per exportable entity, shared by the synchronous CSV endpoints in
+``admin_lists`` and the background export job worker, so both produce the
+same columns. Writers accept rows in batches and push encoded bytes into a
+file-like sink (e.g. ``storage.MultipartUpload``) without holding the whole
+file in memory. Parquet and XLSX need the optional ``exports`` extra
+(pyarrow / openpyxl) and are imported lazily.
+"""
+
+from __future__ import annotations
+
+import tempfile
+import zlib
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from datetime import UTC, date, datetime
+from decimal import Decimal
+from typing import Any, Protocol
+
+from app.models.donation import Donation
+from app.models.order import Order
+from app.models.pledge import Pledge
+from app.services.csv_export import csv_chunk
+
+EXPORT_ENTITIES = ("orders", "donations", "pledges")
+EXPORT_FORMATS = ("csv", "csv_gzip", "parquet", "xlsx")
+
+# format -> (file extension, content type)
+FORMAT_FILE_INFO: dict[str, tuple[str, str]] = {
+    "csv": ("csv", "text/csv; charset=utf-8"),
+    "csv_gzip": ("csv.gz", "application/gzip"),
+    "parquet": ("parquet", "application/vnd.apache.parquet"),
+    "xlsx": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+
+# (header, kind) — kind drives the Parquet column type.
+Column = tuple[str, str]
+
+
+def items_summary(items_json: list) -> str:
+    """Flatten JSONB order items into a readable summary string."""
+    parts = []
+    for item in items_json:
+        name = item.get("name", "?")
+        qty = item.get("qty", 1)
+        parts.append(f"{name} x{qty}")
+    return "; ".join(parts)
+
+
+def _order_items(order: Order) -> list:
+    return order.items if isinstance(order.items, list) else []
+
+
+ORDER_COLUMNS: tuple[Column, ...] = (
+    ("order_number", "str"),
+    ("status", "str"),
+    ("customer_name", "str"),
+    ("customer_phone", "str"),
+    ("customer_email", "str"),
+    ("items", "str"),
+    ("total_amount", "decimal"),
+    ("currency", "str"),
+    ("notes", "str"),
+    ("created_at", "datetime"),
+)
+
+
+def order_row(o: Order) -> tuple:
+    return (
+        o.order_number,
+        o.status,
+        o.customer_name,
+        o.customer_phone,
+        o.customer_email,
+        items_summary(_order_items(o)),
+        o.total_amount,
+        o.currency,
+        o.notes,
+        o.created_at,
+    )
+
+
+# Columnar layout: one row per order line, order fields repeated.
+ORDER_LINE_COLUMNS: tuple[Column, ...] = (
+    ("order_number", "str"),
+    ("status", "str"),
+    ("source", "str"),
+    ("payment_method", "str"),
+    ("fulfillment_status", "str"),
+    ("customer_name", "str"),
+    ("customer_phone", "str"),
+    ("customer_email", "str"),
+    ("total_amount", "decimal"),
+    ("currency", "str"),
+    ("created_at", "datetime"),
+    ("line_no", "int"),
+    ("catalog_item_id", "str"),
+    ("variant_id", "str"),
+    ("item_name", "str"),
+    ("variant_name", "str"),
+    ("qty", "int"),
+    ("unit_price", "decimal"),
+    ("subtotal", "decimal"),
+)
+
+
+def order_line_rows(o: Order) -> list[tuple]:
+    head = (
+        o.order_number,
+        o.status,
+        o.source,
+        o.payment_method,
+        o.fulfillment_status,
+        o.customer_name,
+        o.customer_phone,
+        o.customer_email,
+        o.total_amount,
+        o.currency,
+        o.created_at,
+    )
+    rows = []
+    for line_no, item in enumerate(_order_items(o), start=1):
+        unit_price = item.get("unit_price")
+        subtotal = item.get("subtotal")
+        rows.append(
+            (
+                *head,
+                line_no,
+                item.get("catalog_item_id"),
+                item.get("variant_id"),
+                item.get("name"),
+                item.get("variant_name"),
+                item.get("qty"),
+                Decimal(unit_price) if unit_price is not None else None,
+                Decimal(subtotal) if subtotal is not None else None,
+            )
+        )
+    return rows
+
+
+DONATION_COLUMNS: tuple[Column, ...] = (
+    ("donation_number", "str"),
+    ("status", "str"),
+    ("donor_name", "str"),
+    ("donor_phone", "str"),
+    ("donor_email", "str"),
+    ("amount", "decimal"),
+    ("currency", "str"),
+    ("campaign", "str"),
+    ("receipt_requested", "bool"),
+    ("notes", "str"),
+    ("created_at", "datetime"),
+)
+
+
+def donation_row(d: Donation) -> tuple:
+    return (
+        d.donation_number,
+        d.status,
+        d.donor_name,
+        d.donor_phone,
+        d.donor_email,
+        d.amount,
+        d.currency,
+        d.campaign,
+        d.receipt_requested,
+        d.notes,
+        d.created_at,
+    )
+
+
+PLEDGE_COLUMNS: tuple[Column, ...] = (
+    ("pledge_number", "str"),
+    ("status", "str"),
+    ("pledgor_name", "str"),
+    ("pledgor_phone", "str"),
+    ("pledgor_email", "str"),
+    ("amount", "decimal"),
+    ("currency", "str"),
+    ("target_date", "date"),
+    ("fulfilled_amount", "decimal"),
+    ("notes", "str"),
+    ("created_at", "datetime"),
+)
+
+
+def pledge_row(p: Pledge) -> tuple:
+    return (
+        p.pledge_number,
+        p.status,
+        p.pledgor_name,
+        p.pledgor_phone,
+        p.pledgor_email,
+        p.amount,
+        p.currency,
+        p.target_date,
+        p.fulfilled_amount,
+        p.notes,
+        p.created_at,
+    )
+
+
+@dataclass(frozen=True)
+class ExportSpec:
+    model: type
+    columns: tuple[Column, ...]
+    rows: Callable[[Any], list[tuple]]
+    # Columnar formats may use a flattened layout (orders: one row per line item).
+    columnar_columns: tuple[Column, ...] | None = None
+    columnar_rows: Callable[[Any], list[tuple]] | None = None
+
+    def layout(self, fmt: str) -> tuple[tuple[Column, ...], Callable[[Any], list[tuple]]]:
+        """Return (columns, row-builder) for an export format."""
+        if fmt == "parquet" and self.columnar_columns is not None:
+            return self.columnar_columns, self.columnar_rows  # type: ignore[return-value]
+        return self.columns, self.rows
+
+
+EXPORT_SPECS: dict[str, ExportSpec] = {
+    "orders": ExportSpec(
+        model=Order,
+        columns=ORDER_COLUMNS,
+        rows=lambda o: [order_row(o)],
+        columnar_columns=ORDER_LINE_COLUMNS,
+        columnar_rows=order_line_rows,
+    ),
+    "donations": ExportSpec(
+        model=Donation, columns=DONATION_COLUMNS, rows=lambda d: [donation_row(d)]
+    ),
+    "pledges": ExportSpec(model=Pledge, columns=PLEDGE_COLUMNS, rows=lambda p: [pledge_row(p)]),
+}
+
+
+def headers_of(columns: Sequence[Column]) -> list[str]:
+    return [name for name, _kind in columns]
+
+
+# ---------------------------------------------------------------------------
+# Streaming writers
+# ---------------------------------------------------------------------------
+
+
+class ExportSink(Protocol):
+    def write(self, data: bytes) -> int: ...
+
+
+class ExportWriter(Protocol):
+    def write_rows(self, rows: Sequence[Sequence[Any]]) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class _CsvWriter:
+    """CSV (optionally gzip-compressed) written chunk by chunk."""
+
+    def __init__(self, sink: ExportSink, columns: Sequence[Column], compress: bool) -> None:
+        self._sink = sink
+        self._headers: list[str] | None = headers_of(columns)
+        # wbits=31 → gzip container (header + CRC trailer), readable by gunzip.
+        self._compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+
+    def _emit(self, data: bytes) -> None:
+        if self._compressor is not None:
+            data = self._compressor.compress(data)
+        if data:
+            self._sink.write(data)
+
+    def write_rows(self, rows: Sequence[Sequence[Any]]) -> None:
+        self._emit(csv_chunk(rows, self._headers))
+        self._headers = None
+
+    def close(self) -> None:
+        if self._headers is not None:
+            self.write_rows([])
+        if self._compressor is not None:
+            self._sink.write(self._compressor.flush())
+
+
+def _arrow_type(kind: str):  # type: ignore[no-untyped-def]
+    import pyarrow as pa
+
+    return {
+        "str": pa.string(),
+        "int": pa.int64(),
+        "bool": pa.bool_(),
+        "decimal": pa.decimal128(12, 3),
+        "date": pa.date32(),
+        "datetime": pa.timestamp("us", tz="UTC"),
+    }[kind]
+
+
+class _ParquetWriter:
+    """Parquet written one row group per batch."""
+
+    def __init__(self, sink: ExportSink, columns: Sequence[Column]) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        self._schema = pa.schema([(name, _arrow_type(kind)) for name, kind in columns])
+        self._writer = pq.ParquetWriter(sink, self._schema, compression="zstd")
+
+    def write_rows(self, rows: Sequence[Sequence[Any]]) -> None:
+        if not rows:
+            return
+        arrays = [
+            self._pa.array([row[i] for row in rows], type=field.type)
+            for i, field in enumerate(self._schema)
+        ]
+        self._writer.write_table(self._pa.Table.from_arrays(arrays, schema=self._schema))
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+def _xlsx_value(v: Any) -> Any:
+    # Excel has no timezone support; exports are in UTC.
+    if isinstance(v, datetime) and v.tzinfo is not None:
+        return v.astimezone(UTC).replace(tzinfo=None)
+    return v
+
+
+class _XlsxWriter:
+    """XLSX via openpyxl write-only mode, spooled to a temp file.
+
+    The zip container cannot be emitted incrementally, so the workbook is
+    saved to disk on close and then copied into the sink in chunks.
+    """
+
+    _COPY_CHUNK = 1024 * 1024
+
+    def __init__(self, sink: ExportSink, columns: Sequence[Column]) -> None:
+        from openpyxl import Workbook
+
+        self._sink = sink
+        self._workbook = Workbook(write_only=True)
+        self._sheet = self._workbook.create_sheet("export")
+        self._sheet.append(headers_of(columns))
+
+    def write_rows(self, rows: Sequence[Sequence[Any]]) -> None:
+        for row in rows:
+            self._sheet.append([_xlsx_value(v) for v in row])
+
+    def close(self) -> None:
+        with tempfile.TemporaryFile() as tmp:
+            self._workbook.save(tmp)
+            tmp.seek(0)
+            while chunk := tmp.read(self._COPY_CHUNK):
+                self._sink.write(chunk)
+
+
+def open_export_writer(fmt: str, sink: ExportSink, columns: Sequence[Column]) -> ExportWriter:
+    """Return a streaming writer for *fmt* that pushes bytes into *sink*."""
+    if fmt == "csv":
+        return _CsvWriter(sink, columns, compress=False)
+    if fmt == "csv_gzip":
+        return _CsvWriter(sink, columns, compress=True)
+    if fmt == "parquet":
+        return _ParquetWriter(sink, columns)
+    if fmt == "xlsx":
+        return _XlsxWriter(sink, columns)
+    raise ValueError(f"Unknown export format: {fmt}")
+
+
+def export_file_name(entity: str, fmt: str, created: date | datetime) -> str:
+    """Friendly download name, e.g. ``orders-2026-10-19.csv.gz``."""
+    extension, _content_type = FORMAT_FILE_INFO[fmt]
+    return f"{entity}-{created:%Y-%m-%d}.{extension}"
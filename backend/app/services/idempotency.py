@@ -0,0 +1,267 @@
+"""Idempotency-Key handling for order, donation, pledge and POS submissions.
+
+Clients on flaky networks retry their POSTs. A request that carries an
+``Idempotency-Key`` header runs at most once per key. A retry gets the
+stored response back, marked ``Idempotent-Replayed: true``. Reusing a key
+with a different request body is a 422.
+
+Two layers:
+  1. Redis (IdempotencyMiddleware). ``idem:{endpoint}:{scope}:{sha256(key)}``
+     holds the response for ``IDEMPOTENCY_TTL_SECONDS``. The scope is the
+     storefront slug, or the token subject (+ X-Tenant-Id) for POS. Replays
+     are served before any dependency runs, so they never touch the
+     database. A short in-flight lock (``...:lock``, SET NX PX) makes a
+     concurrent duplicate wait for the first response instead of running.
+  2. Postgres fallback (``idempotency_keys``). The handler claims the key in
+     its own transaction and stores the response before commit, so the row
+     commits or rolls back with the order it describes. This covers Redis
+     misses (eviction, outage, a lock that expired mid-request). A
+     concurrent duplicate blocks on the primary key until the first
+     transaction ends, then replays its response.
+
+Only 2xx responses are stored; a request that failed can be retried with
+the same key. Redis errors degrade to the database layer.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import timedelta
+
+import redis.asyncio as aioredis
+from fastapi import HTTPException, Request
+from pydantic import BaseModel
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.responses import Response
+
+from app.core.config import settings
+from app.models.idempotency_key import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+_POLL_SECONDS = 0.05
+
+# Delete the lock only if this request still owns it.
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    request_hash: str
+    status_code: int
+    body: str
+
+    def to_response(self) -> Response:
+        return Response(
+            content=self.body,
+            status_code=self.status_code,
+            media_type="application/json",
+            headers={REPLAYED_HEADER: "true"},
+        )
+
+
+def request_hash(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+def idempotency_key(request: Request) -> str | None:
+    """The request's Idempotency-Key, or None. Raises 422 if it is too long."""
+    key = request.headers.get(IDEMPOTENCY_HEADER)
+    if not key:
+        return None
+    if len(key) > MAX_KEY_LENGTH:
+        raise HTTPException(
+            status_code=422,
+            detail=f"{IDEMPOTENCY_HEADER} must be at most {MAX_KEY_LENGTH} characters",
+        )
+    return key
+
+
+def _key_reused() -> HTTPException:
+    return HTTPException(
+        status_code=422,
+        detail=f"{IDEMPOTENCY_HEADER} was already used for a different request",
+    )
+
+
+def _in_progress() -> HTTPException:
+    return HTTPException(
+        status_code=409,
+        detail=f"A request with this {IDEMPOTENCY_HEADER} is still in progress",
+    )
+
+
+def _check_replay(stored: StoredResponse, req_hash: str) -> StoredResponse:
+    if stored.request_hash != req_hash:
+        raise _key_reused()
+    return stored
+
+
+# ---------------------------------------------------------------------------
+# Redis layer
+# ---------------------------------------------------------------------------
+
+
+def cache_key(endpoint: str, scope: str, key: str) -> str:
+    return f"idem:{endpoint}:{scope}:{hashlib.sha256(key.encode()).hexdigest()[:32]}"
+
+
+async def _read_cached(r: aioredis.Redis, ckey: str) -> StoredResponse | None:
+    raw = await r.get(ckey)
+    if raw is None:
+        return None
+    data = json.loads(raw)
+    return StoredResponse(data["request_hash"], data["status_code"], data["body"])
+
+
+async def wait_for_turn(
+    r: aioredis.Redis, ckey: str, req_hash: str
+) -> StoredResponse | str | None:
+    """Return the stored response for *ckey*, or take its in-flight lock.
+
+    Returns the lock token when this request should run, or None when Redis
+    is unavailable (run unlocked; the database layer still applies). Waits
+    up to ``IDEMPOTENCY_LOCK_SECONDS`` for a concurrent duplicate, then
+    raises 409. Raises 422 if the key was stored for a different body.
+    """
+    token = uuid.uuid4().hex
+    lock_key = f"{ckey}:lock"
+    deadline = time.monotonic() + settings.IDEMPOTENCY_LOCK_SECONDS
+    try:
+        while True:
+            stored = await _read_cached(r, ckey)
+            if stored is not None:
+                return _check_replay(stored, req_hash)
+            if await r.set(
+                lock_key, token, nx=True, px=int(settings.IDEMPOTENCY_LOCK_SECONDS * 1000)
+            ):
+                # The previous holder may have stored its response just before
+                # releasing the lock.
+                stored = await _read_cached(r, ckey)
+                if stored is None:
+                    return token
+                await release_lock(r, ckey, token)
+                return _check_replay(stored, req_hash)
+            if time.monotonic() >= deadline:
+                raise _in_progress()
+            await asyncio.sleep(_POLL_SECONDS)
+    except HTTPException:
+        raise
+    except Exception:
+        logger.warning("Idempotency cache unavailable for %s", ckey, exc_info=True)
+        return None
+
+
+async def cache_response(r: aioredis.Redis, ckey: str, stored: StoredResponse) -> None:
+    try:
+        await r.set(
+            ckey,
+            json.dumps(
+                {
+                    "request_hash": stored.request_hash,
+                    "status_code": stored.status_code,
+                    "body": stored.body,
+                }
+            ),
+            ex=settings.IDEMPOTENCY_TTL_SECONDS,
+        )
+    except Exception:
+        logger.warning("Idempotency cache write failed for %s", ckey, exc_info=True)
+
+
+async def release_lock(r: aioredis.Redis, ckey: str, token: str) -> None:
+    try:
+        await r.eval(_RELEASE_SCRIPT, 1, f"{ckey}:lock", token)
+    except Exception:
+        logger.warning("Idempotency lock release failed for %s", ckey, exc_info=True)
+
+
+# ---------------------------------------------------------------------------
+# Database layer (tenant context must be set)
+# ---------------------------------------------------------------------------
+
+
+async def claim_idempotency_key(
+    db: AsyncSession, tenant_id: uuid.UUID, endpoint: str, request: Request
+) -> Response | None:
+    """Claim the request's key for this transaction, or return the stored response.
+
+    Returns None when the request carries no key or the claim succeeded;
+    the handler then runs and calls ``save_idempotent_response`` before
+    commit. Claim before taking any other lock.
+    """
+    key = idempotency_key(request)
+    if key is None:
+        return None
+    req_hash = request_hash(await request.body())
+    stmt = insert(IdempotencyKey).values(
+        tenant_id=tenant_id, endpoint=endpoint, key=key, request_hash=req_hash
+    )
+    # A row past its TTL is claimed afresh, as if it had been pruned.
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[IdempotencyKey.tenant_id, IdempotencyKey.endpoint, IdempotencyKey.key],
+        set_={
+            "request_hash": stmt.excluded.request_hash,
+            "status_code": None,
+            "response_body": None,
+            "created_at": stmt.excluded.created_at,
+        },
+        where=IdempotencyKey.created_at
+        < stmt.excluded.created_at - timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS),
+    ).returning(IdempotencyKey.key)
+    if (await db.execute(stmt)).first() is not None:
+        return None
+
+    row = (
+        await db.execute(
+            select(IdempotencyKey).where(
+                IdempotencyKey.tenant_id == tenant_id,
+                IdempotencyKey.endpoint == endpoint,
+                IdempotencyKey.key == key,
+            )
+        )
+    ).scalar_one()
+    if row.status_code is None or row.response_body is None:
+        raise _in_progress()
+    stored = StoredResponse(row.request_hash, row.status_code, row.response_body)
+    return _check_replay(stored, req_hash).to_response()
+
+
+async def save_idempotent_response(
+    db: AsyncSession,
+    tenant_id: uuid.UUID,
+    endpoint: str,
+    request: Request,
+    response: BaseModel,
+    status_code: int = 201,
+) -> None:
+    """Store *response* on the key claimed by ``claim_idempotency_key``."""
+    key = idempotency_key(request)
+    if key is None:
+        return
+    await db.execute(
+        update(IdempotencyKey)
+        .where(
+            IdempotencyKey.tenant_id == tenant_id,
+            IdempotencyKey.endpoint == endpoint,
+            IdempotencyKey.key == key,
+        )
+        .values(status_code=status_code, response_body=response.model_dump_json(by_alias=True))
+    )
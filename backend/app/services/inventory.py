@@ -5,11 +5,12 @@ from __future__ import annotations
 import uuid
 
 from fastapi import HTTPException
-from sqlalchemy import select, text
+from sqlalchemy import insert, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.product import Product
 from app.models.stock_movement import StockMovement
+from app.services.catalog_sync import record_catalog_changes
 
 
 async def record_stock_movement(
@@ -109,6 +110,17 @@ async def record_stock_movement(
     return movement
 
 
+async def insert_stock_movements(db: AsyncSession, rows: list[dict]) -> None:
+    """Append many ledger rows with one multi-row INSERT.
+
+    For set-based callers that already applied the deltas to stock_qty in
+    the same transaction (see catalog_bulk). Single changes go through
+    record_stock_movement.
+    """
+    if rows:
+        await db.execute(insert(StockMovement), rows)
+
+
 async def restore_stock_for_cancelled_order(
     db: AsyncSession,
     *,
@@ -163,4 +175,5 @@ async def restore_stock_for_cancelled_order(
         )
         movements.append(movement)
 
+    await record_catalog_changes(db, tenant_id, [m.product_id for m in movements])
     return movements
@@ -0,0 +1,331 @@
+"""Per-tenant live event channel (Redis pub/sub → SSE).
+
+Dashboards and POS terminals used to poll ``/analytics/pos-today``,
+``/pos/shifts/current`` and the order lists to notice new sales. Writers now
+queue compact events and ``GET /tenants/me/events`` streams them, so clients
+apply deltas locally instead of re-running the aggregates.
+
+Publishing: ``queue_live_event`` stores the event on the session. It is
+published to ``live:{tenant_id}`` after that session commits and dropped if
+it rolls back, so clients never see a sale that did not happen. Publishing
+is fire-and-forget; a Redis error is logged and the write is unaffected.
+
+Fan-out: each API process holds one pattern subscription (``live:*``) and
+hands messages to the queues of its local connections, so a process uses a
+single Redis connection however many clients it serves. A client that falls
+``LIVE_EVENTS_QUEUE_SIZE`` events behind gets a ``resync`` event and the
+stream ends; it should reload its state and reconnect.
+
+Limits: open streams hold a lease in ``live:conn:{tenant_id}`` (a sorted set
+scored by lease expiry). A tenant has at most
+``LIVE_EVENTS_MAX_CONNECTIONS_PER_TENANT`` leases. Each heartbeat renews the
+stream's lease, and leases of streams that died without cleanup expire.
+
+Events (``data`` is JSON):
+  - ``order.created``: a storefront or POS order was placed
+  - ``order.status``: an order changed status (admin transition, POS cancel)
+  - ``order.fulfillment``: a storefront order's fulfillment status changed
+  - ``shift.opened`` / ``shift.closed``: POS shift lifecycle
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import time
+import uuid
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from typing import Any
+
+import redis.asyncio as aioredis
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, SessionTransaction
+
+from app.core.config import settings
+from app.models.order import Order
+from app.models.pos_shift import PosShift
+from app.services.sse import sse_event
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "live:"
+
+_PENDING_KEY = "live_events"
+_RECONNECT_SECONDS = 1.0
+
+# Drop expired leases, then add this one if the tenant is under its limit.
+_ACQUIRE_SCRIPT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[3]) then
+    return 0
+end
+redis.call('ZADD', KEYS[1], ARGV[2], ARGV[4])
+redis.call('PEXPIRE', KEYS[1], ARGV[5])
+return 1
+"""
+
+
+def channel(tenant_id: uuid.UUID) -> str:
+    return f"{CHANNEL_PREFIX}{tenant_id}"
+
+
+def _leases_key(tenant_id: uuid.UUID) -> str:
+    return f"live:conn:{tenant_id}"
+
+
+def _lease_ms() -> int:
+    return int(settings.LIVE_EVENTS_HEARTBEAT_SECONDS * 3 * 1000)
+
+
+# ---------------------------------------------------------------------------
+# Publishing
+# ---------------------------------------------------------------------------
+
+
+def order_event_data(order: Order) -> dict[str, Any]:
+    """Compact order payload shared by the order.* events."""
+    return {
+        "id": order.id,
+        "order_number": order.order_number,
+        "source": order.source,
+        "status": order.status,
+        "fulfillment_status": order.fulfillment_status,
+        "total_amount": order.total_amount,
+        "currency": order.currency,
+        "payment_method": order.payment_method,
+        "shift_id": order.shift_id,
+        "created_at": order.created_at,
+    }
+
+
+def shift_event_data(shift: PosShift) -> dict[str, Any]:
+    """Compact shift payload for the shift.* events."""
+    return {
+        "id": shift.id,
+        "status": shift.status,
+        "starting_cash": shift.starting_cash,
+        "order_count": shift.order_count,
+        "sales_total": shift.sales_total,
+        "cash_sales": shift.cash_sales,
+        "opened_at": shift.opened_at,
+        "closed_at": shift.closed_at,
+    }
+
+
+def queue_live_event(
+    db: AsyncSession, tenant_id: uuid.UUID, event_type: str, data: dict[str, Any]
+) -> None:
+    """Publish an event to the tenant's channel once *db* commits."""
+    payload = json.dumps({"type": event_type, "data": data}, default=str, ensure_ascii=False)
+    db.info.setdefault(_PENDING_KEY, []).append((channel(tenant_id), payload))
+
+
+async def _publish(events: list[tuple[str, str]]) -> None:
+    r = aioredis.from_url(settings.REDIS_URL)
+    try:
+        async with r.pipeline(transaction=False) as pipe:
+            for name, payload in events:
+                pipe.publish(name, payload)
+            await pipe.execute()
+    except Exception:
+        logger.warning("Live event publish failed (%d events)", len(events), exc_info=True)
+    finally:
+        await r.aclose()
+
+
+_publish_tasks: set[asyncio.Task] = set()
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_after_commit(session: Session) -> None:
+    events = session.info.pop(_PENDING_KEY, None)
+    if not events:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return  # sync session outside an event loop: nothing to publish from
+    task = loop.create_task(_publish(events))
+    _publish_tasks.add(task)
+    task.add_done_callback(_publish_tasks.discard)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _drop_unpublished(session: Session, transaction: SessionTransaction) -> None:
+    # Runs after after_commit; anything left was rolled back or discarded.
+    if transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
+
+
+# ---------------------------------------------------------------------------
+# Fan-out (one pattern subscription per process)
+# ---------------------------------------------------------------------------
+
+
+@dataclass(eq=False)
+class _Subscriber:
+    queue: asyncio.Queue[str] = field(
+        default_factory=lambda: asyncio.Queue(settings.LIVE_EVENTS_QUEUE_SIZE)
+    )
+    overflowed: bool = False
+
+
+class _LiveEventHub:
+    def __init__(self) -> None:
+        self._subscribers: dict[str, set[_Subscriber]] = {}
+        self._listener: asyncio.Task | None = None
+        self._subscribed: asyncio.Event | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def subscribe(self, tenant_id: uuid.UUID) -> _Subscriber:
+        """Register a local client; returns once the pattern subscription is live
+        (or after one heartbeat interval if Redis is slow to answer)."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # State bound to another (closed) event loop, e.g. between test runs.
+            self._subscribers, self._listener, self._loop = {}, None, loop
+        sub = _Subscriber()
+        self._subscribers.setdefault(channel(tenant_id), set()).add(sub)
+        if self._listener is None or self._listener.done():
+            self._subscribed = asyncio.Event()
+            self._listener = loop.create_task(self._listen(self._subscribed))
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(
+                self._subscribed.wait(), timeout=settings.LIVE_EVENTS_HEARTBEAT_SECONDS
+            )
+        return sub
+
+    def unsubscribe(self, tenant_id: uuid.UUID, sub: _Subscriber) -> None:
+        subs = self._subscribers.get(channel(tenant_id))
+        if subs is not None:
+            subs.discard(sub)
+            if not subs:
+                del self._subscribers[channel(tenant_id)]
+        if not self._subscribers and self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+
+    def _dispatch(self, name: str, payload: str) -> None:
+        for sub in self._subscribers.get(name, ()):
+            if sub.overflowed:
+                continue
+            try:
+                sub.queue.put_nowait(payload)
+            except asyncio.QueueFull:
+                sub.overflowed = True
+
+    async def _listen(self, subscribed: asyncio.Event) -> None:
+        while True:
+            r = aioredis.from_url(settings.REDIS_URL)
+            pubsub = r.pubsub()
+            try:
+                await pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+                subscribed.set()
+                async for message in pubsub.listen():
+                    if message["type"] == "pmessage":
+                        self._dispatch(message["channel"].decode(), message["data"].decode())
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("Live event subscription lost; reconnecting", exc_info=True)
+            finally:
+                subscribed.clear()
+                await pubsub.aclose()
+                await r.aclose()
+            await asyncio.sleep(_RECONNECT_SECONDS)
+
+
+hub = _LiveEventHub()
+
+
+# ---------------------------------------------------------------------------
+# Connection leases
+# ---------------------------------------------------------------------------
+
+
+async def acquire_connection(tenant_id: uuid.UUID) -> str | None:
+    """Take one of the tenant's stream leases. Returns its id, or None when full.
+
+    Redis errors propagate: without Redis there is nothing to stream.
+    """
+    lease_id = uuid.uuid4().hex
+    now_ms = int(time.time() * 1000)
+    r = aioredis.from_url(settings.REDIS_URL)
+    try:
+        acquired = await r.eval(
+            _ACQUIRE_SCRIPT,
+            1,
+            _leases_key(tenant_id),
+            now_ms,
+            now_ms + _lease_ms(),
+            settings.LIVE_EVENTS_MAX_CONNECTIONS_PER_TENANT,
+            lease_id,
+            _lease_ms(),
+        )
+    finally:
+        await r.aclose()
+    return lease_id if acquired else None
+
+
+async def _renew_lease(r: aioredis.Redis, tenant_id: uuid.UUID, lease_id: str) -> None:
+    try:
+        expires = int(time.time() * 1000) + _lease_ms()
+        await r.zadd(_leases_key(tenant_id), {lease_id: expires}, xx=True)
+        await r.pexpire(_leases_key(tenant_id), _lease_ms())
+    except Exception:
+        logger.warning("Live event lease renewal failed tenant=%s", tenant_id, exc_info=True)
+
+
+async def _release_lease(r: aioredis.Redis, tenant_id: uuid.UUID, lease_id: str) -> None:
+    try:
+        await r.zrem(_leases_key(tenant_id), lease_id)
+    except Exception:
+        logger.warning("Live event lease release failed tenant=%s", tenant_id, exc_info=True)
+
+
+# ---------------------------------------------------------------------------
+# Stream
+# ---------------------------------------------------------------------------
+
+
+def _sse_frame(payload: str) -> str:
+    message = json.loads(payload)
+    return sse_event(message["type"], message["data"])
+
+
+async def live_event_stream(tenant_id: uuid.UUID, lease_id: str) -> AsyncIterator[str]:
+    """SSE frames for one client: ``ready``, then events and ``: ping`` heartbeats.
+
+    Holds *lease_id* (from ``acquire_connection``) and releases it when the
+    client disconnects.
+    """
+    r = aioredis.from_url(settings.REDIS_URL)
+    sub: _Subscriber | None = None
+    heartbeat = settings.LIVE_EVENTS_HEARTBEAT_SECONDS
+    try:
+        sub = await hub.subscribe(tenant_id)
+        yield sse_event("ready", {"heartbeat_seconds": heartbeat})
+        next_ping = time.monotonic() + heartbeat
+        while not (sub.overflowed and sub.queue.empty()):
+            try:
+                payload = await asyncio.wait_for(
+                    sub.queue.get(), timeout=max(next_ping - time.monotonic(), 0)
+                )
+            except TimeoutError:
+                payload = None
+            if payload is not None:
+                yield _sse_frame(payload)
+            if time.monotonic() >= next_ping:
+                await _renew_lease(r, tenant_id, lease_id)
+                yield ": ping\n\n"
+                next_ping = time.monotonic() + heartbeat
+        yield sse_event("resync", {"reason": "client fell behind"})
+    finally:
+        if sub is not None:
+            hub.unsubscribe(tenant_id, sub)
+        await _release_lease(r, tenant_id, lease_id)
+        await r.aclose()
@@ -0,0 +1,144 @@
+"""Resized WebP/JPEG copies of uploaded product images.
+
+The media worker decodes an original once and writes one WebP and one JPEG
+per width in ``DERIVATIVE_WIDTHS``. WebP is what browsers fetch through the
+storefront ``srcset``; the JPEG at ``DEFAULT_WIDTH`` is the ``<img>`` fallback.
+
+Decoding is the expensive part, so:
+
+  - JPEGs are decoded at reduced scale (libjpeg DCT scaling via
+    ``Image.draft``) when the largest target is at most half the original
+  - widths are produced largest first, each resized from the previous one
+  - images are never upscaled; small originals collapse to fewer widths
+  - headers are checked against ``MAX_SOURCE_PIXELS`` before any decode,
+    so a tiny file claiming huge dimensions is rejected cheaply
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Callable
+from typing import BinaryIO, Protocol
+
+from PIL import Image, ImageOps
+
+DERIVATIVE_WIDTHS = (320, 640, 1280)
+DEFAULT_WIDTH = 640
+MAX_SOURCE_PIXELS = 40_000_000  # e.g. 8000x5000; larger originals are rejected
+
+IMAGE_CONTENT_TYPES = frozenset({"image/jpeg", "image/png", "image/webp"})
+
+# format -> (file extension, content type, Pillow save options)
+DERIVATIVE_FORMATS: dict[str, tuple[str, str, dict]] = {
+    "webp": ("webp", "image/webp", {"format": "WEBP", "quality": 80, "method": 4}),
+    "jpeg": (
+        "jpg",
+        "image/jpeg",
+        {"format": "JPEG", "quality": 82, "optimize": True, "progressive": True},
+    ),
+}
+
+_EXIF_ORIENTATION = 0x0112
+_ROTATED_ORIENTATIONS = {5, 6, 7, 8}  # stored sideways; width and height swap
+
+
+class DerivativeWriter(Protocol):
+    key: str
+    size_bytes: int
+
+    def write(self, data: bytes) -> int: ...
+    def close(self) -> None: ...
+    def abort(self) -> None: ...
+
+
+class UnsupportedImageError(ValueError):
+    """The source cannot be turned into derivatives (corrupt, too large, ...)."""
+
+
+def _target_widths(width: int) -> list[int]:
+    return sorted({min(w, width) for w in DERIVATIVE_WIDTHS}, reverse=True)
+
+
+def _open(source: BinaryIO) -> Image.Image:
+    try:
+        img = Image.open(source)
+    except (Image.UnidentifiedImageError, Image.DecompressionBombError) as exc:
+        raise UnsupportedImageError(str(exc)) from exc
+    if img.width * img.height > MAX_SOURCE_PIXELS:
+        img.close()
+        raise UnsupportedImageError(f"Image is too large ({img.width}x{img.height})")
+    return img
+
+
+def _decode(img: Image.Image) -> Image.Image:
+    """Load *img* upright, reduced-scale where possible, in RGB or RGBA mode."""
+    rotated = img.getexif().get(_EXIF_ORIENTATION) in _ROTATED_ORIENTATIONS
+    display_width = img.height if rotated else img.width
+    ratio = max(DERIVATIVE_WIDTHS) / display_width
+    if ratio < 1:
+        # No-op for non-JPEG; for JPEG picks the smallest DCT scale >= request.
+        img.draft("RGB", (math.ceil(img.width * ratio), math.ceil(img.height * ratio)))
+    try:
+        img = ImageOps.exif_transpose(img)
+        has_alpha = img.mode in ("RGBA", "LA", "PA") or "transparency" in img.info
+        return img.convert("RGBA" if has_alpha else "RGB")
+    except (OSError, SyntaxError, Image.DecompressionBombError) as exc:
+        raise UnsupportedImageError(str(exc)) from exc
+
+
+def _flatten(img: Image.Image) -> Image.Image:
+    """JPEG has no alpha channel: composite transparent images onto white."""
+    if img.mode != "RGBA":
+        return img
+    background = Image.new("RGB", img.size, (255, 255, 255))
+    background.paste(img, mask=img.getchannel("A"))
+    return background
+
+
+def generate_derivatives(
+    source: BinaryIO, open_output: Callable[[int, str], DerivativeWriter]
+) -> list[dict]:
+    """Write every derivative of *source*; returns their descriptors.
+
+    ``open_output(width, format)`` returns the writer for one derivative
+    (a storage.MultipartUpload in the worker). A writer whose save fails is
+    aborted before the error propagates.
+    """
+    with _open(source) as original:
+        img = _decode(original)
+
+    derivatives: list[dict] = []
+    source_width, source_height = img.size
+    for width in _target_widths(source_width):
+        if img.width != width:
+            height = max(1, round(source_height * width / source_width))
+            img = img.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=3.0)
+        for fmt, (_ext, _content_type, options) in DERIVATIVE_FORMATS.items():
+            out = open_output(width, fmt)
+            try:
+                (img if fmt == "webp" else _flatten(img)).save(out, **options)
+                out.close()
+            except BaseException:
+                out.abort()
+                raise
+            derivatives.append(
+                {"width": width, "format": fmt, "key": out.key, "size_bytes": out.size_bytes}
+            )
+    return derivatives
+
+
+def pick_default(derivatives: list[dict], fmt: str = "jpeg") -> dict | None:
+    """The *fmt* derivative closest to DEFAULT_WIDTH (largest not above it)."""
+    candidates = sorted((d for d in derivatives if d["format"] == fmt), key=lambda d: d["width"])
+    if not candidates:
+        return None
+    fitting = [d for d in candidates if d["width"] <= DEFAULT_WIDTH]
+    return fitting[-1] if fitting else candidates[0]
+
+
+def build_srcset(derivatives: list[dict], urls: dict[str, str], fmt: str = "webp") -> str | None:
+    """``srcset`` value ("url 320w, url 640w") for the *fmt* derivatives."""
+    entries = sorted((d for d in derivatives if d["format"] == fmt), key=lambda d: d["width"])
+    if not entries:
+        return None
+    return ", ".join(f"{urls[d['key']]} {d['width']}w" for d in entries)
@@ -14,25 +14,29 @@ _PREFIXES = {
 }
 
 
-async def _next_number(
+async def _lock(db: AsyncSession, tenant_id: str, prefix: str) -> None:
+    """Acquire the advisory lock scoped to this tenant+prefix combination."""
+    lock_key = f"{tenant_id}:{prefix}"
+    await db.execute(
+        text("SELECT pg_advisory_xact_lock(hashtext(:key))"),
+        {"key": lock_key},
+    )
+
+
+async def _next_numbers(
     db: AsyncSession,
     tenant_id: str,
     prefix: str,
-) -> str:
-    """Generate the next sequential number for a given prefix and tenant.
+    count: int,
+) -> list[str]:
+    """Generate the next *count* sequential numbers for a given prefix and tenant.
 
     Uses pg_advisory_xact_lock (transaction-scoped) so concurrent callers
     on the same tenant+prefix serialise safely.  The lock is released
     automatically when the surrounding transaction commits or rolls back.
     """
     table, column = _PREFIXES[prefix]
-
-    # Acquire advisory lock scoped to this tenant+prefix combination.
-    lock_key = f"{tenant_id}:{prefix}"
-    await db.execute(
-        text("SELECT pg_advisory_xact_lock(hashtext(:key))"),
-        {"key": lock_key},
-    )
+    await _lock(db, tenant_id, prefix)
 
     # Find the highest existing number for this tenant.
     # The column stores values like "ORD-00042", so we strip the prefix,
@@ -45,9 +49,17 @@ async def _next_number(
         ),
         {"pattern": f"{prefix}-([0-9]+)", "tid": tenant_id},
     )
-    current_max = row.scalar()
-    next_seq = (current_max or 0) + 1
-    return f"{prefix}-{next_seq:05d}"
+    current_max = row.scalar() or 0
+    return [f"{prefix}-{seq:05d}" for seq in range(current_max + 1, current_max + count + 1)]
+
+
+async def _next_number(
+    db: AsyncSession,
+    tenant_id: str,
+    prefix: str,
+) -> str:
+    """Generate the next sequential number for a given prefix and tenant."""
+    return (await _next_numbers(db, tenant_id, prefix, 1))[0]
 
 
 async def get_next_order_number(db: AsyncSession, tenant_id: str) -> str:
@@ -55,6 +67,16 @@ async def get_next_order_number(db: AsyncSession, tenant_id: str) -> str:
     return await _next_number(db, tenant_id, "ORD")
 
 
+async def lock_order_numbering(db: AsyncSession, tenant_id: str) -> None:
+    """Take the order numbering lock now (held until commit; re-entrant)."""
+    await _lock(db, tenant_id, "ORD")
+
+
+async def get_next_order_numbers(db: AsyncSession, tenant_id: str, count: int) -> list[str]:
+    """Return the next *count* order numbers in one locked step (batch uploads)."""
+    return await _next_numbers(db, tenant_id, "ORD", count)
+
+
 async def get_next_donation_number(db: AsyncSession, tenant_id: str) -> str:
     """Return the next donation number, e.g. 'DON-00001'."""
     return await _next_number(db, tenant_id, "DON")
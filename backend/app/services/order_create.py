@@ -13,9 +13,78 @@ from app.models.order import Order
 from app.models.product import Product
 from app.models.product_variant import ProductVariant
 from app.schemas.order import OrderItemRequest
+from app.services.catalog_sync import record_catalog_changes
 from app.services.customer_link import find_or_create_customer
 from app.services.inventory import record_stock_movement
+from app.services.live_events import order_event_data, queue_live_event
 from app.services.numbering import get_next_order_number
+from app.services.tenant_stats import update_tenant_stats
+
+
+def check_order_items(
+    items: list[OrderItemRequest],
+    products_by_id: dict[uuid.UUID, Product],
+    variants_by_id: dict[uuid.UUID, ProductVariant],
+) -> None:
+    """Raise 422 unless every item has a loaded, priced product and matching variant.
+
+    *products_by_id* / *variants_by_id* hold the tenant's active rows only.
+    """
+    for item in items:
+        if item.catalog_item_id not in products_by_id:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Product {item.catalog_item_id} not found or inactive",
+            )
+        product = products_by_id[item.catalog_item_id]
+        if product.price_amount is None:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Product {item.catalog_item_id} has no price",
+            )
+
+    for item in items:
+        if item.variant_id is None:
+            continue
+        variant = variants_by_id.get(item.variant_id)
+        if variant is None or variant.product_id != item.catalog_item_id:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Variant {item.variant_id} not found for product {item.catalog_item_id}",
+            )
+
+
+def build_order_lines(
+    items: list[OrderItemRequest],
+    products_by_id: dict[uuid.UUID, Product],
+    variants_by_id: dict[uuid.UUID, ProductVariant],
+    currency: str,
+) -> tuple[list[dict], Decimal]:
+    """Snapshot *items* at current prices: (JSONB line items, total before shipping)."""
+    items_jsonb: list[dict] = []
+    total = Decimal("0.000")
+    for item in items:
+        product = products_by_id[item.catalog_item_id]
+        variant = variants_by_id.get(item.variant_id) if item.variant_id else None
+        if variant is not None and variant.price_amount is not None:
+            unit_price = variant.price_amount
+        else:
+            unit_price = product.price_amount
+        subtotal = unit_price * item.qty
+        items_jsonb.append(
+            {
+                "catalog_item_id": str(item.catalog_item_id),
+                "variant_id": str(item.variant_id) if item.variant_id else None,
+                "variant_name": variant.name if variant else None,
+                "name": product.name,
+                "qty": item.qty,
+                "unit_price": str(unit_price),
+                "currency": currency,
+                "subtotal": str(subtotal),
+            }
+        )
+        total += subtotal
+    return items_jsonb, total
 
 
 async def create_order(
@@ -37,10 +106,12 @@ async def create_order(
     visit_id: uuid.UUID | None = None,
     actor_user_id: uuid.UUID | None = None,
     payment_method: str | None = None,
+    shift_id: uuid.UUID | None = None,
 ) -> Order:
     """Validate products, decrement stock, and create an Order row.
 
     The caller is responsible for commit timing, UTM events, and notifications.
+    An ``order.created`` live event is published when the caller commits.
     On validation or stock failure, raises HTTPException (422 or 409).
 
     Duplicate product IDs in *items* are processed as separate line items
@@ -61,21 +132,7 @@ async def create_order(
     )
     products_by_id = {p.id: p for p in result.scalars().all()}
 
-    # Validate all items exist, are active, and have a price
-    for item in items:
-        if item.catalog_item_id not in products_by_id:
-            raise HTTPException(
-                status_code=422,
-                detail=f"Product {item.catalog_item_id} not found or inactive",
-            )
-        product = products_by_id[item.catalog_item_id]
-        if product.price_amount is None:
-            raise HTTPException(
-                status_code=422,
-                detail=f"Product {item.catalog_item_id} has no price",
-            )
-
-    # Validate optional variants (C2): exist, active, same tenant, belong to the product.
+    # Load optional variants (C2): active, same tenant.
     variant_ids = [item.variant_id for item in items if item.variant_id is not None]
     variants_by_id: dict[uuid.UUID, ProductVariant] = {}
     if variant_ids:
@@ -88,41 +145,9 @@ async def create_order(
         )
         variants_by_id = {v.id: v for v in result.scalars().all()}
 
-    for item in items:
-        if item.variant_id is None:
-            continue
-        variant = variants_by_id.get(item.variant_id)
-        if variant is None or variant.product_id != item.catalog_item_id:
-            raise HTTPException(
-                status_code=422,
-                detail=f"Variant {item.variant_id} not found for product {item.catalog_item_id}",
-            )
-
-    # Build JSONB snapshot and compute total
+    check_order_items(items, products_by_id, variants_by_id)
     order_currency = tenant_currency
-    items_jsonb: list[dict] = []
-    total = Decimal("0.000")
-    for item in items:
-        product = products_by_id[item.catalog_item_id]
-        variant = variants_by_id.get(item.variant_id) if item.variant_id else None
-        if variant is not None and variant.price_amount is not None:
-            unit_price = variant.price_amount
-        else:
-            unit_price = product.price_amount
-        subtotal = unit_price * item.qty
-        items_jsonb.append(
-            {
-                "catalog_item_id": str(item.catalog_item_id),
-                "variant_id": str(item.variant_id) if item.variant_id else None,
-                "variant_name": variant.name if variant else None,
-                "name": product.name,
-                "qty": item.qty,
-                "unit_price": str(unit_price),
-                "currency": order_currency,
-                "subtotal": str(subtotal),
-            }
-        )
-        total += subtotal
+    items_jsonb, total = build_order_lines(items, products_by_id, variants_by_id, order_currency)
 
     # Server-authoritative shipping fee (never trust a client-sent fee).
     if shipping_fee is not None:
@@ -202,9 +227,11 @@ async def create_order(
         status=status,
         source=source,
         visit_id=visit_id,
+        shift_id=shift_id,
     )
     db.add(order)
     await db.flush()
+    await update_tenant_stats(db, tenant_id, orders=1)
 
     # POS: auditable decrement via record_stock_movement (order.id now available)
     if source == "pos":
@@ -230,4 +257,11 @@ async def create_order(
                 insufficient_stock_detail=detail,
             )
 
+    # New stock levels reach POS terminals through the catalog sync feed.
+    await record_catalog_changes(
+        db,
+        tenant_id,
+        [i.catalog_item_id for i in items if products_by_id[i.catalog_item_id].track_inventory],
+    )
+    queue_live_event(db, tenant_id, "order.created", order_event_data(order))
     return order
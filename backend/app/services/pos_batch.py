@@ -0,0 +1,247 @@
+"""Offline POS sale upload: many sales in one transaction, set-based.
+
+A terminal that lost its connection queues sales with a client-generated
+``client_sale_id`` and the capture time, then uploads the queue to
+``POST /tenants/me/pos/orders/batch``. Each sale gets its own outcome:
+
+  - replays are safe: ``orders.client_sale_id`` is unique per tenant, and a
+    key that is already recorded returns its existing order as ``duplicate``
+  - sales are checked in capture order against the stock locked for the
+    batch. A sale that fails (inactive product, insufficient stock) is
+    ``rejected`` and does not block the others. Nothing is written for it,
+    so no savepoints are needed
+  - accepted sales are written set-based: one order-number allocation, one
+    INSERT for the orders, one ``UPDATE ... FROM (VALUES ...)`` per stock
+    table, one multi-row stock movement INSERT, one tenant_stats upsert, one
+    shift totals update and one catalog sync version, plus one
+    ``order.created`` live event per sale
+
+Locks are taken in the same order as a single POS sale: the open shift row
+(locked by the endpoint), order numbering, then stock rows (all at once,
+sorted by id), then the catalog sync lock.
+Holding the numbering lock first also serialises concurrent uploads of the
+same queue, so the replay check cannot race.
+"""
+
+from __future__ import annotations
+
+import uuid
+from collections import Counter
+from decimal import Decimal
+
+from fastapi import HTTPException
+from sqlalchemy import Integer, column, select, update, values
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.order import Order
+from app.models.product import Product
+from app.models.product_variant import ProductVariant
+from app.schemas.pos import PosBatchSaleResult, PosOfflineSale, PosOrderBatchResponse
+from app.services.catalog_sync import record_catalog_changes
+from app.services.inventory import insert_stock_movements
+from app.services.live_events import order_event_data, queue_live_event
+from app.services.numbering import get_next_order_numbers, lock_order_numbering
+from app.services.order_create import build_order_lines, check_order_items
+from app.services.pos_shift_totals import record_shift_sales
+from app.services.tenant_stats import update_tenant_stats
+
+
+def _stock_needs(
+    sale: PosOfflineSale, products_by_id: dict[uuid.UUID, Product]
+) -> tuple[Counter[uuid.UUID], Counter[uuid.UUID]]:
+    """Units a sale takes from tracked products and variants."""
+    products: Counter[uuid.UUID] = Counter()
+    variants: Counter[uuid.UUID] = Counter()
+    for item in sale.items:
+        if not products_by_id[item.catalog_item_id].track_inventory:
+            continue
+        if item.variant_id is not None:
+            variants[item.variant_id] += item.qty
+        else:
+            products[item.catalog_item_id] += item.qty
+    return products, variants
+
+
+async def _decrement(
+    db: AsyncSession, model: type[Product] | type[ProductVariant], sold: Counter[uuid.UUID]
+) -> None:
+    if not sold:
+        return
+    rows = values(column("id", UUID(as_uuid=True)), column("qty", Integer), name="sold").data(
+        list(sold.items())
+    )
+    await db.execute(
+        update(model)
+        .where(model.id == rows.c.id)
+        .values(stock_qty=model.stock_qty - rows.c.qty)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def create_pos_order_batch(
+    db: AsyncSession,
+    *,
+    tenant_id: uuid.UUID,
+    tenant_currency: str,
+    shift_id: uuid.UUID,
+    sales: list[PosOfflineSale],
+    actor_user_id: uuid.UUID | None = None,
+) -> PosOrderBatchResponse:
+    """Record *sales* in the caller's transaction (tenant context must be set)."""
+    await lock_order_numbering(db, str(tenant_id))
+
+    results: dict[str, PosBatchSaleResult] = {}
+    recorded = await db.execute(
+        select(Order.client_sale_id, Order.id, Order.order_number).where(
+            Order.tenant_id == tenant_id,
+            Order.client_sale_id.in_([sale.client_sale_id for sale in sales]),
+        )
+    )
+    for client_sale_id, order_id, order_number in recorded.all():
+        results[client_sale_id] = PosBatchSaleResult(
+            client_sale_id=client_sale_id,
+            status="duplicate",
+            order_id=order_id,
+            order_number=order_number,
+        )
+    pending = sorted(
+        (sale for sale in sales if sale.client_sale_id not in results),
+        key=lambda sale: sale.captured_at,
+    )
+
+    # Lock every stock row the batch may touch, in id order.
+    product_ids = sorted({item.catalog_item_id for sale in pending for item in sale.items})
+    variant_ids = sorted(
+        {item.variant_id for sale in pending for item in sale.items if item.variant_id}
+    )
+    products_by_id = {
+        p.id: p
+        for p in (
+            await db.execute(
+                select(Product)
+                .where(Product.tenant_id == tenant_id, Product.id.in_(product_ids))
+                .order_by(Product.id)
+                .with_for_update()
+            )
+        ).scalars()
+        if p.is_active
+    }
+    variants_by_id: dict[uuid.UUID, ProductVariant] = {}
+    if variant_ids:
+        variants_by_id = {
+            v.id: v
+            for v in (
+                await db.execute(
+                    select(ProductVariant)
+                    .where(
+                        ProductVariant.tenant_id == tenant_id,
+                        ProductVariant.id.in_(variant_ids),
+                    )
+                    .order_by(ProductVariant.id)
+                    .with_for_update()
+                )
+            ).scalars()
+            if v.is_active
+        }
+
+    stock = {pid: p.stock_qty or 0 for pid, p in products_by_id.items()}
+    variant_stock = {vid: v.stock_qty or 0 for vid, v in variants_by_id.items()}
+    sold: Counter[uuid.UUID] = Counter()
+    sold_variants: Counter[uuid.UUID] = Counter()
+    accepted: list[tuple[PosOfflineSale, list[dict], Decimal]] = []
+    for sale in pending:
+        try:
+            check_order_items(sale.items, products_by_id, variants_by_id)
+            needs, variant_needs = _stock_needs(sale, products_by_id)
+            for pid, qty in needs.items():
+                if stock[pid] - sold[pid] < qty:
+                    raise HTTPException(
+                        status_code=409,
+                        detail=f"Insufficient stock for product '{products_by_id[pid].name}'",
+                    )
+            for vid, qty in variant_needs.items():
+                if variant_stock[vid] - sold_variants[vid] < qty:
+                    raise HTTPException(
+                        status_code=409,
+                        detail=f"Insufficient stock for variant '{variants_by_id[vid].name}'",
+                    )
+        except HTTPException as exc:
+            results[sale.client_sale_id] = PosBatchSaleResult(
+                client_sale_id=sale.client_sale_id,
+                status="rejected",
+                error_status=exc.status_code,
+                detail=exc.detail,
+            )
+            continue
+        sold.update(needs)
+        sold_variants.update(variant_needs)
+        lines, total = build_order_lines(
+            sale.items, products_by_id, variants_by_id, tenant_currency
+        )
+        accepted.append((sale, lines, total))
+
+    if accepted:
+        numbers = await get_next_order_numbers(db, str(tenant_id), len(accepted))
+        orders = [
+            Order(
+                tenant_id=tenant_id,
+                order_number=number,
+                customer_name=sale.customer_name or "Walk-in",
+                items=lines,
+                total_amount=total,
+                currency=tenant_currency,
+                payment_method=sale.payment_method,
+                status="fulfilled",
+                source="pos",
+                shift_id=shift_id,
+                client_sale_id=sale.client_sale_id,
+                created_at=sale.captured_at,
+            )
+            for number, (sale, lines, total) in zip(numbers, accepted, strict=True)
+        ]
+        db.add_all(orders)
+        await db.flush()
+        await update_tenant_stats(db, tenant_id, orders=len(orders))
+        await record_shift_sales(db, tenant_id, shift_id, orders)
+        for order in orders:
+            queue_live_event(db, tenant_id, "order.created", order_event_data(order))
+
+        await _decrement(db, Product, sold)
+        await _decrement(db, ProductVariant, sold_variants)
+        await insert_stock_movements(
+            db,
+            [
+                {
+                    "tenant_id": tenant_id,
+                    "product_id": item.catalog_item_id,
+                    "variant_id": item.variant_id,
+                    "delta_qty": -item.qty,
+                    "reason": "pos_sale",
+                    "order_id": order.id,
+                    "actor_user_id": actor_user_id,
+                }
+                for order, (sale, _lines, _total) in zip(orders, accepted, strict=True)
+                for item in sale.items
+                if products_by_id[item.catalog_item_id].track_inventory
+            ],
+        )
+        await record_catalog_changes(
+            db, tenant_id, list(sold) + [variants_by_id[vid].product_id for vid in sold_variants]
+        )
+        for order, (sale, _lines, _total) in zip(orders, accepted, strict=True):
+            results[sale.client_sale_id] = PosBatchSaleResult(
+                client_sale_id=sale.client_sale_id,
+                status="created",
+                order_id=order.id,
+                order_number=order.order_number,
+            )
+
+    ordered = [results[sale.client_sale_id] for sale in sales]
+    counts = Counter(result.status for result in ordered)
+    return PosOrderBatchResponse(
+        results=ordered,
+        created=counts["created"],
+        duplicates=counts["duplicate"],
+        rejected=counts["rejected"],
+    )
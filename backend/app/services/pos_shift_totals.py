@@ -0,0 +1,228 @@
+"""Running sales totals of POS shifts.
+
+Every POS write that adds orders to a shift or cancels one calls
+``record_shift_sales`` / ``record_shift_cancellation`` in the same
+transaction. These add deltas to the shift's counters and to its
+per-payment-method rows (``pos_shift_payments``), so the current-shift view
+and shift close read a handful of rows instead of summing the shift's
+orders.
+
+Lock order: POS sales, cancellations and shift close lock the shift row
+first (``SELECT ... FOR UPDATE`` when they load the shift). The counter
+updates then wait on nothing, and a sale can never land on a shift after
+its close has read the totals.
+
+``find_shift_total_drift`` / ``rebuild_shift_totals`` recompute the counters
+from orders and back ``python -m scripts.verify_pos_shift_totals``. That is
+the initial backfill and the consistency check.
+"""
+
+from __future__ import annotations
+
+import uuid
+from collections.abc import Sequence
+from decimal import Decimal
+
+from sqlalchemy import delete, or_, select, text, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.order import Order
+from app.models.pos_shift import PosShift, PosShiftPayment
+from app.schemas.pos_shift import PosShiftPaymentTotal
+
+UNSPECIFIED_PAYMENT = "unspecified"
+
+_EXPECTED_SHIFTS = """
+    SELECT s.id,
+           COUNT(o.id) FILTER (WHERE o.status <> 'cancelled') AS order_count,
+           COUNT(o.id) FILTER (WHERE o.status = 'cancelled') AS cancelled_count,
+           COALESCE(SUM(o.total_amount) FILTER (WHERE o.status <> 'cancelled'), 0)
+               AS sales_total,
+           COALESCE(SUM(o.total_amount)
+                    FILTER (WHERE o.status <> 'cancelled' AND o.payment_method = 'cash'), 0)
+               AS cash_sales
+      FROM pos_shifts s
+      LEFT JOIN orders o
+        ON o.tenant_id = s.tenant_id AND o.shift_id = s.id AND o.source = 'pos'
+     WHERE s.tenant_id = :tenant_id
+     GROUP BY s.id
+"""
+
+_EXPECTED_PAYMENTS = """
+    SELECT shift_id, COALESCE(payment_method, 'unspecified') AS payment_method,
+           COUNT(*) AS order_count, SUM(total_amount) AS total
+      FROM orders
+     WHERE tenant_id = :tenant_id AND source = 'pos' AND shift_id IS NOT NULL
+       AND status <> 'cancelled'
+     GROUP BY 1, 2
+"""
+
+_EXPECTED_SHIFTS_SQL = text(_EXPECTED_SHIFTS)
+_EXPECTED_PAYMENTS_SQL = text(_EXPECTED_PAYMENTS)
+
+_REBUILD_SHIFTS_SQL = text(
+    f"""
+    UPDATE pos_shifts s
+       SET order_count = e.order_count, cancelled_count = e.cancelled_count,
+           sales_total = e.sales_total, cash_sales = e.cash_sales
+      FROM ({_EXPECTED_SHIFTS}) e
+     WHERE s.id = e.id
+    """
+)
+
+_REBUILD_PAYMENTS_SQL = text(
+    f"""
+    INSERT INTO pos_shift_payments (tenant_id, shift_id, payment_method, order_count, total)
+    SELECT :tenant_id, e.shift_id, e.payment_method, e.order_count, e.total
+      FROM ({_EXPECTED_PAYMENTS}) e
+    """
+)
+
+_COUNTERS = ("order_count", "cancelled_count", "sales_total", "cash_sales")
+
+
+async def _apply(
+    db: AsyncSession,
+    tenant_id: uuid.UUID,
+    shift_id: uuid.UUID,
+    orders: Sequence[Order],
+    *,
+    cancelled: bool,
+) -> None:
+    if not orders:
+        return
+    sign = -1 if cancelled else 1
+    by_method: dict[str, tuple[int, Decimal]] = {}
+    for order in orders:
+        method = order.payment_method or UNSPECIFIED_PAYMENT
+        count, total = by_method.get(method, (0, Decimal("0")))
+        by_method[method] = (count + 1, total + order.total_amount)
+    sales_total = sum((total for _count, total in by_method.values()), Decimal("0"))
+    cash = by_method.get("cash", (0, Decimal("0")))[1]
+
+    # The tenant_id filters are defense-in-depth on top of RLS.
+    await db.execute(
+        update(PosShift)
+        .where(PosShift.tenant_id == tenant_id, PosShift.id == shift_id)
+        .values(
+            order_count=PosShift.order_count + sign * len(orders),
+            cancelled_count=PosShift.cancelled_count + (len(orders) if cancelled else 0),
+            sales_total=PosShift.sales_total + sign * sales_total,
+            cash_sales=PosShift.cash_sales + sign * cash,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    stmt = insert(PosShiftPayment).values(
+        [
+            {
+                "tenant_id": tenant_id,
+                "shift_id": shift_id,
+                "payment_method": method,
+                "order_count": sign * count,
+                "total": sign * total,
+            }
+            for method, (count, total) in sorted(by_method.items())
+        ]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[PosShiftPayment.shift_id, PosShiftPayment.payment_method],
+        set_={
+            "order_count": PosShiftPayment.order_count + stmt.excluded.order_count,
+            "total": PosShiftPayment.total + stmt.excluded.total,
+        },
+    )
+    await db.execute(stmt)
+
+
+async def record_shift_sales(
+    db: AsyncSession, tenant_id: uuid.UUID, shift_id: uuid.UUID, orders: Sequence[Order]
+) -> None:
+    """Add new POS *orders* to the shift's running totals (tenant context set)."""
+    await _apply(db, tenant_id, shift_id, orders, cancelled=False)
+
+
+async def record_shift_cancellation(
+    db: AsyncSession, tenant_id: uuid.UUID, shift_id: uuid.UUID, order: Order
+) -> None:
+    """Move a cancelled *order* out of the shift's sales totals."""
+    await _apply(db, tenant_id, shift_id, [order], cancelled=True)
+
+
+async def load_shift_payments(
+    db: AsyncSession, tenant_id: uuid.UUID, shift_id: uuid.UUID
+) -> list[PosShiftPaymentTotal]:
+    """The shift's per-payment-method totals (methods with sales only)."""
+    result = await db.execute(
+        select(PosShiftPayment)
+        .where(
+            PosShiftPayment.tenant_id == tenant_id,
+            PosShiftPayment.shift_id == shift_id,
+            PosShiftPayment.order_count > 0,
+        )
+        .order_by(PosShiftPayment.payment_method)
+    )
+    return [
+        PosShiftPaymentTotal(
+            payment_method=row.payment_method, order_count=row.order_count, total=row.total
+        )
+        for row in result.scalars()
+    ]
+
+
+async def find_shift_total_drift(db: AsyncSession, tenant_id: uuid.UUID) -> list[str]:
+    """Compare stored shift totals with the tenant's orders (tenant context set).
+
+    Returns one line per mismatch; an empty list means the totals are exact.
+    """
+    stored = {
+        shift.id: shift
+        for shift in (
+            await db.execute(
+                select(PosShift)
+                .where(PosShift.tenant_id == tenant_id)
+                .execution_options(populate_existing=True)
+            )
+        ).scalars()
+    }
+    drift = []
+    for row in (await db.execute(_EXPECTED_SHIFTS_SQL, {"tenant_id": tenant_id})).mappings():
+        shift = stored[row["id"]]
+        for name in _COUNTERS:
+            if getattr(shift, name) != row[name]:
+                drift.append(f"shift {shift.id}: {name} {getattr(shift, name)} != {row[name]}")
+
+    expected_payments = {
+        (row.shift_id, row.payment_method): (row.order_count, row.total)
+        for row in await db.execute(_EXPECTED_PAYMENTS_SQL, {"tenant_id": tenant_id})
+    }
+    stored_payments = {
+        (row.shift_id, row.payment_method): (row.order_count, row.total)
+        for row in (
+            await db.execute(
+                select(PosShiftPayment)
+                .where(
+                    PosShiftPayment.tenant_id == tenant_id,
+                    or_(PosShiftPayment.order_count != 0, PosShiftPayment.total != 0),
+                )
+                .execution_options(populate_existing=True)
+            )
+        ).scalars()
+    }
+    for shift_id, method in sorted(expected_payments.keys() | stored_payments.keys()):
+        want = expected_payments.get((shift_id, method), (0, Decimal("0")))
+        have = stored_payments.get((shift_id, method), (0, Decimal("0")))
+        if want != have:
+            drift.append(f"shift {shift_id}: payments[{method}] {have} != {want}")
+    return drift
+
+
+async def rebuild_shift_totals(db: AsyncSession, tenant_id: uuid.UUID) -> None:
+    """Recompute a tenant's shift totals from orders (tenant context set).
+
+    Closed shifts keep their ``z_report`` and ``closing_cash_sales``; those are
+    what was reported at close.
+    """
+    await db.execute(_REBUILD_SHIFTS_SQL, {"tenant_id": tenant_id})
+    await db.execute(delete(PosShiftPayment).where(PosShiftPayment.tenant_id == tenant_id))
+    await db.execute(_REBUILD_PAYMENTS_SQL, {"tenant_id": tenant_id})
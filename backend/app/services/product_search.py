@@ -0,0 +1,140 @@
+"""Ranked product search for storefronts, POS and the admin catalog.
+
+Matches name, name_ar, description(_ar), SKU and barcode through two
+generated columns on ``products`` (migration c7d8e9f0a1b2):
+
+  - ``search_vector``: 'simple' tsvector, names weighted A, codes B and
+    descriptions C. Every query word matches as a prefix (``word:*``).
+    GIN-indexed.
+  - ``search_text``: names and codes as one string, for substring matches
+    (queries of ``SUBSTRING_MIN_CHARS`` or more). Served by a pg_trgm GIN
+    index.
+
+An exact SKU or barcode, including a variant's, is also found through the
+``catalog_codes`` primary key.
+
+Both columns are normalized by the SQL ``search_normalize`` function. Queries
+go through ``normalize_search_text``, which must fold text the same way:
+lower case, one form of alef, alef maqsura → ya, ta marbuta → ha,
+tatweel/diacritics dropped, Arabic-Indic digits → ASCII. Typed Arabic
+matches the catalog with or without hamza and harakat.
+
+Ranking: exact code 4, name starting with the query 2, plus ``ts_rank_cd``.
+Scores are rounded so that the keyset cursor ``(score, id)`` compares
+exactly.
+"""
+
+from __future__ import annotations
+
+import re
+import uuid
+from decimal import Decimal, InvalidOperation
+
+from fastapi import HTTPException
+from sqlalchemy import Numeric, any_, case, cast, func, literal_column, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.catalog_code import CatalogCode
+from app.models.product import Product
+from app.services.catalog_codes import CODE_TYPES
+
+SUBSTRING_MIN_CHARS = 3  # shorter substrings cannot use the trigram index
+
+# Keep in sync with search_normalize() in migration c7d8e9f0a1b2.
+_FOLD = str.maketrans(
+    "أإآٱىة٠١٢٣٤٥٦٧٨٩",
+    "اااايه0123456789",
+    "\u0640\u064b\u064c\u064d\u064e\u064f\u0650\u0651\u0652",  # tatweel, tashkeel
+)
+_WORD = re.compile(r"\w+")
+
+_SEARCH_TEXT = literal_column("products.search_text")
+_SEARCH_VECTOR = literal_column("products.search_vector", type_=TSVECTOR)
+
+
+def normalize_search_text(text: str) -> str:
+    """Python twin of the SQL ``search_normalize`` function."""
+    return text.translate(_FOLD).lower()
+
+
+def like_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def encode_search_cursor(score: Decimal, product_id: uuid.UUID) -> str:
+    return f"{score}|{product_id}"
+
+
+def decode_search_cursor(cursor: str) -> tuple[Decimal, uuid.UUID]:
+    try:
+        score_str, id_str = cursor.split("|", 1)
+        return Decimal(score_str), uuid.UUID(id_str)
+    except (ValueError, AttributeError, InvalidOperation) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
+async def search_products(
+    db: AsyncSession,
+    tenant_id: uuid.UUID,
+    q: str,
+    *,
+    limit: int,
+    cursor: str | None = None,
+    active_only: bool = True,
+) -> tuple[list[Product], str | None]:
+    """One page of the tenant's products matching *q*, best match first.
+
+    Returns (products, next_cursor); next_cursor is None on the last page.
+    A query without letters or digits matches nothing.
+    """
+    raw = q.strip()
+    norm = normalize_search_text(raw)
+    words = _WORD.findall(norm)
+    if not words:
+        return [], None
+
+    tsquery = func.to_tsquery("simple", " & ".join(f"{word}:*" for word in words))
+    # = ANY(ARRAY(...)) rather than IN (...): an init plan the planner can
+    # OR with the GIN index scans, where a hashed subplan forces a seq scan.
+    code_hit = Product.id == any_(
+        func.array(
+            select(CatalogCode.product_id)
+            .where(
+                CatalogCode.tenant_id == tenant_id,
+                CatalogCode.code_type.in_(CODE_TYPES),
+                CatalogCode.code == raw,
+            )
+            .scalar_subquery()
+        )
+    )
+    matches = [_SEARCH_VECTOR.op("@@")(tsquery), code_hit]
+    if len(norm) >= SUBSTRING_MIN_CHARS:
+        matches.append(_SEARCH_TEXT.like(f"%{like_escape(norm)}%", escape="\\"))
+
+    score = func.round(
+        cast(
+            case((code_hit, 4), else_=0)
+            + case((_SEARCH_TEXT.like(f"{like_escape(norm)}%", escape="\\"), 2), else_=0)
+            + func.ts_rank_cd(_SEARCH_VECTOR, tsquery),
+            Numeric,
+        ),
+        6,
+    )
+
+    # The tenant_id filter is defense-in-depth on top of RLS.
+    stmt = (
+        select(Product, score)
+        .where(Product.tenant_id == tenant_id, or_(*matches))
+        .order_by(score.desc(), Product.id.desc())
+    )
+    if active_only:
+        stmt = stmt.where(Product.is_active.is_(True))
+    if cursor is not None:
+        cursor_score, cursor_id = decode_search_cursor(cursor)
+        stmt = stmt.where(tuple_(score, Product.id) < tuple_(cursor_score, cursor_id))
+
+    rows = (await db.execute(stmt.limit(limit + 1))).all()
+    page = rows[:limit]
+    next_cursor = encode_search_cursor(page[-1][1], page[-1][0].id) if len(rows) > limit else None
+    return [product for product, _score in page], next_cursor
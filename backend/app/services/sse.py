@@ -0,0 +1,16 @@
+"""Server-Sent Events framing helpers for StreamingResponse endpoints."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+SSE_MEDIA_TYPE = "text/event-stream"
+
+# Disable proxy buffering (nginx / ALB) so events reach the client as sent.
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def sse_event(event: str, data: Any) -> str:
+    """Encode one SSE frame. Data is JSON, so newlines in text are escaped."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str, ensure_ascii=False)}\n\n"
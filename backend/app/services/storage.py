@@ -7,10 +7,14 @@ All keys MUST start with ``{tenant_id}/`` — this is enforced in
 import logging
 import os
 import uuid
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO
 from urllib.parse import quote, urlparse, urlunparse
 
 import boto3
 from botocore.config import Config
+from botocore.exceptions import ClientError
 
 from app.core.config import settings
 
@@ -19,6 +23,10 @@ logger = logging.getLogger(__name__)
 PRESIGN_UPLOAD_EXPIRES = 900  # 15 min
 PRESIGN_DOWNLOAD_EXPIRES = 900  # 15 min
 MAX_UPLOAD_SIZE = 10 * 1024 * 1024  # 10 MB
+MULTIPART_PART_SIZE = 8 * 1024 * 1024  # 8 MB (S3 minimum is 5 MB except the last part)
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MB
+DELETE_BATCH_SIZE = 1000  # S3 DeleteObjects maximum
+HEAD_CONCURRENCY = 10  # parallel HEADs in head_objects (botocore default pool size)
 
 ALLOWED_CONTENT_TYPES = frozenset(
     {
@@ -81,6 +89,37 @@ def build_tenant_key(tenant_id: uuid.UUID, file_name: str) -> str:
     return f"{tenant_id}/media/{uuid.uuid4()}-{safe_name}"
 
 
+def build_export_key(tenant_id: uuid.UUID, job_id: uuid.UUID, extension: str) -> str:
+    """Build an S3 key for an export artifact: ``{tenant_id}/exports/{job_id}.{ext}``."""
+    return f"{tenant_id}/exports/{job_id}.{extension}"
+
+
+def build_import_key(tenant_id: uuid.UUID, job_id: uuid.UUID, extension: str) -> str:
+    """Build an S3 key for an uploaded import file: ``{tenant_id}/imports/{job_id}.{ext}``."""
+    return f"{tenant_id}/imports/{job_id}.{extension}"
+
+
+def build_derivative_key(
+    tenant_id: uuid.UUID, media_id: uuid.UUID, width: int, extension: str
+) -> str:
+    """Build an S3 key for a resized image.
+
+    ``{tenant_id}/media/derivatives/{media_id}/{width}.{ext}``
+    """
+    return f"{tenant_id}/media/derivatives/{media_id}/{width}.{extension}"
+
+
+def derivative_media_id(key: str) -> uuid.UUID | None:
+    """media_id encoded in a ``build_derivative_key`` key, or None for other keys."""
+    parts = key.split("/")
+    if len(parts) != 5 or parts[1:3] != ["media", "derivatives"]:
+        return None
+    try:
+        return uuid.UUID(parts[3])
+    except ValueError:
+        return None
+
+
 def presign_put(
     key: str,
     content_type: str,
@@ -100,24 +139,234 @@ def presign_put(
     return _rewrite_presigned_url(url)
 
 
+def presign_put_many(
+    objects: list[tuple[str, str]],
+    expires: int = PRESIGN_UPLOAD_EXPIRES,
+) -> list[str]:
+    """Presigned PUT URLs for ``(key, content_type)`` pairs, one S3 client."""
+    client = _get_s3_client()
+    return [
+        _rewrite_presigned_url(
+            client.generate_presigned_url(
+                "put_object",
+                Params={"Bucket": settings.S3_BUCKET, "Key": key, "ContentType": content_type},
+                ExpiresIn=expires,
+            )
+        )
+        for key, content_type in objects
+    ]
+
+
+def put_object(key: str, body: bytes, content_type: str) -> None:
+    """Upload a small in-memory object in one request."""
+    client = _get_s3_client()
+    client.put_object(Bucket=settings.S3_BUCKET, Key=key, Body=body, ContentType=content_type)
+
+
 def delete_object(key: str) -> None:
     """Best-effort delete of an S3 object."""
     client = _get_s3_client()
     client.delete_object(Bucket=settings.S3_BUCKET, Key=key)
 
 
+def delete_objects(keys: list[str]) -> list[str]:
+    """Delete keys in DeleteObjects batches. Returns the keys that failed.
+
+    Keys that do not exist count as deleted (S3 semantics).
+    """
+    client = _get_s3_client()
+    failed: list[str] = []
+    for start in range(0, len(keys), DELETE_BATCH_SIZE):
+        batch = keys[start : start + DELETE_BATCH_SIZE]
+        response = client.delete_objects(
+            Bucket=settings.S3_BUCKET,
+            Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+        )
+        failed.extend(error["Key"] for error in response.get("Errors", []))
+    return failed
+
+
+def iter_object_pages(prefix: str) -> Iterator[list[dict]]:
+    """Stream a bucket listing under *prefix*, one ``list_objects_v2`` page at a time.
+
+    Each page is a list of ``{"key", "size_bytes", "last_modified"}``.
+    """
+    paginator = _get_s3_client().get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=settings.S3_BUCKET, Prefix=prefix):
+        yield [
+            {"key": obj["Key"], "size_bytes": obj["Size"], "last_modified": obj["LastModified"]}
+            for obj in page.get("Contents", [])
+        ]
+
+
+def _head(client, key: str) -> dict | None:  # type: ignore[no-untyped-def]
+    try:
+        response = client.head_object(Bucket=settings.S3_BUCKET, Key=key)
+    except ClientError as exc:
+        if exc.response.get("Error", {}).get("Code") in {"404", "NoSuchKey", "NotFound"}:
+            return None
+        raise
+    return {"size_bytes": response["ContentLength"], "content_type": response.get("ContentType")}
+
+
+def head_object(key: str) -> dict | None:
+    """Return ``{"size_bytes", "content_type"}`` of an S3 object, or None if missing."""
+    return _head(_get_s3_client(), key)
+
+
+def head_objects(keys: list[str]) -> dict[str, dict | None]:
+    """``head_object`` for many keys: one client, up to HEAD_CONCURRENCY in flight.
+
+    Blocking; async callers run it in a thread (``asyncio.to_thread``).
+    """
+    if not keys:
+        return {}
+    client = _get_s3_client()  # boto3 clients are thread-safe
+    with ThreadPoolExecutor(max_workers=min(HEAD_CONCURRENCY, len(keys))) as pool:
+        return dict(zip(keys, pool.map(lambda key: _head(client, key), keys), strict=True))
+
+
+def download_to_file(key: str, fileobj: BinaryIO) -> int:
+    """Stream an S3 object into *fileobj* in chunks. Returns the byte count."""
+    client = _get_s3_client()
+    body = client.get_object(Bucket=settings.S3_BUCKET, Key=key)["Body"]
+    size = 0
+    try:
+        for chunk in body.iter_chunks(DOWNLOAD_CHUNK_SIZE):
+            fileobj.write(chunk)
+            size += len(chunk)
+    finally:
+        body.close()
+    return size
+
+
 def presign_get(
     key: str,
     expires: int = PRESIGN_DOWNLOAD_EXPIRES,
+    download_name: str | None = None,
 ) -> str:
-    """Generate a presigned GET URL for downloading from S3."""
+    """Generate a presigned GET URL for downloading from S3.
+
+    ``download_name`` sets Content-Disposition so browsers save the object
+    under a friendly file name instead of the raw key.
+    """
     client = _get_s3_client()
+    params: dict = {
+        "Bucket": settings.S3_BUCKET,
+        "Key": key,
+    }
+    if download_name:
+        params["ResponseContentDisposition"] = f'attachment; filename="{download_name}"'
     url = client.generate_presigned_url(
         "get_object",
-        Params={
-            "Bucket": settings.S3_BUCKET,
-            "Key": key,
-        },
+        Params=params,
         ExpiresIn=expires,
     )
     return _rewrite_presigned_url(url)
+
+
+def presign_get_many(keys: list[str], expires: int = PRESIGN_DOWNLOAD_EXPIRES) -> dict[str, str]:
+    """Presigned GET URLs for many keys, signed with a single S3 client.
+
+    Signing is local, but building a boto3 client is not; listing pages sign
+    one URL per image size, so they share the client.
+    """
+    client = _get_s3_client()
+    return {
+        key: _rewrite_presigned_url(
+            client.generate_presigned_url(
+                "get_object",
+                Params={"Bucket": settings.S3_BUCKET, "Key": key},
+                ExpiresIn=expires,
+            )
+        )
+        for key in dict.fromkeys(keys)
+    }
+
+
+class MultipartUpload:
+    """Buffered S3 multipart upload with a file-like ``write`` interface.
+
+    Bytes are buffered until ``part_size`` is reached and then shipped as one
+    part, so memory stays bounded no matter how large the object grows.
+    ``close()`` uploads the tail and completes the upload; ``abort()`` discards
+    every part already sent. Objects that never reach one full part are sent
+    with a single ``put_object`` instead.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        content_type: str,
+        part_size: int = MULTIPART_PART_SIZE,
+    ) -> None:
+        self.key = key
+        self.content_type = content_type
+        self.part_size = part_size
+        self.size_bytes = 0
+        self.closed = False
+        self._client = _get_s3_client()
+        self._buffer = bytearray()
+        self._upload_id: str | None = None
+        self._parts: list[dict] = []
+
+    def write(self, data: bytes) -> int:
+        self._buffer.extend(data)
+        self.size_bytes += len(data)
+        while len(self._buffer) >= self.part_size:
+            chunk = bytes(self._buffer[: self.part_size])
+            del self._buffer[: self.part_size]
+            self._upload_part(chunk)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.size_bytes
+
+    def flush(self) -> None:
+        """No-op: parts are shipped as soon as they fill up."""
+
+    def _upload_part(self, chunk: bytes) -> None:
+        if self._upload_id is None:
+            response = self._client.create_multipart_upload(
+                Bucket=settings.S3_BUCKET, Key=self.key, ContentType=self.content_type
+            )
+            self._upload_id = response["UploadId"]
+        part_number = len(self._parts) + 1
+        response = self._client.upload_part(
+            Bucket=settings.S3_BUCKET,
+            Key=self.key,
+            UploadId=self._upload_id,
+            PartNumber=part_number,
+            Body=chunk,
+        )
+        self._parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        if self._upload_id is None:
+            self._client.put_object(
+                Bucket=settings.S3_BUCKET,
+                Key=self.key,
+                Body=bytes(self._buffer),
+                ContentType=self.content_type,
+            )
+        else:
+            if self._buffer:
+                self._upload_part(bytes(self._buffer))
+            self._client.complete_multipart_upload(
+                Bucket=settings.S3_BUCKET,
+                Key=self.key,
+                UploadId=self._upload_id,
+                MultipartUpload={"Parts": self._parts},
+            )
+        self._buffer.clear()
+        self.closed = True
+
+    def abort(self) -> None:
+        if self._upload_id is not None and not self.closed:
+            self._client.abort_multipart_upload(
+                Bucket=settings.S3_BUCKET, Key=self.key, UploadId=self._upload_id
+            )
+        self._buffer.clear()
+        self.closed = True
@@ -1,25 +1,40 @@
 """Storefront AI chat gateway — buyer-facing, read-only assistant.
 
 Separate from the dashboard gateway: uses session_id (not user_id),
-separate tables, and a buyer-focused system prompt.
+separate tables, and a buyer-focused system prompt. Repeated opening
+questions are served from a per-tenant answer cache (ai_answer_cache).
 """
 
 from __future__ import annotations
 
 import uuid
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from decimal import Decimal
 
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.models.product import Product
+from app.db.session import tenant_session
 from app.models.storefront_ai_conversation import StorefrontAIConversation
 from app.models.storefront_ai_usage_log import StorefrontAIUsageLog
+from app.models.storefront_config import StorefrontConfig
 from app.models.tenant import Tenant
+from app.services.ai_answer_cache import (
+    ANSWER_CACHE_MODEL,
+    answer_scope,
+    lookup_answer,
+    store_answer,
+)
 from app.services.ai_gateway import _compute_cost
+from app.services.ai_messages import (
+    append_messages,
+    load_context_window,
+    needs_compaction,
+    schedule_compaction,
+)
 from app.services.ai_provider import AIProvider, AIResponse
 from app.services.ai_quota import (
     adjust_tokens,
@@ -27,9 +42,13 @@ from app.services.ai_quota import (
     reserve_tokens,
     rollback_tokens,
 )
+from app.services.ai_tokens import estimate_prompt_tokens
+from app.services.ai_usage import mark_ai_usage
+from app.services.catalog_index import get_catalog_index
 
 _MAX_CONTEXT_TURNS = 6  # fewer turns for buyer chat (cost control)
-_ESTIMATED_TOKENS = 400
+_CATALOG_TOP_K = 10  # products retrieved into the prompt per message
+_DESCRIPTION_CHARS = 160  # per-product description budget in the prompt
 
 
 @dataclass(frozen=True)
@@ -39,6 +58,7 @@ class StorefrontChatResult:
     tokens_in: int
     tokens_out: int
     cost_usd: Decimal
+    compact: bool = False  # schedule compaction once the turn is committed
 
 
 class StorefrontAIGatewayError(Exception):
@@ -49,85 +69,121 @@ class StorefrontAIGatewayError(Exception):
         self.status_code = status_code
 
 
-async def _build_buyer_prompt(db: AsyncSession, tenant: Tenant, slug: str) -> str:
-    """System prompt framed for buyers browsing the storefront."""
-    result = await db.execute(
-        select(Product)
-        .where(Product.is_active.is_(True))
-        .order_by(Product.sort_order, Product.id)
-        .limit(50)
-    )
-    products = list(result.scalars().all())
+# Store-independent instructions first: a shared, stable prefix that
+# provider-side prompt caching can reuse (see ai_gateway._SYSTEM_INSTRUCTIONS).
+_BUYER_INSTRUCTIONS = (
+    "You are a friendly shopping assistant for an online store.\n"
+    "Help visitors learn about products, answer questions, and guide "
+    "them toward placing an order, making a donation, or submitting a pledge.\n\n"
+    "Rules:\n"
+    "- Be concise, friendly, and helpful.\n"
+    "- You can describe products and answer questions about them.\n"
+    "- To place an order, direct the visitor to the checkout page.\n"
+    "- To donate, direct them to the donation page.\n"
+    "- To pledge, direct them to the pledge page.\n"
+    "- You CANNOT create orders, donations, or pledges yourself.\n"
+    "- Never discuss other stores, tenants, or the platform itself.\n"
+    "- If you don't know, say so.\n\n"
+)
+
+
+def get_buyer_prompt(tenant: Tenant) -> str:
+    """Stable part of the buyer prompt: instructions + store name (see
+    ai_gateway.get_system_prompt)."""
+    return f"{_BUYER_INSTRUCTIONS}Store: {tenant.name}"
 
-    lines: list[str] = []
-    for p in products:
-        if p.price_amount:
-            currency = p.currency or tenant.default_currency
-            price = f"{p.price_amount} {currency}"
-        else:
-            price = "Price not set"
-        desc = f" — {p.description}" if p.description else ""
-        lines.append(f"- {p.name}: {price}{desc}")
 
-    catalog = "\n".join(lines) if lines else "No products listed yet."
+async def _catalog_context(db: AsyncSession, tenant: Tenant, query: str) -> str:
+    """Products relevant to the buyer's message, with short descriptions."""
+    index = await get_catalog_index(db, tenant)
+    if not len(index):
+        return "Available products:\nNo products listed yet."
 
+    lines: list[str] = []
+    for e in index.search(query, _CATALOG_TOP_K):
+        desc = f" — {e.description[:_DESCRIPTION_CHARS]}" if e.description else ""
+        lines.append(f"- {e.name}: {e.price_label(tenant.default_currency)}{desc}")
+    catalog = "\n".join(lines)
+    if len(lines) == len(index):
+        return f"Available products:\n{catalog}"
     return (
-        f"You are a friendly shopping assistant for {tenant.name}.\n"
-        f"Help visitors learn about products, answer questions, and guide "
-        f"them toward placing an order, making a donation, or submitting a pledge.\n\n"
-        f"Available products:\n{catalog}\n\n"
-        f"Rules:\n"
-        f"- Be concise, friendly, and helpful.\n"
-        f"- You can describe products and answer questions about them.\n"
-        f"- To place an order, direct the visitor to the checkout page.\n"
-        f"- To donate, direct them to the donation page.\n"
-        f"- To pledge, direct them to the pledge page.\n"
-        f"- You CANNOT create orders, donations, or pledges yourself.\n"
-        f"- Never discuss other stores, tenants, or the platform itself.\n"
-        f"- If you don't know, say so."
+        f"Products most relevant to this message "
+        f"({len(lines)} of {len(index)} in the store):\n{catalog}"
     )
 
 
-def _trim_context(messages: list[dict], max_turns: int) -> list[dict]:
-    if len(messages) <= max_turns * 2:
-        return messages
-    return messages[-(max_turns * 2) :]
+async def _trim_context(
+    db: AsyncSession, conversation_id: uuid.UUID, max_turns: int
+) -> list[dict[str, str]]:
+    return await load_context_window(db, "storefront", conversation_id, max_turns)
 
 
-async def _get_or_create_conversation(
+async def _get_conversation(
     db: AsyncSession, tenant_id: uuid.UUID, session_id: str
-) -> StorefrontAIConversation:
+) -> StorefrontAIConversation | None:
     result = await db.execute(
         select(StorefrontAIConversation).where(
             StorefrontAIConversation.tenant_id == tenant_id,
             StorefrontAIConversation.session_id == session_id,
         )
     )
-    conv = result.scalar_one_or_none()
+    return result.scalar_one_or_none()
+
+
+async def _get_or_create_conversation(
+    db: AsyncSession, tenant_id: uuid.UUID, session_id: str
+) -> StorefrontAIConversation:
+    conv = await _get_conversation(db, tenant_id, session_id)
     if conv is not None:
         return conv
 
     conv = StorefrontAIConversation(
         tenant_id=tenant_id,
         session_id=session_id,
-        messages=[],
     )
     db.add(conv)
     await db.flush()
     return conv
 
 
-async def handle_storefront_chat(
+@dataclass(frozen=True)
+class PreparedStorefrontChat:
+    """Provider input + bookkeeping for one buyer turn (no ORM objects)."""
+
+    tenant_id: uuid.UUID
+    session_id: str
+    message: str
+    provider_messages: list[dict[str, str]]
+    reserved_tokens: int
+    cache_scope: str | None = None  # set for cacheable (first-turn) questions
+    cached_reply: str | None = None  # answer-cache hit; skip the provider
+
+
+async def _answer_cache_scope(db: AsyncSession, tenant: Tenant) -> str:
+    result = await db.execute(
+        select(func.coalesce(StorefrontConfig.updated_at, StorefrontConfig.created_at)).where(
+            StorefrontConfig.tenant_id == tenant.id
+        )
+    )
+    return answer_scope(tenant, result.scalar_one_or_none())
+
+
+async def prepare_storefront_chat(
     db: AsyncSession,
     tenant: Tenant,
     slug: str,
     session_id: str,
     message: str,
-    provider: AIProvider,
     *,
     ai_token_quota: int = 0,
-) -> StorefrontChatResult:
-    """Full buyer chat pipeline."""
+) -> PreparedStorefrontChat:
+    """Steps 1–5: validate, rate-limit, build provider messages, reserve quota.
+
+    First-turn questions are looked up in the answer cache; a hit returns
+    right away with ``cached_reply`` set, no provider messages and nothing
+    reserved (a cached reply costs no tokens), and the caller skips the
+    provider.
+    """
     tenant_id = tenant.id
 
     # 1. Validate input
@@ -145,55 +201,100 @@ async def handle_storefront_chat(
             "rate_limited",
         )
 
-    # 3. Reserve quota (shared tenant-level quota)
-    hard_limit = ai_token_quota
-    quota = await reserve_tokens(str(tenant_id), _ESTIMATED_TOKENS, hard_limit)
+    # 3. Load conversation history (created on first completed turn)
+    conv = await _get_conversation(db, tenant_id, session_id)
+    history = await _trim_context(db, conv.id, _MAX_CONTEXT_TURNS) if conv is not None else []
+
+    # First-turn questions may be answered from the per-tenant cache
+    cache_scope: str | None = None
+    if settings.AI_ANSWER_CACHE_ENABLED and not history:
+        cache_scope = await _answer_cache_scope(db, tenant)
+        cached_reply = await lookup_answer(tenant_id, cache_scope, message)
+        if cached_reply is not None:
+            return PreparedStorefrontChat(
+                tenant_id=tenant_id,
+                session_id=session_id,
+                message=message,
+                provider_messages=[],
+                reserved_tokens=0,
+                cache_scope=cache_scope,
+                cached_reply=cached_reply,
+            )
+
+    # 4. Build messages (stable prompt + retrieved products)
+    system_prompt = get_buyer_prompt(tenant)
+    catalog_context = await _catalog_context(db, tenant, message)
+    provider_messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "system", "content": catalog_context},
+        *history,
+        {"role": "user", "content": message},
+    ]
+
+    # 5. Reserve quota (shared tenant-level quota): prompt + max reply
+    estimated = estimate_prompt_tokens(provider_messages) + settings.AI_MAX_OUTPUT_TOKENS
+    quota = await reserve_tokens(str(tenant_id), estimated, ai_token_quota)
     if not quota.allowed:
         raise StorefrontAIGatewayError(
             "This store's AI assistant is temporarily unavailable.",
             "quota_exhausted",
         )
 
-    # 4. Load/create conversation
-    conv = await _get_or_create_conversation(db, tenant_id, session_id)
+    return PreparedStorefrontChat(
+        tenant_id=tenant_id,
+        session_id=session_id,
+        message=message,
+        provider_messages=provider_messages,
+        reserved_tokens=quota.reserved,
+        cache_scope=cache_scope,
+    )
+
 
-    # 5. Build messages
-    system_prompt = await _build_buyer_prompt(db, tenant, slug)
-    context = _trim_context(list(conv.messages), _MAX_CONTEXT_TURNS)
-    provider_messages = [
-        {"role": "system", "content": system_prompt},
-        *context,
-        {"role": "user", "content": message},
-    ]
+def _cached_response(reply: str) -> AIResponse:
+    return AIResponse(content=reply, tokens_in=0, tokens_out=0, model=ANSWER_CACHE_MODEL)
+
+
+async def abort_storefront_chat(prepared: PreparedStorefrontChat) -> None:
+    await rollback_tokens(str(prepared.tenant_id), prepared.reserved_tokens)
 
-    # 6. Call provider
-    ai_response: AIResponse
-    try:
-        ai_response = await provider.chat(
-            provider_messages,
-            max_tokens=settings.AI_MAX_OUTPUT_TOKENS,
-        )
-    except Exception:
-        await rollback_tokens(str(tenant_id), _ESTIMATED_TOKENS)
-        raise
+
+async def finish_storefront_chat(
+    db: AsyncSession, prepared: PreparedStorefrontChat, ai_response: AIResponse
+) -> StorefrontChatResult:
+    """Steps 7–9: adjust quota, save conversation, log usage.
+
+    Does not commit; see ai_gateway.finish_chat for ``result.compact``.
+    """
+    tenant_id = prepared.tenant_id
 
     # 7. Adjust quota
     actual = ai_response.tokens_in + ai_response.tokens_out
-    await adjust_tokens(str(tenant_id), actual - _ESTIMATED_TOKENS)
+    await adjust_tokens(str(tenant_id), actual - prepared.reserved_tokens)
 
     # 8. Save conversation
-    updated = list(conv.messages)
-    updated.append({"role": "user", "content": message})
-    updated.append({"role": "assistant", "content": ai_response.content})
-    conv.messages = updated
+    conv = await _get_or_create_conversation(db, tenant_id, prepared.session_id)
+    await append_messages(
+        db,
+        tenant_id=tenant_id,
+        kind="storefront",
+        conversation_id=conv.id,
+        messages=[
+            {"role": "user", "content": prepared.message},
+            {"role": "assistant", "content": ai_response.content},
+        ],
+    )
     conv.updated_at = datetime.now(UTC)
     await db.flush()
+    compact = await needs_compaction(db, "storefront", conv.id, _MAX_CONTEXT_TURNS)
+
+    if prepared.cache_scope is not None and prepared.cached_reply is None:
+        await store_answer(tenant_id, prepared.cache_scope, prepared.message, ai_response.content)
 
-    # 9. Log usage
+    # 9. Log usage (cache hits are logged at zero cost)
     cost = _compute_cost(ai_response.model, ai_response.tokens_in, ai_response.tokens_out)
     log = StorefrontAIUsageLog(
         tenant_id=tenant_id,
-        session_id=session_id,
+        session_id=prepared.session_id,
         conversation_id=conv.id,
         model=ai_response.model,
         tokens_in=ai_response.tokens_in,
@@ -202,6 +303,7 @@ async def handle_storefront_chat(
     )
     db.add(log)
     await db.flush()
+    await mark_ai_usage(db, tenant_id)
 
     return StorefrontChatResult(
         conversation_id=conv.id,
@@ -209,4 +311,83 @@ async def handle_storefront_chat(
         tokens_in=ai_response.tokens_in,
         tokens_out=ai_response.tokens_out,
         cost_usd=cost,
+        compact=compact,
     )
+
+
+def _schedule_compaction(tenant_id: uuid.UUID, result: StorefrontChatResult) -> None:
+    if result.compact:
+        schedule_compaction("storefront", tenant_id, result.conversation_id, _MAX_CONTEXT_TURNS)
+
+
+async def handle_storefront_chat(
+    db: AsyncSession,
+    tenant: Tenant,
+    slug: str,
+    session_id: str,
+    message: str,
+    provider: AIProvider,
+    *,
+    ai_token_quota: int = 0,
+) -> StorefrontChatResult:
+    """Full buyer chat pipeline."""
+    prepared = await prepare_storefront_chat(
+        db, tenant, slug, session_id, message, ai_token_quota=ai_token_quota
+    )
+
+    if prepared.cached_reply is not None:
+        ai_response = _cached_response(prepared.cached_reply)
+    else:
+        # 6. Call provider
+        try:
+            ai_response = await provider.chat(
+                prepared.provider_messages,
+                max_tokens=settings.AI_MAX_OUTPUT_TOKENS,
+            )
+        except Exception:
+            await abort_storefront_chat(prepared)
+            raise
+
+    result = await finish_storefront_chat(db, prepared, ai_response)
+    # Commit before enqueueing so the worker sees the new turn.
+    await db.commit()
+    _schedule_compaction(prepared.tenant_id, result)
+    return result
+
+
+async def stream_storefront_chat(
+    prepared: PreparedStorefrontChat, provider: AIProvider
+) -> AsyncIterator[str | StorefrontChatResult]:
+    """Yield text deltas, then the recorded result (see ai_gateway.stream_chat)."""
+    if prepared.cached_reply is not None:
+        yield prepared.cached_reply
+        async with tenant_session(prepared.tenant_id) as db:
+            result = await finish_storefront_chat(
+                db, prepared, _cached_response(prepared.cached_reply)
+            )
+            await db.commit()
+        _schedule_compaction(prepared.tenant_id, result)
+        yield result
+        return
+
+    final: AIResponse | None = None
+    try:
+        async for event in provider.stream_chat(
+            prepared.provider_messages,
+            max_tokens=settings.AI_MAX_OUTPUT_TOKENS,
+        ):
+            if event.final is not None:
+                final = event.final
+            elif event.delta:
+                yield event.delta
+    finally:
+        if final is None:
+            await abort_storefront_chat(prepared)
+    if final is None:
+        raise RuntimeError("Provider stream ended without a final response")
+
+    async with tenant_session(prepared.tenant_id) as db:
+        result = await finish_storefront_chat(db, prepared, final)
+        await db.commit()
+    _schedule_compaction(prepared.tenant_id, result)
+    yield result
@@ -0,0 +1,93 @@
+"""Maintenance of the ``tenant_stats`` counters.
+
+Write paths call ``update_tenant_stats`` in the same transaction as the row
+they create or change, so the counters commit or roll back with it. The
+upsert holds the tenant's stats row lock until commit. Orders, donations
+and pledges already serialise per tenant on their numbering advisory
+locks, so this adds little contention.
+
+``rebuild_tenant_stats`` recomputes one tenant from the source tables and
+backs ``python -m scripts.rebuild_tenant_stats`` (repair).
+"""
+
+import uuid
+
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.tenant_stats import TenantStats
+
+_REBUILD_SQL = text(
+    """
+    INSERT INTO tenant_stats (
+        tenant_id, member_count, order_count, donation_count, pledge_count,
+        last_activity_at, updated_at
+    )
+    SELECT
+        :tenant_id,
+        (SELECT COUNT(*) FROM tenant_members
+         WHERE tenant_id = :tenant_id AND status = 'active'),
+        (SELECT COUNT(*) FROM orders WHERE tenant_id = :tenant_id),
+        (SELECT COUNT(*) FROM donations WHERE tenant_id = :tenant_id),
+        (SELECT COUNT(*) FROM pledges WHERE tenant_id = :tenant_id),
+        GREATEST(
+            (SELECT MAX(created_at) FROM orders WHERE tenant_id = :tenant_id),
+            (SELECT MAX(created_at) FROM donations WHERE tenant_id = :tenant_id),
+            (SELECT MAX(created_at) FROM pledges WHERE tenant_id = :tenant_id)
+        ),
+        now()
+    ON CONFLICT (tenant_id) DO UPDATE SET
+        member_count = EXCLUDED.member_count,
+        order_count = EXCLUDED.order_count,
+        donation_count = EXCLUDED.donation_count,
+        pledge_count = EXCLUDED.pledge_count,
+        last_activity_at = EXCLUDED.last_activity_at,
+        updated_at = EXCLUDED.updated_at
+    """
+)
+
+
+async def update_tenant_stats(
+    db: AsyncSession,
+    tenant_id: uuid.UUID,
+    *,
+    members: int = 0,
+    orders: int = 0,
+    donations: int = 0,
+    pledges: int = 0,
+) -> None:
+    """Add deltas to a tenant's counters (tenant context must be set).
+
+    Any new order/donation/pledge also moves ``last_activity_at`` to now(),
+    the same transaction timestamp their ``created_at`` defaults to.
+    """
+    activity = orders > 0 or donations > 0 or pledges > 0
+    stmt = insert(TenantStats).values(
+        tenant_id=tenant_id,
+        member_count=members,
+        order_count=orders,
+        donation_count=donations,
+        pledge_count=pledges,
+        last_activity_at=func.now() if activity else None,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[TenantStats.tenant_id],
+        set_={
+            "member_count": TenantStats.member_count + stmt.excluded.member_count,
+            "order_count": TenantStats.order_count + stmt.excluded.order_count,
+            "donation_count": TenantStats.donation_count + stmt.excluded.donation_count,
+            "pledge_count": TenantStats.pledge_count + stmt.excluded.pledge_count,
+            # GREATEST ignores NULLs
+            "last_activity_at": func.greatest(
+                TenantStats.last_activity_at, stmt.excluded.last_activity_at
+            ),
+            "updated_at": func.now(),
+        },
+    )
+    await db.execute(stmt)
+
+
+async def rebuild_tenant_stats(db: AsyncSession, tenant_id: uuid.UUID) -> None:
+    """Recompute a tenant's counters from the source tables (tenant context set)."""
+    await db.execute(_REBUILD_SQL, {"tenant_id": tenant_id})
@@ -16,5 +16,28 @@ celery_app.conf.update(
     accept_content=["json"],
     timezone="UTC",
     enable_utc=True,
-    include=["app.workers.tasks.notifications"],
+    include=[
+        "app.workers.tasks.notifications",
+        "app.workers.tasks.exports",
+        "app.workers.tasks.ai_compaction",
+        "app.workers.tasks.ai_usage_rollup",
+        "app.workers.tasks.media",
+        "app.workers.tasks.media_gc",
+        "app.workers.tasks.catalog_import",
+        "app.workers.tasks.idempotency_gc",
+    ],
+    beat_schedule={
+        "rollup-ai-usage": {
+            "task": "rollup_ai_usage",
+            "schedule": settings.AI_USAGE_ROLLUP_INTERVAL_SECONDS,
+        },
+        "collect-orphaned-media": {
+            "task": "collect_orphaned_media",
+            "schedule": settings.MEDIA_GC_INTERVAL_SECONDS,
+        },
+        "collect-expired-idempotency-keys": {
+            "task": "collect_expired_idempotency_keys",
+            "schedule": settings.IDEMPOTENCY_GC_INTERVAL_SECONDS,
+        },
+    },
 )
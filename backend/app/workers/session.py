@@ -0,0 +1,36 @@
+"""Database session helpers for Celery tasks."""
+
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+
+
+@asynccontextmanager
+async def worker_session() -> AsyncIterator[AsyncSession]:
+    """Create a disposable engine + session for a single Celery task.
+
+    Each ``asyncio.run()`` call gets its own event loop.  asyncpg connections
+    are pinned to the loop that created them, so we must NOT reuse the
+    module-level engine (which lives on uvicorn's loop).  Instead we spin up
+    a fresh engine per task and dispose it afterwards — guaranteeing no
+    cross-loop connection leaks.
+    """
+    engine = create_async_engine(settings.DATABASE_URL)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        async with factory() as session:
+            yield session
+    finally:
+        await engine.dispose()
+
+
+async def set_tenant_context(session: AsyncSession, tenant_id: str) -> None:
+    """SET LOCAL app.current_tenant — must be repeated after every commit."""
+    await session.execute(
+        text("SELECT set_config('app.current_tenant', :tid, true)"),
+        {"tid": tenant_id},
+    )
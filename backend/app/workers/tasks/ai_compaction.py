@@ -0,0 +1,116 @@
+"""Celery task: fold old AI chat turns into a stored summary message.
+
+Enqueued by the chat gateways once a conversation has a full batch of
+messages outside its prompt window (see services.ai_messages). The summary
+call is charged to the tenant's AI quota and usage log like a chat turn.
+"""
+
+import asyncio
+import logging
+import uuid
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.ai_conversation import AIConversation
+from app.models.ai_usage_log import AIUsageLog
+from app.models.storefront_ai_conversation import StorefrontAIConversation
+from app.models.storefront_ai_usage_log import StorefrontAIUsageLog
+from app.services.ai_gateway import _compute_cost
+from app.services.ai_messages import ConversationKind, compact_conversation
+from app.services.ai_provider import AIProvider, get_provider
+from app.services.ai_quota import adjust_tokens
+from app.services.ai_usage import mark_ai_usage
+from app.workers.celery_app import celery_app
+from app.workers.session import set_tenant_context, worker_session
+
+logger = logging.getLogger(__name__)
+
+
+async def _process_compaction(
+    session: AsyncSession,
+    kind: ConversationKind,
+    tenant_id: str,
+    conversation_id: str,
+    max_turns: int,
+    provider: AIProvider,
+) -> bool:
+    """Core compaction logic. Returns True if a summary was written."""
+    await set_tenant_context(session, tenant_id)
+
+    # Serialise compactions of one conversation without locking its row: the
+    # summary call can take seconds, and chat turns update that row meanwhile.
+    locked = (
+        await session.execute(
+            text("SELECT pg_try_advisory_xact_lock(hashtext(:key))"),
+            {"key": f"ai_compaction:{conversation_id}"},
+        )
+    ).scalar_one()
+    if not locked:
+        logger.info("AI conversation %s (%s) already compacting; skipped", conversation_id, kind)
+        await session.rollback()
+        return False
+
+    model = AIConversation if kind == "dashboard" else StorefrontAIConversation
+    conversation = (
+        await session.execute(select(model).where(model.id == uuid.UUID(conversation_id)))
+    ).scalar_one_or_none()
+    if conversation is None:
+        logger.warning("AI conversation %s (%s) not found", conversation_id, kind)
+        await session.rollback()
+        return False
+
+    response = await compact_conversation(
+        session,
+        tenant_id=conversation.tenant_id,
+        kind=kind,
+        conversation_id=conversation.id,
+        max_turns=max_turns,
+        provider=provider,
+    )
+    if response is None:
+        await session.rollback()
+        return False
+
+    cost = _compute_cost(response.model, response.tokens_in, response.tokens_out)
+    if kind == "dashboard":
+        log: AIUsageLog | StorefrontAIUsageLog = AIUsageLog(
+            tenant_id=conversation.tenant_id,
+            user_id=conversation.user_id,
+            conversation_id=conversation.id,
+            model=response.model,
+            tokens_in=response.tokens_in,
+            tokens_out=response.tokens_out,
+            cost_usd=cost,
+        )
+    else:
+        log = StorefrontAIUsageLog(
+            tenant_id=conversation.tenant_id,
+            session_id=conversation.session_id,
+            conversation_id=conversation.id,
+            model=response.model,
+            tokens_in=response.tokens_in,
+            tokens_out=response.tokens_out,
+            cost_usd=cost,
+        )
+    session.add(log)
+    await session.flush()
+    await mark_ai_usage(session, conversation.tenant_id)
+    await session.commit()
+    await adjust_tokens(tenant_id, response.tokens_in + response.tokens_out)
+    return True
+
+
+@celery_app.task(name="compact_ai_conversation", ignore_result=True)
+def compact_ai_conversation(
+    kind: ConversationKind, tenant_id: str, conversation_id: str, max_turns: int
+) -> None:
+    """Summarise AI chat turns that have fallen out of the prompt window."""
+
+    async def _run() -> None:
+        async with worker_session() as session:
+            await _process_compaction(
+                session, kind, tenant_id, conversation_id, max_turns, get_provider()
+            )
+
+    asyncio.run(_run())
@@ -0,0 +1,147 @@
+"""Celery task: fold raw AI usage logs into hourly/daily rollups.
+
+Runs on a beat schedule (``AI_USAGE_ROLLUP_INTERVAL_SECONDS``). Each run
+aggregates log rows created in [high-water mark, now - ROLLUP_LAG), adds
+them onto ``ai_usage_rollups`` and advances the mark in the same
+transaction, so a failed run is simply retried from the old mark. Log rows
+stamp ``created_at`` with clock_timestamp() at insert, just before their
+transaction commits; the lag leaves room for that commit.
+
+The logs are RLS-protected, so the job aggregates tenant by tenant under
+each tenant's context (one index range scan per tenant and log). It only
+visits tenants whose ``ai_usage_at`` stamp (see ai_usage.mark_ai_usage) is
+at most ``MARK_INTERVAL`` before the mark; a stamp is never more than that
+earlier than the tenant's newest log row, so skipped tenants have nothing
+to roll up.
+Tenants with new usage then get their Redis monthly quota counter
+reconciled with the logged month-to-date usage (see
+ai_quota.reconcile_month_counters).
+"""
+
+import asyncio
+import logging
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.ai_usage_rollup import AIUsageRollupState
+from app.models.tenant import Tenant
+from app.services.ai_quota import reconcile_month_counters
+from app.services.ai_usage import MARK_INTERVAL, ROLLUP_JOB
+from app.workers.celery_app import celery_app
+from app.workers.session import set_tenant_context, worker_session
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_LAG = timedelta(minutes=2)
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+_ROLLUP_SQL = text(
+    """
+    INSERT INTO ai_usage_rollups AS r (
+        tenant_id, period, bucket_start, channel, model,
+        tokens_in, tokens_out, cost_usd, request_count
+    )
+    SELECT :tenant_id, p.period, date_trunc(p.period, s.created_at, 'UTC'), s.channel,
+           s.model, SUM(s.tokens_in), SUM(s.tokens_out), SUM(s.cost_usd), COUNT(*)
+    FROM (
+        SELECT 'dashboard' AS channel, model, tokens_in, tokens_out, cost_usd, created_at
+        FROM ai_usage_log
+        WHERE tenant_id = :tenant_id AND created_at >= :start AND created_at < :end
+        UNION ALL
+        SELECT 'storefront', model, tokens_in, tokens_out, cost_usd, created_at
+        FROM storefront_ai_usage_log
+        WHERE tenant_id = :tenant_id AND created_at >= :start AND created_at < :end
+    ) s
+    CROSS JOIN (VALUES ('hour'), ('day')) AS p(period)
+    GROUP BY 2, 3, 4, 5
+    ON CONFLICT (tenant_id, period, bucket_start, channel, model) DO UPDATE SET
+        tokens_in = r.tokens_in + EXCLUDED.tokens_in,
+        tokens_out = r.tokens_out + EXCLUDED.tokens_out,
+        cost_usd = r.cost_usd + EXCLUDED.cost_usd,
+        request_count = r.request_count + EXCLUDED.request_count
+    """
+)
+
+# Month-to-date tokens: daily rollups + raw rows not rolled up yet.
+_MONTH_TOKENS_SQL = text(
+    """
+    SELECT
+        COALESCE((
+            SELECT SUM(tokens_in + tokens_out) FROM ai_usage_rollups
+            WHERE tenant_id = :tenant_id AND period = 'day' AND bucket_start >= :month_start
+        ), 0)
+        + COALESCE((
+            SELECT SUM(tokens_in + tokens_out) FROM ai_usage_log
+            WHERE tenant_id = :tenant_id AND created_at >= GREATEST(:end, :month_start)
+        ), 0)
+        + COALESCE((
+            SELECT SUM(tokens_in + tokens_out) FROM storefront_ai_usage_log
+            WHERE tenant_id = :tenant_id AND created_at >= GREATEST(:end, :month_start)
+        ), 0)
+    """
+)
+
+
+async def _process_usage_rollup(session: AsyncSession, now: datetime | None = None) -> int:
+    """Core rollup logic. Returns the number of rollup rows written."""
+    end = (now or datetime.now(UTC)) - ROLLUP_LAG
+
+    # Row lock on the job state serialises overlapping runs.
+    await session.execute(
+        insert(AIUsageRollupState)
+        .values(job=ROLLUP_JOB, rolled_up_to=_EPOCH)
+        .on_conflict_do_nothing(index_elements=["job"])
+    )
+    state = (
+        await session.execute(
+            select(AIUsageRollupState)
+            .where(AIUsageRollupState.job == ROLLUP_JOB)
+            .with_for_update()
+        )
+    ).scalar_one()
+    start = state.rolled_up_to
+    if end <= start:
+        await session.rollback()
+        return 0
+
+    month_start = end.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    recent = select(Tenant.id).where(Tenant.ai_usage_at >= start - MARK_INTERVAL)
+    tenant_ids = (await session.execute(recent)).scalars().all()
+    written = 0
+    used_by_tenant: dict[str, int] = {}
+    for tenant_id in tenant_ids:
+        await set_tenant_context(session, str(tenant_id))
+        params = {"tenant_id": tenant_id, "start": start, "end": end}
+        rows = (await session.execute(_ROLLUP_SQL, params)).rowcount
+        if not rows:
+            continue
+        written += rows
+        used = await session.execute(_MONTH_TOKENS_SQL, {**params, "month_start": month_start})
+        used_by_tenant[str(tenant_id)] = int(used.scalar_one())
+
+    state.rolled_up_to = end
+    state.updated_at = datetime.now(UTC)
+    await session.commit()
+
+    try:
+        await reconcile_month_counters(used_by_tenant, settings.AI_QUOTA_RECONCILE_SLACK_TOKENS)
+    except Exception:
+        logger.warning("AI quota counter reconciliation failed", exc_info=True)
+
+    logger.info("AI usage rolled up to %s: %d rollup rows", end.isoformat(), written)
+    return written
+
+
+@celery_app.task(name="rollup_ai_usage", ignore_result=True)
+def rollup_ai_usage() -> None:
+    """Incrementally aggregate AI usage logs into ai_usage_rollups."""
+
+    async def _run() -> None:
+        async with worker_session() as session:
+            await _process_usage_rollup(session)
+
+    asyncio.run(_run())
@@ -0,0 +1,158 @@
+"""Celery task for bulk catalog imports.
+
+The uploaded file is streamed from ``{tenant_id}/imports/`` into a spooled
+temp file, validated in memory, checked against the catalog with set-based
+queries and loaded in one transaction (see ``services.catalog_import``).
+The tenant's catalog version is bumped before the checks, which takes the
+per-tenant catalog write lock, so no product created concurrently can slip
+between the collision checks and the insert.
+"""
+
+import asyncio
+import logging
+import tempfile
+import uuid
+from datetime import UTC, datetime
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.catalog_import_job import CatalogImportJob
+from app.services.catalog_import import (
+    MAX_REPORTED_ERRORS,
+    CatalogImportError,
+    build_plan,
+    check_against_catalog,
+    load_catalog,
+    read_rows,
+)
+from app.services.catalog_version import bump_catalog_version
+from app.services.storage import delete_object, download_to_file
+from app.workers.celery_app import celery_app
+from app.workers.session import set_tenant_context, worker_session
+
+logger = logging.getLogger(__name__)
+
+_SPOOL_MAX_BYTES = 2 * 1024 * 1024
+_MAX_ERROR_CHARS = 500
+
+
+async def _finish_failed(
+    session: AsyncSession,
+    tenant_id: str,
+    job_id: str,
+    *,
+    error: str,
+    errors: list[dict] | None = None,
+    row_count: int | None = None,
+) -> None:
+    await session.rollback()
+    await set_tenant_context(session, tenant_id)
+    job = await session.get(CatalogImportJob, uuid.UUID(job_id))
+    if job is None:
+        return
+    job.status = "failed"
+    job.error = error[:_MAX_ERROR_CHARS]
+    job.row_count = row_count
+    if errors:
+        job.errors = errors[:MAX_REPORTED_ERRORS]
+        job.error_count = len(errors)
+    job.completed_at = datetime.now(UTC)
+    await session.commit()
+
+
+async def _process_catalog_import(session: AsyncSession, tenant_id: str, job_id: str) -> None:
+    """Core import logic. Accepts a session for testability."""
+    await set_tenant_context(session, tenant_id)
+
+    result = await session.execute(
+        select(CatalogImportJob).where(CatalogImportJob.id == uuid.UUID(job_id)).with_for_update()
+    )
+    job = result.scalar_one_or_none()
+    if job is None:
+        logger.warning("Catalog import job %s not found", job_id)
+        return
+    if job.status != "pending":
+        # Redelivered or already picked up by another worker.
+        logger.info("Catalog import job %s is %s, skipping", job_id, job.status)
+        return
+
+    job.status = "running"
+    job.started_at = datetime.now(UTC)
+    await session.commit()
+    await set_tenant_context(session, tenant_id)
+
+    s3_key, fmt, tid = job.s3_key, job.format, job.tenant_id
+    try:
+        with tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_BYTES) as source:
+            await asyncio.to_thread(download_to_file, s3_key, source)
+            source.seek(0)
+            rows = read_rows(fmt, source)
+    except CatalogImportError as exc:
+        await _finish_failed(session, tenant_id, job_id, error=str(exc))
+        _discard_upload(s3_key)
+        return
+    except Exception as exc:
+        logger.exception("Catalog import job %s: failed to read upload", job_id)
+        await _finish_failed(session, tenant_id, job_id, error=str(exc) or type(exc).__name__)
+        return
+
+    plan = build_plan(rows)
+    try:
+        await bump_catalog_version(session, tid)
+        await check_against_catalog(session, tid, plan)
+        if plan.errors:
+            await _finish_failed(
+                session,
+                tenant_id,
+                job_id,
+                error=f"{len(plan.errors)} row errors; nothing was imported",
+                errors=plan.errors,
+                row_count=plan.row_count,
+            )
+            _discard_upload(s3_key)
+            return
+        await load_catalog(session, tid, plan)
+    except IntegrityError:
+        # Unique index hit despite the checks (e.g. a code written outside
+        # the catalog lock); the whole load rolls back.
+        logger.warning("Catalog import job %s hit a uniqueness conflict", job_id)
+        await _finish_failed(
+            session,
+            tenant_id,
+            job_id,
+            error="Catalog changed during import; nothing was imported, please retry",
+            row_count=plan.row_count,
+        )
+        return
+    except Exception as exc:
+        logger.exception("Catalog import job %s failed", job_id)
+        await _finish_failed(session, tenant_id, job_id, error=str(exc) or type(exc).__name__)
+        return
+
+    job.status = "completed"
+    job.row_count = plan.row_count
+    job.products_created = len(plan.products)
+    job.variants_created = len(plan.variants)
+    job.completed_at = datetime.now(UTC)
+    await session.commit()
+    _discard_upload(s3_key)
+
+
+def _discard_upload(key: str) -> None:
+    try:
+        delete_object(key)
+    except Exception:
+        logger.warning("Failed to delete import upload %s", key, exc_info=True)
+
+
+@celery_app.task(name="run_catalog_import", ignore_result=True)
+def run_catalog_import(tenant_id: str, job_id: str) -> None:
+    """Validate and load an uploaded catalog file in one transaction."""
+
+    async def _run() -> None:
+        async with worker_session() as session:
+            await _process_catalog_import(session, tenant_id, job_id)
+
+    asyncio.run(_run())
@@ -0,0 +1,116 @@
+"""Celery task for background tenant data exports.
+
+Rows are streamed from Postgres in batches (server-side cursor), encoded by
+the format writer, and shipped to ``{tenant_id}/exports/`` through an S3
+multipart upload, so neither the API worker nor the Celery worker ever holds
+the full export in memory.
+"""
+
+import asyncio
+import logging
+import uuid
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.export_job import ExportJob
+from app.services.exports import EXPORT_SPECS, FORMAT_FILE_INFO, open_export_writer
+from app.services.storage import MultipartUpload, build_export_key
+from app.workers.celery_app import celery_app
+from app.workers.session import set_tenant_context, worker_session
+
+logger = logging.getLogger(__name__)
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_RESULT_TTL = timedelta(hours=24)
+_MAX_ERROR_CHARS = 500
+
+
+def export_query(job: ExportJob):  # type: ignore[no-untyped-def]
+    """Oldest-first SELECT for the job's entity and date range."""
+    model = EXPORT_SPECS[job.entity].model
+    stmt = (
+        select(model).where(model.tenant_id == job.tenant_id).order_by(model.created_at, model.id)
+    )
+    if job.start_date:
+        stmt = stmt.where(model.created_at >= job.start_date)
+    if job.end_date:
+        stmt = stmt.where(model.created_at < job.end_date)
+    return stmt
+
+
+async def _process_export_job(session: AsyncSession, tenant_id: str, job_id: str) -> None:
+    """Core export logic. Accepts a session for testability."""
+    await set_tenant_context(session, tenant_id)
+
+    result = await session.execute(
+        select(ExportJob).where(ExportJob.id == uuid.UUID(job_id)).with_for_update()
+    )
+    job = result.scalar_one_or_none()
+    if job is None:
+        logger.warning("Export job %s not found", job_id)
+        return
+    if job.status != "pending":
+        # Redelivered or already picked up by another worker.
+        logger.info("Export job %s is %s, skipping", job_id, job.status)
+        return
+
+    job.status = "running"
+    job.started_at = datetime.now(UTC)
+    await session.commit()
+    await set_tenant_context(session, tenant_id)
+
+    spec = EXPORT_SPECS[job.entity]
+    columns, build_rows = spec.layout(job.format)
+    extension, content_type = FORMAT_FILE_INFO[job.format]
+    key = build_export_key(job.tenant_id, job.id, extension)
+
+    upload = MultipartUpload(key, content_type)
+    row_count = 0
+    try:
+        writer = open_export_writer(job.format, upload, columns)
+        stream = await session.stream_scalars(
+            export_query(job).execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        async for batch in stream.partitions():
+            rows = [row for record in batch for row in build_rows(record)]
+            writer.write_rows(rows)
+            row_count += len(rows)
+        writer.close()
+        upload.close()
+    except Exception as exc:
+        logger.exception("Export job %s failed", job_id)
+        try:
+            upload.abort()
+        except Exception:
+            logger.warning("Failed to abort multipart upload for %s", key, exc_info=True)
+        await session.rollback()
+        await set_tenant_context(session, tenant_id)
+        job = await session.get(ExportJob, uuid.UUID(job_id))
+        if job is not None:
+            job.status = "failed"
+            job.error = str(exc)[:_MAX_ERROR_CHARS] or type(exc).__name__
+            job.completed_at = datetime.now(UTC)
+            await session.commit()
+        return
+
+    now = datetime.now(UTC)
+    job.status = "completed"
+    job.s3_key = key
+    job.row_count = row_count
+    job.size_bytes = upload.size_bytes
+    job.completed_at = now
+    job.expires_at = now + EXPORT_RESULT_TTL
+    await session.commit()
+
+
+@celery_app.task(name="run_export_job", ignore_result=True)
+def run_export_job(tenant_id: str, job_id: str) -> None:
+    """Stream a tenant export to object storage and mark the job completed."""
+
+    async def _run() -> None:
+        async with worker_session() as session:
+            await _process_export_job(session, tenant_id, job_id)
+
+    asyncio.run(_run())
@@ -0,0 +1,59 @@
+"""Celery task: delete expired idempotency keys.
+
+Runs on a beat schedule (``IDEMPOTENCY_GC_INTERVAL_SECONDS``). Rows older
+than ``IDEMPOTENCY_TTL_SECONDS`` are no longer replayed (a new request with
+the same key reclaims them), so they are deleted tenant by tenant, each
+under its own tenant context.
+"""
+
+import asyncio
+import logging
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.idempotency_key import IdempotencyKey
+from app.models.tenant import Tenant
+from app.workers.celery_app import celery_app
+from app.workers.session import set_tenant_context, worker_session
+
+logger = logging.getLogger(__name__)
+
+
+async def _process_idempotency_gc(session: AsyncSession, now: datetime | None = None) -> int:
+    """Delete expired keys of every tenant. Returns the number of rows deleted."""
+    cutoff = (now or datetime.now(UTC)) - timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS)
+    tenant_ids = (await session.execute(select(Tenant.id))).scalars().all()
+    await session.rollback()
+
+    total = 0
+    for tenant_id in tenant_ids:
+        try:
+            await set_tenant_context(session, str(tenant_id))
+            result = await session.execute(
+                delete(IdempotencyKey).where(
+                    IdempotencyKey.tenant_id == tenant_id, IdempotencyKey.created_at < cutoff
+                )
+            )
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            logger.exception("Idempotency GC failed for tenant %s", tenant_id)
+            continue
+        total += result.rowcount
+
+    logger.info("Idempotency GC: %d expired keys deleted", total)
+    return total
+
+
+@celery_app.task(name="collect_expired_idempotency_keys", ignore_result=True)
+def collect_expired_idempotency_keys() -> None:
+    """Delete idempotency keys past their replay window."""
+
+    async def _run() -> None:
+        async with worker_session() as session:
+            await _process_idempotency_gc(session)
+
+    asyncio.run(_run())
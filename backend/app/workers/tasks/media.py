@@ -0,0 +1,80 @@
+"""Celery task: resized WebP/JPEG derivatives for uploaded product images.
+
+Queued by ``POST /tenants/me/media/{id}/confirm`` once the client's direct
+upload is in the bucket (the confirm call stands in for a bucket event
+notification). The original is streamed from S3 into a spooled temp file,
+resized by services.media_derivatives and each derivative is streamed back
+to S3 with MultipartUpload. The descriptors land on
+``media_assets.derivatives``; storefront listings then serve a srcset.
+
+Re-running the task overwrites the same keys, so redelivery is harmless.
+"""
+
+import asyncio
+import logging
+import tempfile
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.media_asset import MediaAsset
+from app.services.media_derivatives import (
+    DERIVATIVE_FORMATS,
+    IMAGE_CONTENT_TYPES,
+    UnsupportedImageError,
+    generate_derivatives,
+)
+from app.services.storage import MultipartUpload, build_derivative_key, download_to_file
+from app.workers.celery_app import celery_app
+from app.workers.session import set_tenant_context, worker_session
+
+logger = logging.getLogger(__name__)
+
+# Originals up to this size stay in memory; larger ones spill to disk.
+_SPOOL_MAX_BYTES = 2 * 1024 * 1024
+
+
+async def _process_media_derivatives(session: AsyncSession, tenant_id: str, media_id: str) -> int:
+    """Core derivative logic. Returns the number of derivatives written."""
+    await set_tenant_context(session, tenant_id)
+
+    result = await session.execute(select(MediaAsset).where(MediaAsset.id == uuid.UUID(media_id)))
+    asset = result.scalar_one_or_none()
+    if asset is None:
+        logger.warning("Media asset %s not found", media_id)
+        return 0
+    if asset.content_type not in IMAGE_CONTENT_TYPES:
+        logger.info("Media asset %s is %s, no derivatives", media_id, asset.content_type)
+        return 0
+
+    def open_output(width: int, fmt: str) -> MultipartUpload:
+        extension, content_type, _ = DERIVATIVE_FORMATS[fmt]
+        key = build_derivative_key(asset.tenant_id, asset.id, width, extension)
+        return MultipartUpload(key, content_type)
+
+    with tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_BYTES) as source:
+        download_to_file(asset.s3_key, source)
+        source.seek(0)
+        try:
+            derivatives = generate_derivatives(source, open_output)
+        except UnsupportedImageError as exc:
+            # Recorded as processed-with-nothing so listings use the original.
+            logger.warning("Media asset %s: no derivatives (%s)", media_id, exc)
+            derivatives = []
+
+    asset.derivatives = derivatives
+    await session.commit()
+    logger.info("Media asset %s: %d derivatives", media_id, len(derivatives))
+    return len(derivatives)
+
+
+@celery_app.task(name="generate_media_derivatives", ignore_result=True)
+def generate_media_derivatives(tenant_id: str, media_id: str) -> None:
+    """Resize one uploaded image into its WebP/JPEG derivatives."""
+
+    async def _run() -> None:
+        async with worker_session() as session:
+            await _process_media_derivatives(session, tenant_id, media_id)
+
+    asyncio.run(_run())
@@ -0,0 +1,174 @@
+"""Celery task: garbage-collect orphaned media rows and S3 objects.
+
+Media rows are created before the client uploads and deletes of S3 objects
+are best-effort, so rows and objects drift apart. Runs on a beat schedule
+(``MEDIA_GC_INTERVAL_SECONDS``). For every tenant it:
+
+  1. deletes ``media_assets`` rows still pending (never confirmed) after
+     the grace period; their objects, if any, become unreferenced
+  2. streams the ``{tenant_id}/media/`` listing page by page and set-diffs
+     each page against ``media_assets`` keys (derivative objects are
+     referenced through their asset id; the storefront logo is kept)
+  3. deletes unreferenced objects older than the grace period with
+     DeleteObjects, 1000 keys per request
+
+Rows are deleted (and committed) before their objects, so a failed run
+leaves only orphaned objects, which the next run picks up. Nothing younger
+than ``MEDIA_GC_GRACE_HOURS`` is touched, which covers in-flight uploads.
+"""
+
+import asyncio
+import logging
+import uuid
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.media_asset import MediaAsset
+from app.models.storefront_config import StorefrontConfig
+from app.models.tenant import Tenant
+from app.services.storage import (
+    DELETE_BATCH_SIZE,
+    delete_objects,
+    derivative_media_id,
+    iter_object_pages,
+)
+from app.workers.celery_app import celery_app
+from app.workers.session import set_tenant_context, worker_session
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MediaGCStats:
+    rows_deleted: int = 0
+    objects_scanned: int = 0
+    objects_deleted: int = 0
+    bytes_reclaimed: int = 0
+    delete_errors: int = 0
+
+    def add(self, other: "MediaGCStats") -> None:
+        self.rows_deleted += other.rows_deleted
+        self.objects_scanned += other.objects_scanned
+        self.objects_deleted += other.objects_deleted
+        self.bytes_reclaimed += other.bytes_reclaimed
+        self.delete_errors += other.delete_errors
+
+
+async def _referenced_keys(
+    session: AsyncSession, tenant_id: uuid.UUID, keys: list[str]
+) -> set[str]:
+    """The subset of *keys* still referenced by a media_assets row."""
+    result = await session.execute(
+        select(MediaAsset.s3_key).where(
+            MediaAsset.tenant_id == tenant_id, MediaAsset.s3_key.in_(keys)
+        )
+    )
+    referenced = set(result.scalars().all())
+
+    owners = {key: derivative_media_id(key) for key in keys if key not in referenced}
+    owner_ids = {media_id for media_id in owners.values() if media_id is not None}
+    if owner_ids:
+        result = await session.execute(
+            select(MediaAsset.id).where(
+                MediaAsset.tenant_id == tenant_id, MediaAsset.id.in_(owner_ids)
+            )
+        )
+        live = set(result.scalars().all())
+        referenced.update(key for key, media_id in owners.items() if media_id in live)
+    return referenced
+
+
+def _delete(objects: list[dict], stats: MediaGCStats) -> None:
+    failed = set(delete_objects([obj["key"] for obj in objects]))
+    for obj in objects:
+        if obj["key"] in failed:
+            stats.delete_errors += 1
+        else:
+            stats.objects_deleted += 1
+            stats.bytes_reclaimed += obj["size_bytes"]
+
+
+async def _collect_tenant_media(
+    session: AsyncSession, tenant_id: uuid.UUID, cutoff: datetime
+) -> MediaGCStats:
+    """GC one tenant's media. Objects/rows newer than *cutoff* are kept."""
+    stats = MediaGCStats()
+    await set_tenant_context(session, str(tenant_id))
+    # The tenant_id filters are defense-in-depth on top of RLS.
+    logo_key = (
+        await session.execute(
+            select(StorefrontConfig.logo_s3_key).where(StorefrontConfig.tenant_id == tenant_id)
+        )
+    ).scalar_one_or_none()
+
+    stale = delete(MediaAsset).where(
+        MediaAsset.tenant_id == tenant_id,
+        MediaAsset.status == "pending",
+        MediaAsset.created_at < cutoff,
+    )
+    if logo_key:
+        stale = stale.where(MediaAsset.s3_key != logo_key)
+    result = await session.execute(stale.returning(MediaAsset.id))
+    stats.rows_deleted = len(result.all())
+    await session.commit()
+    await set_tenant_context(session, str(tenant_id))
+
+    orphans: list[dict] = []
+    for page in iter_object_pages(f"{tenant_id}/media/"):
+        stats.objects_scanned += len(page)
+        candidates = [o for o in page if o["last_modified"] < cutoff and o["key"] != logo_key]
+        if not candidates:
+            continue
+        referenced = await _referenced_keys(session, tenant_id, [o["key"] for o in candidates])
+        orphans.extend(o for o in candidates if o["key"] not in referenced)
+        while len(orphans) >= DELETE_BATCH_SIZE:
+            _delete(orphans[:DELETE_BATCH_SIZE], stats)
+            del orphans[:DELETE_BATCH_SIZE]
+    if orphans:
+        _delete(orphans, stats)
+    await session.rollback()  # read-only from here on; end the transaction
+    return stats
+
+
+async def _process_media_gc(session: AsyncSession, now: datetime | None = None) -> MediaGCStats:
+    """Core GC logic over all tenants. Returns the totals."""
+    cutoff = (now or datetime.now(UTC)) - timedelta(hours=settings.MEDIA_GC_GRACE_HOURS)
+    tenant_ids = (await session.execute(select(Tenant.id))).scalars().all()
+    await session.rollback()
+
+    total = MediaGCStats()
+    for tenant_id in tenant_ids:
+        try:
+            stats = await _collect_tenant_media(session, tenant_id, cutoff)
+        except Exception:
+            await session.rollback()
+            logger.exception("Media GC failed for tenant %s", tenant_id)
+            continue
+        if stats.rows_deleted or stats.objects_deleted or stats.delete_errors:
+            logger.info("Media GC tenant %s: %s", tenant_id, stats)
+        total.add(stats)
+
+    logger.info(
+        "Media GC: %d pending rows deleted, %d of %d objects deleted (%d bytes), %d errors",
+        total.rows_deleted,
+        total.objects_deleted,
+        total.objects_scanned,
+        total.bytes_reclaimed,
+        total.delete_errors,
+    )
+    return total
+
+
+@celery_app.task(name="collect_orphaned_media", ignore_result=True)
+def collect_orphaned_media() -> None:
+    """Delete never-uploaded media rows and unreferenced media objects."""
+
+    async def _run() -> None:
+        async with worker_session() as session:
+            await _process_media_gc(session)
+
+    asyncio.run(_run())
@@ -0,0 +1,145 @@
+"""Benchmark AI quota reservation: token-estimate accuracy and throughput.
+
+Builds realistic chat prompts from a synthetic catalog: the system prompt,
+retrieved catalog context, English/Arabic history and the user message. On
+those prompts it measures:
+
+  - accuracy of ``estimate_prompt_tokens`` against a reference BPE tokenizer
+    (tiktoken, if installed and its encoding files are available)
+  - how often the old fixed 500-token reservation was below the real prompt
+  - estimator throughput (system prompt counts are memoised)
+  - with ``--redis``: reservations/s against REDIS_URL with and without
+    per-process quota leases
+
+Usage (from backend/):
+  python -m scripts.bench_ai_tokens [--prompts 2000] [--encoding o200k_base] [--redis]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid
+from unittest.mock import patch
+
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+from app.services.ai_gateway import _SYSTEM_INSTRUCTIONS
+from app.services.ai_quota import _month_key, release_leases, reserve_tokens
+from app.services.ai_tokens import estimate_prompt_tokens
+
+_LEGACY_RESERVATION = 500
+
+_PRODUCTS = ["Blue ceramic mug", "Organic dates 1kg", "Leather backpack", "Oud candle"]
+_PRODUCTS_AR = ["كوب سيراميك أزرق", "تمر عضوي ١ كغ", "حقيبة ظهر جلدية", "شمعة عود"]
+_QUESTIONS = [
+    "Do you deliver to Salmiya and how long does it take?",
+    "What's the price of the {p}? Is it in stock?",
+    "Can I pay with KNET or cash on delivery?",
+    "هل يوجد توصيل إلى السالمية؟",
+    "كم سعر {p}؟",
+    "I ordered #ORD-10482 yesterday, when will it ship?",
+]
+_ANSWERS = [
+    "Yes! We deliver across Kuwait within 1-2 business days. Delivery to Salmiya is 1.000 KWD.",
+    "The {p} is 4.500 KWD and currently in stock (12 left).",
+    "نعم، التوصيل متاح خلال يومين عمل. رسوم التوصيل ١ دينار.",
+    "We accept KNET, Visa/Mastercard and cash on delivery.",
+]
+
+
+def _prompt(rng: random.Random) -> list[dict[str, str]]:
+    catalog = "\n".join(
+        f"- {rng.choice(_PRODUCTS + _PRODUCTS_AR)} {i}: {rng.randint(500, 50000) / 1000:.3f} KWD"
+        for i in range(rng.randint(3, 15))
+    )
+    messages = [
+        {"role": "system", "content": f"{_SYSTEM_INSTRUCTIONS}Business: Demo Store"},
+        {"role": "system", "content": f"Available products/services:\n{catalog}"},
+    ]
+    for _ in range(rng.randint(0, 10)):
+        p = rng.choice(_PRODUCTS + _PRODUCTS_AR)
+        messages.append({"role": "user", "content": rng.choice(_QUESTIONS).format(p=p)})
+        messages.append({"role": "assistant", "content": rng.choice(_ANSWERS).format(p=p)})
+    p = rng.choice(_PRODUCTS)
+    messages.append({"role": "user", "content": rng.choice(_QUESTIONS).format(p=p)})
+    return messages
+
+
+def _reference_counter(encoding: str):
+    try:
+        import tiktoken
+
+        enc = tiktoken.get_encoding(encoding)
+    except Exception as exc:  # not installed, or encoding files not downloadable
+        print(f"reference:         unavailable ({type(exc).__name__}); accuracy skipped")
+        return None
+
+    def count(messages: list[dict[str, str]]) -> int:
+        return 3 + sum(4 + len(enc.encode(m["content"])) for m in messages)
+
+    return count
+
+
+async def _reservations_per_second(n: int, lease_tokens: int) -> float:
+    tenant_id = str(uuid.uuid4())
+    with patch.object(settings, "AI_QUOTA_LEASE_TOKENS", lease_tokens):
+        start = time.perf_counter()
+        for _ in range(n):
+            await reserve_tokens(tenant_id, 1500, hard_limit=10**12)
+        elapsed = time.perf_counter() - start
+    await release_leases()
+
+    r = aioredis.from_url(settings.REDIS_URL)
+    try:
+        await r.delete(_month_key(tenant_id))
+    finally:
+        await r.aclose()
+    return n / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--prompts", type=int, default=2000)
+    parser.add_argument("--encoding", default="o200k_base")
+    parser.add_argument("--redis", action="store_true")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    prompts = [_prompt(rng) for _ in range(args.prompts)]
+
+    start = time.perf_counter()
+    estimates = [estimate_prompt_tokens(m) for m in prompts]
+    elapsed = time.perf_counter() - start
+
+    print(f"prompts:           {args.prompts}")
+    print(f"estimated tokens:  p50 {statistics.median(estimates):.0f}, max {max(estimates)}")
+    print(f"estimator:         {args.prompts / elapsed:,.0f} prompts/s")
+
+    reference = _reference_counter(args.encoding)
+    if reference is not None:
+        actual = [reference(m) for m in prompts]
+        errors = sorted(100 * (e - a) / a for e, a in zip(estimates, actual, strict=True))
+        under = sum(1 for e in errors if e < 0) / len(errors)
+        legacy_under = sum(1 for a in actual if a > _LEGACY_RESERVATION) / len(actual)
+        print(f"reference:         tiktoken {args.encoding}, p50 {statistics.median(actual):.0f}")
+        print(
+            f"estimate error:    mean {statistics.mean(errors):+.1f}%, "
+            f"p5 {errors[int(len(errors) * 0.05)]:+.1f}%, "
+            f"p95 {errors[int(len(errors) * 0.95)]:+.1f}%"
+        )
+        print(f"under-estimated:   {under:.1%} of prompts")
+        print(f"fixed 500 short:   {legacy_under:.1%} of prompts (before output tokens)")
+
+    if args.redis:
+        n = 2000
+        for lease in (0, settings.AI_QUOTA_LEASE_TOKENS):
+            rate = asyncio.run(_reservations_per_second(n, lease))
+            label = "no lease" if lease == 0 else f"lease {lease}"
+            print(f"{'reserve (' + label + '):':<22} {rate:,.0f} /s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Benchmark the AI catalog retrieval index on a synthetic catalog.
+
+Measures index build time, per-message query time, and the size of the
+catalog section of the storefront prompt: the old fixed "first 50 products"
+block versus the top-k retrieved block. Tokens are estimated at ~4 characters
+per token, the usual rule of thumb for English text with OpenAI/Anthropic
+tokenizers.
+
+Usage (from backend/):
+  python -m scripts.bench_catalog_index [--products 20000] [--queries 200]
+"""
+
+import argparse
+import random
+import statistics
+import time
+from decimal import Decimal
+
+from app.services.catalog_index import build_catalog_index
+from app.services.storefront_ai_gateway import _CATALOG_TOP_K, _DESCRIPTION_CHARS
+
+_ADJECTIVES = ["Blue", "Organic", "Handmade", "Vintage", "Large", "Mini", "Premium", "Classic"]
+_NOUNS = ["mug", "scarf", "notebook", "candle", "tea", "coffee", "backpack", "lamp", "dates"]
+_MATERIALS = ["ceramic", "cotton", "leather", "oak", "glass", "wool", "brass", "linen"]
+
+
+def _catalog(n: int, rng: random.Random) -> list[tuple]:
+    rows = []
+    for i in range(n):
+        name = f"{rng.choice(_ADJECTIVES)} {rng.choice(_MATERIALS)} {rng.choice(_NOUNS)} {i}"
+        description = (
+            f"A {rng.choice(_MATERIALS)} {rng.choice(_NOUNS)} made in small batches. "
+            f"Pairs well with our {rng.choice(_NOUNS)} range and ships within two days."
+        )
+        price = Decimal(rng.randint(500, 50000)) / 1000
+        rows.append((name, None, description, f"SKU-{i:06d}", price, None))
+    return rows
+
+
+def _prompt_block(rows: list[tuple]) -> str:
+    return "\n".join(
+        f"- {name}: {price} KWD — {(desc or '')[:_DESCRIPTION_CHARS]}"
+        for name, _ar, desc, _sku, price, _cur in rows
+    )
+
+
+def _legacy_block(rows: list[tuple]) -> str:
+    # Pre-retrieval prompt: first 50 products, full descriptions.
+    return "\n".join(
+        f"- {name}: {price} KWD — {desc}" for name, _ar, desc, _sku, price, _cur in rows[:50]
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--products", type=int, default=20_000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    rows = _catalog(args.products, rng)
+
+    start = time.perf_counter()
+    index = build_catalog_index(rows, catalog_version=1)
+    build_s = time.perf_counter() - start
+
+    queries = [
+        f"do you have a {rng.choice(_MATERIALS)} {rng.choice(_NOUNS)}?"
+        for _ in range(args.queries)
+    ]
+    timings = []
+    for q in queries:
+        start = time.perf_counter()
+        index.search(q, _CATALOG_TOP_K)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+
+    by_name = {row[0]: row for row in rows}
+    retrieved = [by_name[e.name] for e in index.search(queries[0], _CATALOG_TOP_K)]
+    legacy_tokens = len(_legacy_block(rows)) / 4
+    retrieved_tokens = len(_prompt_block(retrieved)) / 4
+
+    print(f"products:          {args.products}")
+    print(f"index build:       {build_s * 1000:.0f} ms ({index.vectors.nbytes / 1e6:.1f} MB)")
+    print(
+        f"query (top-{_CATALOG_TOP_K}):    p50 {statistics.median(timings):.2f} ms, "
+        f"p95 {timings[int(len(timings) * 0.95)]:.2f} ms"
+    )
+    print(f"catalog tokens:    legacy ~{legacy_tokens:.0f}, retrieved ~{retrieved_tokens:.0f}")
+    print(f"token reduction:   {100 * (1 - retrieved_tokens / legacy_tokens):.0f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Benchmark create_order latency and SQL statement count per checkout.
+
+Creates a throwaway tenant with one untracked product and ``--customers``
+existing customers, then times ``create_order`` for storefront checkouts
+by a new customer, a returning customer matched by email and one matched
+by phone (with an email not on file). Each order is rolled back, so every "new"
+checkout really creates a customer. Also reports how many SQL statements
+each ``create_order`` call sends (SAVEPOINT commands included).
+
+Run it with the superuser DATABASE_URL (it creates a tenant row), against a
+database migrated to head.
+
+Usage (from backend/):
+  python -m scripts.bench_create_order [--orders 300] [--customers 1000]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid
+from decimal import Decimal
+
+from sqlalchemy import delete, event, insert
+
+from app.models.customer import Customer
+from app.models.product import Product
+from app.models.tenant import Tenant
+from app.schemas.order import OrderItemRequest
+from app.services.order_create import create_order
+from app.workers.session import set_tenant_context, worker_session
+
+_KINDS = ("new customer", "returning, email", "returning, phone")
+
+
+def _percentiles(ms: list[float]) -> str:
+    ms = sorted(ms)
+    return f"p50 {statistics.median(ms):6.2f} ms, p95 {ms[int(len(ms) * 0.95)]:6.2f} ms"
+
+
+async def _bench(n_orders: int, n_customers: int) -> None:
+    rng = random.Random(42)
+    async with worker_session() as session:
+        tenant = Tenant(name="Order benchmark", slug=f"bench-order-{uuid.uuid4().hex[:8]}")
+        session.add(tenant)
+        await session.commit()
+        tid = tenant.id
+
+        await set_tenant_context(session, str(tid))
+        product = Product(
+            tenant_id=tid, name="Bench item", price_amount=Decimal("1.000"), track_inventory=False
+        )
+        session.add(product)
+        await session.execute(
+            insert(Customer),
+            [
+                {
+                    "tenant_id": tid,
+                    "name": f"Customer {i}",
+                    "email": f"c{i}@bench.test",
+                    "phone": f"+9655{i:07d}",
+                }
+                for i in range(n_customers)
+            ],
+        )
+        await session.commit()
+        items = [OrderItemRequest(catalog_item_id=product.id, qty=1)]
+
+        statements = 0
+
+        def _count(*_args: object) -> None:
+            nonlocal statements
+            statements += 1
+
+        engine = session.bind.sync_engine
+        event.listen(engine, "before_cursor_execute", _count)
+        timings: dict[str, list[float]] = {kind: [] for kind in _KINDS}
+        order_statements: dict[str, list[int]] = {kind: [] for kind in _KINDS}
+        try:
+            for i in range(n_orders):
+                kind = _KINDS[i % len(_KINDS)]
+                n = rng.randrange(n_customers)
+                if kind == "new customer":
+                    email, phone = f"new{i}@bench.test", f"+9656{i:07d}"
+                elif kind == "returning, email":
+                    email, phone = f"c{n}@bench.test", f"+9655{n:07d}"
+                else:
+                    email, phone = f"other{i}@bench.test", f"+9655{n:07d}"
+
+                await set_tenant_context(session, str(tid))
+                statements = 0
+                start = time.perf_counter()
+                await create_order(
+                    session,
+                    tenant_id=tid,
+                    tenant_currency="KWD",
+                    items=items,
+                    customer_name="Bench",
+                    customer_phone=phone,
+                    customer_email=email,
+                    source="storefront",
+                    status="pending",
+                )
+                timings[kind].append((time.perf_counter() - start) * 1000)
+                order_statements[kind].append(statements)
+                await session.rollback()
+        finally:
+            event.remove(engine, "before_cursor_execute", _count)
+            await session.rollback()
+            await set_tenant_context(session, str(tid))
+            await session.execute(delete(Customer).where(Customer.tenant_id == tid))
+            await session.execute(delete(Product).where(Product.tenant_id == tid))
+            await session.execute(delete(Tenant).where(Tenant.id == tid))
+            await session.commit()
+
+    print(f"orders:          {n_orders} ({n_customers} existing customers)")
+    print("create_order latency / SQL statements per call:")
+    for kind in _KINDS:
+        print(
+            f"  {kind:<17} {_percentiles(timings[kind])}"
+            f"  statements {statistics.mean(order_statements[kind]):.0f}"
+        )
+    print(f"all orders:      {_percentiles([t for ms in timings.values() for t in ms])}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, default=300)
+    parser.add_argument("--customers", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(_bench(args.orders, args.customers))
+
+
+if __name__ == "__main__":
+    main()
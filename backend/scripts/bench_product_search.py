@@ -0,0 +1,156 @@
+"""Benchmark product search latency on a synthetic large-catalog tenant.
+
+Creates a throwaway tenant with ``--products`` products (English and Arabic
+names, descriptions, SKUs and barcodes registered in catalog_codes), then
+times ``search_products`` for a mix of queries: whole words, word
+prefixes, Arabic with and without hamza, SKU substrings and exact barcodes.
+The tenant is deleted afterwards unless ``--keep`` is given.
+
+Run it with the superuser DATABASE_URL (it creates a tenant row), against a
+database migrated to head. Whether the pg_trgm index exists is printed: the
+substring queries depend on it.
+
+Usage (from backend/):
+  python -m scripts.bench_product_search [--products 50000] [--queries 300] [--keep]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid
+from decimal import Decimal
+
+from sqlalchemy import delete, insert, text
+
+from app.models.catalog_code import CatalogCode
+from app.models.product import Product
+from app.models.tenant import Tenant
+from app.services.product_search import search_products
+from app.workers.session import set_tenant_context, worker_session
+
+_ADJECTIVES = ["Blue", "Organic", "Handmade", "Vintage", "Large", "Mini", "Premium", "Classic"]
+_NOUNS = ["mug", "scarf", "notebook", "candle", "tea", "coffee", "backpack", "lamp", "dates"]
+_MATERIALS = ["ceramic", "cotton", "leather", "oak", "glass", "wool", "brass", "linen"]
+_NOUNS_AR = ["كوب", "وشاح", "دفتر", "شمعة", "شاي", "قهوة", "حقيبة", "مصباح", "تمر"]
+_ADJECTIVES_AR = ["أزرق", "عضوي", "يدوي", "كلاسيكي", "كبير", "صغير", "فاخر", "أصلي"]
+_CHUNK = 5000
+
+
+def _products(tenant_id: uuid.UUID, n: int, rng: random.Random) -> list[dict]:
+    rows = []
+    for i in range(n):
+        noun = rng.randrange(len(_NOUNS))
+        rows.append(
+            {
+                "id": uuid.uuid4(),
+                "tenant_id": tenant_id,
+                "name": f"{rng.choice(_ADJECTIVES)} {rng.choice(_MATERIALS)} {_NOUNS[noun]} {i}",
+                "name_ar": f"{_NOUNS_AR[noun]} {rng.choice(_ADJECTIVES_AR)} {i}",
+                "description": (
+                    f"A {rng.choice(_MATERIALS)} {rng.choice(_NOUNS)} made in small batches. "
+                    f"Pairs well with our {rng.choice(_NOUNS)} range and ships within two days."
+                ),
+                "price_amount": Decimal(rng.randint(500, 50000)) / 1000,
+                "sku": f"SKU-{i:06d}",
+                "barcode": f"629{i:010d}",
+            }
+        )
+    return rows
+
+
+def _queries(n_products: int, count: int, rng: random.Random) -> list[tuple[str, str]]:
+    """(kind, query) pairs."""
+    kinds = {
+        "word": lambda: rng.choice(_NOUNS),
+        "two words": lambda: f"{rng.choice(_MATERIALS)} {rng.choice(_NOUNS)}",
+        "prefix": lambda: rng.choice(_MATERIALS)[:3],
+        "arabic": lambda: rng.choice(_NOUNS_AR),
+        "arabic, no hamza": lambda: rng.choice(["ازرق", "اصلي"]),
+        "sku substring": lambda: f"{rng.randrange(n_products):06d}"[1:5],
+        "barcode": lambda: f"629{rng.randrange(n_products):010d}",
+    }
+    names = list(kinds)
+    return [(kind, kinds[kind]()) for kind in (rng.choice(names) for _ in range(count))]
+
+
+def _percentiles(ms: list[float]) -> str:
+    ms = sorted(ms)
+    return f"p50 {statistics.median(ms):6.1f} ms, p95 {ms[int(len(ms) * 0.95)]:6.1f} ms"
+
+
+async def _bench(n_products: int, n_queries: int, keep: bool) -> None:
+    rng = random.Random(42)
+    async with worker_session() as session:
+        tenant = Tenant(name="Search benchmark", slug=f"bench-search-{uuid.uuid4().hex[:8]}")
+        session.add(tenant)
+        await session.commit()
+        tid = tenant.id
+
+        await set_tenant_context(session, str(tid))
+        rows = _products(tid, n_products, rng)
+        start = time.perf_counter()
+        for i in range(0, len(rows), _CHUNK):
+            chunk = rows[i : i + _CHUNK]
+            await session.execute(insert(Product), chunk)
+            await session.execute(
+                insert(CatalogCode),
+                [
+                    {
+                        "tenant_id": tid,
+                        "code_type": kind,
+                        "code": row[kind],
+                        "product_id": row["id"],
+                    }
+                    for row in chunk
+                    for kind in ("sku", "barcode")
+                ],
+            )
+        await session.commit()
+        load_s = time.perf_counter() - start
+        await session.execute(text("ANALYZE products"))
+        await session.execute(text("ANALYZE catalog_codes"))
+        trgm = (
+            await session.execute(
+                text("SELECT 1 FROM pg_indexes WHERE indexname = 'ix_products_search_text_trgm'")
+            )
+        ).first()
+
+        try:
+            await set_tenant_context(session, str(tid))
+            timings: dict[str, list[float]] = {}
+            misses = 0
+            for kind, q in _queries(n_products, n_queries, rng):
+                start = time.perf_counter()
+                items, _cursor = await search_products(session, tid, q, limit=20)
+                timings.setdefault(kind, []).append((time.perf_counter() - start) * 1000)
+                misses += not items
+        finally:
+            if not keep:
+                await set_tenant_context(session, str(tid))
+                await session.execute(delete(Product).where(Product.tenant_id == tid))
+                await session.execute(delete(Tenant).where(Tenant.id == tid))
+            await session.commit()
+
+    print(f"products:        {n_products} (loaded in {load_s:.1f} s)")
+    print(f"trigram index:   {'yes' if trgm else 'NO (pg_trgm unavailable)'}")
+    print(f"queries:         {n_queries} ({misses} with no match)")
+    for kind, ms in sorted(timings.items()):
+        print(f"  {kind:<17} {_percentiles(ms)}  (n={len(ms)})")
+    print(f"all queries:     {_percentiles([t for ms in timings.values() for t in ms])}")
+    if keep:
+        print(f"kept tenant:     {tid}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--products", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--keep", action="store_true", help="keep the benchmark tenant")
+    args = parser.parse_args()
+    asyncio.run(_bench(args.products, args.queries, args.keep))
+
+
+if __name__ == "__main__":
+    main()
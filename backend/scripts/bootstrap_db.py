@@ -2,7 +2,7 @@
 
 Run as a one-off ECS task via the saas-bootstrap task definition.
 Connects as the RDS master/admin user and creates app_migrator (DDL + DML)
-and app_user (DML only, RLS-enforced).
+and app_user (DML only, RLS-enforced), and installs the pg_trgm extension.
 
 This is bootstrap-only setup for task 8.5. No runtime services are consuming
 /prod/database-url at this point, so it is safe to create/update secrets
@@ -171,6 +171,16 @@ async def main() -> None:
         await conn.execute("GRANT USAGE, SELECT ON ALL SEQUENCES IN SCHEMA public TO app_user")
         print("  Grants applied (including FOR ROLE app_migrator defaults)")
 
+        # -- extensions (app_migrator has no CREATE on the database) -------
+        # Migrations skip the trigram search indexes if pg_trgm is missing.
+        print("Installing extensions...")
+        row = await conn.fetchrow("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        if row is None:
+            print("  WARNING: pg_trgm is not available; trigram indexes will be skipped")
+        else:
+            await conn.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            print("  pg_trgm installed")
+
     finally:
         await conn.close()
 
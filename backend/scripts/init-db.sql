@@ -51,3 +51,18 @@ ALTER DEFAULT PRIVILEGES IN SCHEMA public
     GRANT SELECT, INSERT, UPDATE, DELETE ON TABLES TO app_user;
 ALTER DEFAULT PRIVILEGES IN SCHEMA public
     GRANT USAGE, SELECT ON SEQUENCES TO app_user;
+
+-- ---------------------------------------------------------------------------
+-- 3. Extensions — app_migrator cannot CREATE EXTENSION (no CREATE on the
+--    database), so bootstrap installs them. Migrations skip the indexes that
+--    need an extension which is not installed.
+-- ---------------------------------------------------------------------------
+DO $$
+BEGIN
+    IF EXISTS (SELECT FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+    ELSE
+        RAISE WARNING 'pg_trgm is not available; trigram search indexes will be skipped';
+    END IF;
+END
+$$;
@@ -0,0 +1,59 @@
+"""Rebuild the catalog_codes registry from products and product_variants.
+
+The catalog_codes migration backfills the registry; run this to repair it,
+e.g. after fixing duplicate codes the backfill reported. Each tenant is
+recomputed under its own tenant context, so this works with the
+RLS-enforced app_user DATABASE_URL. Codes that another product or variant
+already holds are reported and left out.
+
+Usage (from backend/):
+  python -m scripts.rebuild_catalog_codes [--tenant <tenant_id>] [--batch 100]
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+from sqlalchemy import select
+
+from app.models.tenant import Tenant
+from app.services.catalog_codes import rebuild_catalog_codes
+from app.workers.session import set_tenant_context, worker_session
+
+
+async def _rebuild(tenant_id: uuid.UUID | None, batch: int) -> tuple[int, int]:
+    skipped_total = 0
+    async with worker_session() as session:
+        if tenant_id is not None:
+            tenant_ids = [tenant_id]
+        else:
+            tenant_ids = list((await session.execute(select(Tenant.id))).scalars().all())
+        for i, tid in enumerate(tenant_ids, start=1):
+            await set_tenant_context(session, str(tid))
+            skipped = await rebuild_catalog_codes(session, tid)
+            if skipped:
+                print(f"tenant {tid}: {skipped} duplicate codes not registered")
+                skipped_total += skipped
+            if i % batch == 0:
+                await session.commit()
+        await session.commit()
+    return len(tenant_ids), skipped_total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tenant", type=uuid.UUID, default=None)
+    parser.add_argument("--batch", type=int, default=100, help="tenants per transaction")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    count, skipped = asyncio.run(_rebuild(args.tenant, args.batch))
+    print(
+        f"rebuilt catalog_codes for {count} tenants in {time.perf_counter() - start:.1f}s"
+        f" ({skipped} duplicate codes skipped)"
+    )
+
+
+if __name__ == "__main__":
+    main()
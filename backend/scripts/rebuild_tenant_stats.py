@@ -0,0 +1,51 @@
+"""Rebuild tenant_stats from orders, donations, pledges and tenant_members.
+
+The tenant_stats migration backfills the counters; run this whenever they
+are suspected to have drifted.
+Each tenant is recomputed under its own tenant context, so this works with
+the RLS-enforced app_user DATABASE_URL.
+
+Usage (from backend/):
+  python -m scripts.rebuild_tenant_stats [--tenant <tenant_id>] [--batch 100]
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+from sqlalchemy import select
+
+from app.models.tenant import Tenant
+from app.services.tenant_stats import rebuild_tenant_stats
+from app.workers.session import set_tenant_context, worker_session
+
+
+async def _rebuild(tenant_id: uuid.UUID | None, batch: int) -> int:
+    async with worker_session() as session:
+        if tenant_id is not None:
+            tenant_ids = [tenant_id]
+        else:
+            tenant_ids = list((await session.execute(select(Tenant.id))).scalars().all())
+        for i, tid in enumerate(tenant_ids, start=1):
+            await set_tenant_context(session, str(tid))
+            await rebuild_tenant_stats(session, tid)
+            if i % batch == 0:
+                await session.commit()
+        await session.commit()
+    return len(tenant_ids)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tenant", type=uuid.UUID, default=None)
+    parser.add_argument("--batch", type=int, default=100, help="tenants per transaction")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    count = asyncio.run(_rebuild(args.tenant, args.batch))
+    print(f"rebuilt tenant_stats for {count} tenants in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Verify POS shift running totals against orders, optionally rebuilding them.
+
+Recomputes each shift's order/cancel counts, sales and cash totals and its
+per-payment-method breakdown from ``orders`` and reports every mismatch.
+With ``--fix`` the totals are rewritten from orders; run that once after the
+running-totals migration (it cannot backfill through FORCE RLS). Z-reports of
+closed shifts are left as they were reported. Each tenant is processed under
+its own tenant context, so this works with the RLS-enforced app_user
+DATABASE_URL.
+
+Usage (from backend/):
+  python -m scripts.verify_pos_shift_totals [--tenant <tenant_id>] [--fix]
+"""
+
+import argparse
+import asyncio
+import sys
+import uuid
+
+from sqlalchemy import select
+
+from app.models.tenant import Tenant
+from app.services.pos_shift_totals import find_shift_total_drift, rebuild_shift_totals
+from app.workers.session import set_tenant_context, worker_session
+
+
+async def _verify(tenant_id: uuid.UUID | None, fix: bool) -> int:
+    async with worker_session() as session:
+        if tenant_id is not None:
+            tenant_ids = [tenant_id]
+        else:
+            tenant_ids = list((await session.execute(select(Tenant.id))).scalars().all())
+        mismatches = 0
+        for tid in tenant_ids:
+            await set_tenant_context(session, str(tid))
+            drift = await find_shift_total_drift(session, tid)
+            for line in drift:
+                print(f"tenant {tid}: {line}")
+            mismatches += len(drift)
+            if drift and fix:
+                await rebuild_shift_totals(session, tid)
+            await session.commit()
+    return mismatches
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tenant", type=uuid.UUID, default=None)
+    parser.add_argument("--fix", action="store_true", help="rebuild drifted totals")
+    args = parser.parse_args()
+
+    mismatches = asyncio.run(_verify(args.tenant, args.fix))
+    action = "rebuilt" if args.fix else "found"
+    print(f"{mismatches} mismatched shift totals {action}")
+    if mismatches and not args.fix:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""Keyset pagination, filters and totals for the admin order/donation/pledge lists."""
+
+import uuid
+from datetime import date, timedelta
+from unittest.mock import patch
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.order import Order
+from app.services.pagination import count_rows
+from tests.conftest import auth_headers
+
+pytestmark = pytest.mark.m3
+
+
+def _uid() -> str:
+    return uuid.uuid4().hex[:8]
+
+
+async def _setup(client: AsyncClient) -> tuple[dict, str, str, str]:
+    """Create tenant + stocked product. Return (headers, slug, tenant_id, product_id)."""
+    uid = _uid()
+    headers = auth_headers(sub=f"kl-{uid}", email=f"kl-{uid}@test.com")
+    headers["Content-Type"] = "application/json"
+    slug = f"kl-{uid}"
+    r = await client.post(
+        "/api/v1/tenants/", json={"name": f"KL {uid}", "slug": slug}, headers=headers
+    )
+    assert r.status_code == 201, r.text
+    tenant_id = r.json()["id"]
+    r = await client.post(
+        "/api/v1/tenants/me/products",
+        json={"name": f"P {uid}", "price_amount": "1.000", "is_active": True, "stock_qty": 500},
+        headers=headers,
+    )
+    assert r.status_code == 201, r.text
+    return headers, slug, tenant_id, r.json()["id"]
+
+
+async def _storefront_orders(client: AsyncClient, slug: str, pid: str, n: int) -> list[str]:
+    ids = []
+    with patch("app.api.v1.public_storefront.send_order_notification"):
+        for _ in range(n):
+            r = await client.post(
+                f"/api/v1/storefront/{slug}/orders",
+                json={
+                    "customer_name": "Buyer",
+                    "customer_email": f"b-{_uid()}@e.com",
+                    "items": [{"catalog_item_id": pid, "qty": 1}],
+                },
+            )
+            assert r.status_code == 201, r.text
+            ids.append(r.json()["id"])
+    return ids
+
+
+async def _pos_order(client: AsyncClient, headers: dict, pid: str) -> str:
+    r = await client.post(
+        "/api/v1/tenants/me/pos/shifts/open", json={"starting_cash": "0.000"}, headers=headers
+    )
+    assert r.status_code == 201, r.text
+    r = await client.post(
+        "/api/v1/tenants/me/pos/orders",
+        json={"items": [{"catalog_item_id": pid, "qty": 1}], "payment_method": "knet"},
+        headers=headers,
+    )
+    assert r.status_code == 201, r.text
+    return r.json()["id"]
+
+
+async def test_orders_keyset_pages_cover_all_rows(client: AsyncClient):
+    headers, slug, _, pid = await _setup(client)
+    created = await _storefront_orders(client, slug, pid, 5)
+
+    seen: list[str] = []
+    cursor = None
+    while True:
+        params = {"limit": 2} | ({"cursor": cursor} if cursor else {})
+        r = await client.get("/api/v1/tenants/me/orders", params=params, headers=headers)
+        assert r.status_code == 200, r.text
+        body = r.json()
+        seen.extend(o["id"] for o in body["items"])
+        if not body["has_more"]:
+            assert body["next_cursor"] is None
+            break
+        cursor = body["next_cursor"]
+
+    assert seen == list(reversed(created))
+
+
+async def test_orders_invalid_cursor_400(client: AsyncClient):
+    headers, *_ = await _setup(client)
+    r = await client.get("/api/v1/tenants/me/orders?cursor=garbage", headers=headers)
+    assert r.status_code == 400
+
+
+async def test_orders_filter_by_source_and_payment_method(client: AsyncClient):
+    headers, slug, _, pid = await _setup(client)
+    storefront_ids = await _storefront_orders(client, slug, pid, 2)
+    pos_id = await _pos_order(client, headers, pid)
+
+    r = await client.get("/api/v1/tenants/me/orders?source=pos", headers=headers)
+    assert [o["id"] for o in r.json()["items"]] == [pos_id]
+
+    r = await client.get("/api/v1/tenants/me/orders?source=storefront", headers=headers)
+    assert {o["id"] for o in r.json()["items"]} == set(storefront_ids)
+
+    r = await client.get("/api/v1/tenants/me/orders?payment_method=KNET", headers=headers)
+    assert [o["id"] for o in r.json()["items"]] == [pos_id]
+
+
+async def test_orders_filter_by_fulfillment_status(client: AsyncClient):
+    headers, slug, _, pid = await _setup(client)
+    order_id, other_id = await _storefront_orders(client, slug, pid, 2)
+    r = await client.patch(
+        f"/api/v1/tenants/me/orders/{order_id}/fulfillment",
+        json={"fulfillment_status": "packed"},
+        headers=headers,
+    )
+    assert r.status_code == 200, r.text
+
+    r = await client.get("/api/v1/tenants/me/orders?fulfillment_status=packed", headers=headers)
+    ids = [o["id"] for o in r.json()["items"]]
+    assert ids == [order_id]
+    assert other_id not in ids
+
+
+async def test_orders_filter_by_customer_and_date_range(client: AsyncClient, db: AsyncSession):
+    headers, slug, _, pid = await _setup(client)
+    ids = await _storefront_orders(client, slug, pid, 2)
+    customer_id = (
+        await db.execute(select(Order.customer_id).where(Order.id == uuid.UUID(ids[0])))
+    ).scalar_one()
+    assert customer_id is not None
+
+    r = await client.get(f"/api/v1/tenants/me/orders?customer_id={customer_id}", headers=headers)
+    assert [o["id"] for o in r.json()["items"]] == [ids[0]]
+
+    today = date.today()
+    in_range = f"start_date={today - timedelta(days=1)}&end_date={today + timedelta(days=1)}"
+    r = await client.get(f"/api/v1/tenants/me/orders?{in_range}", headers=headers)
+    assert len(r.json()["items"]) == 2
+
+    r = await client.get(
+        f"/api/v1/tenants/me/orders?start_date={today + timedelta(days=1)}", headers=headers
+    )
+    assert r.json()["items"] == []
+
+
+async def test_orders_include_total_exact_for_small_tenants(client: AsyncClient):
+    headers, slug, _, pid = await _setup(client)
+    await _storefront_orders(client, slug, pid, 3)
+
+    r = await client.get("/api/v1/tenants/me/orders?limit=1&include_total=true", headers=headers)
+    body = r.json()
+    assert body["total"] == 3
+    assert body["total_is_estimate"] is False
+    assert len(body["items"]) == 1
+
+    r = await client.get("/api/v1/tenants/me/orders", headers=headers)
+    assert r.json()["total"] is None
+
+
+async def test_count_rows_falls_back_to_planner_estimate(client: AsyncClient, db: AsyncSession):
+    _, slug, tenant_id, pid = await _setup(client)
+    await _storefront_orders(client, slug, pid, 3)
+
+    stmt = select(Order).where(Order.tenant_id == uuid.UUID(tenant_id))
+    total, estimated = await count_rows(db, stmt, exact_limit=2)
+    assert estimated is True
+    assert total >= 3
+
+
+async def test_donations_and_pledges_paginate(client: AsyncClient):
+    headers, slug, _, _ = await _setup(client)
+    with patch("app.api.v1.public_storefront.send_donation_notification"):
+        for _ in range(3):
+            r = await client.post(
+                f"/api/v1/storefront/{slug}/donations",
+                json={"donor_name": "D", "amount": "5.000"},
+            )
+            assert r.status_code == 201, r.text
+            r = await client.post(
+                f"/api/v1/storefront/{slug}/pledges",
+                json={
+                    "pledgor_name": "P",
+                    "amount": "5.000",
+                    "target_date": str(date.today() + timedelta(days=30)),
+                },
+            )
+            assert r.status_code == 201, r.text
+
+    for kind in ("donations", "pledges"):
+        r = await client.get(f"/api/v1/tenants/me/{kind}?limit=2", headers=headers)
+        first = r.json()
+        assert len(first["items"]) == 2
+        assert first["has_more"] is True
+        r = await client.get(
+            f"/api/v1/tenants/me/{kind}",
+            params={"limit": 2, "cursor": first["next_cursor"]},
+            headers=headers,
+        )
+        second = r.json()
+        assert len(second["items"]) == 1
+        assert second["has_more"] is False
+        assert {i["id"] for i in first["items"]}.isdisjoint(i["id"] for i in second["items"])
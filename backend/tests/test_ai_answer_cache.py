@@ -0,0 +1,153 @@
+"""Storefront AI answer cache: hits, invalidation, similarity tier, hit-rate stats."""
+
+import uuid
+from decimal import Decimal
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.config import settings
+from app.services import storefront_ai_gateway
+from app.services.ai_answer_cache import clear_local_answer_cache, normalize_question
+from app.services.ai_provider import AIResponse
+from tests.conftest import auth_headers
+
+pytestmark = pytest.mark.m4
+
+
+def _uid() -> str:
+    return uuid.uuid4().hex[:8]
+
+
+def _mock_provider() -> AsyncMock:
+    provider = AsyncMock()
+    provider.chat = AsyncMock(
+        return_value=AIResponse(
+            content="Yes, we deliver.", tokens_in=40, tokens_out=8, model="gpt-4o"
+        )
+    )
+    return provider
+
+
+async def _setup_tenant(client: AsyncClient) -> tuple[dict, str]:
+    uid = _uid()
+    headers = auth_headers(sub=f"ac-{uid}", email=f"ac-{uid}@test.com")
+    headers["Content-Type"] = "application/json"
+    slug = f"ac-{uid}"
+    r = await client.post(
+        "/api/v1/tenants/", json={"name": f"AC {uid}", "slug": slug}, headers=headers
+    )
+    assert r.status_code == 201, r.text
+    return headers, slug
+
+
+async def _ask(
+    client: AsyncClient,
+    slug: str,
+    provider: AsyncMock,
+    message: str,
+    session_id: str | None = None,
+) -> dict:
+    with patch("app.services.ai_provider.get_provider", return_value=provider):
+        r = await client.post(
+            f"/api/v1/storefront/{slug}/ai/chat",
+            json={"session_id": session_id or f"s-{_uid()}", "message": message},
+        )
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def test_normalize_question():
+    assert normalize_question("  Do you DELIVER?! ") == "do you deliver"
+    assert normalize_question("هل يوجد توصيل؟") == "هل يوجد توصيل"
+    assert normalize_question("?!") == ""
+
+
+async def test_repeated_question_served_from_cache(client: AsyncClient):
+    headers, slug = await _setup_tenant(client)
+    provider = _mock_provider()
+
+    first = await _ask(client, slug, provider, "Do you deliver?")
+    retrieval = AsyncMock(wraps=storefront_ai_gateway._catalog_context)
+    with patch("app.services.storefront_ai_gateway._catalog_context", retrieval):
+        second = await _ask(client, slug, provider, "do you deliver")
+
+    assert provider.chat.await_count == 1
+    retrieval.assert_not_awaited()  # a hit skips catalog retrieval
+    assert second["reply"] == first["reply"] == "Yes, we deliver."
+    assert second["usage"]["tokens_in"] == second["usage"]["tokens_out"] == 0
+    assert Decimal(second["usage"]["cost_usd"]) == 0
+
+    r = await client.get("/api/v1/tenants/me/ai/storefront/answer-cache", headers=headers)
+    assert r.status_code == 200, r.text
+    stats = r.json()
+    assert (stats["requests"], stats["cache_hits"], stats["hit_rate"]) == (2, 1, 0.5)
+    assert Decimal(stats["provider_cost_usd"]) > 0
+
+
+async def test_follow_up_turns_bypass_cache(client: AsyncClient):
+    _, slug = await _setup_tenant(client)
+    provider = _mock_provider()
+    session_id = f"s-{_uid()}"
+
+    await _ask(client, slug, provider, "do you deliver?")
+    await _ask(client, slug, provider, "do you deliver?", session_id=session_id)
+    # Same text, but now with history in this session: must reach the provider.
+    await _ask(client, slug, provider, "do you deliver?", session_id=session_id)
+    assert provider.chat.await_count == 2
+
+
+async def test_catalog_and_config_changes_invalidate(client: AsyncClient):
+    headers, slug = await _setup_tenant(client)
+    provider = _mock_provider()
+
+    await _ask(client, slug, provider, "what do you sell?")
+    await _ask(client, slug, provider, "what do you sell?")
+    assert provider.chat.await_count == 1
+
+    r = await client.post(
+        "/api/v1/tenants/me/products",
+        json={"name": "Gift box", "price_amount": "4.000", "is_active": True},
+        headers=headers,
+    )
+    assert r.status_code == 201, r.text
+    await _ask(client, slug, provider, "what do you sell?")
+    assert provider.chat.await_count == 2
+
+    r = await client.put(
+        "/api/v1/tenants/me/storefront", json={"hero_text": "Now shipping"}, headers=headers
+    )
+    assert r.status_code == 200, r.text
+    await _ask(client, slug, provider, "what do you sell?")
+    assert provider.chat.await_count == 3
+
+
+async def test_similarity_threshold_matches_near_duplicates(client: AsyncClient):
+    _, slug = await _setup_tenant(client)
+    provider = _mock_provider()
+    clear_local_answer_cache()
+
+    with patch.object(settings, "AI_ANSWER_CACHE_SIMILARITY", 0.8):
+        await _ask(client, slug, provider, "Do you deliver to Salmiya?")
+        hit = await _ask(client, slug, provider, "do you delivers to salmiya")
+        await _ask(client, slug, provider, "Which payment methods do you accept?")
+
+    assert hit["usage"]["tokens_in"] == 0
+    assert provider.chat.await_count == 2
+
+
+async def test_cached_answer_streams(client: AsyncClient):
+    _, slug = await _setup_tenant(client)
+    provider = _mock_provider()
+    await _ask(client, slug, provider, "opening hours?")
+
+    with patch("app.services.ai_provider.get_provider", return_value=provider):
+        r = await client.post(
+            f"/api/v1/storefront/{slug}/ai/chat/stream",
+            json={"session_id": f"s-{_uid()}", "message": "Opening hours"},
+        )
+    assert r.status_code == 200
+    assert 'event: token\ndata: {"delta": "Yes, we deliver."}' in r.text
+    assert "event: done" in r.text
+    assert provider.chat.await_count == 1
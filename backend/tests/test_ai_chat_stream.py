@@ -0,0 +1,169 @@
+"""SSE streaming AI chat (dashboard + storefront) with a mocked streaming provider."""
+
+import json
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.ai_conversation import AIConversation
+from app.models.ai_message import AIMessage
+from app.models.ai_usage_log import AIUsageLog
+from app.models.storefront_ai_conversation import StorefrontAIConversation
+from app.services.ai_provider import AIResponse, AIStreamEvent
+from tests.conftest import auth_headers
+
+pytestmark = pytest.mark.m4
+
+
+def _uid() -> str:
+    return uuid.uuid4().hex[:8]
+
+
+def _streaming_provider(deltas: list[str], fail_after: int | None = None) -> MagicMock:
+    """Provider whose stream_chat yields *deltas*, then a final response."""
+
+    async def _stream(messages, *, max_tokens=1024):
+        for i, delta in enumerate(deltas):
+            if fail_after is not None and i == fail_after:
+                raise RuntimeError("connection reset")
+            yield AIStreamEvent(delta=delta)
+        yield AIStreamEvent(
+            final=AIResponse(content="".join(deltas), tokens_in=40, tokens_out=12, model="gpt-4o")
+        )
+
+    provider = MagicMock()
+    provider.stream_chat = MagicMock(side_effect=_stream)
+    return provider
+
+
+def _parse_sse(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for frame in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in frame.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+async def _setup_tenant(client: AsyncClient) -> tuple[dict, str, str]:
+    uid = _uid()
+    headers = auth_headers(sub=f"st-{uid}", email=f"st-{uid}@test.com")
+    headers["Content-Type"] = "application/json"
+    slug = f"st-{uid}"
+    r = await client.post(
+        "/api/v1/tenants/", json={"name": f"ST {uid}", "slug": slug}, headers=headers
+    )
+    assert r.status_code == 201, r.text
+    return headers, slug, r.json()["id"]
+
+
+async def test_dashboard_stream_relays_tokens_and_records_turn(
+    client: AsyncClient, db: AsyncSession
+):
+    headers, _, tenant_id = await _setup_tenant(client)
+    provider = _streaming_provider(["Hel", "lo ", "there"])
+
+    with patch("app.api.v1.ai_chat.get_provider", return_value=provider):
+        r = await client.post(
+            "/api/v1/tenants/me/ai/chat/stream", json={"message": "hi"}, headers=headers
+        )
+
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/event-stream")
+    events = _parse_sse(r.text)
+    assert [e for e, _ in events] == ["token", "token", "token", "done"]
+    assert "".join(d["delta"] for e, d in events if e == "token") == "Hello there"
+    done = events[-1][1]
+    assert done["reply"] == "Hello there"
+    assert done["usage"]["tokens_in"] == 40
+
+    await db.execute(
+        text("SELECT set_config('app.current_tenant', :tid, true)"), {"tid": tenant_id}
+    )
+    conv = (
+        await db.execute(
+            select(AIConversation).where(AIConversation.tenant_id == uuid.UUID(tenant_id))
+        )
+    ).scalar_one()
+    assert str(conv.id) == done["conversation_id"]
+    messages = await db.execute(
+        select(AIMessage.role, AIMessage.content)
+        .where(AIMessage.conversation_id == conv.id)
+        .order_by(AIMessage.id)
+    )
+    assert messages.all() == [("user", "hi"), ("assistant", "Hello there")]
+    log = (
+        await db.execute(select(AIUsageLog).where(AIUsageLog.conversation_id == conv.id))
+    ).scalar_one()
+    assert log.tokens_out == 12
+
+
+async def test_dashboard_stream_provider_error_rolls_back(client: AsyncClient, db: AsyncSession):
+    headers, _, tenant_id = await _setup_tenant(client)
+    provider = _streaming_provider(["partial", "never"], fail_after=1)
+
+    with (
+        patch("app.api.v1.ai_chat.get_provider", return_value=provider),
+        patch("app.services.ai_gateway.rollback_tokens", new_callable=AsyncMock) as rollback,
+    ):
+        r = await client.post(
+            "/api/v1/tenants/me/ai/chat/stream", json={"message": "hi"}, headers=headers
+        )
+
+    events = _parse_sse(r.text)
+    assert [e for e, _ in events] == ["token", "error"]
+    assert events[-1][1]["type"] == "provider_error"
+    rollback.assert_awaited_once()
+
+    await db.execute(
+        text("SELECT set_config('app.current_tenant', :tid, true)"), {"tid": tenant_id}
+    )
+    result = await db.execute(
+        select(AIUsageLog).where(AIUsageLog.tenant_id == uuid.UUID(tenant_id))
+    )
+    assert result.scalars().all() == []
+
+
+async def test_dashboard_stream_validation_error_is_http(client: AsyncClient):
+    headers, _, _ = await _setup_tenant(client)
+    with patch("app.api.v1.ai_chat.get_provider", return_value=_streaming_provider([])):
+        r = await client.post(
+            "/api/v1/tenants/me/ai/chat/stream", json={"message": ""}, headers=headers
+        )
+    assert r.status_code == 422
+
+
+async def test_storefront_stream_continues_conversation(client: AsyncClient, db: AsyncSession):
+    _, slug, tenant_id = await _setup_tenant(client)
+    session_id = f"sess-{_uid()}"
+
+    for reply in (["One"], ["Two"]):
+        with patch(
+            "app.services.ai_provider.get_provider", return_value=_streaming_provider(reply)
+        ):
+            r = await client.post(
+                f"/api/v1/storefront/{slug}/ai/chat/stream",
+                json={"session_id": session_id, "message": "hello"},
+            )
+        assert r.status_code == 200
+        assert _parse_sse(r.text)[-1][0] == "done"
+
+    await db.execute(
+        text("SELECT set_config('app.current_tenant', :tid, true)"), {"tid": tenant_id}
+    )
+    conv = (
+        await db.execute(
+            select(StorefrontAIConversation).where(
+                StorefrontAIConversation.session_id == session_id
+            )
+        )
+    ).scalar_one()
+    contents = await db.execute(
+        select(AIMessage.content)
+        .where(AIMessage.storefront_conversation_id == conv.id)
+        .order_by(AIMessage.id)
+    )
+    assert contents.scalars().all() == ["hello", "One", "hello", "Two"]
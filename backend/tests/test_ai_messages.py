@@ -0,0 +1,198 @@
+"""Append-only AI message store: bounded context window and summary compaction."""
+
+import uuid
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import delete, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.ai_message import AIMessage
+from app.models.ai_usage_log import AIUsageLog
+from app.services.ai_messages import (
+    COMPACT_BATCH_MESSAGES,
+    append_messages,
+    load_context_window,
+)
+from app.services.ai_provider import AIResponse
+from app.workers.session import set_tenant_context
+from app.workers.tasks.ai_compaction import _process_compaction
+from tests.conftest import auth_headers
+
+pytestmark = pytest.mark.m4
+
+_WINDOW_TURNS = 2
+
+
+def _uid() -> str:
+    return uuid.uuid4().hex[:8]
+
+
+def _mock_provider(content: str = "ok") -> AsyncMock:
+    provider = AsyncMock()
+    provider.chat = AsyncMock(
+        return_value=AIResponse(content=content, tokens_in=30, tokens_out=10, model="gpt-4o")
+    )
+    return provider
+
+
+async def _start_conversation(client: AsyncClient) -> tuple[dict, str, uuid.UUID]:
+    """Tenant + one completed dashboard turn. Return (headers, tenant_id, conversation_id)."""
+    uid = _uid()
+    headers = auth_headers(sub=f"am-{uid}", email=f"am-{uid}@test.com")
+    headers["Content-Type"] = "application/json"
+    r = await client.post(
+        "/api/v1/tenants/", json={"name": f"AM {uid}", "slug": f"am-{uid}"}, headers=headers
+    )
+    assert r.status_code == 201, r.text
+    tenant_id = r.json()["id"]
+    with patch("app.api.v1.ai_chat.get_provider", return_value=_mock_provider("a0")):
+        r = await client.post(
+            "/api/v1/tenants/me/ai/chat", json={"message": "q0"}, headers=headers
+        )
+    assert r.status_code == 200, r.text
+    return headers, tenant_id, uuid.UUID(r.json()["conversation_id"])
+
+
+async def _append_turns(
+    db: AsyncSession, tenant_id: str, conversation_id: uuid.UUID, start: int, n: int
+) -> None:
+    await set_tenant_context(db, tenant_id)
+    messages = []
+    for i in range(start, start + n):
+        messages += [
+            {"role": "user", "content": f"q{i}"},
+            {"role": "assistant", "content": f"a{i}"},
+        ]
+    await append_messages(
+        db,
+        tenant_id=uuid.UUID(tenant_id),
+        kind="dashboard",
+        conversation_id=conversation_id,
+        messages=messages,
+    )
+    await db.commit()
+
+
+async def test_context_window_is_bounded_to_last_turns(client: AsyncClient, db: AsyncSession):
+    _, tenant_id, conv_id = await _start_conversation(client)
+    await _append_turns(db, tenant_id, conv_id, 1, 5)
+
+    await set_tenant_context(db, tenant_id)
+    window = await load_context_window(db, "dashboard", conv_id, _WINDOW_TURNS)
+    assert [m["content"] for m in window] == ["q4", "a4", "q5", "a5"]
+
+
+async def test_gateway_schedules_compaction_past_threshold(client: AsyncClient, db: AsyncSession):
+    headers, tenant_id, conv_id = await _start_conversation(client)
+    # Dashboard window is 10 turns; push a full batch past it.
+    await _append_turns(db, tenant_id, conv_id, 1, 10 + COMPACT_BATCH_MESSAGES // 2)
+
+    with (
+        patch("app.api.v1.ai_chat.get_provider", return_value=_mock_provider()),
+        patch("app.services.ai_gateway.schedule_compaction") as schedule,
+    ):
+        r = await client.post("/api/v1/tenants/me/ai/chat", json={"message": "q"}, headers=headers)
+    assert r.status_code == 200, r.text
+    schedule.assert_called_once_with("dashboard", uuid.UUID(tenant_id), conv_id, 10)
+
+
+async def test_compaction_enqueue_failure_does_not_fail_turn(
+    client: AsyncClient, db: AsyncSession
+):
+    headers, tenant_id, conv_id = await _start_conversation(client)
+    await _append_turns(db, tenant_id, conv_id, 1, 10 + COMPACT_BATCH_MESSAGES // 2)
+
+    with (
+        patch("app.api.v1.ai_chat.get_provider", return_value=_mock_provider("answered")),
+        patch(
+            "app.workers.tasks.ai_compaction.compact_ai_conversation.delay",
+            side_effect=ConnectionError("broker down"),
+        ) as delay,
+    ):
+        r = await client.post("/api/v1/tenants/me/ai/chat", json={"message": "q"}, headers=headers)
+    assert r.status_code == 200, r.text
+    assert r.json()["reply"] == "answered"
+    delay.assert_called_once()
+
+
+async def test_compaction_folds_old_turns_into_summary(client: AsyncClient, db: AsyncSession):
+    headers, tenant_id, conv_id = await _start_conversation(client)
+    turns = _WINDOW_TURNS + COMPACT_BATCH_MESSAGES // 2
+    await _append_turns(db, tenant_id, conv_id, 1, turns)
+
+    summarizer = _mock_provider("User asked q0..q10.")
+    assert await _process_compaction(
+        db, "dashboard", tenant_id, str(conv_id), _WINDOW_TURNS, summarizer
+    )
+    transcript = summarizer.chat.call_args.args[0][1]["content"]
+    assert transcript.startswith("user: q0\nassistant: a0")
+    assert f"q{turns - _WINDOW_TURNS + 1}" not in transcript  # kept in the window
+
+    await set_tenant_context(db, tenant_id)
+    window = await load_context_window(db, "dashboard", conv_id, _WINDOW_TURNS)
+    assert window[0] == {
+        "role": "system",
+        "content": "Summary of the earlier conversation:\nUser asked q0..q10.",
+    }
+    assert [m["content"] for m in window[1:]] == ["q11", "a11", "q12", "a12"]
+
+    logs = await db.execute(select(AIUsageLog).where(AIUsageLog.conversation_id == conv_id))
+    assert len(logs.scalars().all()) == 2  # chat turn + summary
+
+    # Not a full batch since the summary: nothing to do.
+    assert not await _process_compaction(
+        db, "dashboard", tenant_id, str(conv_id), _WINDOW_TURNS, summarizer
+    )
+
+    # The next turn's prompt carries the summary ahead of the window.
+    provider = _mock_provider()
+    with (
+        patch("app.api.v1.ai_chat.get_provider", return_value=provider),
+        patch("app.services.ai_gateway._MAX_CONTEXT_TURNS", _WINDOW_TURNS),
+    ):
+        r = await client.post("/api/v1/tenants/me/ai/chat", json={"message": "q"}, headers=headers)
+    assert r.status_code == 200, r.text
+    sent = provider.chat.call_args.args[0]
+    assert sent[2]["content"].startswith("Summary of the earlier conversation:")
+    assert [m["content"] for m in sent[3:]] == ["q11", "a11", "q12", "a12", "q"]
+
+
+async def test_compaction_skips_while_another_run_holds_the_lock(
+    client: AsyncClient, db: AsyncSession, rls_db: AsyncSession
+):
+    _headers, tenant_id, conv_id = await _start_conversation(client)
+    await _append_turns(db, tenant_id, conv_id, 1, _WINDOW_TURNS + COMPACT_BATCH_MESSAGES // 2)
+
+    # Another worker is compacting this conversation (its transaction holds the lock).
+    await rls_db.execute(
+        text("SELECT pg_advisory_xact_lock(hashtext(:key))"), {"key": f"ai_compaction:{conv_id}"}
+    )
+    summarizer = _mock_provider()
+    assert not await _process_compaction(
+        db, "dashboard", tenant_id, str(conv_id), _WINDOW_TURNS, summarizer
+    )
+    summarizer.chat.assert_not_called()
+
+    await rls_db.rollback()
+    assert await _process_compaction(
+        db, "dashboard", tenant_id, str(conv_id), _WINDOW_TURNS, summarizer
+    )
+
+
+async def test_app_user_cannot_rewrite_messages(client: AsyncClient, rls_db: AsyncSession):
+    _, tenant_id, conv_id = await _start_conversation(client)
+    await set_tenant_context(rls_db, tenant_id)
+    rows = await rls_db.execute(
+        select(AIMessage.role).where(AIMessage.conversation_id == conv_id).order_by(AIMessage.id)
+    )
+    assert rows.scalars().all() == ["user", "assistant"]
+
+    # No UPDATE/DELETE policies: even with table grants, RLS matches no rows.
+    result = await rls_db.execute(
+        update(AIMessage).where(AIMessage.conversation_id == conv_id).values(content="x")
+    )
+    assert result.rowcount == 0
+    result = await rls_db.execute(delete(AIMessage).where(AIMessage.conversation_id == conv_id))
+    assert result.rowcount == 0
@@ -0,0 +1,125 @@
+"""AI system prompt: stable per-tenant prefix; catalog context tracks catalog changes."""
+
+import uuid
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import AsyncClient
+
+from app.services import ai_gateway
+from app.services.ai_provider import AIResponse
+from tests.conftest import auth_headers
+
+pytestmark = pytest.mark.m4
+
+
+def _uid() -> str:
+    return uuid.uuid4().hex[:8]
+
+
+def _mock_provider() -> AsyncMock:
+    provider = AsyncMock()
+    provider.chat = AsyncMock(
+        return_value=AIResponse(content="ok", tokens_in=10, tokens_out=5, model="gpt-4o")
+    )
+    return provider
+
+
+async def _setup_tenant(client: AsyncClient) -> tuple[dict, str]:
+    uid = _uid()
+    headers = auth_headers(sub=f"pc-{uid}", email=f"pc-{uid}@test.com")
+    headers["Content-Type"] = "application/json"
+    slug = f"pc-{uid}"
+    r = await client.post(
+        "/api/v1/tenants/", json={"name": f"PC {uid}", "slug": slug}, headers=headers
+    )
+    assert r.status_code == 201, r.text
+    return headers, slug
+
+
+async def _create_product(client: AsyncClient, headers: dict, name: str) -> str:
+    r = await client.post(
+        "/api/v1/tenants/me/products",
+        json={"name": name, "price_amount": "3.000", "is_active": True},
+        headers=headers,
+    )
+    assert r.status_code == 201, r.text
+    return r.json()["id"]
+
+
+def _system_text(provider: AsyncMock) -> str:
+    """All system messages of the last provider call, joined."""
+    messages = provider.chat.call_args.args[0]
+    assert messages[0]["role"] == "system"
+    return "\n\n".join(m["content"] for m in messages if m["role"] == "system")
+
+
+async def _dashboard_chat(client: AsyncClient, headers: dict, provider: AsyncMock) -> str:
+    """Send one message; return the system prompt the provider received."""
+    with patch("app.api.v1.ai_chat.get_provider", return_value=provider):
+        r = await client.post(
+            "/api/v1/tenants/me/ai/chat", json={"message": "hi"}, headers=headers
+        )
+    assert r.status_code == 200, r.text
+    return _system_text(provider)
+
+
+async def test_dashboard_prompt_prefix_stable_across_turns(client: AsyncClient):
+    headers, _ = await _setup_tenant(client)
+    await _create_product(client, headers, "Blue Mug")
+    provider = _mock_provider()
+
+    await _dashboard_chat(client, headers, provider)
+    first = provider.chat.call_args.args[0][0]["content"]
+    prompt = await _dashboard_chat(client, headers, provider)
+    second = provider.chat.call_args.args[0][0]["content"]
+
+    assert first == second
+    assert "Blue Mug" not in first  # catalog goes in a separate system message
+    assert "Blue Mug" in prompt
+
+
+async def test_product_change_reaches_prompt(client: AsyncClient):
+    headers, _ = await _setup_tenant(client)
+    pid = await _create_product(client, headers, "Old Name")
+    provider = _mock_provider()
+
+    assert "Old Name" in await _dashboard_chat(client, headers, provider)
+
+    r = await client.patch(
+        f"/api/v1/tenants/me/products/{pid}", json={"name": "New Name"}, headers=headers
+    )
+    assert r.status_code == 200, r.text
+
+    prompt = await _dashboard_chat(client, headers, provider)
+    assert "New Name" in prompt
+    assert "Old Name" not in prompt
+
+
+async def test_prompt_has_tenant_independent_prefix(client: AsyncClient):
+    headers_a, _ = await _setup_tenant(client)
+    headers_b, _ = await _setup_tenant(client)
+    prompt_a = await _dashboard_chat(client, headers_a, _mock_provider())
+    prompt_b = await _dashboard_chat(client, headers_b, _mock_provider())
+
+    assert prompt_a.startswith(ai_gateway._SYSTEM_INSTRUCTIONS)
+    assert prompt_b.startswith(ai_gateway._SYSTEM_INSTRUCTIONS)
+
+
+async def test_storefront_prompt_tracks_catalog_changes(client: AsyncClient):
+    headers, slug = await _setup_tenant(client)
+    await _create_product(client, headers, "Red Scarf")
+    provider = _mock_provider()
+
+    async def _ask() -> str:
+        with patch("app.services.ai_provider.get_provider", return_value=provider):
+            r = await client.post(
+                f"/api/v1/storefront/{slug}/ai/chat",
+                json={"session_id": f"s-{_uid()}", "message": "what do you sell?"},
+            )
+        assert r.status_code == 200, r.text
+        return _system_text(provider)
+
+    assert "Red Scarf" in await _ask()
+    await _create_product(client, headers, "Green Hat")
+    assert "Green Hat" in await _ask()
@@ -0,0 +1,114 @@
+"""AI provider factory: per-loop client reuse, failover, fake provider."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core.config import settings
+from app.services.ai_provider import (
+    AIResponse,
+    AIStreamEvent,
+    FailoverProvider,
+    FakeProvider,
+    OpenAIProvider,
+    get_provider,
+)
+
+pytestmark = pytest.mark.m4
+
+_MESSAGES = [
+    {"role": "system", "content": "You are helpful."},
+    {"role": "user", "content": "hello there"},
+]
+
+
+def _response(model: str) -> AIResponse:
+    return AIResponse(content=f"from {model}", tokens_in=5, tokens_out=3, model=model)
+
+
+def _stream(*deltas: str, fail: bool = False, delay: float = 0.0):
+    async def stream_chat(messages, *, max_tokens=1024):
+        await asyncio.sleep(delay)
+        if fail:
+            raise RuntimeError("upstream 503")
+        for delta in deltas:
+            yield AIStreamEvent(delta=delta)
+        yield AIStreamEvent(final=_response("stream"))
+
+    return stream_chat
+
+
+async def _collect(provider) -> str:
+    return "".join([e.delta async for e in provider.stream_chat(_MESSAGES) if e.delta])
+
+
+async def test_provider_reused_within_loop():
+    with patch.multiple(settings, AI_PROVIDER="openai", AI_API_KEY="sk-test"):
+        first = get_provider()
+        assert get_provider() is first
+        assert isinstance(first, OpenAIProvider)
+        with patch.object(settings, "AI_MODEL", "gpt-4o-mini"):
+            assert get_provider() is not first  # settings change rebuilds
+
+
+async def test_fallback_settings_wrap_in_failover():
+    with patch.multiple(
+        settings, AI_PROVIDER="fake", AI_FALLBACK_MODEL="fake-small", AI_FAKE_LATENCY_MS=0
+    ):
+        provider = get_provider()
+    assert isinstance(provider, FailoverProvider)
+    assert isinstance(provider.secondary, FakeProvider)
+    assert (await provider.secondary.chat(_MESSAGES)).model == "fake-small"
+
+
+async def test_chat_fails_over_on_error_and_latency_budget():
+    primary, secondary = AsyncMock(), AsyncMock()
+    secondary.chat = AsyncMock(return_value=_response("backup"))
+
+    primary.chat = AsyncMock(side_effect=RuntimeError("boom"))
+    assert (await FailoverProvider(primary, secondary).chat(_MESSAGES)).model == "backup"
+
+    async def slow(messages, *, max_tokens=1024):
+        await asyncio.sleep(1)
+        return _response("primary")
+
+    primary.chat = slow
+    provider = FailoverProvider(primary, secondary, latency_budget=0.05)
+    assert (await provider.chat(_MESSAGES)).model == "backup"
+    assert secondary.chat.await_count == 2
+
+
+async def test_stream_fails_over_only_before_first_token():
+    secondary = AsyncMock()
+    secondary.stream_chat = _stream("backup")
+
+    primary = AsyncMock()
+    primary.stream_chat = _stream("never", delay=1)
+    provider = FailoverProvider(primary, secondary, latency_budget=0.05)
+    assert await _collect(provider) == "backup"
+
+    primary.stream_chat = _stream(fail=True)
+    assert await _collect(FailoverProvider(primary, secondary)) == "backup"
+
+    async def dies_mid_stream(messages, *, max_tokens=1024):
+        yield AIStreamEvent(delta="partial")
+        raise RuntimeError("connection reset")
+
+    primary.stream_chat = dies_mid_stream
+    with pytest.raises(RuntimeError):
+        await _collect(FailoverProvider(primary, secondary))
+
+
+async def test_fake_provider_is_deterministic_with_latency():
+    provider = FakeProvider(latency=0.05, token_delay=0.0)
+    started = time.perf_counter()
+    first = await provider.chat(_MESSAGES)
+    assert time.perf_counter() - started >= 0.05
+    assert first == await provider.chat(_MESSAGES)
+    assert first.content == "[fake] You said: hello there"
+
+    events = [e async for e in provider.stream_chat(_MESSAGES)]
+    assert "".join(e.delta for e in events if e.delta) == first.content
+    assert events[-1].final == first
@@ -0,0 +1,149 @@
+"""AI quota: prompt token estimate and per-process quota leases."""
+
+import asyncio
+import uuid
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import redis.asyncio as aioredis
+from httpx import AsyncClient
+
+from app.core.config import settings
+from app.services import ai_quota
+from app.services.ai_provider import AIResponse
+from app.services.ai_quota import (
+    QuotaResult,
+    adjust_tokens,
+    reconcile_leases,
+    release_leases,
+    reserve_tokens,
+    rollback_tokens,
+)
+from app.services.ai_tokens import estimate_prompt_tokens, estimate_tokens
+from tests.conftest import auth_headers
+
+pytestmark = pytest.mark.m4
+
+
+async def _counter(tenant_id: str) -> int:
+    r = aioredis.from_url(settings.REDIS_URL)
+    try:
+        return int(await r.get(ai_quota._month_key(tenant_id)) or 0)
+    finally:
+        await r.aclose()
+
+
+def test_estimate_tracks_text_shape():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("Do you deliver?") == 5
+    # Non-Latin scripts cost more tokens per character than English.
+    arabic = "هل يوجد توصيل إلى السالمية"
+    assert estimate_tokens(arabic) > estimate_tokens("Do you deliver to Salmiya")
+    assert estimate_tokens("SKU 1234567") == 1 + 3
+
+    system = {"role": "system", "content": "You are helpful. " * 50}
+    user = {"role": "user", "content": "hi"}
+    assert estimate_prompt_tokens([system, user]) == 3 + 4 + 50 * 5 + 4 + 1
+
+
+async def test_lease_serves_reservations_locally():
+    tenant_id = str(uuid.uuid4())
+    with patch.object(settings, "AI_QUOTA_LEASE_TOKENS", 5000):
+        first = await reserve_tokens(tenant_id, 800, hard_limit=1_000_000)
+        assert first == QuotaResult(allowed=True, over_soft=False, reserved=800)
+        assert await _counter(tenant_id) == 5000  # one chunk leased
+
+        await adjust_tokens(tenant_id, 300 - 800)  # actual usage 300
+        for _ in range(5):
+            await reserve_tokens(tenant_id, 800, hard_limit=1_000_000)
+        await rollback_tokens(tenant_id, 800)
+        assert await _counter(tenant_id) == 5000  # still the same lease
+
+    await release_leases()
+    assert await _counter(tenant_id) == 300 + 4 * 800
+
+
+async def test_lease_never_exceeds_hard_limit():
+    tenant_id = str(uuid.uuid4())
+    assert (await reserve_tokens(tenant_id, 800, hard_limit=1000)).allowed
+    denied = await reserve_tokens(tenant_id, 300, hard_limit=1000)
+    assert (denied.allowed, denied.reason) == (False, "quota_exhausted")
+
+    await rollback_tokens(tenant_id, 800)
+    assert (await reserve_tokens(tenant_id, 300, hard_limit=1000)).allowed
+    await release_leases()
+    assert await _counter(tenant_id) == 300
+
+
+async def test_concurrent_reservations_never_overdraw_the_lease():
+    tenant_id = str(uuid.uuid4())
+    with patch.object(settings, "AI_QUOTA_LEASE_TOKENS", 0):  # lease exactly what is needed
+        await reserve_tokens(tenant_id, 100, hard_limit=1_000_000)
+        await rollback_tokens(tenant_id, 60)  # lease balance 60
+        # The first call leases the 40 it lacks; the second spends the 60
+        # locally while the first awaits Redis, so the first must lease again.
+        results = await asyncio.gather(
+            reserve_tokens(tenant_id, 100, hard_limit=1_000_000),
+            reserve_tokens(tenant_id, 60, hard_limit=1_000_000),
+        )
+    assert all(result.allowed for result in results)
+    assert ai_quota._leases[tenant_id].balance == 0
+    assert await _counter(tenant_id) == 40 + 100 + 60
+    await release_leases()
+
+
+async def test_soft_limit_ignores_unspent_lease():
+    tenant_id = str(uuid.uuid4())
+    r = aioredis.from_url(settings.REDIS_URL)
+    try:
+        await r.set(ai_quota._month_key(tenant_id), 7500)
+    finally:
+        await r.aclose()
+
+    # Leases 625 (a quarter of what is left): counter 8125 > soft 8000, used 7600.
+    result = await reserve_tokens(tenant_id, 100, hard_limit=10_000)
+    assert await _counter(tenant_id) == 8125
+    assert (result.allowed, result.over_soft) == (True, False)
+    assert (await reserve_tokens(tenant_id, 500, hard_limit=10_000)).over_soft
+    await release_leases()
+
+
+async def test_idle_leases_are_reconciled():
+    tenant_id = str(uuid.uuid4())
+    await reserve_tokens(tenant_id, 100, hard_limit=1_000_000)
+    assert await _counter(tenant_id) > 100
+
+    with patch.object(settings, "AI_QUOTA_LEASE_SECONDS", -1):
+        assert await reconcile_leases() >= 1
+    assert await _counter(tenant_id) == 100
+    # The in-flight reservation settles straight against Redis.
+    await adjust_tokens(tenant_id, -40)
+    assert await _counter(tenant_id) == 60
+
+
+async def test_gateway_reserves_estimated_prompt_plus_max_output(client: AsyncClient):
+    uid = uuid.uuid4().hex[:8]
+    headers = auth_headers(sub=f"aq-{uid}", email=f"aq-{uid}@test.com")
+    headers["Content-Type"] = "application/json"
+    r = await client.post(
+        "/api/v1/tenants/", json={"name": f"AQ {uid}", "slug": f"aq-{uid}"}, headers=headers
+    )
+    assert r.status_code == 201, r.text
+
+    provider = AsyncMock()
+    provider.chat = AsyncMock(
+        return_value=AIResponse(content="ok", tokens_in=50, tokens_out=5, model="gpt-4o")
+    )
+    reserve = AsyncMock(return_value=QuotaResult(allowed=True, over_soft=False, reserved=0))
+    with (
+        patch("app.api.v1.ai_chat.get_provider", return_value=provider),
+        patch("app.services.ai_gateway.reserve_tokens", reserve),
+    ):
+        r = await client.post(
+            "/api/v1/tenants/me/ai/chat", json={"message": "hello there"}, headers=headers
+        )
+    assert r.status_code == 200, r.text
+
+    sent = provider.chat.call_args.args[0]
+    estimated = reserve.call_args.args[1]
+    assert estimated == estimate_prompt_tokens(sent) + settings.AI_MAX_OUTPUT_TOKENS
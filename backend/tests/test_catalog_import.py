@@ -0,0 +1,238 @@
+"""Bulk catalog import tests: upload API + worker validation/load."""
+
+import io
+import uuid
+from unittest.mock import patch
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.catalog_import_job import CatalogImportJob
+from app.models.product import Product
+from app.models.product_variant import ProductVariant
+from app.models.tenant import Tenant
+from app.workers.tasks.catalog_import import _process_catalog_import
+from tests.conftest import auth_headers
+
+pytestmark = pytest.mark.catalog_import
+
+
+def _uid() -> str:
+    return uuid.uuid4().hex[:8]
+
+
+async def _setup_tenant(client: AsyncClient) -> tuple[dict, str]:
+    uid = _uid()
+    headers = auth_headers(sub=f"imp-{uid}", email=f"imp-{uid}@test.com")
+    r = await client.post(
+        "/api/v1/tenants/", json={"name": f"IMP {uid}", "slug": f"imp-{uid}"}, headers=headers
+    )
+    assert r.status_code == 201, r.text
+    return headers, r.json()["id"]
+
+
+async def _upload(
+    client: AsyncClient, headers: dict, content: bytes, file_name: str = "catalog.csv"
+) -> tuple[int, dict, dict]:
+    """Upload *content*; returns (status, body, stored objects by key)."""
+    stored: dict[str, bytes] = {}
+    with (
+        patch(
+            "app.api.v1.catalog_imports.put_object",
+            lambda key, body, content_type: stored.__setitem__(key, body),
+        ),
+        patch("app.api.v1.catalog_imports.run_catalog_import") as mock_task,
+    ):
+        r = await client.post(
+            "/api/v1/tenants/me/products/imports",
+            files={"file": (file_name, content)},
+            headers=headers,
+        )
+    if r.status_code == 202:
+        assert mock_task.delay.call_count == 1
+    return r.status_code, r.json(), stored
+
+
+async def _run_import(
+    client: AsyncClient, db: AsyncSession, headers: dict, tenant_id: str, content: bytes, **kw
+) -> CatalogImportJob:
+    status, body, stored = await _upload(client, headers, content, **kw)
+    assert status == 202, body
+
+    def _download(key: str, fileobj) -> int:
+        fileobj.write(stored[key])
+        return len(stored[key])
+
+    with (
+        patch("app.workers.tasks.catalog_import.download_to_file", _download),
+        patch("app.workers.tasks.catalog_import.delete_object") as mock_delete,
+    ):
+        await _process_catalog_import(db, tenant_id, body["id"])
+    job = (
+        await db.execute(
+            select(CatalogImportJob).where(CatalogImportJob.id == uuid.UUID(body["id"]))
+        )
+    ).scalar_one()
+    await db.refresh(job)
+    assert mock_delete.call_count == 1  # the upload is discarded once read
+    return job
+
+
+def _csv(*lines: str) -> bytes:
+    return ("\n".join(lines) + "\n").encode()
+
+
+async def test_upload_queues_job_and_rejects_unknown_format(client: AsyncClient):
+    headers, tenant_id = await _setup_tenant(client)
+    status, body, stored = await _upload(client, headers, _csv("name,price_amount", "A,1"))
+    assert status == 202
+    assert body["status"] == "pending"
+    assert list(stored) == [f"{tenant_id}/imports/{body['id']}.csv"]
+
+    r = await client.get(f"/api/v1/tenants/me/products/imports/{body['id']}", headers=headers)
+    assert r.status_code == 200
+    assert r.json()["file_name"] == "catalog.csv"
+
+    status, _, _ = await _upload(client, headers, b"x", file_name="catalog.txt")
+    assert status == 400
+
+
+async def test_import_loads_products_and_variants(client: AsyncClient, db: AsyncSession):
+    headers, tenant_id = await _setup_tenant(client)
+    r = await client.post(
+        "/api/v1/tenants/me/categories", json={"name": "Shirts"}, headers=headers
+    )
+    assert r.status_code == 201, r.text
+    category_id = r.json()["id"]
+    version_before = (await db.get(Tenant, uuid.UUID(tenant_id))).catalog_version
+
+    uid = _uid()
+    job = await _run_import(
+        client,
+        db,
+        headers,
+        tenant_id,
+        _csv(
+            "name,category,price_amount,stock_qty,sku,variant_name,variant_sku,variant_stock_qty",
+            f"Tee {uid},Shirts,4.500,,TEE-{uid},Small,TEE-{uid}-S,3",
+            f"Tee {uid},,,,,Large,TEE-{uid}-L,5",
+            f"Mug {uid},,2.000,12,MUG-{uid},,,",
+            ",,,,,,,",
+        ),
+    )
+
+    assert job.status == "completed", job.errors
+    assert (job.row_count, job.products_created, job.variants_created) == (3, 2, 2)
+    products = {
+        p.name: p
+        for p in (
+            await db.execute(select(Product).where(Product.tenant_id == uuid.UUID(tenant_id)))
+        ).scalars()
+    }
+    assert set(products) == {f"Tee {uid}", f"Mug {uid}"}
+    assert str(products[f"Tee {uid}"].category_id) == category_id
+    assert products[f"Tee {uid}"].stock_qty == 0  # track_inventory default
+    assert products[f"Mug {uid}"].stock_qty == 12
+    variants = (
+        await db.execute(
+            select(ProductVariant.sku, ProductVariant.stock_qty)
+            .where(ProductVariant.product_id == products[f"Tee {uid}"].id)
+            .order_by(ProductVariant.sku)
+        )
+    ).all()
+    assert [tuple(v) for v in variants] == [(f"TEE-{uid}-L", 5), (f"TEE-{uid}-S", 3)]
+
+    tenant = await db.get(Tenant, uuid.UUID(tenant_id))
+    await db.refresh(tenant)
+    assert tenant.catalog_version == version_before + 1
+
+    # POS terminals pick the imported products up in one sync delta.
+    r = await client.get("/api/v1/tenants/me/pos/catalog", params={"since": 0}, headers=headers)
+    assert r.status_code == 200, r.text
+    assert {p["n"] for p in r.json()["products"]} == {f"Tee {uid}", f"Mug {uid}"}
+
+
+async def test_import_reports_row_errors_and_loads_nothing(client: AsyncClient, db: AsyncSession):
+    headers, tenant_id = await _setup_tenant(client)
+    uid = _uid()
+    r = await client.post(
+        "/api/v1/tenants/me/products",
+        json={"name": f"Existing {uid}", "price_amount": "1.000", "sku": f"OLD-{uid}"},
+        headers=headers,
+    )
+    assert r.status_code == 201, r.text
+    r = await client.post(
+        f"/api/v1/tenants/me/products/{r.json()['id']}/variants",
+        json={"name": "V", "barcode": f"BC-{uid}"},
+        headers=headers,
+    )
+    assert r.status_code == 201, r.text
+
+    job = await _run_import(
+        client,
+        db,
+        headers,
+        tenant_id,
+        _csv(
+            "name,category,price_amount,sku,variant_name,variant_barcode",
+            f"Good {uid},,1.000,NEW-{uid},,",  # row 2: fine on its own
+            f"Bad price {uid},,-1,,,",  # row 3
+            f"Dup sku {uid},,1.000,NEW-{uid},,",  # row 4: SKU repeats row 2
+            f"Existing {uid},,1.000,,,",  # row 5: name exists in DB
+            f"Old sku {uid},,1.000,OLD-{uid},,",  # row 6: SKU used by a product
+            f"Cat {uid},Nope,1.000,,,",  # row 7: unknown category
+            f"Good {uid},,,,Var,BC-{uid}",  # row 8: barcode used by a variant
+            f"Good {uid},,1.000,,,",  # row 9: repeated name, no variant
+        ),
+    )
+
+    assert job.status == "failed"
+    assert job.row_count == 8
+    report = [(e["row"], e["field"]) for e in job.errors]
+    assert report == [
+        (3, "price_amount"),
+        (4, "sku"),
+        (5, "name"),
+        (6, "sku"),
+        (7, "category"),
+        (8, "variant_barcode"),
+        (9, "name"),
+    ]
+    assert job.error_count == 7
+    assert job.products_created is None
+    names = (
+        (await db.execute(select(Product.name).where(Product.tenant_id == uuid.UUID(tenant_id))))
+        .scalars()
+        .all()
+    )
+    assert names == [f"Existing {uid}"]
+
+
+# A rejected header must not leave the reader to clean up after the upload is closed.
+@pytest.mark.filterwarnings("error::pytest.PytestUnraisableExceptionWarning")
+async def test_import_xlsx_and_bad_header(client: AsyncClient, db: AsyncSession):
+    from openpyxl import Workbook
+
+    headers, tenant_id = await _setup_tenant(client)
+    uid = _uid()
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["Name", "Price_Amount", "Stock_Qty", "Is_Active"])
+    sheet.append([f"Sheet item {uid}", 3.25, 7, False])
+    buf = io.BytesIO()
+    workbook.save(buf)
+
+    job = await _run_import(
+        client, db, headers, tenant_id, buf.getvalue(), file_name="catalog.xlsx"
+    )
+    assert job.status == "completed", job.errors
+    product = (
+        await db.execute(select(Product).where(Product.name == f"Sheet item {uid}"))
+    ).scalar_one()
+    assert (str(product.price_amount), product.stock_qty, product.is_active) == ("3.250", 7, False)
+
+    job = await _run_import(client, db, headers, tenant_id, _csv("name,colour", "X,red"))
+    assert job.status == "failed"
+    assert job.error == "Unknown columns: colour"
@@ -0,0 +1,126 @@
+"""Catalog retrieval index: hashed n-gram search and per-message AI catalog context."""
+
+import uuid
+from decimal import Decimal
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pytest
+from httpx import AsyncClient
+
+from app.services import catalog_index
+from app.services.ai_provider import AIResponse
+from app.services.catalog_index import build_catalog_index, embed_hashed_ngrams
+from tests.conftest import auth_headers
+
+pytestmark = pytest.mark.m4
+
+
+def _uid() -> str:
+    return uuid.uuid4().hex[:8]
+
+
+def _rows(names: list[str]) -> list[tuple]:
+    return [(n, None, None, None, Decimal("1.000"), None) for n in names]
+
+
+def test_embeddings_are_unit_length_and_deterministic():
+    vectors = embed_hashed_ngrams(["Blue ceramic mug", "قهوة عربية", ""])
+    assert vectors.shape == (3, catalog_index.EMBED_DIM)
+    assert np.allclose(np.linalg.norm(vectors[:2], axis=1), 1.0)
+    assert not vectors[2].any()
+    assert np.array_equal(vectors, embed_hashed_ngrams(["Blue ceramic mug", "قهوة عربية", ""]))
+
+
+def test_search_ranks_by_similarity_and_tolerates_typos():
+    names = [f"Filler item {i}" for i in range(30)] + ["Arabic coffee beans", "قهوة عربية"]
+    index = build_catalog_index(_rows(names), catalog_version=1)
+
+    assert index.search("do you have arabic cofee?", 3)[0].name == "Arabic coffee beans"
+    assert index.search("قهوة", 3)[0].name == "قهوة عربية"
+
+
+def test_small_catalog_returned_whole_in_order():
+    index = build_catalog_index(_rows(["B", "A", "C"]), catalog_version=1)
+    assert [e.name for e in index.search("anything", 5)] == ["B", "A", "C"]
+
+
+async def _setup_tenant(client: AsyncClient) -> tuple[dict, str]:
+    uid = _uid()
+    headers = auth_headers(sub=f"ci-{uid}", email=f"ci-{uid}@test.com")
+    headers["Content-Type"] = "application/json"
+    slug = f"ci-{uid}"
+    r = await client.post(
+        "/api/v1/tenants/", json={"name": f"CI {uid}", "slug": slug}, headers=headers
+    )
+    assert r.status_code == 201, r.text
+    return headers, slug
+
+
+async def _create_product(client: AsyncClient, headers: dict, name: str) -> str:
+    r = await client.post(
+        "/api/v1/tenants/me/products",
+        json={"name": name, "price_amount": "2.500", "is_active": True},
+        headers=headers,
+    )
+    assert r.status_code == 201, r.text
+    return r.json()["id"]
+
+
+def _mock_provider() -> AsyncMock:
+    provider = AsyncMock()
+    provider.chat = AsyncMock(
+        return_value=AIResponse(content="ok", tokens_in=10, tokens_out=5, model="gpt-4o")
+    )
+    return provider
+
+
+async def test_storefront_prompt_carries_only_relevant_products(client: AsyncClient):
+    headers, slug = await _setup_tenant(client)
+    for i in range(14):
+        await _create_product(client, headers, f"Notebook model {i}")
+    await _create_product(client, headers, "Saffron tea")
+    provider = _mock_provider()
+
+    with patch("app.services.ai_provider.get_provider", return_value=provider):
+        r = await client.post(
+            f"/api/v1/storefront/{slug}/ai/chat",
+            json={"session_id": f"s-{_uid()}", "message": "is the saffron tea in stock?"},
+        )
+    assert r.status_code == 200, r.text
+
+    messages = provider.chat.call_args.args[0]
+    stable, context = messages[0]["content"], messages[1]["content"]
+    assert "Notebook" not in stable
+    assert "(10 of 15 in the store)" in context
+    assert context.splitlines()[1].startswith("- Saffron tea: 2.500")
+
+
+async def test_catalog_change_rebuilds_index(client: AsyncClient):
+    headers, _ = await _setup_tenant(client)
+    pid = await _create_product(client, headers, "Walnut desk")
+    provider = _mock_provider()
+
+    async def _context() -> str:
+        with patch("app.api.v1.ai_chat.get_provider", return_value=provider):
+            r = await client.post(
+                "/api/v1/tenants/me/ai/chat", json={"message": "desk"}, headers=headers
+            )
+        assert r.status_code == 200, r.text
+        return provider.chat.call_args.args[0][1]["content"]
+
+    with patch.object(
+        catalog_index, "build_catalog_index", wraps=catalog_index.build_catalog_index
+    ) as build:
+        assert "Walnut desk" in await _context()
+        await _context()
+        assert build.call_count == 1
+
+        r = await client.patch(
+            f"/api/v1/tenants/me/products/{pid}", json={"name": "Oak desk"}, headers=headers
+        )
+        assert r.status_code == 200, r.text
+        context = await _context()
+        assert build.call_count == 2
+    assert "Oak desk" in context
+    assert "Walnut desk" not in context
@@ -1,13 +1,16 @@
 """M11.8 find_or_create_customer service tests."""
 
+import asyncio
 import uuid
 
+from httpx import AsyncClient
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.customer import Customer
 from app.models.tenant import Tenant
 from app.services.customer_link import find_or_create_customer
+from tests.conftest import auth_headers
 
 
 async def _make_tenant(db: AsyncSession) -> uuid.UUID:
@@ -176,3 +179,36 @@ async def test_phone_trim_normalization(db: AsyncSession):
     )
     assert again is not None
     assert again.id == first.id
+
+
+async def test_parallel_checkouts_by_new_customer_create_one_row(client: AsyncClient):
+    uid = uuid.uuid4().hex[:8]
+    slug = f"link-par-{uid}"
+    headers = auth_headers(sub=f"link-par-{uid}", email=f"link-par-{uid}@test.com")
+    r = await client.post(
+        "/api/v1/tenants/", json={"name": f"Par {uid}", "slug": slug}, headers=headers
+    )
+    assert r.status_code == 201
+    r = await client.post(
+        "/api/v1/tenants/me/products",
+        json={"name": f"Par-{uid}", "price_amount": "1.000", "track_inventory": False},
+        headers=headers,
+    )
+    assert r.status_code == 201
+    order = {
+        "customer_name": "Parallel",
+        "customer_phone": f"+965{uid}",
+        "customer_email": f"par-{uid}@example.com",
+        "items": [{"catalog_item_id": r.json()["id"], "qty": 1}],
+    }
+
+    responses = await asyncio.gather(
+        *(client.post(f"/api/v1/storefront/{slug}/orders", json=order) for _ in range(12))
+    )
+    assert [r.status_code for r in responses] == [201] * 12
+
+    r = await client.get("/api/v1/tenants/me/customers", headers=headers)
+    assert [c["email"] for c in r.json()["items"]] == [f"par-{uid}@example.com"]
+    customer_id = r.json()["items"][0]["id"]
+    r = await client.get(f"/api/v1/tenants/me/customers/{customer_id}/orders", headers=headers)
+    assert len(r.json()) == 12
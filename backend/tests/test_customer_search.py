@@ -0,0 +1,99 @@
+"""Customer search: name/email/phone matching, phone prefixes, ranking, paging."""
+
+import uuid
+
+from httpx import AsyncClient
+
+from tests.conftest import auth_headers
+
+URL = "/api/v1/tenants/me/customers/search"
+
+
+def _uid() -> str:
+    return uuid.uuid4().hex[:8]
+
+
+async def _setup(client: AsyncClient) -> tuple[dict, dict[str, str]]:
+    """Tenant with a few customers. Return (owner headers, customer ids by key)."""
+    uid = _uid()
+    headers = auth_headers(sub=f"csearch-{uid}", email=f"csearch-{uid}@test.com")
+    r = await client.post(
+        "/api/v1/tenants/",
+        json={"name": f"CSearch {uid}", "slug": f"csearch-{uid}"},
+        headers=headers,
+    )
+    assert r.status_code == 201
+    customers = {
+        "ahmed": {"name": "Ahmed Al-Sabah", "phone": "+965 5555-1234", "email": "ahmed@x.com"},
+        "sara": {"name": "Sara Ahmed", "phone": "9876 5432"},
+        "arabic": {"name": "أحمد علي", "phone": "55551299"},
+        "mona": {"name": "Mona", "email": "mona.ahmed@shop.com"},
+    }
+    ids = {}
+    for key, fields in customers.items():
+        r = await client.post("/api/v1/tenants/me/customers", json=fields, headers=headers)
+        assert r.status_code == 201, r.text
+        ids[key] = r.json()["id"]
+    return headers, ids
+
+
+async def _invite_cashier(client: AsyncClient, owner_headers: dict) -> dict:
+    uid = _uid()
+    email = f"csearch-cashier-{uid}@test.com"
+    r = await client.post(
+        "/api/v1/tenants/me/members/invite",
+        json={"email": email, "role": "cashier"},
+        headers=owner_headers,
+    )
+    assert r.status_code == 201, r.text
+    cashier_headers = auth_headers(sub=f"csearch-cashier-{uid}", email=email)
+    r = await client.post("/api/v1/auth/accept-invite", headers=cashier_headers)
+    assert r.status_code == 200, r.text
+    return cashier_headers
+
+
+async def test_search_matches_name_email_and_phone(client: AsyncClient):
+    headers, ids = await _setup(client)
+
+    async def found(q: str) -> list[str]:
+        r = await client.get(URL, params={"q": q}, headers=headers)
+        assert r.status_code == 200, r.text
+        return [c["id"] for c in r.json()["items"]]
+
+    # Name prefix, then a later name word, then an email substring.
+    assert await found("ahmed") == [ids["ahmed"], ids["sara"], ids["mona"]]
+    assert await found("AH") == [ids["ahmed"], ids["sara"]]
+    assert await found("احمد") == [ids["arabic"]]
+    # Typed digits: phones starting with them first, then phones containing them.
+    assert await found("5555") == [ids["arabic"], ids["ahmed"]]
+    assert await found("5555 12") == [ids["arabic"], ids["ahmed"]]
+    assert await found("965-5555-1234") == [ids["ahmed"]]
+    assert await found("98") == [ids["sara"]]
+    assert await found("shop.com") == [ids["mona"]]
+    assert await found("%") == []
+
+    r = await client.get(URL, params={"q": ""}, headers=headers)
+    assert r.status_code == 422
+
+
+async def test_search_paginates_and_allows_cashier(client: AsyncClient):
+    headers, ids = await _setup(client)
+    cashier_headers = await _invite_cashier(client, headers)
+
+    seen: list[str] = []
+    cursor = None
+    while True:
+        params = {"q": "ahmed", "limit": 1}
+        if cursor:
+            params["cursor"] = cursor
+        r = await client.get(URL, params=params, headers=cashier_headers)
+        assert r.status_code == 200, r.text
+        body = r.json()
+        seen += [c["id"] for c in body["items"]]
+        if not body["has_more"]:
+            break
+        cursor = body["next_cursor"]
+    assert seen == [ids["ahmed"], ids["sara"], ids["mona"]]
+
+    r = await client.get(URL, params={"q": "ahmed", "cursor": "nope"}, headers=headers)
+    assert r.status_code == 400
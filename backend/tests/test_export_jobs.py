@@ -0,0 +1,215 @@
+"""Background export job tests: API dedup/status + worker output per format."""
+
+import csv
+import gzip
+import io
+import uuid
+from unittest.mock import patch
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.export_job import ExportJob
+from app.workers.tasks.exports import _process_export_job
+from tests.conftest import auth_headers
+
+pytestmark = pytest.mark.exports
+
+
+def _uid() -> str:
+    return uuid.uuid4().hex[:8]
+
+
+class _FakeUpload:
+    """Stands in for storage.MultipartUpload; keeps bytes in memory."""
+
+    uploads: dict[str, bytes] = {}
+
+    def __init__(self, key: str, content_type: str, part_size: int = 0) -> None:
+        self.key = key
+        self._buf = io.BytesIO()
+        self.size_bytes = 0
+        self.closed = False
+
+    def write(self, data: bytes) -> int:
+        self._buf.write(data)
+        self.size_bytes += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.size_bytes
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+        _FakeUpload.uploads[self.key] = self._buf.getvalue()
+
+    def abort(self) -> None:
+        self.closed = True
+
+
+async def _setup_tenant_with_orders(client: AsyncClient, n_orders: int = 2) -> tuple[dict, str]:
+    uid = _uid()
+    headers = auth_headers(sub=f"exp-{uid}", email=f"exp-{uid}@test.com")
+    headers["Content-Type"] = "application/json"
+    slug = f"exp-{uid}"
+    r = await client.post(
+        "/api/v1/tenants/", json={"name": f"EXP {uid}", "slug": slug}, headers=headers
+    )
+    assert r.status_code == 201, r.text
+    tenant_id = r.json()["id"]
+
+    r = await client.post(
+        "/api/v1/tenants/me/products",
+        json={
+            "name": f"Widget {uid}",
+            "price_amount": "2.500",
+            "is_active": True,
+            "stock_qty": 100,
+        },
+        headers=headers,
+    )
+    assert r.status_code == 201, r.text
+    pid = r.json()["id"]
+
+    with patch("app.api.v1.public_storefront.send_order_notification"):
+        for _ in range(n_orders):
+            r = await client.post(
+                f"/api/v1/storefront/{slug}/orders",
+                json={
+                    "customer_name": "Buyer",
+                    "customer_email": f"b-{_uid()}@e.com",
+                    "items": [{"catalog_item_id": pid, "qty": 2}],
+                },
+            )
+            assert r.status_code == 201, r.text
+    return headers, tenant_id
+
+
+async def _queue(client: AsyncClient, headers: dict, **body) -> tuple[int, dict]:
+    with patch("app.api.v1.exports.run_export_job") as mock_task:
+        r = await client.post("/api/v1/tenants/me/exports", json=body, headers=headers)
+    return r.status_code, r.json() | {"_delay_calls": mock_task.delay.call_count}
+
+
+async def _run_job(db: AsyncSession, tenant_id: str, job_id: str) -> ExportJob:
+    with patch("app.workers.tasks.exports.MultipartUpload", _FakeUpload):
+        await _process_export_job(db, tenant_id, job_id)
+    result = await db.execute(select(ExportJob).where(ExportJob.id == uuid.UUID(job_id)))
+    return result.scalar_one()
+
+
+async def test_create_export_job_queues_task(client: AsyncClient):
+    headers, _ = await _setup_tenant_with_orders(client, n_orders=0)
+    status, data = await _queue(client, headers, entity="orders", format="csv")
+    assert status == 202
+    assert data["status"] == "pending"
+    assert data["download_url"] is None
+    assert data["_delay_calls"] == 1
+
+
+async def test_repeat_request_returns_existing_job(client: AsyncClient):
+    headers, _ = await _setup_tenant_with_orders(client, n_orders=0)
+    status1, first = await _queue(client, headers, entity="donations", format="csv_gzip")
+    status2, second = await _queue(client, headers, entity="donations", format="csv_gzip")
+    assert status1 == 202
+    assert status2 == 200
+    assert second["id"] == first["id"]
+    assert second["_delay_calls"] == 0
+
+    # Different parameters → separate job
+    status3, third = await _queue(client, headers, entity="donations", format="csv")
+    assert status3 == 202
+    assert third["id"] != first["id"]
+
+
+async def test_invalid_format_rejected(client: AsyncClient):
+    headers, _ = await _setup_tenant_with_orders(client, n_orders=0)
+    r = await client.post(
+        "/api/v1/tenants/me/exports", json={"entity": "orders", "format": "pdf"}, headers=headers
+    )
+    assert r.status_code == 422
+
+
+async def test_get_unknown_job_404(client: AsyncClient):
+    headers, _ = await _setup_tenant_with_orders(client, n_orders=0)
+    r = await client.get(f"/api/v1/tenants/me/exports/{uuid.uuid4()}", headers=headers)
+    assert r.status_code == 404
+
+
+async def test_csv_export_job_completes(client: AsyncClient, db: AsyncSession):
+    headers, tenant_id = await _setup_tenant_with_orders(client, n_orders=3)
+    _, data = await _queue(client, headers, entity="orders", format="csv")
+
+    job = await _run_job(db, tenant_id, data["id"])
+    assert job.status == "completed"
+    assert job.row_count == 3
+    assert job.s3_key == f"{tenant_id}/exports/{job.id}.csv"
+
+    body = _FakeUpload.uploads[job.s3_key].decode("utf-8-sig")
+    rows = list(csv.reader(io.StringIO(body)))
+    assert rows[0][0] == "order_number"
+    assert len(rows) == 4
+    assert job.size_bytes == len(_FakeUpload.uploads[job.s3_key])
+
+    r = await client.get(f"/api/v1/tenants/me/exports/{job.id}", headers=headers)
+    assert r.status_code == 200
+    assert r.json()["status"] == "completed"
+    assert r.json()["download_url"]
+
+
+async def test_csv_gzip_export_job(client: AsyncClient, db: AsyncSession):
+    headers, tenant_id = await _setup_tenant_with_orders(client, n_orders=2)
+    _, data = await _queue(client, headers, entity="orders", format="csv_gzip")
+
+    job = await _run_job(db, tenant_id, data["id"])
+    assert job.status == "completed"
+    body = gzip.decompress(_FakeUpload.uploads[job.s3_key]).decode("utf-8-sig")
+    assert len(list(csv.reader(io.StringIO(body)))) == 3
+
+
+async def test_parquet_export_flattens_order_lines(client: AsyncClient, db: AsyncSession):
+    pq = pytest.importorskip("pyarrow.parquet")
+    headers, tenant_id = await _setup_tenant_with_orders(client, n_orders=2)
+    _, data = await _queue(client, headers, entity="orders", format="parquet")
+
+    job = await _run_job(db, tenant_id, data["id"])
+    assert job.status == "completed"
+    table = pq.read_table(io.BytesIO(_FakeUpload.uploads[job.s3_key]))
+    assert table.num_rows == 2
+    assert table.column("qty").to_pylist() == [2, 2]
+    assert table.column("line_no").to_pylist() == [1, 1]
+
+
+async def test_completed_job_not_reprocessed(client: AsyncClient, db: AsyncSession):
+    headers, tenant_id = await _setup_tenant_with_orders(client, n_orders=1)
+    _, data = await _queue(client, headers, entity="orders", format="csv")
+    job = await _run_job(db, tenant_id, data["id"])
+    first_key = job.s3_key
+    _FakeUpload.uploads.pop(first_key)
+
+    # Redelivered task is a no-op
+    job = await _run_job(db, tenant_id, data["id"])
+    assert job.status == "completed"
+    assert first_key not in _FakeUpload.uploads
+
+
+async def test_export_job_failure_recorded(client: AsyncClient, db: AsyncSession):
+    headers, tenant_id = await _setup_tenant_with_orders(client, n_orders=1)
+    _, data = await _queue(client, headers, entity="orders", format="csv")
+
+    with patch(
+        "app.workers.tasks.exports.open_export_writer", side_effect=RuntimeError("disk full")
+    ):
+        job = await _run_job(db, tenant_id, data["id"])
+    assert job.status == "failed"
+    assert job.error == "disk full"
+
+    # A failed job does not block a new request
+    status, again = await _queue(client, headers, entity="orders", format="csv")
+    assert status == 202
+    assert again["id"] != data["id"]
@@ -0,0 +1,119 @@
+"""Idempotency-Key on public submissions and POS sales: replays, mismatches, races."""
+
+import asyncio
+import uuid
+
+import redis.asyncio as aioredis
+from httpx import AsyncClient
+
+from app.core.config import settings
+from app.services.idempotency import cache_key
+from tests.conftest import auth_headers
+
+
+def _uid() -> str:
+    return uuid.uuid4().hex[:8]
+
+
+async def _setup(client: AsyncClient, *, open_shift: bool = False) -> tuple[dict, str, str]:
+    """Create tenant + tracked product (stock 10). Return (headers, slug, product_id)."""
+    uid = _uid()
+    slug = f"idem-{uid}"
+    headers = auth_headers(sub=f"idem-{uid}", email=f"idem-{uid}@test.com")
+    headers["Content-Type"] = "application/json"
+    r = await client.post(
+        "/api/v1/tenants/", json={"name": f"Idem {uid}", "slug": slug}, headers=headers
+    )
+    assert r.status_code == 201
+    r = await client.post(
+        "/api/v1/tenants/me/products",
+        json={"name": f"Idem-{uid}", "price_amount": "1.000", "stock_qty": 10},
+        headers=headers,
+    )
+    assert r.status_code == 201
+    product_id = r.json()["id"]
+    if open_shift:
+        r = await client.post(
+            "/api/v1/tenants/me/pos/shifts/open", json={"starting_cash": "0.000"}, headers=headers
+        )
+        assert r.status_code == 201
+    return headers, slug, product_id
+
+
+def _order(product_id: str, qty: int = 1) -> dict:
+    return {
+        "customer_name": "Retry",
+        "customer_phone": "+96500000000",
+        "items": [{"catalog_item_id": product_id, "qty": qty}],
+    }
+
+
+async def _stock(client: AsyncClient, headers: dict, product_id: str) -> int:
+    r = await client.get(f"/api/v1/tenants/me/products/{product_id}", headers=headers)
+    return r.json()["stock_qty"]
+
+
+async def test_storefront_order_replay_and_key_reuse(client: AsyncClient):
+    headers, slug, product_id = await _setup(client)
+    url = f"/api/v1/storefront/{slug}/orders"
+    key = {"Idempotency-Key": f"order-{_uid()}"}
+
+    first = await client.post(url, json=_order(product_id, 2), headers=key)
+    assert first.status_code == 201, first.text
+    assert "idempotent-replayed" not in first.headers
+
+    again = await client.post(url, json=_order(product_id, 2), headers=key)
+    assert again.status_code == 201
+    assert again.headers["idempotent-replayed"] == "true"
+    assert again.json() == first.json()
+    assert await _stock(client, headers, product_id) == 8
+
+    r = await client.post(url, json=_order(product_id, 3), headers=key)
+    assert r.status_code == 422
+    assert "different request" in r.json()["detail"]
+
+    # No key: every submission is a new order.
+    r = await client.post(url, json=_order(product_id, 2))
+    assert r.json()["order_number"] != first.json()["order_number"]
+    assert await _stock(client, headers, product_id) == 6
+
+
+async def test_replay_falls_back_to_database(client: AsyncClient):
+    """A response evicted from Redis is still replayed from idempotency_keys."""
+    headers, slug, product_id = await _setup(client)
+    idem_key = f"donation-{_uid()}"
+    url = f"/api/v1/storefront/{slug}/donations"
+    payload = {"donor_name": "Donor", "amount": "5.000", "currency": "KWD"}
+
+    first = await client.post(url, json=payload, headers={"Idempotency-Key": idem_key})
+    assert first.status_code == 201, first.text
+
+    r = aioredis.from_url(settings.REDIS_URL)
+    try:
+        assert await r.delete(cache_key("storefront.donations", slug, idem_key)) == 1
+    finally:
+        await r.aclose()
+
+    again = await client.post(url, json=payload, headers={"Idempotency-Key": idem_key})
+    assert again.status_code == 201
+    assert again.headers["idempotent-replayed"] == "true"
+    assert again.json()["id"] == first.json()["id"]
+
+    r = await client.post(url, json=payload, headers={"Idempotency-Key": "x" * 256})
+    assert r.status_code == 422
+
+
+async def test_concurrent_pos_duplicates_create_one_order(client: AsyncClient):
+    headers, _slug, product_id = await _setup(client, open_shift=True)
+    keyed = {**headers, "Idempotency-Key": f"sale-{_uid()}"}
+    body = {"items": [{"catalog_item_id": product_id, "qty": 1}]}
+
+    responses = await asyncio.gather(
+        *(client.post("/api/v1/tenants/me/pos/orders", json=body, headers=keyed) for _ in range(3))
+    )
+    assert [r.status_code for r in responses] == [201, 201, 201]
+    assert len({r.json()["id"] for r in responses}) == 1
+    assert await _stock(client, headers, product_id) == 9
+
+    r = await client.get("/api/v1/tenants/me/pos/orders", headers=headers)
+    assert [o["id"] for o in r.json()["items"]] == [responses[0].json()["id"]]
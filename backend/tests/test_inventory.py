@@ -649,3 +649,104 @@ async def test_custom_threshold_respected(client: AsyncClient):
     assert r.status_code == 200
     assert r.json()["is_low_stock"] is True
     assert r.json()["low_stock_threshold"] == 20
+
+
+# ---------------------------------------------------------------------------
+# Bulk price / active / stock update
+# ---------------------------------------------------------------------------
+
+
+async def test_bulk_update_prices_stock_and_ledger(client: AsyncClient, db: AsyncSession):
+    headers, _slug, product_id, _visit = await _setup(client, stock_qty=10)
+    r = await client.post(
+        "/api/v1/tenants/me/products",
+        json={"name": f"Other-{_uid()}", "price_amount": "1.000", "stock_qty": 4},
+        headers=headers,
+    )
+    other_id = r.json()["id"]
+    r = await client.post(
+        f"/api/v1/tenants/me/products/{other_id}/variants",
+        json={"name": "Blue", "stock_qty": 2},
+        headers=headers,
+    )
+    variant_id = r.json()["id"]
+    r = await client.get("/api/v1/tenants/me", headers=headers)
+    tenant_id = r.json()["id"]
+    version = await db.scalar(
+        text("SELECT catalog_version FROM tenants WHERE id = :id"), {"id": tenant_id}
+    )
+
+    r = await client.post(
+        "/api/v1/tenants/me/products/bulk-update",
+        json={
+            "items": [
+                {"product_id": product_id, "price_amount": "3.750", "stock_delta": 5},
+                {"product_id": other_id, "is_active": False, "stock_delta": -4, "note": "count"},
+                {"product_id": other_id, "variant_id": variant_id, "stock_delta": 3},
+            ]
+        },
+        headers=headers,
+    )
+    assert r.status_code == 200, r.text
+    assert r.json() == {"products_updated": 2, "variants_updated": 1, "stock_movements": 3}
+
+    r = await client.get(f"/api/v1/tenants/me/products/{product_id}", headers=headers)
+    assert (r.json()["price_amount"], r.json()["stock_qty"]) == ("3.750", 15)
+    r = await client.get(f"/api/v1/tenants/me/products/{other_id}", headers=headers)
+    assert (r.json()["is_active"], r.json()["stock_qty"], r.json()["price_amount"]) == (
+        False,
+        0,
+        "1.000",
+    )
+    r = await client.get(
+        f"/api/v1/tenants/me/products/{other_id}/variants/{variant_id}", headers=headers
+    )
+    assert r.json()["stock_qty"] == 5
+
+    rows = await db.execute(
+        select(StockMovement.variant_id, StockMovement.delta_qty, StockMovement.reason)
+        .where(StockMovement.product_id.in_([uuid.UUID(product_id), uuid.UUID(other_id)]))
+        .order_by(StockMovement.delta_qty)
+    )
+    assert [tuple(row) for row in rows] == [
+        (None, -4, "manual_adjustment"),
+        (uuid.UUID(variant_id), 3, "manual_restock"),
+        (None, 5, "manual_restock"),
+    ]
+    assert (
+        await db.scalar(
+            text("SELECT catalog_version FROM tenants WHERE id = :id"), {"id": tenant_id}
+        )
+        == version + 1
+    )
+
+
+async def test_bulk_update_is_all_or_nothing(client: AsyncClient):
+    headers, _slug, product_id, _visit = await _setup(client, stock_qty=3)
+    _h, _s, untracked_id, _v = await _setup(client, track_inventory=False)
+
+    async def _bulk(items: list[dict]):
+        return await client.post(
+            "/api/v1/tenants/me/products/bulk-update", json={"items": items}, headers=headers
+        )
+
+    r = await _bulk(
+        [
+            {"product_id": product_id, "price_amount": "9.000"},
+            {"product_id": product_id, "variant_id": str(uuid.uuid4()), "stock_delta": 1},
+        ]
+    )
+    assert r.status_code == 404
+    # Another tenant's product is invisible
+    r = await _bulk([{"product_id": untracked_id, "is_active": False}])
+    assert r.status_code == 404
+
+    r = await _bulk([{"product_id": product_id, "price_amount": "9.000", "stock_delta": -4}])
+    assert r.status_code == 409
+    r = await client.get(f"/api/v1/tenants/me/products/{product_id}", headers=headers)
+    assert (r.json()["price_amount"], r.json()["stock_qty"]) == ("2.500", 3)
+
+    r = await _bulk([{"product_id": product_id}])
+    assert r.status_code == 422
+    r = await _bulk([{"product_id": product_id, "is_active": True}] * 2)
+    assert r.status_code == 422
@@ -0,0 +1,142 @@
+"""Live event channel: publish-on-commit, SSE fan-out, connection limits, heartbeats.
+
+The stream is read through ``live_event_stream`` directly; an HTTP client
+would buffer the never-ending response.
+"""
+
+import asyncio
+import json
+import uuid
+from unittest.mock import patch
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.config import settings
+from app.services.live_events import acquire_connection, live_event_stream
+from tests.conftest import auth_headers
+
+pytestmark = pytest.mark.pos
+
+
+def _uid() -> str:
+    return uuid.uuid4().hex[:8]
+
+
+async def _setup(client: AsyncClient) -> tuple[dict, uuid.UUID, str]:
+    """Tenant + tracked product (stock 1). Return (headers, tenant_id, product_id)."""
+    uid = _uid()
+    headers = auth_headers(sub=f"live-{uid}", email=f"live-{uid}@test.com")
+    r = await client.post(
+        "/api/v1/tenants/", json={"name": f"Live {uid}", "slug": f"live-{uid}"}, headers=headers
+    )
+    assert r.status_code == 201
+    tenant_id = uuid.UUID(r.json()["id"])
+    r = await client.post(
+        "/api/v1/tenants/me/products",
+        json={"name": f"Live-{uid}", "price_amount": "2.500", "stock_qty": 1},
+        headers=headers,
+    )
+    assert r.status_code == 201
+    return headers, tenant_id, r.json()["id"]
+
+
+async def _next_event(stream) -> tuple[str, dict]:
+    frame = await asyncio.wait_for(anext(stream), timeout=5)
+    event_line, data_line = frame.strip().split("\n")
+    return event_line.removeprefix("event: "), json.loads(data_line.removeprefix("data: "))
+
+
+async def test_committed_writes_reach_the_stream(client: AsyncClient):
+    headers, tenant_id, product_id = await _setup(client)
+    lease_id = await acquire_connection(tenant_id)
+    stream = live_event_stream(tenant_id, lease_id)
+    try:
+        assert (await _next_event(stream))[0] == "ready"
+
+        r = await client.post(
+            "/api/v1/tenants/me/pos/shifts/open", json={"starting_cash": "0.000"}, headers=headers
+        )
+        shift_id = r.json()["id"]
+        event, data = await _next_event(stream)
+        assert (event, data["id"], data["status"]) == ("shift.opened", shift_id, "open")
+
+        sale = {"items": [{"catalog_item_id": product_id, "qty": 1}], "payment_method": "cash"}
+        r = await client.post("/api/v1/tenants/me/pos/orders", json=sale, headers=headers)
+        assert r.status_code == 201
+        order = r.json()
+        # Rolled back (out of stock): nothing is published.
+        r = await client.post("/api/v1/tenants/me/pos/orders", json=sale, headers=headers)
+        assert r.status_code == 409
+
+        event, data = await _next_event(stream)
+        assert event == "order.created"
+        assert data["id"] == order["id"]
+        assert data["shift_id"] == shift_id
+        assert data["total_amount"] == "2.500"
+        assert data["payment_method"] == "cash"
+
+        r = await client.patch(
+            f"/api/v1/tenants/me/pos/orders/{order['id']}/cancel", headers=headers
+        )
+        assert r.status_code == 200
+        event, data = await _next_event(stream)
+        assert (event, data["status"], data["from_status"]) == (
+            "order.status",
+            "cancelled",
+            "fulfilled",
+        )
+
+        await client.post(
+            "/api/v1/tenants/me/pos/shifts/close", json={"counted_cash": "0.000"}, headers=headers
+        )
+        event, data = await _next_event(stream)
+        assert (event, data["status"], data["order_count"]) == ("shift.closed", "closed", 0)
+    finally:
+        await stream.aclose()
+
+
+async def test_connection_limit_and_heartbeat(client: AsyncClient):
+    headers, tenant_id, _product_id = await _setup(client)
+    with (
+        patch.object(settings, "LIVE_EVENTS_MAX_CONNECTIONS_PER_TENANT", 1),
+        patch.object(settings, "LIVE_EVENTS_HEARTBEAT_SECONDS", 0.05),
+    ):
+        lease_id = await acquire_connection(tenant_id)
+        assert lease_id is not None
+        r = await client.get("/api/v1/tenants/me/events", headers=headers)
+        assert r.status_code == 429
+
+        stream = live_event_stream(tenant_id, lease_id)
+        assert (await _next_event(stream))[0] == "ready"
+        assert await asyncio.wait_for(anext(stream), timeout=5) == ": ping\n\n"
+        await stream.aclose()
+
+        # Closing the stream frees its slot.
+        assert await acquire_connection(tenant_id) is not None
+
+
+async def test_slow_client_is_told_to_resync(client: AsyncClient):
+    headers, tenant_id, _product_id = await _setup(client)
+    with patch.object(settings, "LIVE_EVENTS_QUEUE_SIZE", 1):
+        stream = live_event_stream(tenant_id, await acquire_connection(tenant_id))
+        try:
+            assert (await _next_event(stream))[0] == "ready"
+            for _ in range(2):
+                r = await client.post(
+                    "/api/v1/tenants/me/pos/shifts/open",
+                    json={"starting_cash": "0.000"},
+                    headers=headers,
+                )
+                assert r.status_code == 201
+                r = await client.post(
+                    "/api/v1/tenants/me/pos/shifts/close",
+                    json={"counted_cash": "0.000"},
+                    headers=headers,
+                )
+            await asyncio.sleep(0.2)  # let the publishes arrive
+
+            assert (await _next_event(stream))[0] == "shift.opened"
+            assert (await _next_event(stream))[0] == "resync"
+        finally:
+            await stream.aclose()
@@ -257,6 +257,6 @@ async def test_order_list_includes_fulfillment_status(client: AsyncClient):
     assert (await _patch_fulfillment(client, headers, order_id, "packed")).status_code == 200
     r = await client.get("/api/v1/tenants/me/orders", headers=headers)
     assert r.status_code == 200
-    match = [o for o in r.json() if o["id"] == order_id]
+    match = [o for o in r.json()["items"] if o["id"] == order_id]
     assert len(match) == 1
     assert match[0]["fulfillment_status"] == "packed"
@@ -0,0 +1,138 @@
+"""M2 tests: batch presigned uploads, batch confirm and pending-asset hiding."""
+
+import random
+import uuid
+from unittest.mock import MagicMock, patch
+
+import pytest
+from botocore.exceptions import ClientError
+from httpx import AsyncClient
+
+from app.services.storage import head_objects
+from tests.m2_helpers import create_tenant_get_headers
+
+pytestmark = pytest.mark.m2
+
+_JPEG = {"content_type": "image/jpeg", "size_bytes": 1024}
+
+
+async def _upload_batch(client: AsyncClient, headers: dict, files: list[dict]) -> list[dict]:
+    r = await client.post(
+        "/api/v1/tenants/me/media/upload-urls", json={"files": files}, headers=headers
+    )
+    assert r.status_code == 201, r.text
+    return r.json()["items"]
+
+
+async def _confirm_batch(
+    client: AsyncClient, headers: dict, media_ids: list[str], stored_by_key: dict
+) -> tuple[dict, int]:
+    with (
+        patch("app.api.v1.media.head_objects", return_value=stored_by_key),
+        patch("app.api.v1.media.generate_media_derivatives") as mock_task,
+    ):
+        r = await client.post(
+            "/api/v1/tenants/me/media/confirm", json={"media_ids": media_ids}, headers=headers
+        )
+    assert r.status_code == 200, r.text
+    return r.json(), mock_task.delay.call_count
+
+
+async def test_batch_upload_urls(client: AsyncClient):
+    headers, _ = await create_tenant_get_headers(client, slug_prefix="media-bu")
+    entity = {"entity_type": "product", "entity_id": str(uuid.uuid4())}
+    names = ["a.jpg", "b.jpg", "c.pdf"]
+    files = [{"file_name": n, **_JPEG, **entity} for n in names[:2]]
+    pdf = {"file_name": "c.pdf", "content_type": "application/pdf", "size_bytes": 10}
+    files.append(pdf | entity)
+
+    items = await _upload_batch(client, headers, files)
+
+    assert [item["s3_key"].rsplit("-", 1)[1] for item in items] == names
+    assert all(item["s3_key"] in item["upload_url"] for item in items)
+    r = await client.get(
+        "/api/v1/tenants/me/media", params={"entity_id": entity["entity_id"]}, headers=headers
+    )
+    listed = {m["id"]: m["status"] for m in r.json()}
+    assert listed == {item["media_id"]: "pending" for item in items}
+
+
+async def test_batch_upload_rejects_bad_content_type(client: AsyncClient):
+    headers, _ = await create_tenant_get_headers(client, slug_prefix="media-bx")
+    entity = {"entity_type": "product", "entity_id": str(uuid.uuid4())}
+    files = [
+        {"file_name": "a.jpg", **_JPEG, **entity},
+        {"file_name": "x.js", "content_type": "application/javascript", "size_bytes": 10},
+    ]
+    r = await client.post(
+        "/api/v1/tenants/me/media/upload-urls", json={"files": files}, headers=headers
+    )
+    assert r.status_code == 400
+    assert r.json()["detail"].startswith("files[1].content_type")
+
+    r = await client.get(
+        "/api/v1/tenants/me/media", params={"entity_id": entity["entity_id"]}, headers=headers
+    )
+    assert r.json() == []
+
+
+async def test_batch_confirm_and_storefront_hides_pending(client: AsyncClient):
+    headers, slug = await create_tenant_get_headers(client, slug_prefix="media-bc")
+    r = await client.post(
+        "/api/v1/tenants/me/products",
+        json={
+            "name": "Lamp",
+            "price_amount": "9.000",
+            "is_active": True,
+            # The test client bypasses RLS; sort first among other tenants' rows.
+            "sort_order": -(10**9) - random.randrange(10**9),
+        },
+        headers=headers,
+    )
+    assert r.status_code == 201, r.text
+    product_id = r.json()["id"]
+    files = [{"file_name": f"{n}.jpg", "product_id": product_id, **_JPEG} for n in "abc"]
+    ok, missing, wrong = await _upload_batch(client, headers, files)
+    unknown = str(uuid.uuid4())
+
+    stored_by_key = {
+        ok["s3_key"]: {"size_bytes": 900, "content_type": "image/jpeg"},
+        missing["s3_key"]: None,
+        wrong["s3_key"]: {"size_bytes": 900, "content_type": "text/html"},
+    }
+    ids = [missing["media_id"], ok["media_id"], wrong["media_id"], unknown]
+    data, delay_calls = await _confirm_batch(client, headers, ids, stored_by_key)
+
+    assert [(m["id"], m["status"], m["size_bytes"]) for m in data["confirmed"]] == [
+        (ok["media_id"], "ready", 900)
+    ]
+    assert [(f["media_id"], f["status_code"]) for f in data["failed"]] == [
+        (missing["media_id"], 409),
+        (wrong["media_id"], 400),
+        (unknown, 404),
+    ]
+    assert delay_calls == 1
+
+    # "a" was created first but the confirmed upload is the only one shown.
+    r = await client.get(f"/api/v1/storefront/{slug}/products?limit=100")
+    item = next(p for p in r.json()["items"] if p["id"] == product_id)
+    assert ok["s3_key"] in item["image_url"]
+
+
+def test_head_objects_reports_missing_keys():
+    client = MagicMock()
+
+    def _head(Bucket: str, Key: str) -> dict:  # noqa: N803
+        if Key == "missing":
+            raise ClientError({"Error": {"Code": "404"}}, "HeadObject")
+        return {"ContentLength": len(Key), "ContentType": "image/png"}
+
+    client.head_object.side_effect = _head
+    with patch("app.services.storage._get_s3_client", return_value=client):
+        result = head_objects(["t/a.png", "missing", "t/bb.png"])
+
+    assert result == {
+        "t/a.png": {"size_bytes": 7, "content_type": "image/png"},
+        "missing": None,
+        "t/bb.png": {"size_bytes": 8, "content_type": "image/png"},
+    }
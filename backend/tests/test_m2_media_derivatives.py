@@ -0,0 +1,162 @@
+"""M2 tests: upload confirm, image derivative worker and storefront srcset."""
+
+import io
+import random
+import uuid
+from unittest.mock import patch
+
+import pytest
+from httpx import AsyncClient
+from PIL import Image
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.media_derivatives import UnsupportedImageError, generate_derivatives
+from app.workers.tasks.media import _process_media_derivatives
+from tests.m2_helpers import create_tenant_get_headers
+
+pytestmark = pytest.mark.m2
+
+
+class _FakeUpload:
+    """Stands in for storage.MultipartUpload; keeps bytes in memory."""
+
+    uploads: dict[str, bytes] = {}
+
+    def __init__(self, key: str, content_type: str, part_size: int = 0) -> None:
+        self.key = key
+        self._buf = io.BytesIO()
+        self.size_bytes = 0
+        self.aborted = False
+
+    def write(self, data: bytes) -> int:
+        self._buf.write(data)
+        self.size_bytes += len(data)
+        return len(data)
+
+    def close(self) -> None:
+        _FakeUpload.uploads[self.key] = self._buf.getvalue()
+
+    def abort(self) -> None:
+        self.aborted = True
+
+
+def _image_bytes(size: tuple[int, int], fmt: str = "JPEG", mode: str = "RGB") -> bytes:
+    buf = io.BytesIO()
+    Image.new(mode, size, (200, 30, 30, 128) if mode == "RGBA" else (200, 30, 30)).save(
+        buf, format=fmt
+    )
+    return buf.getvalue()
+
+
+def _generate(data: bytes) -> list[dict]:
+    return generate_derivatives(
+        io.BytesIO(data), lambda width, fmt: _FakeUpload(f"d/{width}.{fmt}", fmt)
+    )
+
+
+def test_generate_derivatives_widths_and_formats():
+    derivatives = _generate(_image_bytes((2400, 1600)))
+
+    assert [(d["width"], d["format"]) for d in derivatives] == [
+        (w, f) for w in (1280, 640, 320) for f in ("webp", "jpeg")
+    ]
+    for d in derivatives:
+        out = Image.open(io.BytesIO(_FakeUpload.uploads[d["key"]]))
+        assert out.format == d["format"].upper()
+        assert out.size == (d["width"], round(1600 * d["width"] / 2400))
+        assert d["size_bytes"] == len(_FakeUpload.uploads[d["key"]])
+
+
+def test_generate_derivatives_never_upscales_and_flattens_alpha():
+    derivatives = _generate(_image_bytes((200, 100), fmt="PNG", mode="RGBA"))
+
+    assert [(d["width"], d["format"]) for d in derivatives] == [(200, "webp"), (200, "jpeg")]
+    webp = Image.open(io.BytesIO(_FakeUpload.uploads[derivatives[0]["key"]]))
+    jpeg = Image.open(io.BytesIO(_FakeUpload.uploads[derivatives[1]["key"]]))
+    assert webp.mode == "RGBA"
+    assert jpeg.mode == "RGB"
+
+
+def test_generate_derivatives_rejects_non_images():
+    with pytest.raises(UnsupportedImageError):
+        _generate(b"definitely not an image")
+
+
+async def _upload(client: AsyncClient, headers: dict, **extra) -> dict:
+    body = {"file_name": "photo.jpg", "content_type": "image/jpeg", "size_bytes": 1024}
+    r = await client.post(
+        "/api/v1/tenants/me/media/upload-url", json=body | extra, headers=headers
+    )
+    assert r.status_code == 201, r.text
+    return r.json()
+
+
+async def _confirm(
+    client: AsyncClient, headers: dict, media_id: str, stored: dict | None
+) -> tuple[int, dict, int]:
+    with (
+        patch("app.api.v1.media.head_object", return_value=stored),
+        patch("app.api.v1.media.generate_media_derivatives") as mock_task,
+    ):
+        r = await client.post(f"/api/v1/tenants/me/media/{media_id}/confirm", headers=headers)
+    return r.status_code, r.json(), mock_task.delay.call_count
+
+
+async def test_confirm_upload_records_size_and_queues_derivatives(client: AsyncClient):
+    headers, _ = await create_tenant_get_headers(client, slug_prefix="media-cf")
+    media_id = (await _upload(client, headers))["media_id"]
+
+    status, _, calls = await _confirm(client, headers, media_id, None)
+    assert (status, calls) == (409, 0)
+
+    stored = {"size_bytes": 1024, "content_type": "image/png"}
+    status, _, calls = await _confirm(client, headers, media_id, stored)
+    assert (status, calls) == (400, 0)
+
+    stored = {"size_bytes": 1024, "content_type": "image/jpeg"}
+    status, data, calls = await _confirm(client, headers, media_id, stored)
+    assert (status, calls) == (200, 1)
+    assert (data["status"], data["size_bytes"]) == ("ready", 1024)
+    assert data["derivatives"] is None
+
+
+async def test_derivatives_served_as_srcset(client: AsyncClient, db: AsyncSession):
+    headers, slug = await create_tenant_get_headers(client, slug_prefix="media-ss")
+    r = await client.post(
+        "/api/v1/tenants/me/products",
+        json={
+            "name": "Mug",
+            "price_amount": "3.000",
+            "is_active": True,
+            # The test client bypasses RLS; sort first among other tenants' rows.
+            "sort_order": -(10**9) - random.randrange(10**9),
+        },
+        headers=headers,
+    )
+    assert r.status_code == 201, r.text
+    product = r.json()
+    upload = await _upload(client, headers, product_id=product["id"])
+    stored = {"size_bytes": 1024, "content_type": "image/jpeg"}
+    assert (await _confirm(client, headers, upload["media_id"], stored))[0] == 200
+    original = _image_bytes((1000, 800))
+
+    def _download(key: str, fileobj) -> int:
+        assert key == upload["s3_key"]
+        return fileobj.write(original)
+
+    with (
+        patch("app.workers.tasks.media.download_to_file", _download),
+        patch("app.workers.tasks.media.MultipartUpload", _FakeUpload),
+    ):
+        tenant_id = upload["s3_key"].split("/", 1)[0]  # keys are tenant-prefixed
+        written = await _process_media_derivatives(db, tenant_id, upload["media_id"])
+    assert written == 6  # 1000 (original width), 640, 320 x webp/jpeg
+
+    r = await client.get(f"/api/v1/storefront/{slug}/products?limit=100")
+    assert r.status_code == 200, r.text
+    item = next(p for p in r.json()["items"] if p["id"] == product["id"])
+    prefix = f"media/derivatives/{uuid.UUID(upload['media_id'])}"
+    assert f"{prefix}/640.jpg" in item["image_url"]
+    widths = [entry.rsplit(" ", 1)[1] for entry in item["image_srcset"].split(", ")]
+    assert widths == ["320w", "640w", "1000w"]
+    assert f"{prefix}/320.webp" in item["image_srcset"]
@@ -0,0 +1,108 @@
+"""M2 tests: orphaned media garbage collection."""
+
+import uuid
+from datetime import UTC, datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.media_asset import MediaAsset
+from app.services.storage import build_derivative_key, delete_objects
+from app.workers.tasks.media_gc import _collect_tenant_media
+from tests.m2_helpers import create_tenant_get_headers
+
+pytestmark = pytest.mark.m2
+
+_JPEG = {"content_type": "image/jpeg", "size_bytes": 1024}
+
+
+async def _upload_batch(client: AsyncClient, headers: dict, names: list[str]) -> list[dict]:
+    files = [{"file_name": name, **_JPEG} for name in names]
+    r = await client.post(
+        "/api/v1/tenants/me/media/upload-urls", json={"files": files}, headers=headers
+    )
+    assert r.status_code == 201, r.text
+    return r.json()["items"]
+
+
+async def test_gc_deletes_stale_rows_and_unreferenced_objects(
+    client: AsyncClient, db: AsyncSession
+):
+    headers, _ = await create_tenant_get_headers(client, slug_prefix="media-gc")
+    ready, stale, fresh, logo = await _upload_batch(
+        client, headers, ["ready.jpg", "stale.jpg", "fresh.jpg", "logo.jpg"]
+    )
+    tenant_id = uuid.UUID(ready["s3_key"].split("/", 1)[0])
+    now = datetime.now(UTC)
+    old = now - timedelta(days=3)
+
+    await db.execute(
+        update(MediaAsset)
+        .where(MediaAsset.id.in_([ready["media_id"], stale["media_id"], logo["media_id"]]))
+        .values(created_at=old)
+    )
+    await db.execute(
+        update(MediaAsset).where(MediaAsset.id == ready["media_id"]).values(status="ready")
+    )
+    await db.commit()
+    r = await client.put(
+        "/api/v1/tenants/me/storefront", json={"logo_s3_key": logo["s3_key"]}, headers=headers
+    )
+    assert r.status_code == 200, r.text
+
+    live_derivative = build_derivative_key(tenant_id, ready["media_id"], 320, "webp")
+    dead_derivative = build_derivative_key(tenant_id, uuid.uuid4(), 320, "webp")
+    stray_old = f"{tenant_id}/media/{uuid.uuid4()}-stray.jpg"
+    stray_new = f"{tenant_id}/media/{uuid.uuid4()}-uploading.jpg"
+    listing = [
+        (ready["s3_key"], old),
+        (stale["s3_key"], old),
+        (fresh["s3_key"], now),
+        (logo["s3_key"], old),
+        (live_derivative, old),
+        (dead_derivative, old),
+        (stray_old, old),
+        (stray_new, now),
+    ]
+    pages = [
+        [{"key": key, "size_bytes": 100, "last_modified": modified} for key, modified in page]
+        for page in (listing[:3], listing[3:])
+    ]
+    deleted: list[str] = []
+
+    def _delete_objects(keys: list[str]) -> list[str]:
+        deleted.extend(keys)
+        return []
+
+    with (
+        patch("app.workers.tasks.media_gc.iter_object_pages", return_value=iter(pages)),
+        patch("app.workers.tasks.media_gc.delete_objects", _delete_objects),
+    ):
+        stats = await _collect_tenant_media(db, tenant_id, now - timedelta(hours=24))
+
+    assert sorted(deleted) == sorted([stale["s3_key"], dead_derivative, stray_old])
+    assert (stats.rows_deleted, stats.objects_scanned, stats.objects_deleted) == (1, 8, 3)
+    assert stats.bytes_reclaimed == 300
+
+    result = await db.execute(select(MediaAsset.id).where(MediaAsset.tenant_id == tenant_id))
+    remaining = {str(media_id) for media_id in result.scalars().all()}
+    assert remaining == {ready["media_id"], fresh["media_id"], logo["media_id"]}
+
+
+def test_delete_objects_batches_of_1000():
+    client = MagicMock()
+    client.delete_objects.side_effect = [
+        {},
+        {"Errors": [{"Key": "k1500", "Code": "AccessDenied"}]},
+        {},
+    ]
+    keys = [f"k{i}" for i in range(2500)]
+    with patch("app.services.storage._get_s3_client", return_value=client):
+        failed = delete_objects(keys)
+
+    sizes = [len(c.kwargs["Delete"]["Objects"]) for c in client.delete_objects.call_args_list]
+    assert sizes == [1000, 1000, 500]
+    assert failed == ["k1500"]
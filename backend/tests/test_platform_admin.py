@@ -8,7 +8,10 @@ from sqlalchemy import select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.audit_event import AuditEvent
+from app.models.tenant import Tenant
+from app.models.tenant_stats import TenantStats
 from app.models.user import User
+from app.services.tenant_stats import rebuild_tenant_stats
 from tests.conftest import auth_headers
 
 pytestmark = pytest.mark.m6
@@ -76,8 +79,7 @@ async def test_platform_admin_can_list_tenants(client: AsyncClient, db: AsyncSes
 
     r = await client.get("/api/v1/admin/tenants", headers=admin_headers)
     assert r.status_code == 200
-    data = r.json()
-    assert isinstance(data, list)
+    data = r.json()["items"]
     slugs = [t["slug"] for t in data]
     assert slug in slugs
     # Check member_count is present
@@ -333,7 +335,7 @@ async def test_admin_list_includes_usage_summary(client: AsyncClient, db: AsyncS
     # Admin list tenants
     r = await client.get("/api/v1/admin/tenants", headers=admin_headers)
     assert r.status_code == 200
-    matching = [t for t in r.json() if t["slug"] == slug]
+    matching = [t for t in r.json()["items"] if t["slug"] == slug]
     assert len(matching) == 1
     tenant_data = matching[0]
 
@@ -350,7 +352,7 @@ async def test_admin_list_empty_tenant_has_zero_counts(client: AsyncClient, db:
 
     r = await client.get("/api/v1/admin/tenants", headers=admin_headers)
     assert r.status_code == 200
-    matching = [t for t in r.json() if t["slug"] == slug]
+    matching = [t for t in r.json()["items"] if t["slug"] == slug]
     assert len(matching) == 1
     tenant_data = matching[0]
 
@@ -375,3 +377,86 @@ async def test_non_admin_cannot_suspend(client: AsyncClient):
         headers=headers,
     )
     assert r.status_code == 403
+
+
+# --- Test: tenant_stats-backed sorting, filtering and keyset pagination ---
+
+
+async def _create_named_tenant(client: AsyncClient, name: str, donations: int) -> str:
+    """Create a tenant named *name* with *donations* storefront donations. Return slug."""
+    uid = _uid()
+    headers = auth_headers(sub=f"stats-{uid}", email=f"stats-{uid}@test.com")
+    headers["Content-Type"] = "application/json"
+    slug = f"st-{uid}"
+    r = await client.post("/api/v1/tenants/", json={"name": name, "slug": slug}, headers=headers)
+    assert r.status_code == 201
+    for _ in range(donations):
+        r = await client.post(
+            f"/api/v1/storefront/{slug}/donations",
+            json={"donor_name": "Donor", "amount": "5.000"},
+        )
+        assert r.status_code == 201
+    return slug
+
+
+async def test_admin_list_tenants_sort_filter_keyset(client: AsyncClient, db: AsyncSession):
+    admin_headers, _ = await _create_platform_admin(client, db)
+    group = _uid()
+    most, none, some = [
+        await _create_named_tenant(client, f"Stats {group} {n}", donations=n) for n in (2, 0, 1)
+    ]
+
+    params = {"q": group, "sort": "donation_count", "limit": 2}
+    r = await client.get("/api/v1/admin/tenants", params=params, headers=admin_headers)
+    assert r.status_code == 200
+    page = r.json()
+    assert [t["slug"] for t in page["items"]] == [most, some]
+    assert [t["donation_count"] for t in page["items"]] == [2, 1]
+    assert page["has_more"] is True
+
+    params["cursor"] = page["next_cursor"]
+    r = await client.get("/api/v1/admin/tenants", params=params, headers=admin_headers)
+    page = r.json()
+    assert [t["slug"] for t in page["items"]] == [none]
+    assert page["has_more"] is False
+
+    r = await client.get(
+        "/api/v1/admin/tenants",
+        params={
+            "q": group,
+            "sort": "last_activity_at",
+            "direction": "asc",
+            "active_since": "2020-01-01",
+        },
+        headers=admin_headers,
+    )
+    assert [t["slug"] for t in r.json()["items"]] == [most, some]
+
+    r = await client.get(
+        "/api/v1/admin/tenants", params={"cursor": "garbage"}, headers=admin_headers
+    )
+    assert r.status_code == 400
+
+
+async def test_tenant_stats_rebuild_matches_write_paths(client: AsyncClient, db: AsyncSession):
+    slug = await _create_named_tenant(client, f"Rebuild {_uid()}", donations=2)
+    tenant = (await db.execute(select(Tenant).where(Tenant.slug == slug))).scalar_one()
+
+    async def _stats() -> tuple:
+        row = await db.execute(select(TenantStats).where(TenantStats.tenant_id == tenant.id))
+        s = row.scalar_one()
+        await db.refresh(s)
+        return (
+            s.member_count,
+            s.order_count,
+            s.donation_count,
+            s.pledge_count,
+            s.last_activity_at,
+        )
+
+    incremental = await _stats()
+    assert incremental[:4] == (1, 0, 2, 0)
+
+    await rebuild_tenant_stats(db, tenant.id)
+    await db.commit()
+    assert await _stats() == incremental
@@ -73,7 +73,7 @@ async def test_rls_admin_list_tenants(rls_client: AsyncClient, db: AsyncSession)
 
     r = await rls_client.get("/api/v1/admin/tenants", headers=admin_headers)
     assert r.status_code == 200
-    data = r.json()
+    data = r.json()["items"]
     slugs = [t["slug"] for t in data]
     assert slug in slugs
     # Verify member_count is correct even under RLS
@@ -131,7 +131,7 @@ async def test_rls_admin_list_usage_summary(rls_client: AsyncClient, db: AsyncSe
     # Admin list tenants — verify counts under RLS
     r = await rls_client.get("/api/v1/admin/tenants", headers=admin_headers)
     assert r.status_code == 200
-    matching = [t for t in r.json() if t["slug"] == slug]
+    matching = [t for t in r.json()["items"] if t["slug"] == slug]
     assert len(matching) == 1
     td = matching[0]
 
@@ -161,7 +161,7 @@ async def test_pos_order_source_persists_in_list(client: AsyncClient):
 
     r = await client.get("/api/v1/tenants/me/orders", headers=headers)
     assert r.status_code == 200
-    orders = r.json()
+    orders = r.json()["items"]
     assert len(orders) == 1
     assert orders[0]["source"] == "pos"
 
@@ -948,3 +948,66 @@ async def test_pos_variant_double_cancel_no_double_restore(client: AsyncClient):
 
     vurl = f"/api/v1/tenants/me/products/{product_id}/variants/{variant_id}"
     assert (await client.get(vurl, headers=headers)).json()["stock_qty"] == 5
+
+
+# ---------------------------------------------------------------------------
+# Barcode / SKU scan lookup
+# ---------------------------------------------------------------------------
+
+
+async def test_pos_scan_resolves_product_and_variant_codes(client: AsyncClient):
+    headers, product_id = await _setup(client, stock_qty=4)
+    uid = _uid()
+    r = await client.patch(
+        f"/api/v1/tenants/me/products/{product_id}",
+        json={"barcode": f"PBC-{uid}"},
+        headers=headers,
+    )
+    assert r.status_code == 200
+    r = await client.post(
+        f"/api/v1/tenants/me/products/{product_id}/variants",
+        json={"name": "Large", "sku": f"VSKU-{uid}", "price_amount": "7.500", "stock_qty": 0},
+        headers=headers,
+    )
+    assert r.status_code == 201
+    variant_id = r.json()["id"]
+
+    r = await client.get(f"/api/v1/tenants/me/pos/scan/PBC-{uid}", headers=headers)
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert body["code_type"] == "barcode"
+    assert body["catalog_item_id"] == product_id
+    assert body["variant_id"] is None
+    assert (body["unit_price"], body["stock_qty"], body["in_stock"]) == ("5.000", 4, True)
+
+    r = await client.get(f"/api/v1/tenants/me/pos/scan/VSKU-{uid}", headers=headers)
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert body["code_type"] == "sku"
+    assert (body["variant_id"], body["variant_name"]) == (variant_id, "Large")
+    assert (body["unit_price"], body["stock_qty"], body["in_stock"]) == ("7.500", 0, False)
+
+
+async def test_pos_scan_unknown_inactive_and_cross_tenant(client: AsyncClient):
+    headers, product_id = await _setup(client)
+    uid = _uid()
+    r = await client.patch(
+        f"/api/v1/tenants/me/products/{product_id}",
+        json={"sku": f"SCAN-{uid}"},
+        headers=headers,
+    )
+    assert r.status_code == 200
+
+    r = await client.get(f"/api/v1/tenants/me/pos/scan/NOPE-{uid}", headers=headers)
+    assert r.status_code == 404
+
+    other_headers, _ = await _setup(client)
+    r = await client.get(f"/api/v1/tenants/me/pos/scan/SCAN-{uid}", headers=other_headers)
+    assert r.status_code == 404
+
+    r = await client.patch(
+        f"/api/v1/tenants/me/products/{product_id}", json={"is_active": False}, headers=headers
+    )
+    assert r.status_code == 200
+    r = await client.get(f"/api/v1/tenants/me/pos/scan/SCAN-{uid}", headers=headers)
+    assert r.status_code == 422
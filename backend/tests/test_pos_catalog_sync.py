@@ -0,0 +1,128 @@
+"""POS catalog sync feed: snapshots, since= deltas and compression."""
+
+import uuid
+
+import pytest
+from httpx import AsyncClient
+
+from tests.conftest import auth_headers
+
+pytestmark = pytest.mark.pos
+
+SYNC_URL = "/api/v1/tenants/me/pos/catalog"
+
+
+def _uid() -> str:
+    return uuid.uuid4().hex[:8]
+
+
+async def _setup_tenant(client: AsyncClient) -> dict:
+    uid = _uid()
+    headers = auth_headers(sub=f"sync-{uid}", email=f"sync-{uid}@test.com")
+    headers["Content-Type"] = "application/json"
+    r = await client.post(
+        "/api/v1/tenants/", json={"name": f"SYNC {uid}", "slug": f"sync-{uid}"}, headers=headers
+    )
+    assert r.status_code == 201
+    return headers
+
+
+async def _product(client: AsyncClient, headers: dict, **fields) -> str:
+    payload = {"name": f"Item-{_uid()}", "price_amount": "2.500", **fields}
+    r = await client.post("/api/v1/tenants/me/products", json=payload, headers=headers)
+    assert r.status_code == 201, r.text
+    return r.json()["id"]
+
+
+async def _sync(client: AsyncClient, headers: dict, since: int | None = None) -> dict:
+    params = {"since": since} if since is not None else {}
+    r = await client.get(SYNC_URL, params=params, headers=headers)
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+async def test_snapshot_is_compact_and_sellable_only(client: AsyncClient):
+    headers = await _setup_tenant(client)
+    plain_id = await _product(client, headers, stock_qty=10, sku="PLAIN-1")
+    varied_id = await _product(client, headers, track_inventory=False)
+    await _product(client, headers, is_active=False)
+    for name, active in (("Small", True), ("Large", False)):
+        r = await client.post(
+            f"/api/v1/tenants/me/products/{varied_id}/variants",
+            json={"name": name, "price_amount": "3.000", "is_active": active},
+            headers=headers,
+        )
+        assert r.status_code == 201
+
+    feed = await _sync(client, headers)
+    assert feed["full"] is True
+    assert feed["version"] > 0
+    products = {p["i"]: p for p in feed["products"]}
+    assert set(products) == {plain_id, varied_id}
+    assert products[plain_id] == {
+        "i": plain_id,
+        "n": products[plain_id]["n"],
+        "p": "2.500",
+        "c": "KWD",
+        "t": True,
+        "q": 10,
+        "s": "PLAIN-1",
+    }
+    assert [v["n"] for v in products[varied_id]["v"]] == ["Small"]
+    assert products[varied_id]["v"][0]["p"] == "3.000"
+
+
+async def test_delta_carries_stock_edits_and_removals(client: AsyncClient):
+    headers = await _setup_tenant(client)
+    sold_id = await _product(client, headers, stock_qty=5)
+    hidden_id = await _product(client, headers)
+    deleted_id = await _product(client, headers)
+    untouched_id = await _product(client, headers)
+
+    version = (await _sync(client, headers))["version"]
+    delta = await _sync(client, headers, since=version)
+    assert (delta["version"], delta["full"], delta["products"]) == (version, False, [])
+
+    r = await client.post(
+        "/api/v1/tenants/me/pos/shifts/open", json={"starting_cash": "0.000"}, headers=headers
+    )
+    assert r.status_code == 201
+    r = await client.post(
+        "/api/v1/tenants/me/pos/orders",
+        json={"items": [{"catalog_item_id": sold_id, "qty": 2}]},
+        headers=headers,
+    )
+    assert r.status_code == 201
+    r = await client.patch(
+        f"/api/v1/tenants/me/products/{hidden_id}", json={"is_active": False}, headers=headers
+    )
+    assert r.status_code == 200
+    r = await client.delete(f"/api/v1/tenants/me/products/{deleted_id}", headers=headers)
+    assert r.status_code == 204
+
+    delta = await _sync(client, headers, since=version)
+    assert delta["full"] is False
+    assert delta["version"] == version + 3
+    assert [(p["i"], p["q"]) for p in delta["products"]] == [(sold_id, 3)]
+    assert set(delta["deleted"]) == {hidden_id, deleted_id}
+    assert untouched_id not in delta["deleted"]
+
+    # Caught up: nothing new; a version from the future gets a full snapshot.
+    assert (await _sync(client, headers, since=delta["version"]))["products"] == []
+    assert (await _sync(client, headers, since=delta["version"] + 100))["full"] is True
+
+
+async def test_large_feed_is_gzipped_and_tenant_scoped(client: AsyncClient):
+    headers = await _setup_tenant(client)
+    ids = {await _product(client, headers, description="x") for _ in range(25)}
+
+    r = await client.get(SYNC_URL, headers={**headers, "Accept-Encoding": "gzip"})
+    assert r.status_code == 200
+    assert r.headers["content-encoding"] == "gzip"
+    assert {p["i"] for p in r.json()["products"]} == ids
+
+    r = await client.get(SYNC_URL, headers={**headers, "Accept-Encoding": "identity"})
+    assert "content-encoding" not in r.headers
+
+    other = await _setup_tenant(client)
+    assert (await _sync(client, other))["products"] == []
@@ -0,0 +1,156 @@
+"""Offline POS batch upload: per-sale outcomes, replays and stock."""
+
+import uuid
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.order import Order
+from app.models.stock_movement import StockMovement
+from tests.conftest import auth_headers
+
+pytestmark = pytest.mark.pos
+
+BATCH_URL = "/api/v1/tenants/me/pos/orders/batch"
+
+
+def _uid() -> str:
+    return uuid.uuid4().hex[:8]
+
+
+async def _setup(client: AsyncClient, *, open_shift: bool = True) -> dict:
+    uid = _uid()
+    headers = auth_headers(sub=f"off-{uid}", email=f"off-{uid}@test.com")
+    headers["Content-Type"] = "application/json"
+    r = await client.post(
+        "/api/v1/tenants/", json={"name": f"OFF {uid}", "slug": f"off-{uid}"}, headers=headers
+    )
+    assert r.status_code == 201
+    if open_shift:
+        r = await client.post(
+            "/api/v1/tenants/me/pos/shifts/open", json={"starting_cash": "0.000"}, headers=headers
+        )
+        assert r.status_code == 201
+    return headers
+
+
+async def _product(client: AsyncClient, headers: dict, **fields) -> str:
+    payload = {"name": f"Off-{_uid()}", "price_amount": "1.500", **fields}
+    r = await client.post("/api/v1/tenants/me/products", json=payload, headers=headers)
+    assert r.status_code == 201, r.text
+    return r.json()["id"]
+
+
+def _sale(product_id: str, qty: int = 1, *, minutes_ago: int = 10, **extra) -> dict:
+    captured = datetime.now(UTC) - timedelta(minutes=minutes_ago)
+    return {
+        "client_sale_id": f"T1-{_uid()}",
+        "captured_at": captured.isoformat(),
+        "items": [{"catalog_item_id": product_id, "qty": qty, **extra}],
+        "payment_method": "cash",
+    }
+
+
+async def _stock(client: AsyncClient, headers: dict, product_id: str) -> int:
+    r = await client.get(f"/api/v1/tenants/me/products/{product_id}", headers=headers)
+    return r.json()["stock_qty"]
+
+
+async def test_batch_records_sales_and_replay_is_safe(client: AsyncClient, db: AsyncSession):
+    headers = await _setup(client)
+    tracked = await _product(client, headers, stock_qty=10)
+    untracked = await _product(client, headers, track_inventory=False)
+    r = await client.post(
+        f"/api/v1/tenants/me/products/{tracked}/variants",
+        json={"name": "Big", "price_amount": "2.000", "stock_qty": 4},
+        headers=headers,
+    )
+    variant_id = r.json()["id"]
+    sales = [
+        _sale(tracked, 3, minutes_ago=30),
+        _sale(tracked, 1, variant_id=variant_id),
+        _sale(untracked, 5),
+    ]
+
+    r = await client.post(BATCH_URL, json={"sales": sales}, headers=headers)
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert (body["created"], body["duplicates"], body["rejected"]) == (3, 0, 0)
+    assert [res["client_sale_id"] for res in body["results"]] == [
+        s["client_sale_id"] for s in sales
+    ]
+    numbers = sorted(res["order_number"] for res in body["results"])
+    assert numbers == ["ORD-00001", "ORD-00002", "ORD-00003"]
+    assert await _stock(client, headers, tracked) == 7
+    r = await client.get("/api/v1/tenants/me/pos/shifts/current", headers=headers)
+    shift = r.json()["shift"]
+    assert shift["order_count"] == 3
+    assert Decimal(shift["cash_sales"]) == Decimal(shift["sales_total"]) == Decimal("14.000")
+
+    first = (
+        await db.execute(
+            select(Order).where(Order.id == uuid.UUID(body["results"][0]["order_id"]))
+        )
+    ).scalar_one()
+    assert first.created_at == datetime.fromisoformat(sales[0]["captured_at"])
+    assert (first.source, first.status) == ("pos", "fulfilled")
+    assert first.total_amount == Decimal("4.500")
+    assert first.shift_id is not None
+    movements = (
+        await db.execute(
+            select(StockMovement.delta_qty, StockMovement.variant_id).where(
+                StockMovement.product_id == uuid.UUID(tracked),
+                StockMovement.reason == "pos_sale",
+            )
+        )
+    ).all()
+    assert sorted((m.delta_qty, str(m.variant_id)) for m in movements) == [
+        (-3, "None"),
+        (-1, variant_id),
+    ]
+
+    r = await client.post(BATCH_URL, json={"sales": sales}, headers=headers)
+    assert r.status_code == 200
+    replay = r.json()
+    assert (replay["created"], replay["duplicates"]) == (0, 3)
+    assert [res["order_id"] for res in replay["results"]] == [
+        res["order_id"] for res in body["results"]
+    ]
+    assert await _stock(client, headers, tracked) == 7
+
+
+async def test_batch_rejects_per_sale_in_capture_order(client: AsyncClient):
+    headers = await _setup(client)
+    product = await _product(client, headers, stock_qty=3)
+    inactive = await _product(client, headers, is_active=False)
+    later = _sale(product, 2, minutes_ago=5)
+    earlier = _sale(product, 2, minutes_ago=50)
+    dead = _sale(inactive, 1)
+
+    r = await client.post(BATCH_URL, json={"sales": [later, earlier, dead]}, headers=headers)
+    assert r.status_code == 200, r.text
+    results = r.json()["results"]
+    assert [res["status"] for res in results] == ["rejected", "created", "rejected"]
+    assert results[0]["error_status"] == 409
+    assert "Insufficient stock" in results[0]["detail"]
+    assert results[2]["error_status"] == 422
+    assert await _stock(client, headers, product) == 1
+
+
+async def test_batch_requires_shift_and_valid_queue(client: AsyncClient):
+    headers = await _setup(client, open_shift=False)
+    product = await _product(client, headers, stock_qty=3)
+    sale = _sale(product)
+
+    r = await client.post(BATCH_URL, json={"sales": [sale]}, headers=headers)
+    assert r.status_code == 409
+
+    r = await client.post(BATCH_URL, json={"sales": [sale, dict(sale)]}, headers=headers)
+    assert r.status_code == 422
+    future = _sale(product, minutes_ago=-60)
+    r = await client.post(BATCH_URL, json={"sales": [future]}, headers=headers)
+    assert r.status_code == 422
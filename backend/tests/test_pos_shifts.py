@@ -1,13 +1,17 @@
 """POS shift open/close + cash-summary tests (M12.3)."""
 
+import asyncio
 import uuid
 from decimal import Decimal
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import delete, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.order import Order
+from app.models.pos_shift import PosShift, PosShiftPayment
+from app.services.pos_shift_totals import find_shift_total_drift, rebuild_shift_totals
 from tests.conftest import auth_headers
 
 pytestmark = pytest.mark.pos
@@ -177,6 +181,20 @@ async def test_cancelled_cash_order_excluded_from_cash_sales(client: AsyncClient
     assert Decimal(shift["cash_sales"]) == Decimal("0")
 
 
+async def test_concurrent_cancels_move_sale_out_of_shift_once(client: AsyncClient):
+    headers, pid = await _setup(client)
+    await _open(client, headers, "0.000")
+    order_id = (await _sale(client, headers, pid, qty=2)).json()["id"]
+    assert (await _sale(client, headers, pid, qty=1)).status_code == 201
+
+    url = f"/api/v1/tenants/me/pos/orders/{order_id}/cancel"
+    responses = await asyncio.gather(*(client.patch(url, headers=headers) for _ in range(4)))
+    assert sorted(r.status_code for r in responses) == [200, 409, 409, 409]
+
+    shift = (await _current(client, headers)).json()["shift"]
+    assert Decimal(shift["cash_sales"]) == Decimal("5.000")
+
+
 async def test_close_shift_success(client: AsyncClient):
     headers, pid = await _setup(client)
     await _open(client, headers, "10.000")
@@ -226,3 +244,62 @@ async def test_cross_tenant_shift_isolation(client: AsyncClient):
 
     # A's shift is still open and unaffected.
     assert (await _current(client, headers_a)).json()["shift"] is not None
+
+
+async def test_running_totals_payment_breakdown_and_z_report(client: AsyncClient):
+    headers, pid = await _setup(client)
+    shift_id = (await _open(client, headers, "10.000")).json()["id"]
+
+    assert (await _sale(client, headers, pid, qty=2, payment_method="cash")).status_code == 201
+    knet = await _sale(client, headers, pid, qty=1, payment_method="knet")
+    assert (await _sale(client, headers, pid, qty=1, payment_method=None)).status_code == 201
+    rc = await client.patch(
+        f"/api/v1/tenants/me/pos/orders/{knet.json()['id']}/cancel", headers=headers
+    )
+    assert rc.status_code == 200
+
+    shift = (await _current(client, headers)).json()["shift"]
+    assert (shift["order_count"], shift["cancelled_count"]) == (2, 1)
+    assert Decimal(shift["sales_total"]) == Decimal("15.000")
+    assert [
+        (p["payment_method"], p["order_count"], Decimal(p["total"])) for p in shift["payments"]
+    ] == [("cash", 1, Decimal("10.000")), ("unspecified", 1, Decimal("5.000"))]
+
+    r = await client.get(f"/api/v1/tenants/me/pos/shifts/{shift_id}/report", headers=headers)
+    assert r.status_code == 409
+
+    closed = (await _close(client, headers, "20.000")).json()
+    r = await client.get(f"/api/v1/tenants/me/pos/shifts/{shift_id}/report", headers=headers)
+    assert r.status_code == 200
+    report = r.json()
+    assert report["currency"] == "KWD"
+    assert {k: v for k, v in report.items() if k != "currency"} == closed
+    assert Decimal(report["variance"]) == Decimal("0")
+
+    other, _ = await _setup(client)
+    r = await client.get(f"/api/v1/tenants/me/pos/shifts/{shift_id}/report", headers=other)
+    assert r.status_code == 404
+
+
+async def test_shift_total_drift_is_detected_and_rebuilt(client: AsyncClient, db: AsyncSession):
+    headers, pid = await _setup(client)
+    shift_id = uuid.UUID((await _open(client, headers, "0.000")).json()["id"])
+    assert (await _sale(client, headers, pid, qty=3, payment_method="cash")).status_code == 201
+    tenant_id = uuid.UUID((await client.get("/api/v1/tenants/me", headers=headers)).json()["id"])
+
+    assert await find_shift_total_drift(db, tenant_id) == []
+
+    await db.execute(
+        update(PosShift).where(PosShift.id == shift_id).values(cash_sales=Decimal("1.000"))
+    )
+    await db.execute(delete(PosShiftPayment).where(PosShiftPayment.shift_id == shift_id))
+    drift = await find_shift_total_drift(db, tenant_id)
+    assert len(drift) == 2
+    assert "cash_sales" in drift[0] and "payments[cash]" in drift[1]
+
+    await rebuild_shift_totals(db, tenant_id)
+    assert await find_shift_total_drift(db, tenant_id) == []
+    await db.commit()
+    shift = (await _current(client, headers)).json()["shift"]
+    assert Decimal(shift["cash_sales"]) == Decimal("15.000")
+    assert shift["payments"][0]["order_count"] == 1
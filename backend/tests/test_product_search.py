@@ -0,0 +1,102 @@
+"""Product search: storefront + POS/admin endpoints, Arabic folding, ranking, paging."""
+
+import uuid
+
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.product_search import normalize_search_text
+from tests.conftest import auth_headers
+
+
+def _uid() -> str:
+    return uuid.uuid4().hex[:8]
+
+
+async def _setup(client: AsyncClient) -> tuple[dict, str, str, dict[str, str]]:
+    """Tenant with a small catalog. Return (headers, slug, uid, product ids by key)."""
+    uid = _uid()
+    slug = f"search-{uid}"
+    headers = auth_headers(sub=f"search-{uid}", email=f"search-{uid}@test.com")
+    r = await client.post(
+        "/api/v1/tenants/", json={"name": f"Search {uid}", "slug": slug}, headers=headers
+    )
+    assert r.status_code == 201
+    catalog = {
+        "shirt": {
+            "name": "Cotton Shirt",
+            "name_ar": "قميص قطن أزرق",
+            "sku": f"SH-{uid}",
+            "barcode": "6291041500213",
+        },
+        "tote": {"name": "Canvas Tote", "description": "Fits a folded shirt and a laptop"},
+        "dates": {"name": "Medjool Dates", "name_ar": "تمر مجدول", "sku": "DT-١٠٠"},
+        "retired": {"name": "Shirt Classic", "is_active": False},
+    }
+    ids = {}
+    for key, fields in catalog.items():
+        r = await client.post(
+            "/api/v1/tenants/me/products",
+            json={"price_amount": "1.000", **fields},
+            headers=headers,
+        )
+        assert r.status_code == 201, r.text
+        ids[key] = r.json()["id"]
+    return headers, slug, uid, ids
+
+
+async def test_storefront_search_matches_and_ranks(client: AsyncClient):
+    _headers, slug, uid, ids = await _setup(client)
+
+    async def found(q: str) -> list[str]:
+        r = await client.get(f"/api/v1/storefront/{slug}/products/search", params={"q": q})
+        assert r.status_code == 200, r.text
+        return [p["id"] for p in r.json()["items"]]
+
+    # A name match ranks above a description match; inactive products are hidden.
+    assert await found("shirt") == [ids["shirt"], ids["tote"]]
+    assert await found("cott") == [ids["shirt"]]
+    # Arabic with or without hamza and harakat; Arabic-Indic digits.
+    assert await found("قميص ازرق") == [ids["shirt"]]
+    assert await found("تَمْر") == [ids["dates"]]
+    assert await found("dt-100") == [ids["dates"]]
+    # Exact barcode, and a substring of a SKU.
+    assert await found("6291041500213") == [ids["shirt"]]
+    assert await found(uid[2:7]) == [ids["shirt"]]
+    # LIKE wildcards are literal; punctuation alone matches nothing.
+    assert await found("%") == []
+    assert await found("_ir") == []
+
+    r = await client.get(f"/api/v1/storefront/{slug}/products/search", params={"q": ""})
+    assert r.status_code == 422
+
+
+async def test_admin_search_paginates_and_includes_inactive(client: AsyncClient):
+    headers, _slug, _uid_, ids = await _setup(client)
+    url = "/api/v1/tenants/me/products/search"
+
+    seen: list[str] = []
+    cursor = None
+    while True:
+        params = {"q": "shirt", "limit": 1, "include_inactive": "true"}
+        if cursor:
+            params["cursor"] = cursor
+        r = await client.get(url, params=params, headers=headers)
+        assert r.status_code == 200, r.text
+        body = r.json()
+        seen += [p["id"] for p in body["items"]]
+        if not body["has_more"]:
+            break
+        cursor = body["next_cursor"]
+    # "Shirt Classic" starts with the query, so it outranks "Cotton Shirt".
+    assert seen == [ids["retired"], ids["shirt"], ids["tote"]]
+
+    r = await client.get(url, params={"q": "shirt", "cursor": "nope"}, headers=headers)
+    assert r.status_code == 400
+
+
+async def test_python_and_sql_normalization_agree(db: AsyncSession):
+    sample = "أَحْمَد إبراهيم آل مكتبة مصطفى ٱلـعربية ١٢٣ ABC"
+    result = await db.execute(text("SELECT search_normalize(:s)"), {"s": sample})
+    assert result.scalar_one() == normalize_search_text(sample)
@@ -344,6 +344,34 @@ async def test_patch_variant_to_existing_product_code_409(client: AsyncClient):
     assert r.status_code == 409
 
 
+async def test_code_freed_by_patch_and_delete_can_be_reused(client: AsyncClient):
+    # The code registry follows updates and deletes: released codes are reusable.
+    headers, _slug = await _make_owner(client)
+    product_id = await _make_product(client, headers, sku="OLD-SKU")
+    r = await client.post(
+        _vurl(product_id), json={"name": "V1", "barcode": "VAR-BC"}, headers=headers
+    )
+    assert r.status_code == 201
+    variant_id = r.json()["id"]
+
+    r = await client.patch(
+        f"/api/v1/tenants/me/products/{product_id}", json={"sku": "NEW-SKU"}, headers=headers
+    )
+    assert r.status_code == 200
+    r = await client.post(
+        _vurl(product_id), json={"name": "V2", "sku": "OLD-SKU"}, headers=headers
+    )
+    assert r.status_code == 201
+    r = await client.post(
+        _vurl(product_id), json={"name": "V3", "sku": "NEW-SKU"}, headers=headers
+    )
+    assert r.status_code == 409
+
+    r = await client.delete(f"{_vurl(product_id)}/{variant_id}", headers=headers)
+    assert r.status_code == 204
+    await _make_product(client, headers, barcode="VAR-BC")
+
+
 # ---------------------------------------------------------------------------
 # has_variants hint on the authenticated product list (M12.2.1 — POS feed)
 # ---------------------------------------------------------------------------
@@ -8,6 +8,7 @@ from httpx import AsyncClient
 from sqlalchemy import select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.ai_message import AIMessage
 from app.models.storefront_ai_conversation import StorefrontAIConversation
 from app.models.storefront_ai_usage_log import StorefrontAIUsageLog
 from app.services.ai_provider import AIResponse
@@ -78,9 +79,12 @@ async def test_storefront_chat_success(client: AsyncClient, db: AsyncSession):
         select(StorefrontAIConversation).where(StorefrontAIConversation.session_id == session_id)
     )
     conv = result.scalar_one()
-    assert len(conv.messages) == 2
-    assert conv.messages[0]["role"] == "user"
-    assert conv.messages[1]["role"] == "assistant"
+    roles = await db.execute(
+        select(AIMessage.role)
+        .where(AIMessage.storefront_conversation_id == conv.id)
+        .order_by(AIMessage.id)
+    )
+    assert roles.scalars().all() == ["user", "assistant"]
 
     # Verify usage log
     log_result = await db.execute(
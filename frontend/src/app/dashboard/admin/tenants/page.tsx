@@ -18,6 +18,12 @@ interface AdminTenant {
   last_activity_at: string | null;
 }
 
+interface AdminTenantPage {
+  items: AdminTenant[];
+  next_cursor: string | null;
+  has_more: boolean;
+}
+
 function formatDate(iso: string): string {
   return new Date(iso).toLocaleDateString();
 }
@@ -37,8 +43,11 @@ function formatRelative(iso: string | null): string {
 
 function AdminTenantsContent() {
   const [tenants, setTenants] = useState<AdminTenant[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [hasMore, setHasMore] = useState(false);
   const [error, setError] = useState("");
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [actionId, setActionId] = useState<string | null>(null);
   const [actionResult, setActionResult] = useState<{
     type: "success" | "error";
@@ -48,22 +57,43 @@ function AdminTenantsContent() {
   async function loadTenants() {
     setLoading(true);
     setError("");
-    const result = await apiFetch<AdminTenant[]>("/api/v1/admin/tenants");
+    const result = await apiFetch<AdminTenantPage>("/api/v1/admin/tenants");
     if (result.ok) {
-      setTenants(result.data);
+      setTenants(result.data.items);
+      setNextCursor(result.data.next_cursor);
+      setHasMore(result.data.has_more);
     } else {
       setError(result.detail);
     }
     setLoading(false);
   }
 
+  async function handleLoadMore() {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    setError("");
+    const result = await apiFetch<AdminTenantPage>(
+      `/api/v1/admin/tenants?cursor=${encodeURIComponent(nextCursor)}`
+    );
+    if (result.ok) {
+      setTenants((prev) => [...prev, ...result.data.items]);
+      setNextCursor(result.data.next_cursor);
+      setHasMore(result.data.has_more);
+    } else {
+      setError(result.detail);
+    }
+    setLoadingMore(false);
+  }
+
   useEffect(() => {
     let cancelled = false;
     async function fetchInitial() {
-      const result = await apiFetch<AdminTenant[]>("/api/v1/admin/tenants");
+      const result = await apiFetch<AdminTenantPage>("/api/v1/admin/tenants");
       if (cancelled) return;
       if (result.ok) {
-        setTenants(result.data);
+        setTenants(result.data.items);
+        setNextCursor(result.data.next_cursor);
+        setHasMore(result.data.has_more);
       } else {
         setError(result.detail);
       }
@@ -223,6 +253,19 @@ function AdminTenantsContent() {
             </table>
           </div>
         )}
+
+        {hasMore && (
+          <div className="mt-4 text-center">
+            <button
+              type="button"
+              onClick={handleLoadMore}
+              disabled={loadingMore}
+              className="rounded border border-gray-300 px-4 py-2 text-sm font-medium text-gray-700 hover:bg-gray-100 disabled:opacity-50"
+            >
+              Load more
+            </button>
+          </div>
+        )}
     </main>
   );
 }
@@ -44,10 +44,10 @@ function DonationsContent() {
     let cancelled = false;
     async function load() {
       setLoading(true);
-      const result = await apiFetch<Donation[]>("/api/v1/tenants/me/donations");
+      const result = await apiFetch<{ items: Donation[] }>("/api/v1/tenants/me/donations");
       if (cancelled) return;
       if (result.ok) {
-        setDonations(result.data);
+        setDonations(result.data.items);
       } else {
         setError(result.detail);
       }
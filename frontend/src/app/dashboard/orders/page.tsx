@@ -123,10 +123,10 @@ function OrdersContent() {
     let cancelled = false;
     async function load() {
       setLoading(true);
-      const result = await apiFetch<Order[]>("/api/v1/tenants/me/orders");
+      const result = await apiFetch<{ items: Order[] }>("/api/v1/tenants/me/orders");
       if (cancelled) return;
       if (result.ok) {
-        setOrders(result.data);
+        setOrders(result.data.items);
       } else {
         setError(result.detail);
       }
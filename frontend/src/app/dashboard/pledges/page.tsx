@@ -44,10 +44,10 @@ function PledgesContent() {
     let cancelled = false;
     async function load() {
       setLoading(true);
-      const result = await apiFetch<Pledge[]>("/api/v1/tenants/me/pledges");
+      const result = await apiFetch<{ items: Pledge[] }>("/api/v1/tenants/me/pledges");
       if (cancelled) return;
       if (result.ok) {
-        setPledges(result.data);
+        setPledges(result.data.items);
       } else {
         setError(result.detail);
       }
@@ -1,6 +1,6 @@
 "use client";
 
-import { useCallback, useEffect, useState } from "react";
+import { Fragment, useCallback, useEffect, useRef, useState } from "react";
 import { useTranslations } from "next-intl";
 import { RequireAuth } from "@/components/require-auth";
 import { DashboardShell } from "@/components/dashboard-shell";
@@ -24,10 +24,35 @@ interface Product {
   has_variants: boolean;
 }
 
-interface PaginatedProducts {
-  items: Product[];
-  next_cursor: string | null;
-  has_more: boolean;
+/** POS catalog sync feed (short keys; empty fields are omitted). */
+interface SyncVariant {
+  i: string;
+  n: string;
+  sz?: string;
+  co?: string;
+  p?: string;
+  q?: number;
+  s?: string;
+  b?: string;
+}
+
+interface SyncProduct {
+  i: string;
+  n: string;
+  p: string;
+  c: string;
+  t: boolean;
+  q?: number;
+  s?: string;
+  b?: string;
+  v?: SyncVariant[];
+}
+
+interface CatalogSync {
+  version: number;
+  full: boolean;
+  products: SyncProduct[];
+  deleted: string[];
 }
 
 interface Variant {
@@ -101,6 +126,12 @@ interface PaginatedHistory {
   has_more: boolean;
 }
 
+interface ShiftPaymentTotal {
+  payment_method: string;
+  order_count: number;
+  total: string;
+}
+
 interface ShiftResponse {
   id: string;
   status: string;
@@ -109,6 +140,10 @@ interface ShiftResponse {
   expected_cash: string;
   counted_cash: string | null;
   variance: string | null;
+  order_count: number;
+  cancelled_count: number;
+  sales_total: string;
+  payments: ShiftPaymentTotal[];
   opened_at: string;
   opened_by: string | null;
   closed_at: string | null;
@@ -124,6 +159,9 @@ interface CurrentShiftResponse {
 // Helpers
 // ---------------------------------------------------------------------------
 
+/** How often the terminal pulls catalog deltas (price/stock changes elsewhere). */
+const SYNC_INTERVAL_MS = 30_000;
+
 function canSell(p: Product): boolean {
   if (!p.is_active) return false;
   if (p.has_variants) return true;
@@ -131,6 +169,37 @@ function canSell(p: Product): boolean {
   return true;
 }
 
+/** Expand a sync feed entry into the product + variant shapes the page uses. */
+function fromSync(sp: SyncProduct): { product: Product; variants: Variant[] } {
+  const variants = (sp.v ?? []).map((v, idx) => ({
+    id: v.i,
+    name: v.n,
+    size: v.sz ?? null,
+    color: v.co ?? null,
+    sku: v.s ?? null,
+    barcode: v.b ?? null,
+    price_amount: v.p ?? null,
+    stock_qty: v.q ?? null,
+    is_active: true,
+    sort_order: idx,
+  }));
+  return {
+    product: {
+      id: sp.i,
+      name: sp.n,
+      price_amount: sp.p,
+      effective_currency: sp.c,
+      is_active: true,
+      track_inventory: sp.t,
+      stock_qty: sp.q ?? null,
+      sku: sp.s ?? null,
+      barcode: sp.b ?? null,
+      has_variants: variants.length > 0,
+    },
+    variants,
+  };
+}
+
 /** Max sellable qty for a product line, or null when stock is not tracked (unlimited). */
 function productMax(p: Product): number | null {
   if (!p.track_inventory) return null;
@@ -221,32 +290,58 @@ function POSContent() {
   const [closeNotes, setCloseNotes] = useState("");
   const [closedSummary, setClosedSummary] = useState<ShiftResponse | null>(null);
 
-  // ------ Fetch products ------
+  // ------ Catalog sync (snapshot once, then since= deltas) ------
 
   const [refreshKey, setRefreshKey] = useState(0);
+  const syncVersion = useRef<number | null>(null);
+
+  const syncCatalog = useCallback(async () => {
+    const since = syncVersion.current;
+    const result = await apiFetch<CatalogSync>(
+      since == null
+        ? "/api/v1/tenants/me/pos/catalog"
+        : `/api/v1/tenants/me/pos/catalog?since=${since}`,
+    );
+    if (!result.ok) {
+      if (since == null) setError(result.detail);
+      setLoading(false);
+      return;
+    }
+    const feed = result.data;
+    const changed = feed.products.map(fromSync);
+    const byId = new Map(changed.map((c) => [c.product.id, c.product]));
+    const removed = new Set(feed.deleted);
+    setProducts((prev) => {
+      if (feed.full) return changed.map((c) => c.product).filter(canSell);
+      const known = new Set(prev.map((p) => p.id));
+      const kept = prev
+        .filter((p) => !removed.has(p.id))
+        .map((p) => byId.get(p.id) ?? p);
+      const added = changed
+        .map((c) => c.product)
+        .filter((p) => !known.has(p.id));
+      return [...kept, ...added].filter(canSell);
+    });
+    setVariantsByProduct((prev) => {
+      const next = feed.full ? {} : { ...prev };
+      for (const id of removed) delete next[id];
+      for (const c of changed) next[c.product.id] = c.variants;
+      return next;
+    });
+    syncVersion.current = feed.version;
+    setLoading(false);
+  }, []);
 
   function refreshProducts() {
-    setLoading(true);
-    setError("");
     setRefreshKey((k) => k + 1);
+    void syncCatalog();
   }
 
   useEffect(() => {
-    let cancelled = false;
-    (async () => {
-      const result = await apiFetch<PaginatedProducts>(
-        "/api/v1/tenants/me/products",
-      );
-      if (cancelled) return;
-      if (result.ok) {
-        setProducts(result.data.items.filter(canSell));
-      } else {
-        setError(result.detail);
-      }
-      setLoading(false);
-    })();
-    return () => { cancelled = true; };
-  }, [refreshKey]);
+    void syncCatalog();
+    const timer = setInterval(() => void syncCatalog(), SYNC_INTERVAL_MS);
+    return () => clearInterval(timer);
+  }, [syncCatalog]);
 
   useEffect(() => {
     let cancelled = false;
@@ -666,7 +761,6 @@ function POSContent() {
                 setShowHistory(false);
                 setShowCancelForm(false);
                 setCancelReason("");
-                setVariantsByProduct({});
                 setPickerProduct(null);
                 setLoadingVariantsFor(null);
                 refreshProducts();
@@ -841,6 +935,29 @@ function POSContent() {
             >
               {closedSummary.variance}
             </dd>
+            <dt className="text-gray-500">{t("saleCount")}</dt>
+            <dd className="text-right text-gray-900">
+              {closedSummary.order_count}
+            </dd>
+            <dt className="text-gray-500">{t("cancelledCount")}</dt>
+            <dd className="text-right text-gray-900">
+              {closedSummary.cancelled_count}
+            </dd>
+            <dt className="text-gray-500">{t("salesTotal")}</dt>
+            <dd className="text-right text-gray-900">
+              {closedSummary.sales_total}
+            </dd>
+            {closedSummary.payments.map((p) => (
+              <Fragment key={p.payment_method}>
+                <dt className="ps-3 text-gray-500">
+                  {p.payment_method === "unspecified"
+                    ? t("unspecifiedPayment")
+                    : tPayment(p.payment_method)}{" "}
+                  ({p.order_count})
+                </dt>
+                <dd className="text-right text-gray-900">{p.total}</dd>
+              </Fragment>
+            ))}
             <dt className="text-gray-500">{t("shiftOpened")}</dt>
             <dd className="text-right text-gray-700">
               {fmtTime(closedSummary.opened_at)}
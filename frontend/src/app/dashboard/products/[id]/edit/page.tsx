@@ -6,7 +6,7 @@ import Link from "next/link";
 import { useTranslations } from "next-intl";
 import { RequireAuth } from "@/components/require-auth";
 import { apiFetch } from "@/lib/api-client";
-import { uploadFile, getMediaDownloadUrl } from "@/lib/upload";
+import { uploadFiles, getMediaDownloadUrl } from "@/lib/upload";
 import type { UploadProgress } from "@/lib/upload";
 import { ProductVariants } from "@/components/product-variants";
 
@@ -272,48 +272,44 @@ function EditProductContent() {
 
     setImages((prev) => [...prev, ...newEntries]);
 
-    // Upload each file in parallel
-    await Promise.all(
-      validFiles.map(async (file, idx) => {
+    // Upload all files in parallel (one presign and one confirm request)
+    const results = await uploadFiles(validFiles, {
+      entity_type: "product",
+      entity_id: productId,
+      product_id: productId,
+      onProgress: (idx, progress) => {
         const tempId = newEntries[idx].id;
+        setImages((prev) =>
+          prev.map((img) => (img.id === tempId ? { ...img, progress } : img))
+        );
+      },
+    });
 
-        const result = await uploadFile(file, {
-          entity_type: "product",
-          entity_id: productId,
-          product_id: productId,
-          onProgress: (progress) => {
-            setImages((prev) =>
-              prev.map((img) =>
-                img.id === tempId ? { ...img, progress } : img
-              )
-            );
-          },
-        });
-
-        if (result.ok) {
-          setImages((prev) =>
-            prev.map((img) =>
-              img.id === tempId
-                ? {
-                    ...img,
-                    id: result.result.media_id,
-                    uploading: false,
-                    progress: null,
-                  }
-                : img
-            )
-          );
-        } else {
-          setImages((prev) =>
-            prev.map((img) =>
-              img.id === tempId
-                ? { ...img, uploading: false, error: result.detail }
-                : img
-            )
-          );
-        }
-      })
-    );
+    results.forEach((result, idx) => {
+      const tempId = newEntries[idx].id;
+      if (result.ok) {
+        setImages((prev) =>
+          prev.map((img) =>
+            img.id === tempId
+              ? {
+                  ...img,
+                  id: result.result.media_id,
+                  uploading: false,
+                  progress: null,
+                }
+              : img
+          )
+        );
+      } else {
+        setImages((prev) =>
+          prev.map((img) =>
+            img.id === tempId
+              ? { ...img, uploading: false, error: result.detail }
+              : img
+          )
+        );
+      }
+    });
 
     // Reset file input so same files can be re-selected
     if (fileInputRef.current) {
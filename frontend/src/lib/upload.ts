@@ -6,6 +6,11 @@
  *      (authenticated via apiFetch, which attaches Bearer token)
  *   2. PUT  file bytes to upload_url (direct to S3/MinIO)
  *      (NO auth headers — presigned URL signature would break)
+ *   3. POST /api/v1/tenants/me/media/{media_id}/confirm
+ *      (marks the asset ready; pending assets are hidden from storefronts)
+ *
+ * uploadFiles() does the same for a gallery with the batch endpoints
+ * (POST /media/upload-urls, POST /media/confirm).
  *
  * Uses XMLHttpRequest for the S3 PUT to track upload progress.
  */
@@ -72,6 +77,26 @@ export async function requestUploadUrl(
   return { ok: true, data: result.data };
 }
 
+// ------ Confirm finished uploads ------
+
+interface ConfirmFailure {
+  media_id: string;
+  status_code: number;
+  detail: string;
+}
+
+export async function confirmUpload(
+  mediaId: string
+): Promise<{ ok: true } | { ok: false; detail: string }> {
+  const result = await apiFetch(`/api/v1/tenants/me/media/${mediaId}/confirm`, {
+    method: "POST",
+  });
+  if (!result.ok) {
+    return { ok: false, detail: result.detail };
+  }
+  return { ok: true };
+}
+
 // ------ PUT file to presigned URL with progress ------
 
 export function uploadToPresignedUrl(
@@ -149,6 +174,12 @@ export async function uploadFile(
     };
   }
 
+  // 3. Confirm (marks the asset ready)
+  const confirmResult = await confirmUpload(urlResult.data.media_id);
+  if (!confirmResult.ok) {
+    return { ok: false, detail: confirmResult.detail };
+  }
+
   return {
     ok: true,
     result: {
@@ -158,6 +189,110 @@ export async function uploadFile(
   };
 }
 
+// ------ Convenience: batch upload flow (galleries) ------
+
+export type FileUploadOutcome =
+  | { ok: true; result: UploadResult }
+  | { ok: false; detail: string };
+
+interface UploadFilesOptions {
+  entity_type?: string;
+  entity_id?: string;
+  product_id?: string;
+  onProgress?: (index: number, progress: UploadProgress) => void;
+}
+
+// Server-side limit per batch request (MAX_BATCH_UPLOADS)
+const MAX_BATCH_UPLOADS = 20;
+
+export async function uploadFiles(
+  files: File[],
+  opts?: UploadFilesOptions
+): Promise<FileUploadOutcome[]> {
+  const outcomes: FileUploadOutcome[] = [];
+  for (let start = 0; start < files.length; start += MAX_BATCH_UPLOADS) {
+    const batch = files.slice(start, start + MAX_BATCH_UPLOADS);
+    outcomes.push(
+      ...(await uploadBatch(batch, {
+        ...opts,
+        onProgress: (idx, progress) => opts?.onProgress?.(start + idx, progress),
+      }))
+    );
+  }
+  return outcomes;
+}
+
+async function uploadBatch(
+  files: File[],
+  opts?: UploadFilesOptions
+): Promise<FileUploadOutcome[]> {
+  // 1. One request for all presigned URLs
+  const entity =
+    opts?.entity_type && opts?.entity_id
+      ? { entity_type: opts.entity_type, entity_id: opts.entity_id }
+      : {};
+  const urlsResult = await apiFetch<{ items: UploadUrlResponse[] }>(
+    "/api/v1/tenants/me/media/upload-urls",
+    {
+      method: "POST",
+      body: JSON.stringify({
+        files: files.map((file) => ({
+          file_name: file.name,
+          content_type: file.type,
+          size_bytes: file.size,
+          ...entity,
+          ...(opts?.product_id ? { product_id: opts.product_id } : {}),
+        })),
+      }),
+    }
+  );
+  if (!urlsResult.ok) {
+    return files.map(() => ({ ok: false, detail: urlsResult.detail }));
+  }
+  const items = urlsResult.data.items;
+
+  // 2. PUT every file to S3 in parallel
+  const outcomes: FileUploadOutcome[] = await Promise.all(
+    files.map(async (file, idx): Promise<FileUploadOutcome> => {
+      try {
+        await uploadToPresignedUrl(items[idx].upload_url, file, (progress) =>
+          opts?.onProgress?.(idx, progress)
+        );
+      } catch (err) {
+        return {
+          ok: false,
+          detail: err instanceof Error ? err.message : "Upload failed",
+        };
+      }
+      return {
+        ok: true,
+        result: { media_id: items[idx].media_id, s3_key: items[idx].s3_key },
+      };
+    })
+  );
+
+  // 3. One request to confirm everything that reached S3
+  const uploadedIds = outcomes.flatMap((o) => (o.ok ? [o.result.media_id] : []));
+  if (uploadedIds.length === 0) return outcomes;
+  const confirmResult = await apiFetch<{ failed: ConfirmFailure[] }>(
+    "/api/v1/tenants/me/media/confirm",
+    { method: "POST", body: JSON.stringify({ media_ids: uploadedIds }) }
+  );
+  if (!confirmResult.ok) {
+    return outcomes.map((o) =>
+      o.ok ? { ok: false, detail: confirmResult.detail } : o
+    );
+  }
+  const failedById = new Map(
+    confirmResult.data.failed.map((f) => [f.media_id, f.detail])
+  );
+  return outcomes.map((o) => {
+    if (!o.ok) return o;
+    const detail = failedById.get(o.result.media_id);
+    return detail === undefined ? o : { ok: false, detail };
+  });
+}
+
 // ------ Get download URL for a media asset ------
 
 export async function getMediaDownloadUrl(